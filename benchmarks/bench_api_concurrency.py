@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the API.
+Runs the uvicorn app in-process against a synthetic history and measures how
+long cheap requests (GET /api/settings) wait while concurrent clients issue
+expensive ones (GET /api/stats). A background writer keeps adding rows so the
+stats responses are not served from the response cache.
+
+With database calls on the event loop, every settings request queues behind
+the running stats queries; with the database executor it does not.
+
+Usage:
+    python benchmarks/bench_api_concurrency.py --rows 200000 --heavy 8 --seconds 10
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def free_port() -> int:
+    """Return a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def populate(repository, rows: int):
+    """Insert synthetic rows spread over the last year."""
+    from vaibvoice.models.transcription import Transcription
+
+    now = datetime.datetime.now()
+    batch = []
+    for i in range(rows):
+        batch.append(Transcription(
+            timestamp=now - datetime.timedelta(minutes=(rows - i) * 3),
+            audio_path=f"audio_temp/recording_{i}.wav",
+            text="lorem ipsum dolor sit amet " * (1 + i % 20),
+            duration=5.0 + i % 30
+        ))
+        if len(batch) == 10000:
+            repository.add_many(batch)
+            batch = []
+    repository.add_many(batch)
+
+
+def writer(repository, interval: float, stop: threading.Event):
+    """Add a row every `interval` seconds so cached responses go stale."""
+    from vaibvoice.models.transcription import Transcription
+
+    while not stop.wait(interval):
+        repository.add(Transcription(audio_path="audio_temp/live.wav", text="live dictation", duration=2.0))
+
+
+async def client_loop(client, path: str, deadline: float, latencies: list):
+    """Issue requests to `path` back to back until the deadline, recording latencies."""
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load(base_url: str, heavy: int, seconds: float):
+    """Run `heavy` stats clients and one settings client for `seconds`."""
+    import httpx
+
+    limits = httpx.Limits(max_connections=heavy + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        await client.get("/api/settings")
+        deadline = time.monotonic() + seconds
+        stats_latencies, settings_latencies = [], []
+        await asyncio.gather(
+            client_loop(client, "/api/settings", deadline, settings_latencies),
+            *(client_loop(client, "/api/stats", deadline, stats_latencies) for _ in range(heavy))
+        )
+    return settings_latencies, stats_latencies
+
+
+def summarize(name: str, latencies: list, seconds: float):
+    """Print throughput and latency percentiles in milliseconds."""
+    if not latencies:
+        print(f"  {name:<14} no completed requests")
+        return
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"  {name:<14} {len(ordered) / seconds:8.1f} req/s"
+        f"  p50 {statistics.median(ordered) * 1000:8.1f} ms"
+        f"  p95 {p95 * 1000:8.1f} ms"
+        f"  max {ordered[-1] * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API latency under concurrent load")
+    parser.add_argument("--rows", type=int, default=200000, help="Number of synthetic rows")
+    parser.add_argument("--heavy", type=int, default=8, help="Concurrent GET /api/stats clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of the load")
+    parser.add_argument("--write-interval", type=float, default=0.05, help="Seconds between background inserts")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The database path must be set before vaibvoice.config is imported
+        os.environ["DB_PATH"] = os.path.join(tmp, "bench.db")
+
+        import uvicorn
+        from vaibvoice.api.server import create_app
+        from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+
+        repository = TranscriptionRepository()
+        populate(repository, args.rows)
+
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="warning"))
+        server_thread = threading.Thread(target=server.run, daemon=True)
+        server_thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        stop = threading.Event()
+        writer_thread = threading.Thread(target=writer, args=(repository, args.write_interval, stop), daemon=True)
+        writer_thread.start()
+        try:
+            settings_latencies, stats_latencies = asyncio.run(
+                run_load(f"http://127.0.0.1:{port}", args.heavy, args.seconds)
+            )
+        finally:
+            stop.set()
+            server.should_exit = True
+            server_thread.join(10)
+
+    print(f"{args.rows} rows, {args.heavy} stats clients + 1 settings client, {args.seconds:.0f}s")
+    summarize("GET /settings", settings_latencies, args.seconds)
+    summarize("GET /stats", stats_latencies, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
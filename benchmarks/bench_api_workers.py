@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for multi-worker API deployments.
+Starts `python -m vaibvoice.api.server --workers N` against a synthetic
+history for each requested worker count and drives it from several client
+processes, so that the load generator is not the bottleneck. Every client
+also keeps an event stream open, to check that events published through one
+worker reach clients connected to the others.
+
+Throughput should scale with the worker count up to the number of cores.
+
+Usage:
+    python benchmarks/bench_api_workers.py --rows 20000 --workers 1 2 4 --clients 8 --seconds 10
+"""
+
+import argparse
+import asyncio
+import datetime
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATHS = ("/api/transcriptions", "/api/stats", "/api/settings")
+
+
+def free_port() -> int:
+    """Return a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def populate(rows: int):
+    """Insert synthetic rows spread over the last year."""
+    from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+    from vaibvoice.models.transcription import Transcription
+
+    repository = TranscriptionRepository()
+    now = datetime.datetime.now()
+    batch = []
+    for i in range(rows):
+        batch.append(Transcription(
+            timestamp=now - datetime.timedelta(minutes=(rows - i) * 3),
+            audio_path=f"audio_temp/recording_{i}.wav",
+            text="lorem ipsum dolor sit amet " * (1 + i % 20),
+            duration=5.0 + i % 30
+        ))
+        if len(batch) == 10000:
+            repository.add_many(batch)
+            batch = []
+    repository.add_many(batch)
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0):
+    """Wait for the server to answer requests."""
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(base_url + "/api/settings", timeout=1).raise_for_status()
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError("API server did not start")
+
+
+async def client_main(base_url: str, concurrency: int, seconds: float) -> tuple:
+    """Issue requests with `concurrency` connections; return (requests, settings events seen)."""
+    import httpx
+
+    completed = 0
+    events = 0
+    deadline = time.monotonic() + seconds
+
+    async def requester(client, index):
+        nonlocal completed
+        while time.monotonic() < deadline:
+            response = await client.get(PATHS[(completed + index) % len(PATHS)])
+            response.raise_for_status()
+            completed += 1
+
+    async def listener(client):
+        nonlocal events
+        try:
+            async with client.stream("GET", "/api/events") as response:
+                async for line in response.aiter_lines():
+                    if line == "event: settings":
+                        events += 1
+        except (httpx.HTTPError, asyncio.CancelledError):
+            pass
+
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        listen_task = asyncio.ensure_future(listener(client))
+        await asyncio.gather(*(requester(client, i) for i in range(concurrency)))
+        # Give the relays time to deliver the last published event
+        await asyncio.sleep(1.0)
+        listen_task.cancel()
+        await asyncio.gather(listen_task, return_exceptions=True)
+    return completed, events
+
+
+def client_process(args):
+    """Entry point of a load generating process."""
+    return asyncio.run(client_main(*args))
+
+
+def publisher(base_url: str, seconds: float) -> int:
+    """Change a setting once per second; return the number of changes."""
+    import httpx
+
+    settings = httpx.get(base_url + "/api/settings").json()
+    changes = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        settings["transcription_language"] = "en" if changes % 2 else "it"
+        httpx.post(base_url + "/api/settings", json=settings).raise_for_status()
+        changes += 1
+        time.sleep(1.0)
+    return changes
+
+
+def run(workers: int, clients: int, concurrency: int, seconds: float, env: dict) -> tuple:
+    """Run one load test against a server with `workers` processes."""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "vaibvoice.api.server", "--port", str(port), "--workers", str(workers)],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(base_url)
+        with multiprocessing.Pool(clients) as pool:
+            pending = pool.map_async(client_process, [(base_url, concurrency, seconds)] * clients)
+            # Let the event streams connect before the first change
+            time.sleep(0.5)
+            changes = publisher(base_url, seconds - 1.0)
+            results = pending.get()
+    finally:
+        server.terminate()
+        server.wait(30)
+
+    completed = sum(requests for requests, _ in results)
+    missed = sum(changes - events for _, events in results)
+    return completed / seconds, changes, missed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API throughput across worker processes")
+    parser.add_argument("--rows", type=int, default=20000, help="Number of synthetic rows")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to compare")
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 2, help="Load generating processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="Connections per client process")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The database path must be set before vaibvoice.config is imported
+        os.environ["DB_PATH"] = os.path.join(tmp, "bench.db")
+        os.environ["GUI_DIST_DIR"] = os.path.join(tmp, "no-gui")
+        populate(args.rows)
+
+        print(
+            f"{args.rows} rows, {args.clients} client processes x {args.concurrency} connections,"
+            f" {args.seconds:.0f}s per run, {os.cpu_count()} cores"
+        )
+        baseline = None
+        for workers in args.workers:
+            env = dict(os.environ, API_WORKERS=str(workers))
+            throughput, changes, missed = run(workers, args.clients, args.concurrency, args.seconds, env)
+            baseline = baseline or throughput
+            print(
+                f"  {workers:>2} worker(s) {throughput:9.1f} req/s  x{throughput / baseline:4.2f}"
+                f"  settings events missed {missed}/{changes * args.clients}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the JSON response path.
+Measures p50/p99 time to turn transcription rows into a response body for
+several payload sizes:
+    - validated: Pydantic model per row, jsonable_encoder and json.dumps, as
+      FastAPI does for a response_model
+    - stdlib: rows -> dicts -> json.dumps (the path without orjson)
+    - fast: rows -> dicts -> dumps_json (orjson when installed)
+    - fast+gzip / fast+br: the fast path plus compression of the body
+
+Usage:
+    python benchmarks/bench_json_responses.py --sizes 100,1000,10000 --repeat 50
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+from vaibvoice.api.compression import SUPPORTED_ENCODINGS, compress
+from vaibvoice.api.models.transcription import TranscriptionResponse
+from vaibvoice.api.serialization import dumps_json, orjson, transcription_rows_to_json
+from vaibvoice.models.transcription import transcription_row_to_dict
+
+
+def make_rows(count: int) -> list:
+    """Build synthetic rows in TRANSCRIPTION_COLUMNS order."""
+    base = datetime.datetime(2024, 1, 1, 9, 0, 0)
+    return [
+        (
+            i + 1,
+            (base + datetime.timedelta(minutes=i)).isoformat(),
+            f"store:{i:064x}",
+            "lorem ipsum dolor sit amet " * (1 + i % 20),
+            5.0 + i % 30,
+            5 * (1 + i % 20)
+        )
+        for i in range(count)
+    ]
+
+
+def validated(rows: list) -> bytes:
+    """Pydantic model per row, then FastAPI's response_model encoding."""
+    models = [TranscriptionResponse(**transcription_row_to_dict(row)) for row in rows]
+    return json.dumps(jsonable_encoder(models)).encode("utf-8")
+
+
+def stdlib(rows: list) -> bytes:
+    """Direct row serialization with the standard library encoder."""
+    payload = [transcription_row_to_dict(row) for row in rows]
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast(rows: list) -> bytes:
+    """Direct row serialization through dumps_json."""
+    return transcription_rows_to_json(rows)
+
+
+def compressed(encoding: str):
+    """Fast path followed by compression with the given coding."""
+    def path(rows: list) -> bytes:
+        return compress(transcription_rows_to_json(rows), encoding)
+    return path
+
+
+def measure(func, rows: list, repeat: int):
+    """Return (p50, p99, body size) over `repeat` runs."""
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = func(rows)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    return statistics.median(timings), p99, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON response serialization")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated row counts")
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per path and size")
+    args = parser.parse_args()
+
+    paths = [("validated", validated), ("stdlib", stdlib), ("fast", fast)]
+    paths += [(f"fast+{encoding}", compressed(encoding)) for encoding in SUPPORTED_ENCODINGS]
+
+    print(f"dumps_json encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        rows = make_rows(size)
+        baseline = None
+        print(f"\n{size} rows, {args.repeat} runs")
+        for name, func in paths:
+            p50, p99, length = measure(func, rows, args.repeat)
+            baseline = baseline or p50
+            print(
+                f"  {name:<10} p50 {p50 * 1000:9.2f} ms  p99 {p99 * 1000:9.2f} ms"
+                f"  {length / 1024:9.1f} KiB  {baseline / p50:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark for transcription row mapping.
+Compares the per-row cost of the legacy tuple -> domain object -> Pydantic -> JSON
+path with the row factory and the direct rows -> JSON path.
+
+Usage:
+    python benchmarks/bench_row_mapping.py --rows 10000 --repeat 5
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vaibvoice.api.models.transcription import TranscriptionResponse
+from vaibvoice.api.serialization import transcription_rows_to_json
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.models.transcription import Transcription
+
+
+class LegacyTranscription:
+    """Dict-backed copy of the original Transcription model, kept as the baseline."""
+
+    def __init__(self, id=None, timestamp=None, audio_path="", text="", duration=0.0, word_count=None):
+        self.id = id
+        self.timestamp = timestamp or datetime.datetime.now()
+        self.audio_path = audio_path
+        self.text = text
+        self.duration = duration
+        if word_count is None and text:
+            self.word_count = len(text.split())
+        else:
+            self.word_count = word_count or 0
+
+
+def populate(repository: TranscriptionRepository, rows: int):
+    """Insert synthetic rows in one transaction."""
+    base = datetime.datetime(2024, 1, 1, 9, 0, 0)
+    batch = [
+        Transcription(
+            timestamp=base + datetime.timedelta(minutes=i),
+            audio_path=f"audio_temp/recording_{i}.wav",
+            text="lorem ipsum dolor sit amet " * (1 + i % 20),
+            duration=5.0 + i % 30
+        )
+        for i in range(rows)
+    ]
+    repository.add_many(batch)
+
+
+def legacy_path(repository: TranscriptionRepository) -> bytes:
+    """Original path: tuple -> domain object -> Pydantic model -> JSON."""
+    rows = repository.execute_query("SELECT * FROM transcriptions ORDER BY timestamp DESC", fetch=True)
+    objects = [
+        LegacyTranscription(
+            id=row[0],
+            timestamp=datetime.datetime.fromisoformat(row[1].split('.')[0]),
+            audio_path=row[2],
+            text=row[3],
+            duration=row[4],
+            word_count=row[5]
+        )
+        for row in rows
+    ]
+    models = [
+        TranscriptionResponse(
+            id=t.id,
+            timestamp=t.timestamp.isoformat(),
+            audio_path=t.audio_path,
+            text=t.text,
+            duration=t.duration,
+            word_count=t.word_count
+        )
+        for t in objects
+    ]
+    return json.dumps([m.model_dump() if hasattr(m, "model_dump") else m.dict() for m in models]).encode("utf-8")
+
+
+def row_factory_path(repository: TranscriptionRepository) -> list:
+    """Row factory building slotted Transcription objects directly."""
+    return repository.get_all()
+
+
+def direct_json_path(repository: TranscriptionRepository) -> bytes:
+    """List endpoint path: rows serialized straight to JSON."""
+    return transcription_rows_to_json(repository.get_all_rows())
+
+
+def measure(func, repository, repeat: int) -> float:
+    """Return the best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(repository)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcription row mapping")
+    parser.add_argument("--rows", type=int, default=10000, help="Number of synthetic rows")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = TranscriptionRepository(os.path.join(tmp, "bench.db"))
+        populate(repository, args.rows)
+
+        results = {}
+        for name, func in (
+            ("legacy (tuple -> object -> pydantic -> json)", legacy_path),
+            ("row factory (tuple -> slotted object)", row_factory_path),
+            ("direct json (tuple -> json)", direct_json_path),
+        ):
+            results[name] = measure(func, repository, args.repeat)
+
+    baseline = results["legacy (tuple -> object -> pydantic -> json)"]
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name, seconds in results.items():
+        per_row_us = seconds / args.rows * 1e6
+        print(f"  {name:<46} {per_row_us:8.2f} us/row  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
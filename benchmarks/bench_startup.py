@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark.
+Starts `python -m vaibvoice.main` repeatedly against a throwaway database
+and measures, from process launch:
+    - listener: until the key listener is running ("VaibVoice is running.")
+    - api: until GET /api/settings answers
+
+The browser is not opened and the GUI is not built. The key listener needs
+pynput and, on Linux, an X display.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10
+"""
+
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READY_LINE = "VaibVoice is running."
+
+
+def free_port() -> int:
+    """Return a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def api_ready(port: int) -> bool:
+    """Check whether the API answers GET /api/settings."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/settings", timeout=1) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def run_once(tmp: str, timeout: float) -> dict:
+    """Start the application once and time it until the listener and the API are ready."""
+    port = free_port()
+    gui_dir = os.path.join(tmp, "gui_dist")
+    os.makedirs(gui_dir, exist_ok=True)
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        PYTHONUNBUFFERED="1",
+        DB_PATH=os.path.join(tmp, "startup.db"),
+        AUDIO_TEMP_DIR=os.path.join(tmp, "audio_temp"),
+        AUDIO_STORE_DIR=os.path.join(tmp, "audio_store"),
+        GUI_DIST_DIR=gui_dir,
+        API_PORT=str(port),
+        BROWSER="true",  # webbrowser runs `true` instead of opening a browser
+    )
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "vaibvoice.main"],
+        cwd=tmp, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    listener_ready = threading.Event()
+    output = []
+
+    def read_output():
+        for line in process.stdout:
+            output.append(line)
+            if READY_LINE in line:
+                listener_ready.set()
+
+    threading.Thread(target=read_output, daemon=True).start()
+
+    result = {}
+    try:
+        deadline = start + timeout
+        while time.perf_counter() < deadline and process.poll() is None:
+            if "listener" not in result and listener_ready.is_set():
+                result["listener"] = time.perf_counter() - start
+            if "api" not in result and api_ready(port):
+                result["api"] = time.perf_counter() - start
+            if len(result) == 2:
+                break
+            time.sleep(0.005)
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    if len(result) < 2:
+        result["error"] = "".join(output[-10:]).strip() or f"exit code {process.returncode}"
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark application startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of starts")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for each start")
+    args = parser.parse_args()
+
+    timings = {"listener": [], "api": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(args.runs):
+            result = run_once(tmp, args.timeout)
+            if "error" in result:
+                print(f"run {run + 1}: did not become ready:\n{result['error']}")
+                continue
+            print(f"run {run + 1}: listener {result['listener'] * 1000:7.1f} ms  api {result['api'] * 1000:7.1f} ms")
+            for name in timings:
+                timings[name].append(result[name])
+
+    for name, values in timings.items():
+        if values:
+            print(
+                f"{name:<9} min {min(values) * 1000:7.1f} ms  median {statistics.median(values) * 1000:7.1f} ms"
+                f"  max {max(values) * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
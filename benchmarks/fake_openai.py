@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI API, for benchmarks that must not touch the network.
+Implements the two endpoints VaibVoice uses:
+    - POST /v1/audio/transcriptions: JSON for whisper-1, and the
+      transcript.text.delta / transcript.text.done SSE stream when stream=true
+    - POST /v1/chat/completions: returns the transcription found in the prompt
+
+The transcription text is read from a .txt file next to the uploaded WAV's
+name in --corpus when there is one, and otherwise generated from the audio
+length (about 2.5 words per second).
+
+Latencies are drawn from distributions given as "const:S", "uniform:LO:HI",
+"normal:MEAN:STDEV" or "lognormal:MEDIAN:SIGMA" (seconds). Throughput can be
+limited by concurrency and by rate, and errors can be injected.
+
+Point VaibVoice at it with OPENAI_BASE_URL=http://127.0.0.1:8900/v1.
+
+Usage:
+    python benchmarks/fake_openai.py --port 8900 --first-delta lognormal:0.4:0.3 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Callable, Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+WORDS = (
+    "the quick brown fox jumps over a lazy dog while we write a short note about the meeting "
+    "tomorrow please send the report before noon and remember to check the numbers twice"
+).split()
+
+
+def parse_distribution(spec: str) -> Callable[[], float]:
+    """
+    Parse a latency distribution.
+
+    Args:
+        spec (str): "const:S", "uniform:LO:HI", "normal:MEAN:STDEV" or "lognormal:MEDIAN:SIGMA"
+
+    Returns:
+        Callable[[], float]: Function drawing a non-negative number of seconds
+    """
+    kind, _, rest = spec.partition(":")
+    values = [float(value) for value in rest.split(":") if value]
+    if kind == "const" and len(values) == 1:
+        return lambda: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda: random.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(values[0]) if values[0] > 0 else 0.0
+        return lambda: random.lognormvariate(mu, values[1])
+    raise argparse.ArgumentTypeError(f"Invalid distribution: {spec}")
+
+
+class RateLimiter:
+    """
+    Token bucket; requests beyond the rate are answered with 429.
+
+    Attributes:
+        rate (float): Requests per second, 0 for unlimited
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Take a token if one is available."""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class FakeOpenAI:
+    """
+    The stand-in's behaviour and counters.
+
+    Attributes:
+        options (argparse.Namespace): Latency, limit and error settings
+        stats (Dict[str, int]): Requests served, rejected and failed per endpoint
+    """
+
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        self.upload = parse_distribution(options.upload)
+        self.first_delta = parse_distribution(options.first_delta)
+        self.delta_interval = parse_distribution(options.delta_interval)
+        self.chat = parse_distribution(options.chat)
+        self.limiter = RateLimiter(options.rate)
+        self.semaphore = asyncio.Semaphore(options.max_concurrency)
+        self.stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+
+    def count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    async def admit(self, endpoint: str) -> Optional[Response]:
+        """Apply the rate limit and error injection; return the error response, if any."""
+        if not self.limiter.allow():
+            self.count(f"{endpoint}.rate_limited")
+            return JSONResponse(
+                {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error"}},
+                status_code=429,
+                headers={"Retry-After": "1"}
+            )
+        if random.random() < self.options.error_rate:
+            self.count(f"{endpoint}.injected_error")
+            return JSONResponse({"error": {"message": "Injected failure", "type": "server_error"}}, status_code=500)
+        return None
+
+    def transcript_for(self, filename: str, audio: bytes) -> str:
+        """Pick the text of an upload: the corpus sidecar file, or words for its duration."""
+        if self.options.corpus and filename:
+            sidecar = os.path.join(self.options.corpus, os.path.splitext(os.path.basename(filename))[0] + ".txt")
+            if os.path.isfile(sidecar):
+                with open(sidecar, "r", encoding="utf-8") as text:
+                    return text.read().strip()
+        seconds = audio_seconds(audio)
+        count = max(1, int(seconds * 2.5))
+        return " ".join(WORDS[i % len(WORDS)] for i in range(count)).capitalize() + "."
+
+
+def audio_seconds(audio: bytes) -> float:
+    """Duration of a WAV upload, estimated from its size when it cannot be decoded."""
+    try:
+        import soundfile as sf
+
+        info = sf.info(io.BytesIO(audio))
+        return info.frames / info.samplerate
+    except Exception:
+        return len(audio) / 88200  # 16-bit mono at 44.1 kHz
+
+
+def parse_multipart(content_type: str, body: bytes) -> Dict[str, tuple]:
+    """
+    Parse a multipart/form-data body without python-multipart.
+
+    Returns:
+        Dict[str, tuple]: field name -> (filename or None, bytes)
+    """
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        fields[name] = (part.get_filename(), part.get_payload(decode=True) or b"")
+    return fields
+
+
+def usage_for(text: str, audio: bytes) -> Dict[str, int]:
+    """Plausible token usage for a transcription."""
+    return {
+        "input_tokens": int(audio_seconds(audio) * 10),
+        "output_tokens": len(text.split()),
+        "total_tokens": int(audio_seconds(audio) * 10) + len(text.split()),
+    }
+
+
+def create_app(fake: FakeOpenAI) -> Starlette:
+    """Build the stand-in's ASGI app."""
+
+    async def transcriptions(request: Request):
+        async with fake.semaphore:
+            rejected = await fake.admit("transcriptions")
+            if rejected is not None:
+                return rejected
+
+            fields = parse_multipart(request.headers.get("content-type", ""), await request.body())
+            filename, audio = fields.get("file", (None, b""))
+            model = fields.get("model", (None, b"whisper-1"))[1].decode()
+            stream = fields.get("stream", (None, b"false"))[1].decode().lower() == "true"
+            text = fake.transcript_for(filename, audio)
+
+            # Time to receive and accept the upload
+            await asyncio.sleep(fake.upload())
+            fake.count("transcriptions")
+
+            if not stream or model == "whisper-1":
+                await asyncio.sleep(fake.first_delta())
+                return JSONResponse({"text": text})
+
+            words = text.split(" ")
+            abort = random.random() < fake.options.abort_rate
+
+            async def events():
+                await asyncio.sleep(fake.first_delta())
+                for index, word in enumerate(words):
+                    if abort and index == len(words) // 2:
+                        fake.count("transcriptions.aborted")
+                        return
+                    delta = word if index == 0 else " " + word
+                    yield "data: " + json.dumps({"type": "transcript.text.delta", "delta": delta}) + "\n\n"
+                    await asyncio.sleep(fake.delta_interval())
+                done = {"type": "transcript.text.done", "text": text, "usage": usage_for(text, audio)}
+                yield "data: " + json.dumps(done) + "\n\n"
+
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def chat_completions(request: Request):
+        async with fake.semaphore:
+            rejected = await fake.admit("chat")
+            if rejected is not None:
+                return rejected
+
+            payload = await request.json()
+            prompt = payload["messages"][-1]["content"]
+            # The formatter sends "Transcription: <text>\n\n Formatted version:"
+            text = prompt.split("Transcription:", 1)[-1].split("Formatted version:", 1)[0].strip()
+            await asyncio.sleep(fake.chat())
+            fake.count("chat")
+            return JSONResponse({
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get("model", "gpt-4o-mini"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": len(prompt.split()),
+                    "completion_tokens": len(text.split()),
+                    "total_tokens": len(prompt.split()) + len(text.split()),
+                },
+            })
+
+    async def stats(request: Request):
+        return JSONResponse(fake.stats)
+
+    return Starlette(
+        routes=[
+            Route("/v1/audio/transcriptions", transcriptions, methods=["POST"]),
+            Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+            Route("/stats", stats, methods=["GET"]),
+        ]
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options, shared with the replay harness."""
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stand-in server", add_help=False)
+    parser.add_argument("--upload", default="lognormal:0.08:0.4", help="Upload acceptance latency distribution")
+    parser.add_argument("--first-delta", default="lognormal:0.35:0.3", help="Latency until the first delta")
+    parser.add_argument("--delta-interval", default="uniform:0.005:0.03", help="Latency between deltas")
+    parser.add_argument("--chat", default="lognormal:0.6:0.35", help="Chat completion latency distribution")
+    parser.add_argument("--max-concurrency", type=int, default=64, help="Requests served at once; others wait")
+    parser.add_argument("--rate", type=float, default=0.0, help="Requests per second before 429s, 0 for no limit")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--abort-rate", type=float, default=0.0, help="Fraction of streams cut off halfway")
+    parser.add_argument("--corpus", help="Directory with <name>.txt transcripts for uploaded <name>.wav files")
+    return parser
+
+
+def start_in_thread(options: argparse.Namespace, port: int):
+    """Run the stand-in on a background thread; returns the uvicorn server once it is serving."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(FakeOpenAI(options)), host="127.0.0.1", port=port, log_level="warning"
+    ))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(parents=[build_parser()], description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    options = parser.parse_args()
+    print(f"OpenAI stand-in at http://{options.host}:{options.port}/v1", file=sys.stderr)
+    uvicorn.run(create_app(FakeOpenAI(options)), host=options.host, port=options.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
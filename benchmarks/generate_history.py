@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Synthetic transcription history generator.
+Bulk-creates realistic rows in the transcriptions table of a throwaway
+database, to reproduce the behaviour of a large transcription_history.db:
+    - timestamps spread over several years, on weekdays more than weekends
+      and in working hours more than at night, in short bursts
+    - recording lengths from a log-normal distribution (median about 8 s)
+    - text length following the duration at a varying speaking rate
+    - most recordings in the audio store, some legacy file paths, some without audio
+
+The output is reproducible for a given --seed.
+
+Usage:
+    python benchmarks/generate_history.py /tmp/history.db --rows 1000000 --years 3
+"""
+
+import argparse
+import datetime
+import math
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VOCABULARY = (
+    "the a to and of for in on with that this is it we you I can please send meeting email "
+    "tomorrow today report project update team review thanks hello let me know about the "
+    "next week call after before schedule draft note idea function test deploy issue fix "
+    "customer order invoice budget numbers check again quickly write reply summary agenda"
+).split()
+
+# Relative dictation activity by hour of day and by weekday (Monday first)
+HOUR_WEIGHTS = [1, 0.5, 0.3, 0.2, 0.2, 0.4, 1, 3, 7, 10, 10, 9, 6, 8, 10, 10, 9, 7, 4, 3, 3, 2, 2, 1]
+DAY_WEIGHTS = [10, 10, 10, 10, 9, 3, 2]
+
+
+def generate_timestamps(rng: random.Random, rows: int, years: float, end: datetime.datetime):
+    """
+    Draw `rows` timestamps in the `years` before `end`, oldest first.
+
+    Dictations come in sessions: a start drawn from the weekly activity
+    pattern, followed by a few entries seconds to minutes apart.
+    """
+    days = max(1, int(years * 365))
+    timestamps = []
+    while len(timestamps) < rows:
+        day = end - datetime.timedelta(days=rng.randrange(days))
+        while rng.random() * 10 > DAY_WEIGHTS[day.weekday()]:
+            day = end - datetime.timedelta(days=rng.randrange(days))
+        hour = rng.choices(range(24), weights=HOUR_WEIGHTS)[0]
+        moment = day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60), microsecond=0)
+        for _ in range(min(rows - len(timestamps), 1 + int(rng.expovariate(1 / 3)))):
+            if moment < end:
+                timestamps.append(moment)
+            moment += datetime.timedelta(seconds=20 + rng.expovariate(1 / 90))
+    timestamps.sort()
+    return timestamps
+
+
+def generate_text(rng: random.Random, duration: float) -> str:
+    """Words for a recording of `duration` seconds, at 1.5-3.5 words per second."""
+    count = max(1, int(duration * rng.uniform(1.5, 3.5)))
+    words = rng.choices(VOCABULARY, k=count)
+    sentences, start = [], 0
+    while start < count:
+        end = min(count, start + rng.randint(6, 18))
+        sentence = " ".join(words[start:end])
+        sentences.append(sentence[0].upper() + sentence[1:] + ".")
+        start = end
+    return " ".join(sentences)
+
+
+def generate_history(repository, rows: int, years: float = 3.0, seed: int = 0, batch_size: int = 10000) -> int:
+    """
+    Add `rows` synthetic transcriptions to a repository.
+
+    Args:
+        repository (TranscriptionRepository): Repository of the throwaway database
+        rows (int): Number of transcriptions to add
+        years (float): Period the timestamps are spread over, ending now
+        seed (int): Seed for reproducible output
+        batch_size (int): Rows per transaction
+
+    Returns:
+        int: Number of transcriptions added
+    """
+    from vaibvoice.models.transcription import Transcription
+
+    rng = random.Random(seed)
+    added = 0
+    batch = []
+    for index, timestamp in enumerate(generate_timestamps(rng, rows, years, datetime.datetime.now())):
+        duration = round(min(300.0, max(0.5, rng.lognormvariate(math.log(8.0), 0.8))), 2)
+        kind = rng.random()
+        if kind < 0.85:
+            audio_path = f"store:{rng.getrandbits(256):064x}"
+        elif kind < 0.95:
+            audio_path = f"audio_temp/recording_{timestamp:%Y%m%d_%H%M%S}_{index}.wav"
+        else:
+            audio_path = ""
+        batch.append(Transcription(
+            timestamp=timestamp,
+            audio_path=audio_path,
+            text=generate_text(rng, duration),
+            duration=duration
+        ))
+        if len(batch) == batch_size:
+            if not repository.add_many(batch):
+                raise RuntimeError("Failed to insert a batch of transcriptions")
+            added += len(batch)
+            batch = []
+    if batch:
+        if not repository.add_many(batch):
+            raise RuntimeError("Failed to insert a batch of transcriptions")
+        added += len(batch)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic transcription history database")
+    parser.add_argument("db_path", help="Database file to create")
+    parser.add_argument("--rows", type=int, default=100000, help="Number of transcriptions")
+    parser.add_argument("--years", type=float, default=3.0, help="Years of history")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--force", action="store_true", help="Replace the database file if it exists")
+    args = parser.parse_args()
+
+    db_path = os.path.abspath(args.db_path)
+    if os.path.exists(db_path):
+        if not args.force:
+            parser.error(f"{db_path} exists; pass --force to replace it")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+
+    start = time.perf_counter()
+    added = generate_history(TranscriptionRepository(db_path), args.rows, args.years, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"{added} transcriptions written to {db_path} in {elapsed:.1f} s ({os.path.getsize(db_path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of VaibVoice modules.
+Imports each module in a fresh interpreter with `python -X importtime` and
+reports where the time goes: the slowest imports by cumulative time, and the
+self time summed per top-level package, which shows the cost of each
+third-party dependency.
+
+Usage:
+    python benchmarks/import_profile.py
+    python benchmarks/import_profile.py vaibvoice.core.keyboard vaibvoice.api.server --top 30 --output imports.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ("vaibvoice.main", "vaibvoice.core.keyboard", "vaibvoice.api.server")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile_import(module: str) -> Dict:
+    """
+    Import `module` in a new interpreter and parse its -X importtime output.
+
+    Args:
+        module (str): Module to import
+
+    Returns:
+        Dict: {"module", "total", "error", "imports": [{"name", "self", "cumulative", "depth"}]}
+            with times in seconds
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    imports = []
+    error = None
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            imports.append({
+                "name": match.group(4),
+                "self": int(match.group(1)) / 1e6,
+                "cumulative": int(match.group(2)) / 1e6,
+                "depth": len(match.group(3)) // 2,
+            })
+        elif line.strip() and not line.startswith("import time:"):
+            error = line.strip()
+    target = next((entry for entry in imports if entry["name"] == module), None)
+    return {
+        "module": module,
+        "total": target["cumulative"] if target else None,
+        "error": error if result.returncode else None,
+        "imports": imports,
+    }
+
+
+def by_package(imports: List[Dict]) -> Dict[str, float]:
+    """Self time summed per top-level package, slowest first."""
+    totals: Dict[str, float] = {}
+    for entry in imports:
+        package = entry["name"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + entry["self"]
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the import time of VaibVoice modules")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES), help="Modules to import")
+    parser.add_argument("--top", type=int, default=15, help="Entries to show per table")
+    parser.add_argument("--output", help="Write the profiles as JSON to this file")
+    args = parser.parse_args()
+
+    profiles = []
+    for module in args.modules:
+        profile = profile_import(module)
+        profiles.append(profile)
+
+        total = f"{profile['total'] * 1000:.1f} ms" if profile["total"] is not None else "failed"
+        print(f"\nimport {module}: {total}")
+        if profile["error"]:
+            print(f"  {profile['error']}")
+
+        print("  slowest imports (cumulative):")
+        for entry in sorted(profile["imports"], key=lambda e: e["cumulative"], reverse=True)[:args.top]:
+            print(f"    {entry['cumulative'] * 1000:9.1f} ms  {entry['name']}")
+
+        print("  self time per package:")
+        for package, seconds in list(by_package(profile["imports"]).items())[:args.top]:
+            print(f"    {seconds * 1000:9.1f} ms  {package}")
+
+    if args.output:
+        for profile in profiles:
+            profile["packages"] = by_package(profile["imports"])
+        with open(args.output, "w", encoding="utf-8") as out:
+            json.dump({"python": sys.version, "profiles": profiles}, out, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Load test for the API at a target request rate.
+Runs the uvicorn app in-process against a synthetic history (see
+generate_history.py) and drives GET /api/transcriptions, /api/stats and
+/api/settings with an open-loop schedule: requests are sent at fixed
+intervals whether or not earlier ones have finished, and latency is measured
+from the scheduled send time, so a slow server shows up as latency instead
+of as a lower request rate.
+
+Reports the achieved rate, latency percentiles and the error rate per endpoint.
+
+Usage:
+    python benchmarks/load_api.py --rows 200000 --rps 50 --seconds 30
+    python benchmarks/load_api.py --db /tmp/history.db --rps 100 --mix transcriptions=1,stats=2,settings=5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_history import generate_history  # noqa: E402
+
+ENDPOINTS = {
+    "transcriptions": "/api/transcriptions",
+    "stats": "/api/stats",
+    "settings": "/api/settings",
+}
+
+
+def free_port() -> int:
+    """Return a free TCP port on localhost."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse "name=weight,..." into endpoint weights."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def schedule(mix: Dict[str, int]) -> List[str]:
+    """One cycle of endpoint names, interleaved in proportion to their weights."""
+    total = sum(mix.values())
+    slots = []
+    for name, weight in mix.items():
+        slots.extend((index / weight, name) for index in range(weight))
+    return [name for _, name in sorted(slots)] if total else []
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_load(base_url: str, mix: Dict[str, int], rps: float, seconds: float, timeout: float):
+    """Send requests at `rps` for `seconds`; return latencies and errors per endpoint."""
+    import httpx
+
+    latencies = {name: [] for name in mix}
+    errors = {name: {} for name in mix}
+    cycle = schedule(mix)
+
+    async def request(client, name: str, scheduled: float):
+        try:
+            response = await client.get(ENDPOINTS[name])
+            outcome = None if response.status_code < 400 else str(response.status_code)
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        if outcome is None:
+            latencies[name].append(time.perf_counter() - scheduled)
+        else:
+            errors[name][outcome] = errors[name].get(outcome, 0) + 1
+
+    limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        for path in ENDPOINTS.values():
+            await client.get(path)
+        tasks = []
+        start = time.perf_counter()
+        total = int(rps * seconds)
+        for index in range(total):
+            scheduled = start + index / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(request(client, cycle[index % len(cycle)], scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, Dict[str, int]], elapsed: float) -> Dict:
+    """Achieved rate, latency percentiles in seconds and error rate per endpoint."""
+    summary = {}
+    for name in latencies:
+        ordered = sorted(latencies[name])
+        failed = sum(errors[name].values())
+        sent = len(ordered) + failed
+        entry = {
+            "requests": sent,
+            "rps": sent / elapsed,
+            "error_rate": failed / sent if sent else 0.0,
+            "errors": errors[name],
+        }
+        if ordered:
+            entry.update({
+                "p50": percentile(ordered, 0.50),
+                "p95": percentile(ordered, 0.95),
+                "p99": percentile(ordered, 0.99),
+                "max": ordered[-1],
+            })
+        summary[name] = entry
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API at a target request rate")
+    parser.add_argument("--db", help="Existing history database to serve (a copy is used)")
+    parser.add_argument("--rows", type=int, default=100000, help="Synthetic rows when --db is not given")
+    parser.add_argument("--years", type=float, default=3.0, help="Years of synthetic history")
+    parser.add_argument("--rps", type=float, default=50.0, help="Target requests per second, all endpoints together")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Duration of the load")
+    parser.add_argument("--mix", type=parse_mix, default="transcriptions=1,stats=1,settings=1",
+                        help="Endpoint weights, e.g. transcriptions=1,stats=2,settings=5")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "history.db")
+        # These must be set before vaibvoice.config is imported
+        os.environ["DB_PATH"] = db_path
+        os.environ["AUDIO_TEMP_DIR"] = os.path.join(tmp, "audio_temp")
+        os.environ["AUDIO_STORE_DIR"] = os.path.join(tmp, "audio_store")
+
+        import uvicorn
+        from vaibvoice.api.server import create_app
+        from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+
+        if args.db:
+            shutil.copyfile(args.db, db_path)
+        else:
+            print(f"Generating {args.rows} rows...", flush=True)
+            generate_history(TranscriptionRepository(db_path), args.rows, args.years)
+
+        port = free_port()
+        server = uvicorn.Server(uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="warning"))
+        server_thread = threading.Thread(target=server.run, daemon=True)
+        server_thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        try:
+            latencies, errors, elapsed = asyncio.run(
+                run_load(f"http://127.0.0.1:{port}", args.mix, args.rps, args.seconds, args.timeout)
+            )
+        finally:
+            server.should_exit = True
+            server_thread.join(10)
+
+    summary = summarize(latencies, errors, elapsed)
+    print(f"Target {args.rps:.0f} req/s for {args.seconds:.0f} s, mix {args.mix}")
+    for name, entry in summary.items():
+        line = f"  GET {ENDPOINTS[name]:<20} {entry['rps']:7.1f} req/s  errors {entry['error_rate'] * 100:5.1f}%"
+        if "p50" in entry:
+            line += (
+                f"  p50 {entry['p50'] * 1000:8.1f} ms  p95 {entry['p95'] * 1000:8.1f} ms"
+                f"  p99 {entry['p99'] * 1000:8.1f} ms  max {entry['max'] * 1000:8.1f} ms"
+            )
+        print(line)
+        if entry["errors"]:
+            print(f"      {entry['errors']}")
+
+    if args.output:
+        document = {
+            "settings": {key: value for key, value in vars(args).items() if key != "output"},
+            "elapsed": elapsed,
+            "endpoints": summary,
+        }
+        with open(args.output, "w", encoding="utf-8") as out:
+            json.dump(document, out, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
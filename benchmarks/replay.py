@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Replay harness for the transcription pipeline.
+Pushes a corpus of WAV files through request_transcription and
+format_transcription (the stages of transcribe_audio, without typing the
+result) at a configurable concurrency, and reports p50/p95/p99 per stage.
+
+By default it starts the local OpenAI stand-in (benchmarks/fake_openai.py)
+and points VaibVoice at it through OPENAI_BASE_URL; pass --base-url to
+replay against another OpenAI-compatible endpoint instead. The stand-in's
+latency, throughput and error options are accepted here too.
+
+The corpus is a directory of .wav files; --synthesize generates one. A
+<name>.txt next to <name>.wav is used as the stand-in's transcript.
+
+Usage:
+    python benchmarks/replay.py --synthesize 50 --concurrency 8
+    python benchmarks/replay.py --corpus recordings/ --concurrency 4 --error-rate 0.05 --output replay.json
+    python benchmarks/replay.py --corpus recordings/ --base-url http://127.0.0.1:8900/v1
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_openai  # noqa: E402
+
+STAGES = ("upload", "first_delta", "transcription", "format", "total")
+
+
+def synthesize_corpus(directory: str, count: int, sample_rate: int = 16000):
+    """Write `count` WAV files of 2-20 seconds of noise-like speech stand-in audio."""
+    import numpy as np
+    import soundfile as sf
+
+    rng = np.random.default_rng(0)
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        seconds = 2 + (i * 7) % 19
+        tone = np.sin(2 * np.pi * 220 * np.arange(int(seconds * sample_rate)) / sample_rate)
+        data = (0.1 * tone + 0.02 * rng.standard_normal(tone.size)).astype(np.float32)
+        sf.write(os.path.join(directory, f"utterance_{i:04d}.wav"), data, sample_rate)
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, Dict]:
+    """p50/p95/p99, mean and max of each stage, in seconds."""
+    summary = {}
+    for stage in STAGES:
+        ordered = sorted(samples[stage])
+        if not ordered:
+            continue
+        summary[stage] = {
+            "count": len(ordered),
+            "p50": percentile(ordered, 0.50),
+            "p95": percentile(ordered, 0.95),
+            "p99": percentile(ordered, 0.99),
+            "mean": sum(ordered) / len(ordered),
+            "max": ordered[-1],
+        }
+    return summary
+
+
+def replay_one(path: str) -> Dict:
+    """Run one file through the pipeline with a trace active and return its timings."""
+    from vaibvoice.core.formatter import format_transcription
+    from vaibvoice.core.transcriber import request_transcription
+    from vaibvoice.models.trace import DictationTrace
+    from vaibvoice.utils.metrics import activate_trace
+
+    trace = DictationTrace()
+    start = time.perf_counter()
+    with activate_trace(trace):
+        try:
+            text = request_transcription(path)
+        except Exception as e:
+            return {"error": f"transcription: {type(e).__name__}"}
+        format_transcription(text)
+    trace.total = time.perf_counter() - start
+    # format_transcription falls back to the raw text on failure; llm_model is only set on success
+    result = {name: getattr(trace, name) for name in STAGES if getattr(trace, name) is not None}
+    if text.strip() and trace.llm_model is None:
+        result["error"] = "format"
+    return result
+
+
+def save_models(model: str, llm_model: str):
+    """Store the models to request in the settings of the temporary database; the pipeline reads them from there."""
+    from vaibvoice.db.repositories.settings_repository import SettingsRepository
+
+    repository = SettingsRepository()
+    settings = repository.get()
+    settings.transcription_model = model
+    settings.llm_model = llm_model
+    if not repository.save(settings):
+        sys.exit("Failed to save the replay settings")
+
+
+def main():
+    parser = argparse.ArgumentParser(parents=[fake_openai.build_parser()], description="Replay a WAV corpus through the transcription pipeline")
+    parser.add_argument("--synthesize", type=int, default=0, help="Generate this many WAV files as the corpus")
+    parser.add_argument("--concurrency", type=int, default=4, help="Files in flight at once")
+    parser.add_argument("--repeat", type=int, default=1, help="Times to replay the whole corpus")
+    parser.add_argument("--model", default="gpt-4o-transcribe", help="Transcription model to request")
+    parser.add_argument("--llm-model", default="gpt-4o-mini", help="Formatting model to request")
+    parser.add_argument("--base-url", help="Use this OpenAI-compatible endpoint instead of starting the stand-in")
+    parser.add_argument("--port", type=int, default=8900, help="Port for the stand-in")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthesize:
+            args.corpus = os.path.join(tmp, "corpus")
+            synthesize_corpus(args.corpus, args.synthesize)
+        if not args.corpus:
+            parser.error("give --corpus or --synthesize")
+        files = sorted(
+            os.path.join(args.corpus, name) for name in os.listdir(args.corpus) if name.lower().endswith(".wav")
+        ) * args.repeat
+        if not files:
+            parser.error(f"no .wav files in {args.corpus}")
+
+        server = None
+        if not args.base_url:
+            server = fake_openai.start_in_thread(args, args.port)
+            args.base_url = f"http://127.0.0.1:{args.port}/v1"
+
+        # These must be set before vaibvoice.config is imported
+        os.environ["OPENAI_BASE_URL"] = args.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "replay")
+        os.environ["DB_PATH"] = os.path.join(tmp, "settings.db")
+        os.environ["AUDIO_TEMP_DIR"] = os.path.join(tmp, "audio_temp")
+        os.environ["METRICS_ENABLED"] = "false"
+        save_models(args.model, args.llm_model)
+
+        print(f"Replaying {len(files)} files at concurrency {args.concurrency} against {args.base_url}", flush=True)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(replay_one, files))
+        elapsed = time.perf_counter() - start
+
+        if server is not None:
+            server.should_exit = True
+
+    samples = {stage: [] for stage in STAGES}
+    errors: Dict[str, int] = {}
+    for result in results:
+        if "error" in result:
+            errors[result["error"]] = errors.get(result["error"], 0) + 1
+        for stage in STAGES:
+            if stage in result:
+                samples[stage].append(result[stage])
+
+    summary = summarize(samples)
+    print(f"{'stage':<15}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for stage, values in summary.items():
+        print(
+            f"{stage:<15}{values['count']:>7}{values['p50'] * 1000:>10.1f}{values['p95'] * 1000:>10.1f}"
+            f"{values['p99'] * 1000:>10.1f}{values['max'] * 1000:>10.1f}"
+        )
+    print(f"{len(files)} files in {elapsed:.2f} s ({len(files) / elapsed:.2f}/s), errors: {errors or 'none'}")
+
+    if args.output:
+        document = {
+            "settings": {key: value for key, value in vars(args).items() if key != "output"},
+            "files": len(files),
+            "elapsed": elapsed,
+            "errors": errors,
+            "stages": summary,
+        }
+        with open(args.output, "w", encoding="utf-8") as out:
+            json.dump(document, out, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Soak test for resource leaks.
+Runs thousands of synthetic dictations in one process through the same code
+as the key listener: AudioRecorder capture and stop, the audio store, the
+write-behind history queue with a trace per dictation, and periodic API
+reads. No microphone, OpenAI account or display is needed: audio blocks are
+fed to the recorder's stream callback and the transcription is synthetic,
+unless --openai replays through the local stand-in (benchmarks/fake_openai.py).
+
+RSS, open file descriptors, threads and open SQLite connections are sampled
+along the way. After a warm-up, the test fails (exit code 1) if any of them
+is still climbing: if the last third of the samples is above the first third
+by more than the allowed growth.
+
+Usage:
+    python benchmarks/soak.py --dictations 5000
+    python benchmarks/soak.py --dictations 2000 --openai --max-rss-growth-mb 16
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+RESOURCES = ("rss_mb", "open_fds", "threads", "sqlite_connections")
+
+
+class _SilentStream:
+    """Stands in for the sounddevice input stream that the recorder stops and closes."""
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def sample_resources() -> Dict[str, float]:
+    """Current resource usage of the process."""
+    from vaibvoice.utils.diagnostics import collect
+
+    diagnostics = collect(limit=1)
+    return {
+        "rss_mb": (diagnostics["rss"] or 0) / 1e6,
+        "open_fds": diagnostics["open_fds"] or 0,
+        "threads": diagnostics["threads"],
+        "sqlite_connections": diagnostics["sqlite_connections"],
+    }
+
+
+def find_growth(samples: List[Dict[str, float]], warmup: float, limits: Dict[str, float]) -> List[str]:
+    """
+    Compare the first and last third of the samples after the warm-up.
+
+    Returns:
+        List[str]: A message per resource that grew more than its limit
+    """
+    steady = samples[int(len(samples) * warmup):]
+    third = max(1, len(steady) // 3)
+    failures = []
+    for name in RESOURCES:
+        early = statistics.median(sample[name] for sample in steady[:third])
+        late = statistics.median(sample[name] for sample in steady[-third:])
+        if late - early > limits[name]:
+            failures.append(f"{name} grew from {early:.1f} to {late:.1f} (limit +{limits[name]:g})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run synthetic dictations and check that resource usage levels off")
+    parser.add_argument("--dictations", type=int, default=2000, help="Number of dictations")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Length of each recording")
+    parser.add_argument("--blocksize", type=int, default=512, help="Frames per recorder callback")
+    parser.add_argument("--api-every", type=int, default=10, help="Dictations between API reads, 0 for none")
+    parser.add_argument("--sample-every", type=int, default=25, help="Dictations between resource samples")
+    parser.add_argument("--warmup", type=float, default=0.2, help="Fraction of samples ignored as warm-up")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=32.0, help="Allowed RSS growth after warm-up")
+    parser.add_argument("--max-handle-growth", type=int, default=2, help="Allowed growth of descriptors, threads and connections")
+    parser.add_argument("--openai", action="store_true", help="Transcribe through the local OpenAI stand-in")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # These must be set before vaibvoice.config is imported
+        os.environ["DB_PATH"] = os.path.join(tmp, "soak.db")
+        os.environ["ARCHIVE_DB_PATH"] = os.path.join(tmp, "soak_archive.db")
+        os.environ["AUDIO_TEMP_DIR"] = os.path.join(tmp, "audio_temp")
+        os.environ["AUDIO_STORE_DIR"] = os.path.join(tmp, "audio_store")
+        os.environ["AUDIO_STORE_QUOTA_MB"] = "64"
+
+        server = None
+        if args.openai:
+            import fake_openai
+
+            options = fake_openai.build_parser().parse_args([
+                "--upload", "const:0", "--first-delta", "const:0.005", "--delta-interval", "const:0", "--chat", "const:0.005"
+            ])
+            server = fake_openai.start_in_thread(options, 8901)
+            os.environ["OPENAI_BASE_URL"] = "http://127.0.0.1:8901/v1"
+            os.environ.setdefault("OPENAI_API_KEY", "soak")
+
+        import numpy as np
+        from fastapi.testclient import TestClient
+        from vaibvoice.api.server import create_app
+        from vaibvoice.core.audio_store import get_audio_store
+        from vaibvoice.core.recorder import AudioRecorder
+        from vaibvoice.db.write_behind import get_history_writer
+        from vaibvoice.models.trace import DictationTrace
+        from vaibvoice.services.settings_service import get_settings_service
+        from vaibvoice.services.transcription_service import TranscriptionService
+        from vaibvoice.utils.metrics import activate_trace
+
+        if args.openai:
+            from vaibvoice.core.transcriber import transcribe_audio
+
+        # No sound cues: there is no output device
+        get_settings_service().update(start_sound="none", end_sound="none")
+        recorder = AudioRecorder()
+        audio_store = get_audio_store()
+        writer = get_history_writer()
+        service = TranscriptionService(writer=writer)
+        client = TestClient(create_app())
+        rng = np.random.default_rng(0)
+        blocks = int(args.seconds * recorder.sample_rate / args.blocksize)
+        block = (rng.standard_normal((args.blocksize, recorder.channels)) * 0.05).astype(np.float32)
+
+        samples = []
+        start = time.perf_counter()
+        for index in range(args.dictations):
+            trace = DictationTrace()
+            # The pipeline reports each dictation on stdout
+            with activate_trace(trace), contextlib.redirect_stdout(io.StringIO()):
+                recorder.frames = []
+                recorder.recording = True
+                recorder.start_time = time.time() - args.seconds
+                recorder.stream = _SilentStream()
+                # A distinct first block keeps recordings from being deduplicated by the audio store
+                recorder._on_audio(rng.standard_normal(block.shape).astype(np.float32) * 0.05, args.blocksize, None, None)
+                for _ in range(blocks - 1):
+                    recorder._on_audio(block, args.blocksize, None, None)
+                audio_path, duration = recorder.stop_recording()
+
+                if args.openai:
+                    text = transcribe_audio(audio_path, type_directly=False)
+                else:
+                    text = f"synthetic dictation number {index}"
+            service.add_transcription(audio_path, text, duration, trace=trace, ingest_audio=True)
+
+            if args.api_every and index % args.api_every == 0:
+                for path in ("/api/transcriptions", "/api/stats", "/api/settings"):
+                    response = client.get(path)
+                    if response.status_code >= 400:
+                        print(f"GET {path} failed with {response.status_code}")
+
+            if index % args.sample_every == 0 or index == args.dictations - 1:
+                writer.flush(10)
+                sample = sample_resources()
+                samples.append(sample)
+                print(
+                    f"{index + 1:6d} dictations  rss {sample['rss_mb']:7.1f} MB  fds {sample['open_fds']:4.0f}"
+                    f"  threads {sample['threads']:3d}  sqlite {sample['sqlite_connections']:3d}",
+                    flush=True
+                )
+
+        elapsed = time.perf_counter() - start
+        client.close()
+        writer.close()
+        audio_store.close()
+        if server is not None:
+            server.should_exit = True
+
+    limits = {
+        "rss_mb": args.max_rss_growth_mb,
+        "open_fds": args.max_handle_growth,
+        "threads": args.max_handle_growth,
+        "sqlite_connections": args.max_handle_growth,
+    }
+    print(f"{args.dictations} dictations in {elapsed:.1f} s")
+    failures = find_growth(samples, args.warmup, limits) if len(samples) >= 4 else []
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: resource usage leveled off")
+
+
+if __name__ == "__main__":
+    main()
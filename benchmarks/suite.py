@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark suite for local hot paths.
+Runs offline against synthetic data and writes machine-readable results with
+environment metadata, so runs on different commits or machines can be compared.
+
+Benchmarks:
+    - recorder.callback: AudioRecorder._on_audio per captured block
+    - recorder.save: concatenating a recording and writing the WAV file
+    - audio.normalize / audio.convert_flac: audio_utils on a long file
+    - repository.get_all / repository.get_stats at each row count
+    - api.serialize: transcription rows to a JSON response body
+
+Usage:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --quick --compare results.json
+    python benchmarks/suite.py --only repository --rows 1000,100000,1000000
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCHEMA_VERSION = 1
+
+
+def measure(func: Callable[[], None], repeat: int, number: int = 1, setup: Optional[Callable[[], None]] = None) -> Dict:
+    """
+    Time `func` `repeat` times, each timing covering `number` calls.
+
+    Args:
+        func (Callable[[], None]): The code under test
+        repeat (int): Number of timings
+        number (int): Calls per timing
+        setup (Callable[[], None], optional): Run before each timing, untimed
+
+    Returns:
+        Dict: Per-call statistics in seconds
+    """
+    samples = []
+    func()  # warm up caches and lazy imports
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) / number)
+        finally:
+            gc.enable()
+    ordered = sorted(samples)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "max": ordered[-1],
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def environment() -> Dict:
+    """Describe the machine, interpreter, libraries and commit the results come from."""
+    import numpy
+    import soundfile
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT, capture_output=True, text=True, timeout=30
+        ).stdout.strip())
+    except (OSError, subprocess.SubprocessError):
+        commit, dirty = None, None
+
+    try:
+        import orjson
+        orjson_version = orjson.__version__
+    except ImportError:
+        orjson_version = None
+
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "sqlite": sqlite3.sqlite_version,
+        "numpy": numpy.__version__,
+        "soundfile": soundfile.__version__,
+        "libsndfile": soundfile.__libsndfile_version__,
+        "orjson": orjson_version,
+    }
+
+
+def bench_recorder(args, tmp: str) -> List[Dict]:
+    """AudioRecorder callback and save path, fed with synthetic blocks instead of a device."""
+    import numpy as np
+    from vaibvoice.core.recorder import AudioRecorder
+
+    recorder = AudioRecorder()
+    block = np.random.default_rng(0).uniform(-0.5, 0.5, (args.blocksize, recorder.channels)).astype(np.float32)
+    blocks_per_recording = int(args.record_seconds * recorder.sample_rate / args.blocksize)
+
+    def start():
+        recorder.frames = []
+        recorder.recording = True
+
+    def callback():
+        recorder._on_audio(block, args.blocksize, None, None)
+
+    start()
+    results = [{
+        "name": "recorder.callback",
+        "params": {"blocksize": args.blocksize, "channels": recorder.channels},
+        **measure(callback, args.repeat, number=blocks_per_recording, setup=start),
+    }]
+
+    start()
+    for _ in range(blocks_per_recording):
+        callback()
+    saved = []
+
+    def save():
+        saved.append(recorder.save_recording())
+
+    def cleanup():
+        while saved:
+            os.remove(saved.pop())
+
+    results.append({
+        "name": "recorder.save",
+        "params": {"seconds": args.record_seconds, "sample_rate": recorder.sample_rate},
+        **measure(save, args.repeat, setup=cleanup),
+    })
+    cleanup()
+    return results
+
+
+def bench_audio(args, tmp: str) -> List[Dict]:
+    """normalize_audio and convert_audio_format on a long synthetic recording."""
+    import numpy as np
+    import soundfile as sf
+    import vaibvoice.config as config
+    from vaibvoice.utils.audio_utils import convert_audio_format, normalize_audio
+
+    rng = np.random.default_rng(1)
+    data = (rng.standard_normal(int(args.audio_seconds * config.SAMPLE_RATE)) * 0.1).astype(np.float32)
+    source = os.path.join(tmp, "long_recording.wav")
+    sf.write(source, data, config.SAMPLE_RATE)
+    params = {"seconds": args.audio_seconds, "sample_rate": config.SAMPLE_RATE, "bytes": os.path.getsize(source)}
+
+    results = []
+    for name, func in (
+        ("audio.normalize", lambda: normalize_audio(source)),
+        ("audio.convert_flac", lambda: convert_audio_format(source, "flac")),
+    ):
+        results.append({"name": name, "params": params, **measure(func, max(1, args.repeat // 2))})
+    return results
+
+
+def populate(repository, rows: int, start: int):
+    """Add synthetic rows spread over the last years, continuing from `start`."""
+    from vaibvoice.models.transcription import Transcription
+
+    now = datetime.datetime.now()
+    batch = []
+    for i in range(start, rows):
+        batch.append(Transcription(
+            timestamp=now - datetime.timedelta(minutes=(rows - i) * 3),
+            audio_path=f"store:{i:064x}",
+            text="lorem ipsum dolor sit amet " * (1 + i % 20),
+            duration=5.0 + i % 30
+        ))
+        if len(batch) == 10000:
+            repository.add_many(batch)
+            batch = []
+    repository.add_many(batch)
+
+
+def bench_repository(args, tmp: str) -> List[Dict]:
+    """TranscriptionRepository.get_all and get_stats, growing one database through each row count."""
+    from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+
+    repository = TranscriptionRepository(os.path.join(tmp, "repository.db"))
+    results = []
+    populated = 0
+    for rows in sorted(args.rows):
+        populate(repository, rows, populated)
+        populated = rows
+        # Large tables get fewer repetitions so the suite finishes in minutes
+        repeat = max(3, min(args.repeat, int(args.repeat * 100000 / max(rows, 1))))
+        for name, func in (
+            ("repository.get_all", repository.get_all),
+            ("repository.get_stats", repository.get_stats),
+        ):
+            results.append({"name": name, "params": {"rows": rows}, **measure(func, repeat)})
+    return results
+
+
+def bench_api(args, tmp: str) -> List[Dict]:
+    """Serialization of transcription rows to the JSON response body."""
+    from vaibvoice.api.serialization import transcription_rows_to_json
+
+    now = datetime.datetime.now()
+    results = []
+    for size in args.payloads:
+        rows = [
+            (i, (now - datetime.timedelta(minutes=i)).isoformat(), f"store:{i:064x}",
+             "lorem ipsum dolor sit amet " * (1 + i % 20), 5.0 + i % 30, 5 * (1 + i % 20))
+            for i in range(size)
+        ]
+        results.append({
+            "name": "api.serialize",
+            "params": {"rows": size},
+            **measure(lambda: transcription_rows_to_json(rows), args.repeat),
+        })
+    return results
+
+
+GROUPS = {
+    "recorder": bench_recorder,
+    "audio": bench_audio,
+    "repository": bench_repository,
+    "api": bench_api,
+}
+
+
+def result_key(result: Dict) -> str:
+    """Identify a benchmark and its parameters across runs."""
+    params = ",".join(f"{key}={value}" for key, value in sorted(result.get("params", {}).items()) if key != "bytes")
+    return f"{result['name']}[{params}]"
+
+
+def print_results(results: List[Dict], baseline: Optional[Dict[str, Dict]] = None):
+    """Print a table of median timings, with the ratio to a baseline run when given."""
+    for result in results:
+        key = result_key(result)
+        if "skipped" in result:
+            print(f"  {key:<52} skipped: {result['skipped']}")
+            continue
+        line = f"  {key:<52} {result['median'] * 1000:12.4f} ms"
+        previous = (baseline or {}).get(key)
+        if previous and "median" in previous:
+            line += f"  x{result['median'] / previous['median']:5.2f} vs baseline"
+        print(line)
+
+
+def parse_ints(value: str) -> List[int]:
+    """Parse a comma separated list of integers."""
+    return [int(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local microbenchmark suite")
+    parser.add_argument("--only", nargs="+", choices=sorted(GROUPS), help="Benchmark groups to run")
+    parser.add_argument("--rows", type=parse_ints, default=[1000, 100000, 1000000], help="Row counts, comma separated")
+    parser.add_argument("--payloads", type=parse_ints, default=[100, 1000, 10000], help="Serialized row counts")
+    parser.add_argument("--repeat", type=int, default=10, help="Timings per benchmark")
+    parser.add_argument("--blocksize", type=int, default=512, help="Frames per recorder callback")
+    parser.add_argument("--record-seconds", type=float, default=60.0, help="Length of the recording to save")
+    parser.add_argument("--audio-seconds", type=float, default=600.0, help="Length of the file for audio_utils")
+    parser.add_argument("--quick", action="store_true", help="Small sizes, for a smoke run")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Results JSON of a previous run to compare against")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.rows = [1000, 10000]
+        args.payloads = [100, 1000]
+        args.repeat = min(args.repeat, 5)
+        args.record_seconds = min(args.record_seconds, 10.0)
+        args.audio_seconds = min(args.audio_seconds, 30.0)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as previous:
+            baseline = {result_key(result): result for result in json.load(previous)["results"]}
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep every file the code under test writes inside the temporary directory;
+        # these must be set before vaibvoice.config is imported
+        os.environ["DB_PATH"] = os.path.join(tmp, "settings.db")
+        os.environ["AUDIO_TEMP_DIR"] = os.path.join(tmp, "audio_temp")
+        os.environ["METRICS_ENABLED"] = "false"
+        os.makedirs(os.environ["AUDIO_TEMP_DIR"], exist_ok=True)
+
+        for group in args.only or list(GROUPS):
+            print(f"{group}...", flush=True)
+            try:
+                group_results = GROUPS[group](args, tmp)
+            except ImportError as e:
+                # e.g. sounddevice without PortAudio on a headless machine
+                group_results = [{"name": group, "params": {}, "skipped": f"missing dependency: {e.name or e}"}]
+            print_results(group_results, baseline)
+            results.extend(group_results)
+
+    document = {
+        "schema": SCHEMA_VERSION,
+        "environment": environment(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            json.dump(document, out, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
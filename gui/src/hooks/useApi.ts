@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 
-const API_BASE_URL = 'http://127.0.0.1:5000/api';
+// The GUI is served by the API server, so the API is on the same origin
+const API_BASE_URL = '/api';
 
 export interface Transcription {
   id: number;
@@ -40,6 +41,24 @@ export interface Settings {
   end_sound: string;
 }
 
+type EventHandlers = Record<string, (data: any) => void>;
+
+/**
+ * Open the server's event stream and dispatch each event to its handler.
+ * EventSource reconnects on its own and resumes with Last-Event-ID; a
+ * "resync" event means missed events were lost and data must be refetched.
+ * Returns a function that closes the stream.
+ */
+function subscribeToEvents(handlers: EventHandlers): () => void {
+  const source = new EventSource(`${API_BASE_URL}/events`);
+  for (const [type, handler] of Object.entries(handlers)) {
+    source.addEventListener(type, (event) => {
+      handler(JSON.parse((event as MessageEvent).data));
+    });
+  }
+  return () => source.close();
+}
+
 export function useTranscriptions() {
   const [transcriptions, setTranscriptions] = useState<Transcription[]>([]);
   const [loading, setLoading] = useState<boolean>(true);
@@ -62,6 +81,12 @@ export function useTranscriptions() {
     }
 
     fetchTranscriptions();
+
+    return subscribeToEvents({
+      transcription: (data) => setTranscriptions((current) => [data.transcription, ...current]),
+      history_cleared: () => setTranscriptions([]),
+      resync: () => fetchTranscriptions(),
+    });
   }, []);
 
   return { transcriptions, loading, error };
@@ -89,6 +114,29 @@ export function useStats() {
     }
 
     fetchStats();
+
+    return subscribeToEvents({
+      transcription: (data) => setStats((current) => current && {
+        ...current,
+        ...data.stats,
+        recentTranscriptions: [
+          {
+            id: data.transcription.id,
+            text: data.transcription.text,
+            timestamp: data.transcription.timestamp,
+            duration: data.transcription.duration,
+            words: data.transcription.word_count,
+          },
+          ...current.recentTranscriptions,
+        ].slice(0, 3),
+      }),
+      history_cleared: (data) => setStats((current) => current && {
+        ...current,
+        ...data.stats,
+        recentTranscriptions: [],
+      }),
+      resync: () => fetchStats(),
+    });
   }, []);
 
   return { stats, loading, error };
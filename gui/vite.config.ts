@@ -8,6 +8,10 @@ export default defineConfig(({ mode }) => ({
   server: {
     host: "::",
     port: 8080,
+    // In development the API runs separately; in production it serves the GUI
+    proxy: {
+      "/api": "http://127.0.0.1:5000",
+    },
   },
   plugins: [
     react(),
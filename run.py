@@ -12,16 +12,27 @@ import importlib.util
 def check_dependencies():
     """
     Check if all required dependencies are installed.
+    Only looks the modules up, without importing them, so the check is cheap
+    and pip runs only when something is actually missing.
     """
-    required_packages = [
-        "fastapi", "uvicorn", "pydantic", "sounddevice", "soundfile", 
-        "numpy", "python-dotenv", "pynput", "pyautogui", "openai"
-    ]
+    # Distribution name -> module it provides
+    required_packages = {
+        "fastapi": "fastapi",
+        "uvicorn": "uvicorn",
+        "pydantic": "pydantic",
+        "sounddevice": "sounddevice",
+        "soundfile": "soundfile",
+        "numpy": "numpy",
+        "python-dotenv": "dotenv",
+        "pynput": "pynput",
+        "pyautogui": "pyautogui",
+        "openai": "openai",
+    }
 
-    missing_packages = []
-    for package in required_packages:
-        if importlib.util.find_spec(package) is None:
-            missing_packages.append(package)
+    missing_packages = [
+        package for package, module in required_packages.items()
+        if importlib.util.find_spec(module) is None
+    ]
 
     if missing_packages:
         print(f"Installing missing dependencies: {', '.join(missing_packages)}")
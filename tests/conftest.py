@@ -0,0 +1,39 @@
+"""
+Shared fixtures for the test suite.
+Every test gets its own history database in a temporary directory.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vaibvoice.config as config
+
+# Runtime files the services create at the project root by default
+DEFAULT_PATHS = {
+    "DB_PATH": "transcription_history.db",
+    "HISTORY_JOURNAL_PATH": "transcription_history.journal",
+    "ARCHIVE_DB_PATH": "transcription_archive.db",
+    "AUDIO_STORE_DIR": "audio_store",
+    "PEAKS_CACHE_DIR": "peaks_cache",
+    "TRANSCODE_CACHE_DIR": "transcode_cache",
+    "SIMILARITY_INDEX_PATH": "similarity.idx",
+}
+
+
+@pytest.fixture(autouse=True)
+def default_paths(tmp_path, monkeypatch):
+    """Keep runtime files a test creates through the defaults out of the project root."""
+    root = tmp_path / "defaults"
+    root.mkdir()
+    for name, filename in DEFAULT_PATHS.items():
+        monkeypatch.setattr(config, name, str(root / filename))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path of an empty history database."""
+    return str(tmp_path / "history.db")
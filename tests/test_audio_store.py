@@ -0,0 +1,95 @@
+"""
+Tests for the content-addressed audio store.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from vaibvoice.core.audio_store import AudioStore, is_store_ref
+from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.db.write_behind import WriteBehindQueue
+from vaibvoice.models.transcription import Transcription
+
+
+def write_wav(path, seconds=0.5, seed=0, sample_rate=16000):
+    """Write a short noise recording and return its path."""
+    samples = np.random.default_rng(seed).uniform(-0.3, 0.3, int(seconds * sample_rate)).astype(np.float32)
+    sf.write(str(path), samples, sample_rate)
+    return str(path)
+
+
+@pytest.fixture
+def store(db_path, tmp_path):
+    store = AudioStore(
+        str(tmp_path / "store"), quota_mb=0, repository=AudioBlobRepository(db_path), derived_caches=()
+    )
+    yield store
+    store.close()
+
+
+def _last_access(store, blob_hash):
+    return store.repository.execute_query(
+        "SELECT last_access FROM audio_blobs WHERE hash = ?", (blob_hash,), fetch=True, fetch_all=False
+    )[0]
+
+
+def test_resolve_is_read_only_unless_asked(store, tmp_path):
+    ref = store.ingest(write_wav(tmp_path / "a.wav"), compress=False)
+    blob_hash = ref.split(":", 1)[1]
+    before = _last_access(store, blob_hash)
+
+    assert store.resolve(ref) == store.blob_path(blob_hash, "wav")
+    assert _last_access(store, blob_hash) == before
+
+    store.resolve(ref, touch=True)
+    touched = _last_access(store, blob_hash)
+    assert touched >= before
+    # Further touches within TOUCH_INTERVAL are not written
+    store.repository.execute_query("UPDATE audio_blobs SET last_access = 0 WHERE hash = ?", (blob_hash,))
+    store.resolve(ref, touch=True)
+    assert _last_access(store, blob_hash) == 0
+
+
+def test_compression_does_not_revive_an_evicted_blob(store, tmp_path):
+    ref = store.ingest(write_wav(tmp_path / "a.wav"), compress=False)
+    blob_hash = ref.split(":", 1)[1]
+    # Eviction wins the race against the compressor
+    os.remove(store.blob_path(blob_hash, "wav"))
+    store.repository.mark_evicted(blob_hash)
+
+    store._compress_and_evict(blob_hash)
+
+    assert store.repository.get(blob_hash)[2] is True
+    assert store.resolve(ref) is None
+    assert not os.path.exists(store.blob_path(blob_hash, "flac"))
+
+
+def test_compression_replaces_the_wav(store, tmp_path):
+    ref = store.ingest(write_wav(tmp_path / "a.wav"), compress=False)
+    blob_hash = ref.split(":", 1)[1]
+
+    store._compress_and_evict(blob_hash)
+
+    assert store.repository.get(blob_hash)[0] == "flac"
+    assert store.resolve(ref) == store.blob_path(blob_hash, "flac")
+    assert not os.path.exists(store.blob_path(blob_hash, "wav"))
+
+
+def test_history_writer_ingests_recordings(db_path, store, tmp_path):
+    wav = write_wav(tmp_path / "a.wav")
+    writer = WriteBehindQueue(
+        TranscriptionRepository(db_path), str(tmp_path / "history.journal"), audio_store=store
+    )
+    writer.start()
+    writer.put(Transcription(timestamp=datetime.now(), audio_path=wav, text="hello", duration=0.5), ingest_audio=True)
+    writer.close(5)
+
+    (row,) = TranscriptionRepository(db_path).get_all()
+    assert is_store_ref(row.audio_path)
+    assert not os.path.exists(wav)
+    assert store.resolve(row.audio_path) is not None
@@ -0,0 +1,112 @@
+"""
+Tests for streaming recordings: the audio route and Opus resampling.
+"""
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import vaibvoice.services.audio_stream_service as audio_stream_service
+from vaibvoice.api.dependencies import get_transcription_service
+from vaibvoice.api.routes.transcriptions import router
+from vaibvoice.core.audio_store import AudioStore
+from vaibvoice.core.transcode import resample_blocks
+from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.services.audio_stream_service import AudioStreamService
+from vaibvoice.services.event_bus import EventBus
+from vaibvoice.services.transcription_service import TranscriptionService
+
+from tests.test_audio_store import write_wav
+
+
+@pytest.fixture
+def client(db_path, tmp_path, monkeypatch):
+    store = AudioStore(
+        str(tmp_path / "store"), quota_mb=0, compress_format="wav",
+        repository=AudioBlobRepository(db_path), derived_caches=()
+    )
+    monkeypatch.setattr(audio_stream_service, "_service", AudioStreamService(store, str(tmp_path / "opus")))
+    service = TranscriptionService(TranscriptionRepository(db_path), events=EventBus())
+    ref = store.ingest(write_wav(tmp_path / "a.wav", seconds=1), compress=False)
+    transcription = service.store_transcription(ref, "hello", 1.0)
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.dependency_overrides[get_transcription_service] = lambda: service
+    with TestClient(app) as client:
+        client.url = f"/api/transcriptions/{transcription.id}/audio"
+        yield client
+    store.close()
+
+
+def test_audio_is_served_whole_without_a_range(client):
+    response = client.get(client.url)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert int(response.headers["content-length"]) == len(response.content)
+    assert response.content[:4] == b"RIFF"
+
+
+def test_range_requests_get_partial_content(client):
+    whole = client.get(client.url).content
+
+    response = client.get(client.url, headers={"Range": "bytes=100-199"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-199/{len(whole)}"
+    assert response.content == whole[100:200]
+
+    # Open-ended and suffix ranges
+    response = client.get(client.url, headers={"Range": "bytes=1000-"})
+    assert response.status_code == 206
+    assert response.content == whole[1000:]
+    response = client.get(client.url, headers={"Range": "bytes=-44"})
+    assert response.status_code == 206
+    assert response.content == whole[-44:]
+
+
+def test_unsatisfiable_range_is_rejected(client):
+    size = len(client.get(client.url).content)
+
+    response = client.get(client.url, headers={"Range": f"bytes={size}-"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{size}"
+
+
+def test_matching_etag_is_not_modified(client):
+    etag = client.get(client.url).headers["etag"]
+
+    response = client.get(client.url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+
+
+def _resample(samples, rate_in, rate_out, sizes=(100, 4000, 30, 70000)):
+    """Resample a mono signal fed in blocks of varying size."""
+    blocks, start = [], 0
+    while start < len(samples):
+        size = sizes[len(blocks) % len(sizes)]
+        blocks.append(samples[start:start + size, None])
+        start += size
+    return np.concatenate(list(resample_blocks(blocks, rate_in, rate_out)))[:, 0]
+
+
+def test_downsampling_does_not_alias():
+    t = np.arange(96000 * 2) / 96000
+    # 30 kHz is above the 24 kHz Nyquist frequency of 48 kHz and would fold to 18 kHz
+    out = _resample((0.5 * np.sin(2 * np.pi * 30000 * t)).astype(np.float32), 96000, 48000)
+
+    assert np.sqrt(np.mean(out[1000:-1000] ** 2)) < 0.005
+
+
+def test_downsampling_keeps_the_audible_band_in_place():
+    t = np.arange(96000 * 2) / 96000
+    out = _resample((0.5 * np.sin(2 * np.pi * 1000 * t)).astype(np.float32), 96000, 48000)
+    expected = 0.5 * np.sin(2 * np.pi * 1000 * np.arange(len(out)) / 48000)
+
+    assert len(out) == 96000
+    assert np.max(np.abs(out[1000:-1000] - expected[1000:-1000])) < 0.01
@@ -0,0 +1,55 @@
+"""
+Tests for the response cache.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from vaibvoice.api.caching import ResponseCache
+
+
+def test_cancelled_caller_does_not_fail_the_shared_render():
+    cache = ResponseCache()
+    started = threading.Event()
+    release = threading.Event()
+    renders = []
+
+    def render():
+        renders.append(1)
+        started.set()
+        release.wait(5)
+        return b"body"
+
+    async def scenario():
+        first = asyncio.create_task(cache.get_or_render("stats", '"1"', render))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        second = asyncio.create_task(cache.get_or_render("stats", '"1"', render))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == b"body"
+    assert renders == [1]
+    assert cache.get("stats", '"1"') == b"body"
+
+
+def test_failed_render_is_not_cached():
+    cache = ResponseCache()
+
+    def render():
+        raise RuntimeError("database is locked")
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await cache.get_or_render("stats", '"1"', render)
+        return await cache.get_or_render("stats", '"1"', lambda: b"body")
+
+    assert asyncio.run(scenario()) == b"body"
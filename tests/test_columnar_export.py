@@ -0,0 +1,58 @@
+"""
+Tests for the columnar history export.
+"""
+
+import pytest
+
+import vaibvoice.config as config
+from vaibvoice.cli import main
+from vaibvoice.core.audio_store import AudioStore
+from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.services.columnar_export_service import ColumnarExportService
+
+from tests.test_audio_store import write_wav
+
+
+@pytest.fixture
+def service(db_path, tmp_path):
+    repository = TranscriptionRepository(db_path)
+    store = AudioStore(str(tmp_path / "store"), repository=AudioBlobRepository(db_path))
+    yield ColumnarExportService(repository, audio_store=store)
+    store.close()
+
+
+def test_malformed_timestamp_is_exported_as_null(service, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    service.repository.import_rows([
+        ("2024-01-31T12:00:00", "a.wav", "good", 1.0, 1),
+        ("31/01/2024 noon", "b.wav", "bad", 1.0, 1),
+    ])
+
+    result = service.export(str(tmp_path / "history.parquet"))
+
+    assert result["rows"] == 2
+    assert result["invalid_timestamps"] == 1
+    assert pq.read_table(result["path"]).column("timestamp").null_count == 1
+
+
+def test_parse_timestamp_counts_malformed_values(service):
+    assert service._parse_timestamp("2024-01-31T12:00:00.5").year == 2024
+    assert service._parse_timestamp("not a time") is None
+    assert service._parse_timestamp(None) is None
+    assert service._invalid_timestamps == 2
+
+
+def test_cli_resolves_recordings_in_the_database_store(db_path, tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(config, "AUDIO_STORE_DIR", str(tmp_path / "store"))
+    store = AudioStore(repository=AudioBlobRepository(db_path), compress_format="wav", derived_caches=())
+    ref = store.ingest(write_wav(tmp_path / "a.wav", seconds=1), compress=False)
+    store.close()
+    TranscriptionRepository(db_path).import_rows([("2024-01-31T12:00:00", ref, "stored", 1.0, 1)])
+
+    assert main(["--db", db_path, "export-columnar", str(tmp_path / "history.parquet")]) == 0
+
+    table = pq.read_table(str(tmp_path / "history.parquet"))
+    assert table.column("audio_path").to_pylist() == [ref]
+    assert table.column("audio_duration").to_pylist() == [1.0]
@@ -0,0 +1,86 @@
+"""
+Tests for response compression.
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import vaibvoice.api.caching as caching
+import vaibvoice.config as config
+from vaibvoice.api.compression import negotiate_encoding, parse_accept_encoding
+from vaibvoice.api.dependencies import get_transcription_service
+from vaibvoice.api.routes.transcriptions import router
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.services.event_bus import EventBus
+from vaibvoice.services.transcription_service import TranscriptionService
+
+
+def test_accept_encoding_quality_values():
+    assert parse_accept_encoding("gzip;q=0.5, br, identity;q=0") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+    assert parse_accept_encoding(" GZip ; q=0.8 ,, *;q=0.1") == {"gzip": 0.8, "*": 0.1}
+    assert parse_accept_encoding("gzip;q=high") == {"gzip": 0.0}
+    assert parse_accept_encoding(None) == {}
+
+
+def test_negotiation_follows_quality_values():
+    size = config.COMPRESSION_MIN_SIZE
+
+    assert negotiate_encoding("gzip", size) == "gzip"
+    assert negotiate_encoding("*", size) is not None
+    assert negotiate_encoding("*;q=0", size) is None
+    assert negotiate_encoding("gzip;q=0, *", size) != "gzip"
+    assert negotiate_encoding("identity;q=0", size) is None
+    assert negotiate_encoding("deflate", size) is None
+    assert negotiate_encoding(None, size) is None
+
+
+def test_small_bodies_are_not_compressed():
+    assert negotiate_encoding("gzip, br", config.COMPRESSION_MIN_SIZE - 1) is None
+
+
+@pytest.fixture
+def client(db_path, monkeypatch):
+    monkeypatch.setattr(caching, "_cache", caching.ResponseCache())
+    service = TranscriptionService(TranscriptionRepository(db_path), events=EventBus())
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.dependency_overrides[get_transcription_service] = lambda: service
+    with TestClient(app) as client:
+        client.service = service
+        yield client
+
+
+def _add_history(service, count):
+    for n in range(count):
+        service.store_transcription("a.wav", f"dictation number {n} about the quarterly report", 1.0)
+
+
+def test_compressed_variants_have_their_own_etags(client):
+    _add_history(client.service, 40)
+
+    plain = client.get("/api/transcriptions", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/api/transcriptions", headers={"Accept-Encoding": "gzip"})
+
+    assert len(plain.content) >= config.COMPRESSION_MIN_SIZE
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+    assert gzipped.content == plain.content
+
+    for response in (plain, gzipped):
+        revalidated = client.get("/api/transcriptions", headers={"If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
+
+
+def test_small_responses_are_sent_uncompressed(client):
+    _add_history(client.service, 1)
+
+    response = client.get("/api/transcriptions", headers={"Accept-Encoding": "gzip"})
+
+    assert len(response.content) < config.COMPRESSION_MIN_SIZE
+    assert "content-encoding" not in response.headers
+    assert len(json.loads(response.content)) == 1
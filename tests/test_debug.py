@@ -0,0 +1,119 @@
+"""
+Tests for the debug endpoints and the sampling profiler.
+"""
+
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import vaibvoice.config as config
+import vaibvoice.utils.profiler as profiler
+from vaibvoice.api.routes.debug import router
+from vaibvoice.utils.profiler import StackSampler
+
+TOKEN = "s3cret-debug-token"
+PROFILE = "/api/debug/profile?seconds=0.05"
+
+
+def _client(address="127.0.0.1"):
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    return TestClient(app, client=(address, 50000))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(config, "DEBUG_TOKEN", TOKEN)
+    with _client() as client:
+        yield client
+
+
+def test_debug_routes_do_not_exist_without_a_token(monkeypatch):
+    monkeypatch.setattr(config, "DEBUG_TOKEN", None)
+    with _client() as client:
+        response = client.get(PROFILE, headers={"X-Debug-Token": TOKEN})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("address", ["192.168.1.20", "testclient"])
+def test_remote_clients_are_forbidden(monkeypatch, address):
+    monkeypatch.setattr(config, "DEBUG_TOKEN", TOKEN)
+    with _client(address) as client:
+        response = client.get(PROFILE, headers={"X-Debug-Token": TOKEN})
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    {"X-Debug-Token": "wrong"},
+    {"Authorization": f"Basic {TOKEN}"},
+    {"Authorization": "Bearer wrong"},
+])
+def test_missing_or_wrong_token_is_unauthorized(client, headers):
+    response = client.get(PROFILE, headers=headers)
+
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+@pytest.mark.parametrize("headers", [{"X-Debug-Token": TOKEN}, {"Authorization": f"Bearer {TOKEN}"}])
+def test_local_client_with_the_token_gets_a_profile(client, headers):
+    response = client.get(PROFILE, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].endswith('.collapsed.txt"')
+
+
+def test_concurrent_profile_is_a_conflict(client):
+    assert profiler._running.acquire(blocking=False)
+    try:
+        response = client.get(PROFILE, headers={"X-Debug-Token": TOKEN})
+    finally:
+        profiler._running.release()
+
+    assert response.status_code == 409
+
+
+def _known_busy_function(started, release):
+    started.set()
+    release.wait(5)
+
+
+@pytest.fixture
+def sampled():
+    started, release = threading.Event(), threading.Event()
+    thread = threading.Thread(target=_known_busy_function, args=(started, release), name="known worker")
+    thread.start()
+    started.wait(5)
+    sampler = StackSampler(interval=0.005)
+    try:
+        sampler.run(0.1)
+    finally:
+        release.set()
+        thread.join(5)
+    return sampler
+
+
+def test_collapsed_stacks_contain_the_thread_frames(sampled):
+    lines = sampled.to_collapsed().splitlines()
+    known = [line for line in lines if line.startswith("known_worker;")]
+
+    assert known
+    assert any("_known_busy_function (test_debug.py:" in line for line in known)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert not any(line.startswith(threading.current_thread().name + ";") for line in lines)
+
+
+def test_speedscope_profile_contains_the_thread_frames(sampled):
+    document = sampled.to_speedscope("test")
+    frames = document["shared"]["frames"]
+    profile = next(profile for profile in document["profiles"] if profile["name"] == "known worker")
+
+    names = {frames[index]["name"] for stack in profile["samples"] for index in stack}
+    assert "_known_busy_function" in names
+    assert len(profile["samples"]) == len(profile["weights"])
+    assert profile["endValue"] == pytest.approx(sum(profile["weights"]))
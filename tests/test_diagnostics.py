@@ -0,0 +1,75 @@
+"""
+Tests for the resource diagnostics.
+"""
+
+import gc
+import os
+import threading
+import tracemalloc
+
+import pytest
+
+from vaibvoice.db.base import open_connection_count
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.utils.diagnostics import collect
+
+
+def test_open_connections_are_counted_until_closed(db_path):
+    repository = TranscriptionRepository(db_path)
+    before = open_connection_count()
+
+    first = repository.get_connection()
+    second = repository.get_connection()
+    assert open_connection_count() == before + 2
+
+    first.close()
+    first.close()
+    assert open_connection_count() == before + 1
+
+    # A leaked connection stops counting once it is garbage collected
+    del second
+    gc.collect()
+    assert open_connection_count() == before
+
+
+def test_queries_do_not_leak_connections(db_path):
+    repository = TranscriptionRepository(db_path)
+    before = open_connection_count()
+
+    repository.get_all_rows()
+    repository.execute_query("SELECT 1", fetch=True, fetch_all=False)
+
+    assert open_connection_count() == before
+
+
+def test_collect_reports_every_resource(db_path):
+    connection = TranscriptionRepository(db_path).get_connection()
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start(1)
+    try:
+        diagnostics = collect(limit=3)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+        connection.close()
+
+    assert diagnostics["pid"] == os.getpid()
+    assert diagnostics["rss"] > 0
+    assert diagnostics["open_fds"] > 0
+    assert diagnostics["threads"] == sum(diagnostics["thread_names"].values()) >= 1
+    assert threading.main_thread().name in diagnostics["thread_names"]
+    assert diagnostics["sqlite_connections"] >= 1
+    traced = diagnostics["tracemalloc"]
+    assert traced["tracing"] is True
+    assert 0 <= traced["current"] <= traced["peak"]
+    assert len(traced["top"]) <= 3
+    assert all(set(site) == {"location", "size", "count"} for site in traced["top"])
+
+
+def test_collect_without_tracing_reports_no_allocations():
+    if tracemalloc.is_tracing():
+        pytest.skip("allocations are traced for the whole run")
+    traced = collect()["tracemalloc"]
+
+    assert traced == {"tracing": False, "current": None, "peak": None, "top": None}
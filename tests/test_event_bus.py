@@ -0,0 +1,125 @@
+"""
+Tests for the event bus shared by API worker processes.
+"""
+
+import asyncio
+import threading
+
+from vaibvoice.db.repositories.event_repository import EventRepository
+from vaibvoice.services.event_bus import KeyedEventBus, SharedEventBus
+
+
+def _bus(db_path, buffer_size=100):
+    bus = SharedEventBus(EventRepository(db_path), buffer_size=buffer_size, queue_size=100, poll_interval=0.01)
+    bus.start()
+    return bus
+
+
+async def _receive(subscription, count):
+    events = []
+    while len(events) < count:
+        event = await subscription.get(2)
+        assert event is not None, "timed out waiting for an event"
+        events.append(event)
+    return events
+
+
+def test_resume_replays_missed_events_then_relays_new_ones(db_path):
+    async def scenario():
+        bus = _bus(db_path)
+        first = bus.subscribe()
+        published = [bus.publish("transcription", {"n": n}) for n in range(3)]
+        await _receive(first, 3)
+
+        resumed = bus.subscribe()
+        missed = bus.replay(published[0].id, resumed)
+        later = bus.publish("transcription", {"n": 3})
+        relayed = await _receive(resumed, 1)
+        return published, missed, later, relayed
+
+    published, missed, later, relayed = asyncio.run(scenario())
+
+    assert [event.id for event in missed] == [published[1].id, published[2].id]
+    assert [event.data for event in missed] == [{"n": 1}, {"n": 2}]
+    assert [event.id for event in relayed] == [later.id]
+
+
+def test_resume_from_another_process_sees_its_events(db_path):
+    async def scenario():
+        other = _bus(db_path)
+        bus = _bus(db_path)
+        subscription = bus.subscribe()
+        published = [other.publish("settings", {"n": n}) for n in range(2)]
+        return published, [event.id for event in await _receive(subscription, 2)]
+
+    published, received = asyncio.run(scenario())
+
+    assert received == [event.id for event in published]
+
+
+def test_resume_from_a_trimmed_event_asks_for_a_resync(db_path):
+    async def scenario():
+        bus = _bus(db_path, buffer_size=2)
+        subscription = bus.subscribe()
+        published = [bus.publish("transcription", {"n": n}) for n in range(5)]
+        await _receive(subscription, 5)
+        bus.repository.trim(2)
+
+        resumed = bus.subscribe()
+        too_old = bus.replay(published[0].id, resumed)
+        unknown = bus.replay("not-an-id", resumed)
+        return too_old, unknown
+
+    too_old, unknown = asyncio.run(scenario())
+
+    assert too_old is None
+    assert unknown is None
+
+
+def test_subscribing_does_not_read_the_event_log(db_path, monkeypatch):
+    async def scenario():
+        bus = _bus(db_path)
+        published = bus.publish("settings", {"n": 1})
+        await asyncio.sleep(0.1)
+
+        def on_loop(read):
+            def guarded(*args):
+                # The relay thread keeps reading the log; the loop thread must not
+                assert threading.current_thread() is not threading.main_thread()
+                return read(*args)
+            return guarded
+        monkeypatch.setattr(bus.repository, "get_bounds", on_loop(bus.repository.get_bounds))
+        monkeypatch.setattr(bus.repository, "get_after", on_loop(bus.repository.get_after))
+        bus.start()
+        subscription = bus.subscribe()
+        return published, subscription.delivered
+
+    published, delivered = asyncio.run(scenario())
+
+    assert delivered == int(published.id)
+
+
+def test_failed_append_is_not_published(db_path, monkeypatch):
+    bus = _bus(db_path)
+    monkeypatch.setattr(bus.repository, "append", lambda event_type, data: None)
+
+    assert bus.publish("transcription", {"n": 1}) is None
+
+
+def test_keyed_bus_delivers_only_to_subscribers_of_the_key():
+    async def scenario():
+        bus = KeyedEventBus(queue_size=10)
+        mine = bus.subscribe("job-a")
+        other = bus.subscribe("job-b")
+        bus.publish("job-a", "job_delta", {"delta": "hello"})
+        received = await _receive(mine, 1)
+        leaked = await other.get(0.05)
+        bus.unsubscribe("job-a", mine)
+        bus.unsubscribe("job-b", other)
+        return received, leaked, bus._subscribers
+
+    received, leaked, subscribers = asyncio.run(scenario())
+
+    assert [event.data for event in received] == [{"delta": "hello"}]
+    assert leaked is None
+    assert subscribers == {}
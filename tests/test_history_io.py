@@ -0,0 +1,53 @@
+"""
+Tests for history import validation.
+"""
+
+import csv
+import io
+
+import pytest
+
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.services.history_io_service import HistoryImportError, HistoryIOService
+
+
+@pytest.mark.parametrize("timestamp, valid", [
+    ("2024-01-31T12:00:00", True),
+    ("2024-01-31T12:00:00.123456", True),
+    ("2024-01-31T12:00:00+02:00", False),
+    ("2024-01-31T12:00:00.5Z", False),
+    ("2024-02-30T12:00:00", False),
+    ("2024-01-31 12:00", False),
+    ("yesterday", False),
+])
+def test_import_validates_the_whole_timestamp(db_path, timestamp, valid):
+    service = HistoryIOService(TranscriptionRepository(db_path))
+    line = '{"timestamp": "%s", "text": "hello", "duration": 1}\n' % timestamp
+
+    assert service.import_lines([line], "ndjson") == int(valid)
+    assert service.import_errors == int(not valid)
+
+
+def test_malformed_csv_is_reported_with_its_line(db_path):
+    service = HistoryIOService(TranscriptionRepository(db_path))
+    lines = io.StringIO(
+        "timestamp,audio_path,text,duration\n"
+        "2024-01-31T12:00:00,a.wav,hello,1\n"
+        "2024-01-31T12:00:01,b.wav," + "x" * (csv.field_size_limit() + 1) + ",1\n"
+    )
+
+    with pytest.raises(HistoryImportError) as error:
+        service.import_lines(lines, "csv")
+    assert error.value.line == 3
+
+
+def test_invalid_utf8_is_reported_with_its_line(db_path, tmp_path):
+    path = tmp_path / "history.ndjson"
+    path.write_bytes(b'{"text": "ok", "timestamp": "2024-01-31T12:00:00"}\n{"text": "\xff"}\n')
+    service = HistoryIOService(TranscriptionRepository(db_path))
+
+    with open(path, "rb") as lines:
+        with pytest.raises(HistoryImportError) as error:
+            service.import_lines(lines, "ndjson", batch_size=1)
+    assert error.value.line == 2
+    assert service.repository.get_data_version().max_id == 1
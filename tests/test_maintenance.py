@@ -0,0 +1,88 @@
+"""
+Tests for history retention and database maintenance.
+"""
+
+import os
+import time
+
+from vaibvoice.core.audio_store import AudioStore, is_store_ref
+from vaibvoice.db.repositories.archive_repository import ArchiveRepository, archive_path_for
+from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.services.maintenance_service import MaintenanceService
+
+from tests.test_audio_store import write_wav
+
+
+def test_archive_path_is_derived_from_the_history_database(tmp_path):
+    db_path = str(tmp_path / "other.db")
+    assert archive_path_for(db_path) == str(tmp_path / "other_archive.db")
+    assert ArchiveRepository(db_path).archive_path == str(tmp_path / "other_archive.db")
+
+
+def test_maintenance_archives_next_to_its_database(db_path, tmp_path):
+    repository = TranscriptionRepository(db_path)
+    repository.import_rows([
+        ("2000-01-01T12:00:00", "old.wav", "old dictation", 1.0, 2),
+        ("2999-01-01T12:00:00", "new.wav", "new dictation", 1.0, 2),
+    ])
+    store = AudioStore(str(tmp_path / "store"), repository=AudioBlobRepository(db_path))
+    service = MaintenanceService(db_path=db_path, retention_days=30, audio_retention_days=0, audio_store=store)
+
+    report = service.run()
+    store.close()
+
+    assert report["errors"] == []
+    assert report["archived_rows"] == 1
+    assert os.path.exists(archive_path_for(db_path))
+    assert [t.text for t in service.repository.get_all()] == ["old dictation"]
+    # The history database is not in WAL mode, so no WAL file is involved
+    assert not os.path.exists(db_path + "-wal")
+
+
+def _old_recording(path, seed):
+    write_wav(path, seed=seed)
+    old = time.time() - 90 * 86400
+    os.utime(path, (old, old))
+    return str(path)
+
+
+def test_old_recordings_still_referenced_are_migrated_not_pruned(db_path, tmp_path):
+    audio_dir = tmp_path / "recordings"
+    audio_dir.mkdir()
+    referenced = _old_recording(audio_dir / "recording_1.wav", seed=1)
+    orphan = _old_recording(audio_dir / "recording_2.wav", seed=2)
+    repository = TranscriptionRepository(db_path)
+    repository.import_rows([("2999-01-01T12:00:00", referenced, "kept dictation", 1.0, 2)])
+    store = AudioStore(str(tmp_path / "store"), compress_format="wav", repository=AudioBlobRepository(db_path), derived_caches=())
+    service = MaintenanceService(
+        db_path=db_path, retention_days=0, audio_retention_days=30, audio_dir=str(audio_dir), audio_store=store
+    )
+
+    report = service.run()
+
+    (row,) = repository.get_all()
+    assert report["errors"] == []
+    assert report["migrated_audio_files"] == 1
+    assert report["deleted_audio_files"] == 1
+    assert is_store_ref(row.audio_path) and store.resolve(row.audio_path) is not None
+    assert not os.path.exists(orphan)
+    store.close()
+
+
+def test_pruning_skips_recordings_that_could_not_be_migrated(db_path, tmp_path, monkeypatch):
+    audio_dir = tmp_path / "recordings"
+    audio_dir.mkdir()
+    referenced = _old_recording(audio_dir / "recording_1.wav", seed=1)
+    TranscriptionRepository(db_path).import_rows([("2999-01-01T12:00:00", referenced, "kept dictation", 1.0, 2)])
+    store = AudioStore(str(tmp_path / "store"), compress_format="wav", repository=AudioBlobRepository(db_path), derived_caches=())
+    monkeypatch.setattr(store, "ingest", lambda *args, **kwargs: None)
+    service = MaintenanceService(
+        db_path=db_path, retention_days=0, audio_retention_days=30, audio_dir=str(audio_dir), audio_store=store
+    )
+
+    report = service.run()
+
+    assert report["deleted_audio_files"] == 0
+    assert os.path.exists(referenced)
+    store.close()
@@ -0,0 +1,41 @@
+"""
+Tests for metrics shared between processes.
+"""
+
+from vaibvoice.db.repositories.metrics_repository import MetricsRepository
+from vaibvoice.services.metrics_service import MetricsService
+from vaibvoice.utils.metrics import Metrics
+
+
+def test_worker_scrape_includes_the_dictation_process(db_path):
+    repository = MetricsRepository(db_path)
+    dictation = Metrics(enabled=True)
+    dictation.observe("dictation", 1.5)
+    dictation.count("input_overflow")
+    worker = Metrics(enabled=True)
+    worker.observe("dictation", 0.3)
+    worker.observe("db_write", 0.002)
+
+    MetricsService(repository, dictation).export()
+    exposition = MetricsService(repository, worker).render()
+
+    assert 'vaibvoice_stage_seconds_count{stage="dictation"} 2' in exposition
+    assert 'vaibvoice_stage_seconds_sum{stage="dictation"} 1.8' in exposition
+    assert 'vaibvoice_stage_seconds_count{stage="db_write"} 1' in exposition
+    assert 'vaibvoice_events_total{event="input_overflow"} 1' in exposition
+    # One family per metric, as the text format requires
+    assert exposition.count("# TYPE vaibvoice_stage_seconds histogram") == 1
+
+
+def test_export_replaces_the_previous_snapshot(db_path):
+    repository = MetricsRepository(db_path)
+    dictation = Metrics(enabled=True)
+    service = MetricsService(repository, dictation)
+    dictation.observe("dictation", 1.0)
+    service.export()
+    dictation.observe("dictation", 1.0)
+    service.export()
+
+    exposition = MetricsService(repository, Metrics(enabled=True)).render()
+
+    assert 'vaibvoice_stage_seconds_count{stage="dictation"} 2' in exposition
@@ -0,0 +1,69 @@
+"""
+Tests for the domain models built straight from database rows.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from vaibvoice.db.repositories.settings_repository import SettingsRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.models.settings import Settings
+from vaibvoice.models.transcription import Transcription, transcription_row_to_dict
+
+
+def _through_constructor(row):
+    """Build a Transcription the way the repository did before from_row."""
+    return Transcription(
+        id=row[0],
+        timestamp=datetime.fromisoformat(row[1].split('.')[0]),
+        audio_path=row[2],
+        text=row[3],
+        duration=row[4],
+        word_count=row[5]
+    )
+
+
+def test_transcription_rows_round_trip(db_path):
+    repository = TranscriptionRepository(db_path)
+    repository.add(Transcription(timestamp=datetime(2024, 1, 31, 12, 0, 0, 654321), audio_path="a.wav", text="three little words", duration=2.5))
+    repository.add(Transcription(timestamp=datetime(2024, 2, 1), audio_path="store:ab", text="", duration=0.0))
+    repository.import_rows([("2024-02-02T08:30:00", "b.wav", "counted elsewhere", 1.0, 0)])
+    rows = repository.get_all_rows()
+    assert len(rows) == 3
+
+    for row in rows:
+        expected = _through_constructor(row).to_dict()
+        assert Transcription.from_row(row).to_dict() == expected
+        assert transcription_row_to_dict(row) == expected
+        assert Transcription.from_dict(expected).to_dict() == expected
+
+
+def test_settings_rows_round_trip(db_path):
+    repository = SettingsRepository(db_path)
+    saved = Settings(record_key="alt", openai_api_key="sk-test", transcription_language="de", start_sound="on.mp3")
+    assert repository.save(saved)
+
+    row = repository.execute_query("SELECT * FROM settings WHERE id = 1", fetch=True, fetch_all=False)
+    expected = Settings(
+        id=row[0],
+        record_key=row[1],
+        openai_api_key=row[2],
+        transcription_model=row[3],
+        transcription_language=row[4],
+        llm_model=row[5],
+        start_sound=row[6],
+        end_sound=row[7]
+    ).to_dict()
+
+    assert expected == saved.to_dict()
+    assert Settings.from_row(row).to_dict() == expected
+    assert repository.get().to_dict() == expected
+    assert Settings.from_dict(expected).to_dict() == expected
+
+
+@pytest.mark.parametrize("model", [Transcription(text="hi"), Settings()])
+def test_models_have_no_instance_dict(model):
+    assert not hasattr(model, "__dict__")
+    with pytest.raises(AttributeError):
+        model.misspelled = 1
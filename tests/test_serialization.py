@@ -0,0 +1,45 @@
+"""
+Tests for serializing API responses.
+"""
+
+import json
+from datetime import datetime
+from typing import List
+
+from pydantic import TypeAdapter
+
+from vaibvoice.api.models.transcription import TranscriptionResponse
+from vaibvoice.api.serialization import dumps_json, transcription_rows_to_json
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.models.transcription import Transcription
+
+
+def _pydantic_json(transcriptions) -> bytes:
+    """Serialize the way the route did through its response_model."""
+    models = [TranscriptionResponse(**t.to_dict()) for t in transcriptions]
+    return TypeAdapter(List[TranscriptionResponse]).dump_json(models)
+
+
+def test_rows_serialize_like_the_response_model(db_path):
+    repository = TranscriptionRepository(db_path)
+    for text, timestamp in (
+        ("plain words", datetime(2024, 1, 31, 12, 0, 0, 123456)),
+        ("naïve café \"quoted\" \\ 日本語 😀", datetime(2024, 2, 1, 8, 30)),
+        ("line\nbreak\ttab", datetime(2024, 2, 2)),
+    ):
+        assert repository.add(Transcription(timestamp=timestamp, audio_path="a.wav", text=text, duration=1.25))
+    rows = repository.get_all_rows()
+
+    fast = json.loads(transcription_rows_to_json(rows))
+
+    assert fast == json.loads(_pydantic_json(Transcription.from_row(row) for row in rows))
+    assert [list(item) for item in fast] == [list(TranscriptionResponse.model_fields)] * len(rows)
+    assert all("." not in item["timestamp"] for item in fast)
+
+
+def test_empty_history_is_an_empty_array():
+    assert transcription_rows_to_json([]) == b"[]"
+
+
+def test_dumps_json_is_compact_utf8():
+    assert dumps_json({"text": "café", "n": [1, None, True]}) == '{"text":"café","n":[1,null,true]}'.encode("utf-8")
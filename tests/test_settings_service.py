@@ -0,0 +1,60 @@
+"""
+Tests for the settings service and repository.
+"""
+
+import vaibvoice.config as config
+from vaibvoice.db.repositories.settings_repository import SettingsRepository
+from vaibvoice.services.settings_service import SettingsService
+
+
+def test_missing_row_is_created_from_env_defaults(db_path, monkeypatch):
+    monkeypatch.setattr(config, "LLM_MODEL", "env-llm")
+    repository = SettingsRepository(db_path)
+    repository.execute_query("DELETE FROM settings")
+
+    assert repository.get().llm_model == "env-llm"
+    # The row was recreated, not only returned
+    row = repository.execute_query("SELECT llm_model FROM settings WHERE id = 1", fetch=True, fetch_all=False)
+    assert row == ("env-llm",)
+
+
+def test_other_process_changes_are_polled_at_most_once_per_interval(db_path, monkeypatch):
+    monkeypatch.setattr(config, "SETTINGS_POLL_INTERVAL", 3600)
+    service = SettingsService(SettingsRepository(db_path))
+    first = service.current()
+
+    # Another process changes the settings
+    other = SettingsRepository(db_path)
+    settings = other.get()
+    settings.llm_model = "other-llm"
+    other.save(settings)
+
+    assert service.current() is first
+
+    monkeypatch.setattr(config, "SETTINGS_POLL_INTERVAL", 0)
+    current = service.current()
+    assert current.llm_model == "other-llm"
+    assert current.version == first.version + 1
+
+
+def test_unrelated_commits_keep_the_snapshot(db_path, monkeypatch):
+    monkeypatch.setattr(config, "SETTINGS_POLL_INTERVAL", 0)
+    service = SettingsService(SettingsRepository(db_path))
+    first = service.current()
+    notified = []
+    service.subscribe(notified.append)
+
+    SettingsRepository(db_path).execute_query("CREATE TABLE unrelated (id INTEGER)")
+
+    assert service.current() is first
+    assert notified == []
+
+
+def test_update_is_visible_immediately(db_path, monkeypatch):
+    monkeypatch.setattr(config, "SETTINGS_POLL_INTERVAL", 3600)
+    service = SettingsService(SettingsRepository(db_path))
+    service.current()
+
+    service.update(llm_model="new-llm")
+
+    assert service.current().llm_model == "new-llm"
@@ -0,0 +1,67 @@
+"""
+Tests for the similar transcriptions service.
+"""
+
+from datetime import datetime
+
+from vaibvoice.db.repositories.archive_repository import ArchiveRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.models.transcription import Transcription
+from vaibvoice.services.similarity_service import SimilarityService, similarity_index_path_for
+
+
+def _add(repository, text, timestamp):
+    transcription = Transcription(timestamp=timestamp, audio_path="a.wav", text=text, duration=1.0)
+    assert repository.add(transcription)
+    return transcription.id
+
+
+def _ready_service(repository, dims=4096):
+    service = SimilarityService(repository, dims=dims)
+    assert service.find_similar("anything") is None
+    service._builder.join(5)
+    assert service.ready
+    return service
+
+
+def test_archived_rows_do_not_crowd_out_results(db_path):
+    repository = TranscriptionRepository(db_path)
+    old, new = datetime(2020, 1, 1), datetime(2030, 1, 1)
+    query_id = _add(repository, "order more coffee beans for the office", new)
+    # The closest matches are archived below
+    archived = [_add(repository, "order more coffee beans for the office", old) for _ in range(6)]
+    hot = [
+        _add(repository, "coffee beans for the office", new),
+        _add(repository, "order coffee", new),
+        _add(repository, "the office", new),
+    ]
+    _add(repository, "unrelated words entirely", new)
+
+    service = _ready_service(repository)
+    ranked = [transcription.id for transcription, _ in service.find_similar("order more coffee beans for the office", 3, query_id)]
+    assert set(ranked) <= set(archived) and len(ranked) == 3
+
+    assert len(ArchiveRepository(db_path).archive_before(datetime(2021, 1, 1).isoformat())) == len(archived)
+    similar = service.find_similar("order more coffee beans for the office", 3, query_id)
+
+    assert sorted(transcription.id for transcription, _ in similar) == hot
+    assert [score for _, score in similar] == sorted((score for _, score in similar), reverse=True)
+    assert all(transcription.text for transcription, _ in similar)
+
+
+def test_rows_added_after_the_build_are_found(db_path):
+    repository = TranscriptionRepository(db_path)
+    _add(repository, "first note about invoices", datetime(2030, 1, 1))
+    service = _ready_service(repository)
+
+    added = _add(repository, "second note about invoices", datetime(2030, 1, 2))
+    similar = service.find_similar("invoices", 10)
+
+    assert added in [transcription.id for transcription, _ in similar]
+
+
+def test_index_path_follows_the_database(tmp_path):
+    repository = TranscriptionRepository(str(tmp_path / "other.db"))
+
+    assert SimilarityService(repository).index_path == str(tmp_path / "other_similarity.idx")
+    assert similarity_index_path_for(str(tmp_path / "other.db")) != similarity_index_path_for(str(tmp_path / "third.db"))
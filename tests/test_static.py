@@ -0,0 +1,85 @@
+"""
+Tests for serving the built GUI.
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from vaibvoice.api.static import IMMUTABLE, REVALIDATE, SPAStaticFiles
+
+INDEX = b"<!doctype html><div id=app></div>"
+SCRIPT = b"console.log('vaibvoice');\n" * 100
+
+
+@pytest.fixture
+def client(tmp_path):
+    dist = tmp_path / "dist"
+    (dist / "assets").mkdir(parents=True)
+    (dist / "index.html").write_bytes(INDEX)
+    (dist / "assets" / "index-BwH3cD9k.js").write_bytes(SCRIPT)
+    (dist / "assets" / "index-BwH3cD9k.js.gz").write_bytes(gzip.compress(SCRIPT))
+    # Only the headers of the brotli variant are checked; its body is never decoded
+    (dist / "assets" / "index-BwH3cD9k.js.br").write_bytes(b"brotli variant")
+    app = FastAPI()
+    app.mount("/", SPAStaticFiles(str(dist)), name="gui")
+    with TestClient(app) as client:
+        client.dist = dist
+        yield client
+
+
+def test_hashed_asset_is_immutable_and_precompressed(client):
+    url = "/assets/index-BwH3cD9k.js"
+
+    gzipped = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert gzipped.status_code == 200
+    assert gzipped.headers["cache-control"] == IMMUTABLE
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+    assert gzipped.content == SCRIPT
+
+    preferred = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+    assert preferred.headers["content-encoding"] == "br"
+
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert plain.content == SCRIPT
+
+    # Each variant has its own validator
+    etags = {response.headers["etag"] for response in (gzipped, preferred, plain)}
+    assert len(etags) == 3
+
+
+def test_stale_asset_is_not_found(client):
+    response = client.get("/assets/index-0ld8uild.js")
+
+    assert response.status_code == 404
+    assert b"<!doctype html>" not in response.content
+
+
+def test_unknown_api_route_is_not_found(client):
+    assert client.get("/api/nope").status_code == 404
+    assert client.get("/api").status_code == 404
+
+
+def test_client_routes_fall_back_to_index_from_memory(client):
+    (client.dist / "index.html").unlink()
+
+    response = client.get("/history/42")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["cache-control"] == REVALIDATE
+    assert response.content == INDEX
+
+    cached = client.get("/settings", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_other_methods_are_not_allowed(client):
+    assert client.post("/index.html").status_code == 405
+    assert client.delete("/assets/index-BwH3cD9k.js").status_code == 405
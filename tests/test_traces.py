@@ -0,0 +1,105 @@
+"""
+Tests for dictation traces.
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from vaibvoice.api.dependencies import get_transcription_service
+from vaibvoice.api.routes.transcriptions import router
+from vaibvoice.db.repositories.archive_repository import ArchiveRepository
+from vaibvoice.db.repositories.trace_repository import TraceRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.models.trace import DictationTrace
+from vaibvoice.models.transcription import Transcription
+from vaibvoice.services.event_bus import EventBus
+from vaibvoice.services.transcription_service import TranscriptionService
+
+
+def _dictation(repository, timestamp, total, **fields):
+    trace = DictationTrace()
+    trace.total = total
+    for name, value in fields.items():
+        setattr(trace, name, value)
+    transcription = Transcription(timestamp=timestamp, audio_path="a.wav", text="traced dictation", duration=1.0)
+    assert repository.add(transcription, trace)
+    return transcription.id
+
+
+def test_archiving_keeps_the_trace(db_path):
+    repository = TranscriptionRepository(db_path)
+    traces = TraceRepository(db_path)
+    old = _dictation(repository, datetime(2020, 1, 1), 1.5)
+    new = _dictation(repository, datetime(2999, 1, 1), 2.5)
+    service = TranscriptionService(repository, events=EventBus(), traces=traces)
+
+    assert len(ArchiveRepository(db_path).archive_before(datetime(2021, 1, 1).isoformat())) == 1
+
+    assert traces.get(old) is None
+    assert service.get_trace(old).total == 1.5
+    assert service.get_trace(new).total == 2.5
+    assert service.get_archived_transcriptions()[0].id == old
+
+
+def test_deleting_a_transcription_deletes_its_trace(db_path):
+    repository = TranscriptionRepository(db_path)
+    traces = TraceRepository(db_path)
+    transcription_id = _dictation(repository, datetime(2999, 1, 1), 1.0)
+
+    repository.execute_query("DELETE FROM transcriptions WHERE id = ?", (transcription_id,))
+
+    assert traces.get(transcription_id) is None
+
+
+def test_breakdown_of_no_traces_is_empty(db_path):
+    assert TraceRepository(db_path).get_breakdown() == {"count": 0, "stages": {}, "tokens": {}}
+
+
+def test_breakdown_skips_stages_no_dictation_reached(db_path):
+    traces = TraceRepository(db_path)
+    repository = TranscriptionRepository(db_path)
+    _dictation(repository, datetime(2999, 1, 1), 1.0, upload=0.25, transcription_input_tokens=100)
+    _dictation(repository, datetime(2999, 1, 2), 2.0, upload=0.75, format=0.5, format_output_tokens=7)
+    # A stage timed on only one dictation averages over that one
+    _dictation(repository, datetime(2999, 1, 3), 3.0, transcription_input_tokens=20)
+
+    breakdown = traces.get_breakdown()
+
+    assert breakdown["count"] == 3
+    assert breakdown["stages"]["total"] == {"avg": 2.0, "max": 3.0}
+    assert breakdown["stages"]["upload"] == {"avg": 0.5, "max": 0.75}
+    assert breakdown["stages"]["format"] == {"avg": 0.5, "max": 0.5}
+    assert "paste" not in breakdown["stages"]
+    assert breakdown["tokens"] == {
+        "transcription_input": 120,
+        "transcription_output": 0,
+        "format_input": 0,
+        "format_output": 7
+    }
+
+
+@pytest.fixture
+def client(db_path):
+    service = TranscriptionService(TranscriptionRepository(db_path), events=EventBus(), traces=TraceRepository(db_path))
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.dependency_overrides[get_transcription_service] = lambda: service
+    with TestClient(app) as client:
+        yield client
+
+
+def test_trace_route(client, db_path):
+    traced = _dictation(TranscriptionRepository(db_path), datetime(2999, 1, 1), 1.5, paste=0.1)
+    untraced = Transcription(timestamp=datetime(2999, 1, 2), audio_path="a.wav", text="no trace", duration=1.0)
+    assert TranscriptionRepository(db_path).add(untraced)
+
+    response = client.get(f"/api/transcriptions/{traced}/trace")
+    assert response.status_code == 200
+    assert response.json()["total"] == 1.5
+    assert response.json()["paste"] == 0.1
+
+    assert client.get(f"/api/transcriptions/{untraced.id}/trace").status_code == 404
+    assert client.get("/api/transcriptions/999999/trace").status_code == 404
@@ -0,0 +1,219 @@
+"""
+Tests for the durable transcription job queue.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import vaibvoice.config as config
+import vaibvoice.core.transcriber as transcriber
+import vaibvoice.services.transcription_job_service as transcription_job_service
+from vaibvoice.api.routes.transcribe import router
+from vaibvoice.db.repositories.job_repository import JobRepository
+from vaibvoice.models.job import JOB_CANCELLED, JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+from vaibvoice.services.event_bus import KeyedEventBus
+from vaibvoice.services.transcription_job_service import TranscriptionJobService, TranscriptionWorkerPool
+
+
+@pytest.fixture
+def repository(db_path):
+    return JobRepository(db_path)
+
+
+@pytest.fixture
+def service(repository):
+    return TranscriptionJobService(repository, events=KeyedEventBus(), queue_depth=10)
+
+
+def _submit(service, tmp_path, name):
+    upload = tmp_path / f"{name}.wav"
+    upload.write_bytes(b"RIFF")
+    return service.submit(str(upload), f"{name}.wav")
+
+
+def _set_heartbeat(repository, job_id, moment):
+    repository.execute_query(
+        "UPDATE transcription_jobs SET heartbeat_at = ? WHERE id = ?", (moment.isoformat(), job_id)
+    )
+
+
+def test_jobs_are_claimed_once_in_submission_order(service, repository, tmp_path):
+    first = _submit(service, tmp_path, "first")
+    second = _submit(service, tmp_path, "second")
+
+    claimed = repository.claim_next("pool-a")
+    assert claimed.id == first.id
+    assert claimed.status == JOB_RUNNING
+    assert repository.claim_next("pool-b").id == second.id
+    assert repository.claim_next("pool-a") is None
+
+
+def test_submit_refuses_jobs_past_the_queue_depth(repository, tmp_path):
+    service = TranscriptionJobService(repository, events=KeyedEventBus(), queue_depth=1)
+    _submit(service, tmp_path, "first")
+
+    with pytest.raises(Exception, match="queue is full"):
+        _submit(service, tmp_path, "second")
+
+
+def test_requeue_leaves_jobs_with_a_live_lease_alone(service, repository, tmp_path):
+    live = _submit(service, tmp_path, "live")
+    stale = _submit(service, tmp_path, "stale")
+    own = _submit(service, tmp_path, "own")
+    repository.claim_next("other-process")
+    repository.claim_next("dead-process")
+    repository.claim_next("this-pool")
+    _set_heartbeat(repository, stale.id, datetime.now() - timedelta(minutes=5))
+
+    assert repository.requeue_interrupted("this-pool", lease_seconds=60) == 2
+
+    assert repository.get(live.id).status == JOB_RUNNING
+    assert repository.get(stale.id).status == JOB_QUEUED
+    assert repository.get(own.id).status == JOB_QUEUED
+
+
+def test_heartbeat_renews_the_lease(service, repository, tmp_path):
+    job = _submit(service, tmp_path, "job")
+    repository.claim_next("this-pool")
+    _set_heartbeat(repository, job.id, datetime.now() - timedelta(minutes=5))
+
+    assert repository.heartbeat("this-pool") == 1
+    assert repository.requeue_interrupted("another-pool", lease_seconds=60) == 0
+
+
+def test_requeue_cancels_abandoned_jobs_that_were_being_cancelled(service, repository, tmp_path):
+    job = _submit(service, tmp_path, "job")
+    repository.claim_next("dead-process")
+    service.cancel(job.id)
+    _set_heartbeat(repository, job.id, datetime.now() - timedelta(minutes=5))
+
+    assert repository.requeue_interrupted(None, lease_seconds=60) == 0
+    assert repository.get(job.id).status == JOB_CANCELLED
+
+
+def test_cancel_queued_job_removes_its_upload(service, tmp_path):
+    job = _submit(service, tmp_path, "job")
+
+    assert service.cancel(job.id).status == JOB_CANCELLED
+    assert not (tmp_path / "job.wav").exists()
+
+
+def test_cancel_running_job_is_left_to_its_worker(service, repository, tmp_path):
+    job = _submit(service, tmp_path, "job")
+    repository.claim_next("this-pool")
+
+    cancelled = service.cancel(job.id)
+
+    assert cancelled.status == JOB_RUNNING
+    assert repository.is_cancel_requested(job.id)
+    assert (tmp_path / "job.wav").exists()
+
+
+def test_failed_job_removes_its_upload(service, repository, tmp_path, monkeypatch):
+    def fail(audio_path):
+        raise RuntimeError("unsupported audio")
+
+    monkeypatch.setattr(transcriber, "preprocess_audio", fail)
+    job = _submit(service, tmp_path, "job")
+    pool = TranscriptionWorkerPool(service, workers=1)
+
+    pool._process(repository.claim_next(pool.owner))
+
+    stored = repository.get(job.id)
+    assert stored.status == JOB_FAILED
+    assert stored.error == "unsupported audio"
+    assert not (tmp_path / "job.wav").exists()
+
+
+def test_stopping_the_pool_does_not_cancel_running_jobs(service):
+    pool = TranscriptionWorkerPool(service, workers=1)
+    should_cancel = pool._cancel_checker("missing-job")
+
+    pool.stop()
+
+    assert not should_cancel(force=True)
+
+
+def test_api_worker_processes_queue_jobs_without_running_a_pool(service, repository, tmp_path, monkeypatch):
+    pool = TranscriptionWorkerPool(service, workers=1)
+    monkeypatch.setattr(config, "API_WORKERS", 2)
+    monkeypatch.setattr(config, "AUDIO_TEMP_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(transcription_job_service, "_service", service)
+    monkeypatch.setattr(transcription_job_service, "_workers", pool)
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+
+    with TestClient(app) as client:
+        response = client.post("/api/transcribe", params={"filename": "a.wav"}, content=b"RIFF")
+
+    assert response.status_code == 202
+    assert repository.get(response.json()["id"]).status == JOB_QUEUED
+    # The main process runs the only pool
+    assert pool._threads == []
+
+
+def test_streamed_text_goes_to_the_job_channel_and_its_row(service, repository, tmp_path, monkeypatch):
+    job = _submit(service, tmp_path, "job")
+    published = []
+    monkeypatch.setattr(service.events, "publish", lambda key, event_type, data: published.append((key, event_type)))
+    saved = []
+
+    def stream(audio_path, on_delta, should_cancel):
+        on_delta("hello")
+        on_delta(" world")
+        saved.append(repository.get(job.id).text)
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(transcriber, "preprocess_audio", lambda path: (path, 1.0))
+    monkeypatch.setattr(transcriber, "request_transcription", stream)
+    pool = TranscriptionWorkerPool(service, workers=1, share_progress=True)
+    pool.CANCEL_CHECK_INTERVAL = 0
+
+    pool._process(repository.claim_next(pool.owner))
+
+    assert saved == ["hello world"]
+    assert published == [(job.id, "job_delta"), (job.id, "job_delta"), (job.id, "job")]
+
+
+def _read_sse(response):
+    events, event_type = [], None
+    for line in response.iter_lines():
+        if line.startswith("event: "):
+            event_type = line[len("event: "):]
+        elif line.startswith("data: "):
+            events.append((event_type, json.loads(line[len("data: "):])))
+    return events
+
+
+def test_jobs_run_by_another_process_are_followed_through_their_row(service, repository, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "API_WORKERS", 2)
+    monkeypatch.setattr(config, "EVENTS_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(transcription_job_service, "_service", service)
+    job = _submit(service, tmp_path, "job")
+    running = repository.claim_next("main-process")
+
+    def main_process():
+        for text in ("hel", "hello"):
+            time.sleep(0.05)
+            repository.set_partial_text(job.id, text)
+        time.sleep(0.05)
+        running.status, running.text = JOB_DONE, "Hello."
+        repository.finish(running)
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    with TestClient(app) as client:
+        threading.Thread(target=main_process).start()
+        with client.stream("GET", f"/api/transcribe/{job.id}/events") as response:
+            events = _read_sse(response)
+
+    assert events[0][0] == "job" and events[0][1]["status"] == JOB_RUNNING
+    assert "".join(data["delta"] for event_type, data in events if event_type == "job_delta") == "hello"
+    assert events[-1][0] == "job" and events[-1][1]["status"] == JOB_DONE
+    assert events[-1][1]["text"] == "Hello."
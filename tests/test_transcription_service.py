@@ -0,0 +1,34 @@
+"""
+Tests for the transcription service.
+"""
+
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.db.write_behind import WriteBehindQueue
+from vaibvoice.services.event_bus import EventBus
+from vaibvoice.services.transcription_service import TranscriptionService
+
+
+def test_counters_are_computed_once_per_batch(db_path, tmp_path, monkeypatch):
+    repository = TranscriptionRepository(db_path)
+    events = EventBus()
+    published = []
+    monkeypatch.setattr(events, "publish", lambda event, data: published.append(data))
+    calls = []
+    get_counters = repository.get_counters
+    monkeypatch.setattr(repository, "get_counters", lambda: calls.append(1) or get_counters())
+
+    writer = WriteBehindQueue(repository, str(tmp_path / "history.journal"), batch_size=3, flush_interval=60)
+    service = TranscriptionService(repository, writer=writer, events=events)
+    writer.start()
+    for n in range(3):
+        assert service.add_transcription(f"store:{n:064x}", f"dictation {n}", 1.0)
+    writer.close(5)
+
+    assert len(published) == 3
+    assert len(calls) == 1
+    assert all(data["stats"]["totalTranscriptions"] == 3 for data in published)
+
+    # A later commit is counted again
+    service.store_transcription("store:" + "f" * 64, "one more", 1.0)
+    assert len(calls) == 2
+    assert published[-1]["stats"]["totalTranscriptions"] == 4
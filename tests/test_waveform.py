@@ -0,0 +1,71 @@
+"""
+Tests for the waveform peaks cache.
+"""
+
+import os
+import threading
+
+import vaibvoice.services.waveform_service as waveform_service
+from vaibvoice.core.audio_store import AudioStore, derived_path
+from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+from vaibvoice.services.waveform_service import WaveformService
+
+from tests.test_audio_store import write_wav
+
+
+def _store(db_path, tmp_path, quota_mb=0):
+    return AudioStore(
+        str(tmp_path / "store"),
+        quota_mb=quota_mb,
+        compress_format="wav",
+        repository=AudioBlobRepository(db_path),
+        derived_caches=((str(tmp_path / "peaks"), "peaks"),)
+    )
+
+
+def test_concurrent_requests_compute_the_peaks_once(db_path, tmp_path, monkeypatch):
+    store = _store(db_path, tmp_path)
+    ref = store.ingest(write_wav(tmp_path / "a.wav", seconds=2))
+    service = WaveformService(store, str(tmp_path / "peaks"), 256)
+    compute = waveform_service.compute_waveform
+    computed = []
+    barrier = threading.Barrier(4)
+
+    def counting_compute(path, samples_per_peak):
+        computed.append(path)
+        return compute(path, samples_per_peak)
+
+    monkeypatch.setattr(waveform_service, "compute_waveform", counting_compute)
+
+    results = []
+
+    def request():
+        barrier.wait()
+        results.append(service.get_waveform(ref))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    assert len(computed) == 1
+    assert all(result is not None and result[0] == results[0][0] for result in results)
+    assert service._locks == {}
+
+
+def test_eviction_deletes_the_cached_peaks(db_path, tmp_path):
+    store = _store(db_path, tmp_path)
+    ref = store.ingest(write_wav(tmp_path / "a.wav", seconds=2), compress=False)
+    service = WaveformService(store, str(tmp_path / "peaks"), 256)
+    key, _ = service.get_waveform(ref)
+    peaks = derived_path(str(tmp_path / "peaks"), key, "peaks")
+    assert os.path.exists(peaks)
+
+    store.quota_bytes = 1
+    store.enforce_quota()
+    store.close()
+
+    assert service.get_waveform(ref) is None
+    assert not os.path.exists(peaks)
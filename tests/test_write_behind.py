@@ -0,0 +1,194 @@
+"""
+Tests for the write-behind history queue and its crash-recovery journal.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from vaibvoice.core.audio_store import AudioStore, is_store_ref
+from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+from vaibvoice.db.repositories.trace_repository import TraceRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.db.write_behind import WriteBehindQueue
+from vaibvoice.models.trace import DictationTrace
+from vaibvoice.models.transcription import Transcription
+
+from tests.test_audio_store import write_wav
+
+
+def _transcription(n: int) -> Transcription:
+    return Transcription(
+        timestamp=datetime(2024, 1, 1, 12, 0, n, 123456),
+        audio_path=f"store:{n:064x}",
+        text=f"dictation number {n}",
+        duration=1.5
+    )
+
+
+@pytest.fixture
+def store(db_path, tmp_path):
+    store = AudioStore(
+        str(tmp_path / "store"), quota_mb=0, compress_format="wav",
+        repository=AudioBlobRepository(db_path), derived_caches=()
+    )
+    yield store
+    store.close()
+
+
+def _recording(tmp_path) -> Transcription:
+    return Transcription(
+        timestamp=datetime(2024, 1, 1, 12, 0, 0, 123456),
+        audio_path=write_wav(tmp_path / "recording_1.wav"),
+        text="dictated with a recording",
+        duration=0.5
+    )
+
+
+def _write_journal(path, lines):
+    with open(path, "w", encoding="utf-8") as journal:
+        for line in lines:
+            journal.write((line if isinstance(line, str) else json.dumps(line)) + "\n")
+
+
+def test_recover_replays_uncommitted_entries(db_path, tmp_path):
+    journal_path = str(tmp_path / "history.journal")
+    _write_journal(journal_path, [
+        {"seq": 1, "transcription": _transcription(1).to_dict()},
+        {"seq": 2, "transcription": _transcription(2).to_dict()},
+        {"committed": 1},
+        {"seq": 3, "transcription": _transcription(3).to_dict()},
+        '{"seq": 4, "transcr',  # torn final line
+    ])
+    repository = TranscriptionRepository(db_path)
+
+    assert WriteBehindQueue(repository, journal_path).recover() == 2
+
+    texts = sorted(t.text for t in repository.get_all())
+    assert texts == ["dictation number 2", "dictation number 3"]
+    assert not (tmp_path / "history.journal").exists()
+
+
+def test_recover_skips_rows_committed_before_the_marker(db_path, tmp_path):
+    # Crash between the batch commit and the "committed" journal entry
+    repository = TranscriptionRepository(db_path)
+    assert repository.add_many([_transcription(1)])
+    journal_path = str(tmp_path / "history.journal")
+    _write_journal(journal_path, [
+        {"seq": 1, "transcription": _transcription(1).to_dict()},
+        {"seq": 2, "transcription": _transcription(2).to_dict()},
+    ])
+
+    WriteBehindQueue(repository, journal_path).recover()
+
+    assert sorted(t.text for t in repository.get_all()) == ["dictation number 1", "dictation number 2"]
+
+
+def test_queued_rows_survive_a_crash(db_path, tmp_path):
+    journal_path = str(tmp_path / "history.journal")
+    repository = TranscriptionRepository(db_path)
+    crashed = WriteBehindQueue(repository, journal_path, batch_size=100, flush_interval=3600)
+    crashed.start()
+    for n in range(3):
+        assert crashed.put(_transcription(n))
+    # The process dies before the batch is written: nothing reached the database
+    assert repository.get_all() == []
+
+    restarted = WriteBehindQueue(repository, journal_path)
+    restarted.start()
+    assert len(repository.get_all()) == 3
+    restarted.close(5)
+
+
+def test_close_flushes_and_removes_the_journal(db_path, tmp_path):
+    journal_path = str(tmp_path / "history.journal")
+    repository = TranscriptionRepository(db_path)
+    committed = []
+    writer = WriteBehindQueue(repository, journal_path, batch_size=100, flush_interval=3600)
+    writer.start()
+    writer.put(_transcription(1), on_commit=committed.append)
+
+    writer.close(5)
+
+    assert [t.id for t in committed] == [repository.get_all()[0].id]
+    assert not (tmp_path / "history.journal").exists()
+
+
+def test_trace_is_written_with_its_transcription(db_path, tmp_path):
+    repository = TranscriptionRepository(db_path)
+    traces = TraceRepository(db_path)
+    before = repository.get_data_version().change_counter
+    writer = WriteBehindQueue(repository, str(tmp_path / "history.journal"))
+    writer.start()
+    trace = DictationTrace()
+    trace.total = 1.25
+
+    writer.put(_transcription(1), trace=trace)
+    writer.close(5)
+
+    (stored,) = repository.get_all()
+    saved = traces.get(stored.id)
+    assert saved.total == 1.25
+    assert saved.db_write is not None
+    # One version bump for the dictation, not one for the row and one for the trace
+    assert repository.get_data_version().change_counter == before + 1
+
+
+def test_recover_skips_an_ingested_row_committed_before_the_marker(db_path, store, tmp_path, monkeypatch):
+    journal_path = str(tmp_path / "history.journal")
+    repository = TranscriptionRepository(db_path)
+    writer = WriteBehindQueue(repository, journal_path, audio_store=store)
+    # Crash between the batch commit and the "committed" journal entry
+    monkeypatch.setattr(writer, "_mark_committed", lambda seq: None)
+    writer.start()
+    recording = _recording(tmp_path)
+    temp_path = recording.audio_path
+    assert writer.put(recording, ingest_audio=True)
+    writer.close(5)
+
+    with open(journal_path, encoding="utf-8") as journal:
+        assert temp_path in journal.read()
+    (committed,) = repository.get_all()
+    assert is_store_ref(committed.audio_path)
+
+    assert WriteBehindQueue(repository, journal_path, audio_store=store).recover() == 1
+    assert [t.audio_path for t in repository.get_all()] == [committed.audio_path]
+
+
+def test_recover_keeps_the_reference_of_a_recording_stored_before_a_crash(db_path, store, tmp_path, monkeypatch):
+    journal_path = str(tmp_path / "history.journal")
+    repository = TranscriptionRepository(db_path)
+    writer = WriteBehindQueue(repository, journal_path, audio_store=store)
+    # Crash after the recording is stored, before its row is committed
+    monkeypatch.setattr(writer.repository, "add_many", lambda *args, **kwargs: False)
+    writer.start()
+    recording = _recording(tmp_path)
+    temp_path = recording.audio_path
+    assert writer.put(recording, ingest_audio=True)
+    writer.close(5)
+    monkeypatch.undo()
+    assert not os.path.exists(temp_path)
+
+    assert WriteBehindQueue(repository, journal_path, audio_store=store).recover() == 1
+
+    (recovered,) = repository.get_all()
+    assert is_store_ref(recovered.audio_path)
+    assert store.resolve(recovered.audio_path) is not None
+
+
+def test_recover_uses_the_recording_not_yet_stored(db_path, store, tmp_path):
+    # Crash after the reference was journaled, before the recording was moved
+    journal_path = str(tmp_path / "history.journal")
+    recording = _recording(tmp_path)
+    data = recording.to_dict()
+    _write_journal(journal_path, [
+        {"seq": 1, "transcription": data},
+        {"seq": 1, "transcription": dict(data, audio_path="store:" + "a" * 64), "source": recording.audio_path},
+    ])
+    repository = TranscriptionRepository(db_path)
+
+    assert WriteBehindQueue(repository, journal_path, audio_store=store).recover() == 1
+
+    assert [t.audio_path for t in repository.get_all()] == [recording.audio_path]
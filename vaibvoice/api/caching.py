@@ -0,0 +1,272 @@
+"""
+Conditional GET support for API responses.
+Answers If-None-Match with 304 and caches rendered and compressed bodies per data version.
+"""
+
+import asyncio
+import datetime
+import threading
+from email.utils import format_datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from vaibvoice.api.compression import SUPPORTED_ENCODINGS, compress, negotiate_encoding
+from vaibvoice.db.executor import run_db
+
+IDENTITY = "identity"
+
+
+class ResponseCache:
+    """
+    In-memory cache of rendered response bodies.
+
+    Only the bodies for the newest ETag of each key are kept: once the data
+    changes, older bodies can never be served again. Each ETag holds the
+    identity body and any compressed variants that have been requested.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty ResponseCache.
+        """
+        self._entries: Dict[str, Tuple[str, Dict[str, bytes]]] = {}
+        self._lock = threading.Lock()
+        self._renders: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    def get(self, key: str, etag: str, encoding: str = IDENTITY) -> Optional[bytes]:
+        """
+        Get the cached body of a key if it was rendered for the given ETag.
+
+        Args:
+            key (str): Name of the cached response
+            etag (str): ETag of the current data version
+            encoding (str): Content coding of the body
+
+        Returns:
+            Optional[bytes]: The cached body, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == etag:
+                return entry[1].get(encoding)
+        return None
+
+    def put(self, key: str, etag: str, body: bytes, encoding: str = IDENTITY):
+        """
+        Store the body rendered for a key at the given ETag.
+
+        Args:
+            key (str): Name of the cached response
+            etag (str): ETag of the data version the body was rendered from
+            body (bytes): Rendered response body
+            encoding (str): Content coding of the body
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                entry = (etag, {})
+                self._entries[key] = entry
+            entry[1][encoding] = body
+
+    async def get_or_render(self, key: str, etag: str, render: Callable[[], bytes]) -> bytes:
+        """
+        Get the cached body of a key, rendering it on the database executor on a miss.
+        Concurrent misses for the same key and ETag share a single render. The
+        render runs in its own task, so a caller that is cancelled (e.g. because
+        its client disconnected) does not cancel it for the others.
+
+        Args:
+            key (str): Name of the cached response
+            etag (str): ETag of the current data version
+            render (Callable[[], bytes]): Builds the body
+
+        Returns:
+            bytes: The body
+        """
+        body = self.get(key, etag)
+        if body is not None:
+            return body
+
+        task = self._renders.get((key, etag))
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._render(key, etag, render))
+            self._renders[(key, etag)] = task
+            task.add_done_callback(lambda done: self._render_done(key, etag, done))
+        return await asyncio.shield(task)
+
+    async def _render(self, key: str, etag: str, render: Callable[[], bytes]) -> bytes:
+        """
+        Render a body on the database executor and cache it.
+
+        Args:
+            key (str): Name of the cached response
+            etag (str): ETag of the current data version
+            render (Callable[[], bytes]): Builds the body
+
+        Returns:
+            bytes: The body
+        """
+        body = await run_db(render)
+        self.put(key, etag, body)
+        return body
+
+    def _render_done(self, key: str, etag: str, task: asyncio.Task):
+        """
+        Forget a finished shared render.
+
+        Args:
+            key (str): Name of the cached response
+            etag (str): ETag the body was rendered for
+            task (asyncio.Task): The finished render
+        """
+        if self._renders.get((key, etag)) is task:
+            del self._renders[(key, etag)]
+        if not task.cancelled():
+            # Retrieve the exception so a render every caller abandoned does not log a warning
+            task.exception()
+
+    def clear(self):
+        """
+        Drop every cached body.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get the process-wide response cache.
+
+    Returns:
+        ResponseCache: The shared cache
+    """
+    return _cache
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the parts of a data version.
+
+    Args:
+        *parts: Values identifying the version
+
+    Returns:
+        str: Quoted ETag
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Get the ETag of a compressed variant, so each byte sequence has its own strong ETag.
+
+    Args:
+        etag (str): ETag of the identity body
+        encoding (str): Content coding of the variant
+
+    Returns:
+        str: Quoted ETag of the variant
+    """
+    return etag[:-1] + "-" + encoding + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the If-None-Match header of a request matches an ETag.
+    Weak comparison is used, as required for If-None-Match.
+
+    Args:
+        request (Request): The incoming request
+        etag (str): ETag of the current representation
+
+    Returns:
+        bool: True if the client already has this representation
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def http_date(timestamp: str) -> Optional[str]:
+    """
+    Convert a UTC ISO timestamp to an HTTP date.
+
+    Args:
+        timestamp (str): ISO timestamp such as "2024-01-31T12:00:00Z"
+
+    Returns:
+        Optional[str]: The HTTP date, or None if the timestamp cannot be parsed
+    """
+    try:
+        moment = datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ")
+    except (TypeError, ValueError):
+        return None
+    return format_datetime(moment.replace(tzinfo=datetime.timezone.utc), usegmt=True)
+
+
+async def conditional_response(
+    request: Request,
+    key: str,
+    etag: str,
+    render: Callable[[], bytes],
+    last_modified: Optional[str] = None,
+    media_type: str = "application/json"
+) -> Response:
+    """
+    Answer a GET request for a versioned resource.
+
+    Returns 304 without rendering when the client's If-None-Match matches,
+    the cached body when this version was rendered before, and otherwise
+    renders, caches and returns a new body, sharing the render with any
+    concurrent request for the same version. Bodies above the compression
+    threshold are sent gzip or brotli encoded as negotiated from
+    Accept-Encoding; compressed variants are cached alongside. Responses carry
+    "Cache-Control: no-cache" so browsers revalidate with If-None-Match
+    on every fetch instead of refetching the full body.
+
+    Args:
+        request (Request): The incoming request
+        key (str): Name of the cached response
+        etag (str): ETag of the current data version
+        render (Callable[[], bytes]): Builds the body; only called on a cache miss,
+            on the database executor
+        last_modified (str, optional): UTC ISO timestamp of the last change
+        media_type (str): Media type of the body
+
+    Returns:
+        Response: The 200 or 304 response
+    """
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    modified = http_date(last_modified) if last_modified else None
+    if modified:
+        headers["Last-Modified"] = modified
+
+    for variant in (etag, *(encoded_etag(etag, coding) for coding in SUPPORTED_ENCODINGS)):
+        if etag_matches(request, variant):
+            headers["ETag"] = variant
+            return Response(status_code=304, headers=headers)
+
+    cache = get_response_cache()
+    body = await cache.get_or_render(key, etag, render)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), len(body))
+    if encoding is not None:
+        compressed = cache.get(key, etag, encoding)
+        if compressed is None:
+            compressed = await run_in_threadpool(compress, body, encoding)
+            cache.put(key, etag, compressed, encoding)
+        body = compressed
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = encoded_etag(etag, encoding)
+    else:
+        headers["ETag"] = etag
+    return Response(content=body, media_type=media_type, headers=headers)
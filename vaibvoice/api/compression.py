@@ -0,0 +1,89 @@
+"""
+Response compression for the API.
+Negotiates gzip or brotli from Accept-Encoding and compresses bodies above a size threshold.
+"""
+
+import gzip
+from typing import Dict, Optional
+
+import vaibvoice.config as config
+
+try:
+    import brotli
+except ImportError:  # optional: pip install vaibvoice[speedups]
+    brotli = None
+
+# Preferred first; brotli is only offered when the module is installed
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header into codings and their quality values.
+
+    Args:
+        header (str, optional): The Accept-Encoding header
+
+    Returns:
+        Dict[str, float]: Quality value per lower-cased coding
+    """
+    accepted = {}
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header: Optional[str], size: int) -> Optional[str]:
+    """
+    Choose the content coding for a response body.
+
+    Args:
+        header (str, optional): The request's Accept-Encoding header
+        size (int): Size in bytes of the uncompressed body
+
+    Returns:
+        Optional[str]: "br" or "gzip", or None to send the body uncompressed
+    """
+    if size < config.COMPRESSION_MIN_SIZE:
+        return None
+
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a body with the given content coding.
+
+    Args:
+        body (bytes): The uncompressed body
+        encoding (str): "br" or "gzip"
+
+    Returns:
+        bytes: The compressed body
+
+    Raises:
+        ValueError: If the coding is not supported
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=config.GZIP_LEVEL, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=config.BROTLI_QUALITY)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
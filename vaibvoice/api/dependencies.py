@@ -0,0 +1,41 @@
+"""
+Request-scoped dependencies for the API routes.
+Builds the services used by a request; their database calls are run with run_db.
+"""
+
+from vaibvoice.services.history_io_service import HistoryIOService
+from vaibvoice.services.stats_service import StatsService
+from vaibvoice.services.transcription_service import TranscriptionService
+
+
+# Dependencies are plain functions, so FastAPI builds the services in its
+# threadpool rather than on the event loop.
+
+def get_transcription_service() -> TranscriptionService:
+    """
+    Build the TranscriptionService for a request.
+
+    Returns:
+        TranscriptionService: The service
+    """
+    return TranscriptionService()
+
+
+def get_stats_service() -> StatsService:
+    """
+    Build the StatsService for a request.
+
+    Returns:
+        StatsService: The service
+    """
+    return StatsService()
+
+
+def get_history_io_service() -> HistoryIOService:
+    """
+    Build the HistoryIOService for a request.
+
+    Returns:
+        HistoryIOService: The service
+    """
+    return HistoryIOService()
@@ -0,0 +1,21 @@
+"""
+API models for transcription jobs.
+Defines Pydantic models for the API.
+"""
+
+from pydantic import BaseModel
+from typing import Optional
+
+class JobResponse(BaseModel):
+    """Model for returning a transcription job."""
+    id: str
+    status: str
+    filename: Optional[str] = None
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    duration: Optional[float] = None
+    text: Optional[str] = None
+    error: Optional[str] = None
+    transcription_id: Optional[int] = None
+    cancel_requested: bool = False
@@ -0,0 +1,24 @@
+"""
+API models for maintenance.
+Defines Pydantic models for the maintenance API.
+"""
+
+from pydantic import BaseModel
+from typing import List
+
+
+class MaintenanceReport(BaseModel):
+    """
+    Response model for a maintenance run.
+    """
+    started_at: str
+    duration_ms: int
+    archived_rows: int
+    deleted_audio_files: int
+    audio_bytes_reclaimed: int
+    migrated_audio_files: int
+    evicted_audio_blobs: int
+    db_bytes_before: int
+    db_bytes_after: int
+    db_bytes_reclaimed: int
+    errors: List[str]
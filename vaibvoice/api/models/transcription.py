@@ -26,6 +26,36 @@ class TranscriptionResponse(BaseModel):
     duration: float
     word_count: int
 
+class SimilarTranscriptionResponse(TranscriptionResponse):
+    """Model for returning a transcription similar to another, with its cosine similarity (0-1)."""
+    score: float
+
+class ImportResponse(BaseModel):
+    """Model for returning the result of a history import."""
+    imported: int
+    skipped: int
+
+class TraceResponse(BaseModel):
+    """Model for returning the timing breakdown of a dictation; timings are in seconds."""
+    transcription_id: int
+    stream_open: Optional[float] = None
+    capture: Optional[float] = None
+    encode: Optional[float] = None
+    upload: Optional[float] = None
+    first_delta: Optional[float] = None
+    transcription: Optional[float] = None
+    format: Optional[float] = None
+    paste: Optional[float] = None
+    db_write: Optional[float] = None
+    total: Optional[float] = None
+    upload_bytes: Optional[int] = None
+    transcription_model: Optional[str] = None
+    llm_model: Optional[str] = None
+    transcription_input_tokens: Optional[int] = None
+    transcription_output_tokens: Optional[int] = None
+    format_input_tokens: Optional[int] = None
+    format_output_tokens: Optional[int] = None
+
 class StatsResponse(BaseModel):
     """Model for returning statistics."""
     totalTranscriptions: int
@@ -33,4 +63,11 @@ class StatsResponse(BaseModel):
     totalWords: int
     avgWordsPerMinute: int
     todayStats: Dict[str, Any]
-    recentTranscriptions: List[Dict[str, Any]]
\ No newline at end of file
+    recentTranscriptions: List[Dict[str, Any]]
+    latencyBreakdown: Dict[str, Any] = {}
+class PeaksResponse(BaseModel):
+    """Model for returning waveform peaks; peaks are min, max pairs scaled to -127..127."""
+    sample_rate: int
+    frames: int
+    samples_per_peak: int
+    peaks: List[int]
@@ -0,0 +1,119 @@
+"""
+API routes for debugging a running instance.
+Samples the stacks of all threads on demand and reports resource usage,
+without restarting the process.
+"""
+
+import hmac
+import ipaddress
+import time
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+import vaibvoice.config as config
+from vaibvoice.utils.diagnostics import collect
+from vaibvoice.utils.profiler import ProfilerBusyError, StackSampler
+
+router = APIRouter()
+
+def _authorize(request: Request, authorization: Optional[str], debug_token: Optional[str]):
+    """
+    Allow debug requests only from the local machine and with the configured token.
+
+    Args:
+        request (Request): The request
+        authorization (str, optional): Authorization header, "Bearer <token>"
+        debug_token (str, optional): X-Debug-Token header
+
+    Raises:
+        HTTPException: 404 if DEBUG_TOKEN is not set, 403 for remote clients,
+            401 for a missing or wrong token
+    """
+    if not config.DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    host = request.client.host if request.client else ""
+    try:
+        local = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        local = False
+    if not local:
+        raise HTTPException(status_code=403, detail="Debug endpoints are only available locally")
+
+    token = debug_token
+    if token is None and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:].strip()
+    if token is None or not hmac.compare_digest(token.encode(), config.DEBUG_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid debug token", headers={"WWW-Authenticate": "Bearer"})
+
+@router.get("/debug/profile")
+async def get_profile(
+    request: Request,
+    seconds: float = Query(10.0, gt=0),
+    format: str = Query("collapsed", pattern="^(collapsed|speedscope)$"),
+    interval: Optional[float] = Query(None, ge=0.001, le=1.0),
+    authorization: Optional[str] = Header(None),
+    x_debug_token: Optional[str] = Header(None)
+):
+    """
+    Sample the stacks of every thread of this process for a while.
+    With several API workers, the profile covers the worker that served the request.
+
+    Args:
+        seconds (float): How long to sample, at most PROFILE_MAX_SECONDS
+        format (str): "collapsed" for collapsed stacks, "speedscope" for a speedscope file
+        interval (float, optional): Seconds between samples; PROFILE_INTERVAL by default
+
+    Returns:
+        PlainTextResponse | JSONResponse: The profile, as a download
+
+    Raises:
+        HTTPException: 401/403/404 if not authorized, 400 if seconds is too long,
+            409 if a profile is already running
+    """
+    _authorize(request, authorization, x_debug_token)
+    if seconds > config.PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {config.PROFILE_MAX_SECONDS:g}")
+
+    sampler = StackSampler(interval or config.PROFILE_INTERVAL)
+    try:
+        # Sample from a worker thread so the event loop keeps serving, and shows up in the profile
+        await run_in_threadpool(sampler.run, seconds)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    name = f"vaibvoice-{time.strftime('%Y%m%d-%H%M%S')}"
+    if format == "speedscope":
+        return JSONResponse(
+            sampler.to_speedscope(name),
+            headers={"Content-Disposition": f'attachment; filename="{name}.speedscope.json"'}
+        )
+    return PlainTextResponse(
+        sampler.to_collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="{name}.collapsed.txt"'}
+    )
+
+@router.get("/debug/diagnostics")
+async def get_diagnostics(
+    request: Request,
+    top: int = Query(20, ge=1, le=200),
+    authorization: Optional[str] = Header(None),
+    x_debug_token: Optional[str] = Header(None)
+):
+    """
+    Report memory, open file descriptors, threads and SQLite connections of this process.
+    Allocation sites are included when tracing was enabled with TRACEMALLOC_FRAMES.
+
+    Args:
+        top (int): Number of allocation sites to report
+
+    Returns:
+        dict: The diagnostics (see vaibvoice.utils.diagnostics.collect)
+
+    Raises:
+        HTTPException: 401/403/404 if not authorized
+    """
+    _authorize(request, authorization, x_debug_token)
+    return await run_in_threadpool(collect, top)
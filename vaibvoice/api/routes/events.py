@@ -0,0 +1,74 @@
+"""
+API routes for live events.
+Streams new transcriptions, counter updates and settings changes as Server-Sent Events.
+"""
+
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+import vaibvoice.config as config
+from vaibvoice.db.executor import run_db
+from vaibvoice.services.event_bus import get_event_bus
+
+router = APIRouter()
+
+# Reconnection delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 3000
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream events as Server-Sent Events.
+
+    Event types:
+        - transcription: {"transcription": <row>, "stats": <counters>} after a new transcription is stored
+        - history_cleared: {"stats": <counters>} after the history was cleared
+        - settings: <settings> after the settings changed
+        - resync: {} when missed events can no longer be replayed; the client should refetch
+
+    A client that reconnects with Last-Event-ID first receives the events it
+    missed. A client that falls too far behind is disconnected and resumes
+    the same way.
+
+    Returns:
+        StreamingResponse: The event stream
+    """
+    bus = get_event_bus()
+    # Reads of the event log run off the loop; registering the subscription does not
+    await run_db(bus.start)
+    subscription = bus.subscribe()
+    try:
+        missed = await run_db(bus.replay, last_event_id, subscription) if last_event_id else []
+    except BaseException:
+        bus.unsubscribe(subscription)
+        raise
+
+    async def stream():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            if missed is None:
+                yield "event: resync\ndata: {}\n\n"
+            else:
+                for event in missed:
+                    yield event.to_sse()
+
+            while not await request.is_disconnected():
+                event = await subscription.get(config.EVENTS_HEARTBEAT)
+                if event is not None:
+                    yield event.to_sse()
+                elif subscription.dropped:
+                    break
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
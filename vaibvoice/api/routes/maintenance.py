@@ -0,0 +1,39 @@
+"""
+API routes for maintenance.
+Defines FastAPI routes for retention and database maintenance.
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from vaibvoice.api.models.maintenance import MaintenanceReport
+from vaibvoice.services.maintenance_service import get_maintenance_scheduler
+
+router = APIRouter()
+
+@router.get("/maintenance", response_model=MaintenanceReport)
+async def get_maintenance_report():
+    """
+    Get the report of the most recent maintenance run.
+    
+    Returns:
+        MaintenanceReport: The last report
+        
+    Raises:
+        HTTPException: If maintenance has not run yet
+    """
+    report = get_maintenance_scheduler().service.last_report
+    if report is None:
+        raise HTTPException(status_code=404, detail="Maintenance has not run yet")
+    return MaintenanceReport(**report)
+
+@router.post("/maintenance/run", response_model=MaintenanceReport)
+async def run_maintenance():
+    """
+    Run retention and database maintenance now.
+    
+    Returns:
+        MaintenanceReport: Report of the run
+    """
+    report = await run_in_threadpool(get_maintenance_scheduler().service.run)
+    return MaintenanceReport(**report)
@@ -0,0 +1,43 @@
+"""
+API routes for metrics.
+Exposes stage timings and counters in the Prometheus text format.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+import vaibvoice.config as config
+from vaibvoice.db.executor import run_db
+from vaibvoice.services.metrics_service import MetricsService
+from vaibvoice.utils.metrics import get_metrics
+
+router = APIRouter()
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _render_shared() -> str:
+    """
+    Render this worker's metrics together with those exported by the dictation process.
+
+    Returns:
+        str: The exposition
+    """
+    return MetricsService().render()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """
+    Get the metrics in the Prometheus text format.
+    With several API workers, each scrape reports the worker that served it
+    plus the dictation process, whose metrics are exported to the database
+    every METRICS_EXPORT_INTERVAL seconds.
+
+    Returns:
+        PlainTextResponse: The exposition
+    """
+    if config.API_WORKERS > 1:
+        body = await run_db(_render_shared)
+    else:
+        body = get_metrics().render()
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
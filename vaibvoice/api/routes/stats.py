@@ -3,31 +3,43 @@ API routes for statistics.
 Defines FastAPI routes for statistics operations.
 """
 
-from fastapi import APIRouter, Depends
+import datetime
+from fastapi import APIRouter, Depends, Request
 from typing import Dict, Any
 
+from vaibvoice.api.caching import conditional_response, make_etag
+from vaibvoice.api.dependencies import get_stats_service
 from vaibvoice.api.models.transcription import StatsResponse
+from vaibvoice.api.serialization import dumps_json
+from vaibvoice.db.executor import run_db
 from vaibvoice.services.stats_service import StatsService
 
 router = APIRouter()
 
 @router.get("/stats", response_model=StatsResponse)
 async def get_stats(
-    service: StatsService = Depends(lambda: StatsService())
+    request: Request,
+    service: StatsService = Depends(get_stats_service)
 ):
     """
     Get statistics about the transcriptions.
+    Supports conditional GET: a matching If-None-Match is answered with 304.
     
     Returns:
         StatsResponse: Statistics about the transcriptions
     """
-    stats = service.get_stats()
-    
-    return StatsResponse(
-        totalTranscriptions=stats["totalTranscriptions"],
-        totalDuration=stats["totalDuration"],
-        totalWords=stats["totalWords"],
-        avgWordsPerMinute=stats["avgWordsPerMinute"],
-        todayStats=stats["todayStats"],
-        recentTranscriptions=stats["recentTranscriptions"]
-    )
\ No newline at end of file
+    version = await run_db(service.get_data_version)
+    # Today's stats roll over at midnight UTC (SQLite's date('now')) without any row changing
+    today = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+    def render() -> bytes:
+        # The repository builds the stats dict in StatsResponse's shape; response_model only documents it
+        return dumps_json(service.get_stats())
+
+    return await conditional_response(
+        request,
+        "stats",
+        make_etag("s", version.max_id, version.change_counter, today),
+        render,
+        last_modified=version.modified_at
+    )
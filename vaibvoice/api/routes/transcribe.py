@@ -0,0 +1,309 @@
+"""
+API routes for transcription jobs.
+Accepts audio uploads for transcription and reports job progress.
+"""
+
+import asyncio
+import json
+import os
+import uuid
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
+
+import vaibvoice.config as config
+from vaibvoice.api.models.job import JobResponse
+from vaibvoice.db.executor import run_db
+from vaibvoice.models.job import FINISHED_STATUSES, JOB_RUNNING, TranscriptionJob
+from vaibvoice.services.event_bus import Subscription
+from vaibvoice.services.transcription_job_service import (
+    QueueFullError,
+    get_transcription_job_service,
+    get_transcription_workers,
+)
+
+router = APIRouter()
+
+# Seconds a client is asked to wait before resubmitting to a full queue
+RETRY_AFTER = 5
+
+def _upload_path(filename: Optional[str]) -> str:
+    """
+    Build the path an upload is spooled to, keeping the extension of the client's file name.
+
+    Args:
+        filename (str, optional): Name of the file as given by the client
+
+    Returns:
+        str: Path in the audio temp directory
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if not extension[1:].isalnum():
+        extension = ".wav"
+    return os.path.join(config.AUDIO_TEMP_DIR, f"upload_{uuid.uuid4().hex}{extension}")
+
+async def _spool_upload(request: Request, upload_path: str, max_bytes: int) -> int:
+    """
+    Write the request body to a file. File operations run in the threadpool,
+    so a slow disk does not stall the event loop.
+
+    Args:
+        request (Request): The upload request
+        upload_path (str): Path to write the body to
+        max_bytes (int): Maximum size of the body
+
+    Returns:
+        int: Size of the body in bytes
+
+    Raises:
+        HTTPException: 413 if the body is larger than max_bytes
+    """
+    await run_in_threadpool(os.makedirs, config.AUDIO_TEMP_DIR, exist_ok=True)
+    upload = await run_in_threadpool(open, upload_path, "wb")
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=413, detail=f"Upload exceeds {config.TRANSCRIBE_MAX_UPLOAD_MB} MB"
+                )
+            await run_in_threadpool(upload.write, chunk)
+    finally:
+        await run_in_threadpool(upload.close)
+    return size
+
+@router.post("/transcribe", response_model=JobResponse, status_code=202)
+async def submit_transcription(
+    request: Request,
+    filename: Optional[str] = Query(None, max_length=255)
+):
+    """
+    Queue the audio in the request body for transcription.
+    The body is the raw audio file; the format is taken from the extension of filename.
+
+    Args:
+        filename (str, optional): Name of the uploaded file
+
+    Returns:
+        JobResponse: The queued job, with its URL in the Location header
+
+    Raises:
+        HTTPException: 400 for an empty body, 413 if the upload is too large,
+            503 if the queue is full
+    """
+    max_bytes = config.TRANSCRIBE_MAX_UPLOAD_MB * 1024 * 1024
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds {config.TRANSCRIBE_MAX_UPLOAD_MB} MB")
+
+    upload_path = _upload_path(filename)
+    try:
+        size = await _spool_upload(request, upload_path, max_bytes)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Request body must contain the audio file")
+
+        service = get_transcription_job_service()
+        job = await run_db(service.submit, upload_path, filename)
+    except QueueFullError as e:
+        await run_in_threadpool(os.remove, upload_path)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(RETRY_AFTER)})
+    except BaseException:
+        # Not awaited, so the file is removed even when the request was cancelled
+        if os.path.exists(upload_path):
+            os.remove(upload_path)
+        raise
+
+    # Jobs run on the one worker pool of the main process. With several API
+    # workers it picks the job up on its next poll; a pool per API process
+    # would multiply TRANSCRIBE_WORKERS by the number of processes.
+    if config.API_WORKERS <= 1:
+        workers = get_transcription_workers()
+        # Requeues abandoned jobs (a database write) the first time in this process
+        await run_in_threadpool(workers.start)
+        workers.notify()
+
+    return JSONResponse(
+        job.to_dict(),
+        status_code=202,
+        headers={"Location": f"/api/transcribe/{job.id}"}
+    )
+
+@router.get("/transcribe", response_model=List[JobResponse])
+async def get_jobs(limit: int = Query(50, ge=1, le=500)):
+    """
+    Get the most recently submitted jobs.
+
+    Args:
+        limit (int): Maximum number of jobs to return
+
+    Returns:
+        List[JobResponse]: Jobs, newest first
+    """
+    jobs = await run_db(get_transcription_job_service().get_recent, limit)
+    return [job.to_dict() for job in jobs]
+
+@router.get("/transcribe/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    Get the status of a job, and its text once done.
+
+    Args:
+        job_id (str): ID of the job
+
+    Returns:
+        JobResponse: The job
+
+    Raises:
+        HTTPException: If the job is not found
+    """
+    job = await run_db(get_transcription_job_service().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+def _job_sse(event_type: str, data: dict) -> str:
+    """
+    Format a job event as a Server-Sent Events message.
+
+    Args:
+        event_type (str): "job" or "job_delta"
+        data (dict): Payload of the event
+
+    Returns:
+        str: The SSE message
+    """
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def _published_job_events(request: Request, subscription: Subscription):
+    """
+    Relay the events the worker pool of this process publishes for a job, until it finishes.
+
+    Args:
+        request (Request): The streaming request
+        subscription (Subscription): Subscription to the job's events
+
+    Yields:
+        str: SSE messages
+    """
+    while not await request.is_disconnected():
+        event = await subscription.get(config.EVENTS_HEARTBEAT)
+        if event is None:
+            if subscription.dropped:
+                return
+            yield ": keep-alive\n\n"
+            continue
+        yield event.to_sse()
+        if event.type == "job" and event.data["status"] in FINISHED_STATUSES:
+            return
+
+async def _polled_job_events(request: Request, job: TranscriptionJob):
+    """
+    Follow a job run by another process through its row, until it finishes.
+    Status changes are sent as "job" events and text added to the row while
+    it runs as "job_delta" events.
+
+    Args:
+        request (Request): The streaming request
+        job (TranscriptionJob): The job as last sent to the client
+
+    Yields:
+        str: SSE messages
+    """
+    service = get_transcription_job_service()
+    status, text = job.status, job.text or ""
+    idle = 0.0
+    while not await request.is_disconnected():
+        await asyncio.sleep(config.EVENTS_POLL_INTERVAL)
+        job = await run_db(service.get, job.id)
+        if job is None:
+            return
+        sent = False
+        if job.status == JOB_RUNNING and job.text and job.text.startswith(text) and len(job.text) > len(text):
+            yield _job_sse("job_delta", {"job_id": job.id, "delta": job.text[len(text):]})
+            text = job.text
+            sent = True
+        if job.status != status:
+            status = job.status
+            yield _job_sse("job", job.to_dict())
+            sent = True
+            if job.finished:
+                return
+        idle = 0.0 if sent else idle + config.EVENTS_POLL_INTERVAL
+        if idle >= config.EVENTS_HEARTBEAT:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+
+@router.get("/transcribe/{job_id}/events")
+async def stream_job(request: Request, job_id: str):
+    """
+    Stream the progress of a job as Server-Sent Events.
+
+    Event types:
+        - job: <job> on every status change, starting with the current state
+        - job_delta: {"job_id", "delta"} for each piece of streamed text
+
+    The stream ends once the job reached a final status. Only this job's
+    events are sent. With several API workers the job runs in the main
+    process, and is followed by polling its row.
+
+    Args:
+        job_id (str): ID of the job
+
+    Returns:
+        StreamingResponse: The event stream
+
+    Raises:
+        HTTPException: If the job is not found
+    """
+    service = get_transcription_job_service()
+    local = config.API_WORKERS <= 1
+    # Subscribe before reading the job, so no status change falls in between
+    subscription = service.events.subscribe(job_id) if local else None
+    job = await run_db(service.get, job_id)
+    if job is None:
+        if subscription is not None:
+            service.events.unsubscribe(job_id, subscription)
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        try:
+            yield _job_sse("job", job.to_dict())
+            if job.finished:
+                return
+            if local:
+                events = _published_job_events(request, subscription)
+            else:
+                events = _polled_job_events(request, job)
+            async for message in events:
+                yield message
+        finally:
+            if subscription is not None:
+                service.events.unsubscribe(job_id, subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.delete("/transcribe/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """
+    Cancel a job. A queued job is cancelled at once; a running job stops at
+    its next checkpoint and reports "cancelled" when it does.
+
+    Args:
+        job_id (str): ID of the job
+
+    Returns:
+        JobResponse: The job after the request
+
+    Raises:
+        HTTPException: If the job is not found
+    """
+    job = await run_db(get_transcription_job_service().cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
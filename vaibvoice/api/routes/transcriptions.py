@@ -3,44 +3,136 @@ API routes for transcriptions.
 Defines FastAPI routes for transcription operations.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+import os
+import tempfile
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from typing import List
 
-from vaibvoice.api.models.transcription import TranscriptionResponse
+from vaibvoice.api.caching import conditional_response, etag_matches, make_etag
+from vaibvoice.api.dependencies import get_history_io_service, get_transcription_service
+from vaibvoice.api.models.transcription import (
+    ImportResponse,
+    PeaksResponse,
+    SimilarTranscriptionResponse,
+    TraceResponse,
+    TranscriptionResponse
+)
+from vaibvoice.api.serialization import transcription_rows_to_json
+from vaibvoice.db.executor import run_db
+from vaibvoice.services.audio_stream_service import AUDIO_MEDIA_TYPES, get_audio_stream_service
+from vaibvoice.services.history_io_service import EXPORT_MEDIA_TYPES, HistoryImportError, HistoryIOService
+from vaibvoice.services.similarity_service import get_similarity_service
 from vaibvoice.services.transcription_service import TranscriptionService
+from vaibvoice.services.waveform_service import get_waveform_service
 
 router = APIRouter()
 
+# Seconds a client is asked to wait before asking for similar transcriptions
+# again while the similarity index is built
+SIMILARITY_RETRY_AFTER = 5
+
 @router.get("/transcriptions", response_model=List[TranscriptionResponse])
 async def get_transcriptions(
-    service: TranscriptionService = Depends(lambda: TranscriptionService())
+    request: Request,
+    service: TranscriptionService = Depends(get_transcription_service)
 ):
     """
     Get all transcriptions.
+    Supports conditional GET: a matching If-None-Match is answered with 304.
     
     Returns:
         List[TranscriptionResponse]: List of all transcriptions
     """
-    transcriptions = service.get_all_transcriptions()
-    
-    # Convert domain models to API response models
-    response = []
-    for t in transcriptions:
-        response.append(TranscriptionResponse(
-            id=t.id,
-            timestamp=t.timestamp.isoformat(),
-            audio_path=t.audio_path,
-            text=t.text,
-            duration=t.duration,
-            word_count=t.word_count
-        ))
-    
-    return response
+    version = await run_db(service.get_data_version)
+    # Rows are serialized straight to JSON; response_model only documents the shape
+    return await conditional_response(
+        request,
+        "transcriptions",
+        make_etag("t", version.max_id, version.change_counter),
+        lambda: transcription_rows_to_json(service.get_all_transcription_rows()),
+        last_modified=version.modified_at
+    )
+
+@router.get("/transcriptions/archive", response_model=List[TranscriptionResponse])
+async def get_archived_transcriptions(
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    service: TranscriptionService = Depends(get_transcription_service)
+):
+    """
+    Get archived transcriptions, newest first.
+    
+    Args:
+        limit (int): Maximum number of transcriptions to return
+        offset (int): Number of transcriptions to skip
+        
+    Returns:
+        List[TranscriptionResponse]: Archived transcriptions
+    """
+    transcriptions = await run_db(service.get_archived_transcriptions, limit, offset)
+    return [TranscriptionResponse(**t.to_dict()) for t in transcriptions]
+
+@router.get("/transcriptions/export")
+async def export_transcriptions(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    service: HistoryIOService = Depends(get_history_io_service)
+):
+    """
+    Export all transcriptions as NDJSON or CSV.
+    The body is streamed with chunked transfer from a single database cursor.
+    
+    Args:
+        format (str): "ndjson" or "csv"
+        
+    Returns:
+        StreamingResponse: The export stream
+    """
+    return StreamingResponse(
+        service.export(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transcriptions.{format}"'}
+    )
+
+@router.post("/transcriptions/import", response_model=ImportResponse)
+async def import_transcriptions(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    service: HistoryIOService = Depends(get_history_io_service)
+):
+    """
+    Import transcriptions from an NDJSON or CSV request body.
+    The body is spooled to a temporary file and ingested in batched transactions.
+    
+    Args:
+        format (str): "ndjson" or "csv"
+        
+    Returns:
+        ImportResponse: Number of imported and skipped records
+    """
+    fd, spool_path = tempfile.mkstemp(suffix=f".{format}")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            async for chunk in request.stream():
+                spool.write(chunk)
+
+        def _import():
+            with open(spool_path, "rb") as lines:
+                return service.import_lines(lines, format)
+
+        imported = await run_db(_import)
+    except HistoryImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        os.remove(spool_path)
+    
+    return ImportResponse(imported=imported, skipped=service.import_errors)
 
 @router.get("/transcriptions/{transcription_id}", response_model=TranscriptionResponse)
 async def get_transcription(
     transcription_id: int,
-    service: TranscriptionService = Depends(lambda: TranscriptionService())
+    service: TranscriptionService = Depends(get_transcription_service)
 ):
     """
     Get a transcription by ID.
@@ -54,7 +146,7 @@ async def get_transcription(
     Raises:
         HTTPException: If the transcription is not found
     """
-    transcription = service.get_transcription_by_id(transcription_id)
+    transcription = await run_db(service.get_transcription_by_id, transcription_id)
     
     if not transcription:
         raise HTTPException(status_code=404, detail="Transcription not found")
@@ -66,4 +158,173 @@ async def get_transcription(
         text=transcription.text,
         duration=transcription.duration,
         word_count=transcription.word_count
-    )
\ No newline at end of file
+    )
+
+@router.get("/transcriptions/{transcription_id}/trace", response_model=TraceResponse)
+async def get_transcription_trace(
+    transcription_id: int,
+    service: TranscriptionService = Depends(get_transcription_service)
+):
+    """
+    Get the timing breakdown of a dictation.
+    
+    Args:
+        transcription_id (int): ID of the transcription
+        
+    Returns:
+        TraceResponse: The timings, in seconds, with upload size, token usage and models
+        
+    Raises:
+        HTTPException: If the transcription has no trace
+    """
+    trace = await run_db(service.get_trace, transcription_id)
+    
+    if not trace:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    
+    return TraceResponse(**trace.to_dict())
+
+@router.get("/transcriptions/{transcription_id}/peaks", response_model=PeaksResponse)
+async def get_transcription_peaks(
+    request: Request,
+    transcription_id: int,
+    resolution: int = Query(1000, ge=1, le=1000000),
+    format: str = Query("binary", pattern="^(binary|json)$"),
+    service: TranscriptionService = Depends(get_transcription_service)
+):
+    """
+    Get the waveform peaks of a recording, for drawing it without the audio.
+    Peaks are computed on the first request and cached. The level returned is
+    the coarsest with at least `resolution` peaks (the finest if none has).
+    The binary format is the int8 min, max pairs, with the sample rate, frame
+    count and frames per peak in X-Sample-Rate, X-Frames and X-Samples-Per-Peak.
+    Supports conditional GET: a matching If-None-Match is answered with 304.
+    
+    Args:
+        transcription_id (int): ID of the transcription
+        resolution (int): Number of peaks wanted, e.g. the width of the display in pixels
+        format (str): "binary" or "json"
+        
+    Returns:
+        Response | PeaksResponse: The peaks
+        
+    Raises:
+        HTTPException: If the transcription is not found or its recording is not available
+    """
+    transcription = await run_db(service.get_transcription_by_id, transcription_id)
+    if not transcription:
+        raise HTTPException(status_code=404, detail="Transcription not found")
+    
+    result = await run_in_threadpool(get_waveform_service().get_waveform, transcription.audio_path)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Recording not available")
+    key, waveform = result
+    level = waveform.level_for(resolution)
+    
+    headers = {
+        "Cache-Control": "no-cache",
+        "ETag": make_etag("p", key, level.samples_per_peak, format),
+        "X-Sample-Rate": str(waveform.sample_rate),
+        "X-Frames": str(waveform.frames),
+        "X-Samples-Per-Peak": str(level.samples_per_peak),
+    }
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    if format == "json":
+        return Response(
+            content=PeaksResponse(
+                sample_rate=waveform.sample_rate,
+                frames=waveform.frames,
+                samples_per_peak=level.samples_per_peak,
+                peaks=level.peaks.ravel().tolist()
+            ).model_dump_json(),
+            media_type="application/json",
+            headers=headers
+        )
+    return Response(content=level.peaks.tobytes(), media_type="application/octet-stream", headers=headers)
+
+@router.get("/transcriptions/{transcription_id}/audio")
+async def get_transcription_audio(
+    request: Request,
+    transcription_id: int,
+    format: str = Query("original", pattern="^(original|opus)$"),
+    service: TranscriptionService = Depends(get_transcription_service)
+):
+    """
+    Stream the recording of a transcription.
+    The file is sent from disk in chunks, or with the server's zero-copy path
+    send when it offers one. Range requests are answered with 206 partial
+    content, so players can seek without downloading the whole recording.
+    With format=opus, the recording is transcoded to Ogg Opus on the first
+    request and the copy is cached. Supports conditional GET: a matching
+    If-None-Match is answered with 304.
+    
+    Args:
+        transcription_id (int): ID of the transcription
+        format (str): "original" for the stored WAV or FLAC file, "opus" for an Opus copy
+        
+    Returns:
+        FileResponse: The audio file
+        
+    Raises:
+        HTTPException: If the transcription is not found or its recording is not available
+    """
+    transcription = await run_db(service.get_transcription_by_id, transcription_id)
+    if not transcription:
+        raise HTTPException(status_code=404, detail="Transcription not found")
+    
+    audio = await run_in_threadpool(get_audio_stream_service().get_audio_file, transcription.audio_path, format)
+    if audio is None:
+        raise HTTPException(status_code=404, detail="Recording not available")
+    
+    headers = {"Cache-Control": "no-cache", "ETag": make_etag("a", audio.key, audio.format)}
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    # FileResponse handles Range and If-Range against this ETag
+    return FileResponse(
+        audio.path,
+        media_type=AUDIO_MEDIA_TYPES[audio.format],
+        headers=headers,
+        filename=f"transcription-{transcription_id}.{audio.format}",
+        content_disposition_type="inline"
+    )
+
+@router.get("/transcriptions/{transcription_id}/similar", response_model=List[SimilarTranscriptionResponse])
+async def get_similar_transcriptions(
+    transcription_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    min_score: float = Query(0.0, ge=0.0, le=1.0),
+    service: TranscriptionService = Depends(get_transcription_service)
+):
+    """
+    Get the past transcriptions whose text is most similar to a transcription,
+    by cosine similarity of hashed TF-IDF vectors of words and word pairs.
+    Archived transcriptions are not included.
+    
+    Args:
+        transcription_id (int): ID of the transcription
+        limit (int): Maximum number of transcriptions to return
+        min_score (float): Leave out transcriptions less similar than this
+        
+    Returns:
+        List[SimilarTranscriptionResponse]: Similar transcriptions, most similar first
+        
+    Raises:
+        HTTPException: If the transcription is not found, or 503 while the similarity index is being built
+    """
+    transcription = await run_db(service.get_transcription_by_id, transcription_id)
+    if not transcription:
+        raise HTTPException(status_code=404, detail="Transcription not found")
+    
+    matches = await run_db(get_similarity_service().find_similar, transcription.text, limit, transcription_id)
+    if matches is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Similarity index is being built",
+            headers={"Retry-After": str(SIMILARITY_RETRY_AFTER)}
+        )
+    return [
+        SimilarTranscriptionResponse(**match.to_dict(), score=round(score, 4))
+        for match, score in matches
+        if score >= min_score
+    ]
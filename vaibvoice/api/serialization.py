@@ -0,0 +1,46 @@
+"""
+Serialization helpers for API responses.
+Converts database rows straight to JSON for list endpoints.
+"""
+
+import json
+from typing import Any, Iterable, List
+
+from vaibvoice.models.transcription import transcription_row_to_dict
+
+try:
+    import orjson
+except ImportError:  # optional: pip install vaibvoice[speedups]
+    orjson = None
+
+
+def dumps_json(obj: Any) -> bytes:
+    """
+    Encode trusted, already-validated data as compact UTF-8 JSON.
+    Uses orjson when it is installed and the standard library otherwise;
+    both produce the same document.
+
+    Args:
+        obj (Any): Data made of dicts, lists, strings, numbers, booleans and None
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def transcription_rows_to_json(rows: Iterable[tuple]) -> bytes:
+    """
+    Serialize transcriptions rows to a JSON array without building domain
+    or Pydantic objects. The output matches a list of TranscriptionResponse.
+
+    Args:
+        rows (Iterable[tuple]): Rows selected with TRANSCRIPTION_COLUMNS
+
+    Returns:
+        bytes: UTF-8 encoded JSON array
+    """
+    payload: List[dict] = [transcription_row_to_dict(row) for row in rows]
+    return dumps_json(payload)
@@ -3,20 +3,35 @@ FastAPI server for VaibVoice.
 Provides API endpoints for the GUI to consume.
 """
 
+import argparse
+import os
+import subprocess
+import sys
 import threading
-import uvicorn
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from typing import TYPE_CHECKING
 
 import vaibvoice.config as config
 
-def create_app() -> FastAPI:
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+def create_app() -> "FastAPI":
     """
     Create and configure the FastAPI application.
+    FastAPI and uvicorn are imported here and in run_api_server rather than at
+    module level, so that starting the server thread does not delay startup.
 
     Returns:
         FastAPI: The configured FastAPI application
     """
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.middleware.gzip import GZipMiddleware
+    from vaibvoice.utils.diagnostics import start_tracemalloc
+
+    # Trace allocations from here on if enabled, for /api/debug/diagnostics
+    start_tracemalloc()
+
     app = FastAPI(
         title="VaibVoice API",
         description="API for the VaibVoice application",
@@ -26,36 +41,73 @@ def create_app() -> FastAPI:
     # Configure CORS to allow requests from the GUI
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[f"http://{config.API_HOST}:{config.API_PORT}", "http://localhost:8000", "http://127.0.0.1:8000"],
+        allow_origins=[f"http://{config.API_HOST}:{config.API_PORT}", "http://localhost:8080", "http://127.0.0.1:8080"],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
 
+    # Compress other large responses, such as exports; cached JSON responses
+    # are compressed once per version by api.caching and passed through
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=config.COMPRESSION_MIN_SIZE,
+        compresslevel=config.GZIP_LEVEL
+    )
+
     # Import routes here to avoid circular imports
     from vaibvoice.api.routes.transcriptions import router as transcriptions_router
     from vaibvoice.api.routes.stats import router as stats_router
     from vaibvoice.api.routes.settings import router as settings_router
+    from vaibvoice.api.routes.maintenance import router as maintenance_router
+    from vaibvoice.api.routes.events import router as events_router
+    from vaibvoice.api.routes.transcribe import router as transcribe_router
+    from vaibvoice.api.routes.metrics import router as metrics_router
+    from vaibvoice.api.routes.debug import router as debug_router
 
     # Include routers
     app.include_router(transcriptions_router, prefix="/api", tags=["transcriptions"])
     app.include_router(stats_router, prefix="/api", tags=["stats"])
     app.include_router(settings_router, prefix="/api", tags=["settings"])
+    app.include_router(maintenance_router, prefix="/api", tags=["maintenance"])
+    app.include_router(events_router, prefix="/api", tags=["events"])
+    app.include_router(transcribe_router, prefix="/api", tags=["transcribe"])
+    app.include_router(debug_router, prefix="/api", tags=["debug"])
+    # Served at the conventional /metrics path for Prometheus scrapers
+    app.include_router(metrics_router, tags=["metrics"])
+
+    # Serve the built GUI; mounted last so that API routes take precedence
+    if os.path.isfile(os.path.join(config.GUI_DIST_DIR, "index.html")):
+        from vaibvoice.api.static import SPAStaticFiles
+        app.mount("/", SPAStaticFiles(config.GUI_DIST_DIR), name="gui")
 
     return app
 
-def run_api_server(host: str = None, port: int = None):
+def run_api_server(host: str = None, port: int = None, workers: int = None):
     """
     Run the FastAPI server.
 
+    With more than one worker, uvicorn runs each worker in its own process
+    and must be called from the main thread. The workers share settings,
+    response caches, the job queue and the event stream through the
+    database, so any of them can serve any request.
+
     Args:
         host (str): Host to bind the server to
         port (int): Port to bind the server to
+        workers (int): Number of worker processes
     """
     host = host if host is not None else config.API_HOST
     port = port if port is not None else config.API_PORT
-    app = create_app()
-    uvicorn.run(app, host=host, port=port)
+    workers = workers if workers is not None else config.API_WORKERS
+    import uvicorn
+
+    if workers > 1:
+        # Each worker process imports and builds its own app
+        uvicorn.run("vaibvoice.api.server:create_app", factory=True, host=host, port=port, workers=workers)
+    else:
+        app = create_app()
+        uvicorn.run(app, host=host, port=port)
 
 def start_api_server_thread(host: str = None, port: int = None):
     """
@@ -74,3 +126,44 @@ def start_api_server_thread(host: str = None, port: int = None):
     api_thread.daemon = True  # The thread will terminate when the main thread terminates
     api_thread.start()
     return api_thread
+
+def start_api_server_process(host: str = None, port: int = None, workers: int = None) -> subprocess.Popen:
+    """
+    Start the FastAPI server with several worker processes in a child process.
+
+    Args:
+        host (str): Host to bind the server to
+        port (int): Port to bind the server to
+        workers (int): Number of worker processes
+
+    Returns:
+        subprocess.Popen: The server process
+    """
+    host = host if host is not None else config.API_HOST
+    port = port if port is not None else config.API_PORT
+    workers = workers if workers is not None else config.API_WORKERS
+    # The workers pick the shared event bus from API_WORKERS, so it must match in every process
+    env = dict(os.environ, API_WORKERS=str(workers))
+    return subprocess.Popen(
+        [sys.executable, "-m", "vaibvoice.api.server", "--host", host, "--port", str(port), "--workers", str(workers)],
+        env=env
+    )
+
+def main():
+    """
+    Run the API server on its own, e.g. to serve the API with several workers.
+    """
+    parser = argparse.ArgumentParser(description="Run the VaibVoice API server")
+    parser.add_argument("--host", default=config.API_HOST, help="Host to bind the server to")
+    parser.add_argument("--port", type=int, default=config.API_PORT, help="Port to bind the server to")
+    parser.add_argument("--workers", type=int, default=config.API_WORKERS, help="Number of worker processes")
+    args = parser.parse_args()
+
+    if args.workers != config.API_WORKERS:
+        # Worker processes read API_WORKERS from the environment
+        os.environ["API_WORKERS"] = str(args.workers)
+        config.API_WORKERS = args.workers
+    run_api_server(args.host, args.port, args.workers)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Static file serving for the built GUI.
+Serves gui/dist from the API process with precompressed variants and cache headers.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+import vaibvoice.config as config
+from vaibvoice.api.compression import brotli, parse_accept_encoding
+
+# Vite emits content-hashed names such as assets/index-BwH3cD9k.js
+HASHED_ASSET = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[a-z0-9]+$")
+COMPRESSIBLE_EXTENSIONS = (".js", ".mjs", ".css", ".html", ".svg", ".json", ".map", ".txt", ".xml", ".ico", ".wasm")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+# Precompressed files by content coding, in order of preference
+PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+class StaticAsset(NamedTuple):
+    """
+    A file of the built GUI, indexed once at startup.
+    """
+    path: str
+    stat: os.stat_result
+    media_type: str
+    etag: str
+    cache_control: str
+    variants: Dict[str, Tuple[str, os.stat_result]]
+
+
+def precompress_assets(build_dir: str, min_size: int = None) -> int:
+    """
+    Write .gz (and .br when brotli is installed) files next to compressible
+    assets that lack an up-to-date variant. Existing variants from the build
+    are kept.
+
+    Args:
+        build_dir (str): Directory of the built GUI
+        min_size (int, optional): Smallest file size worth compressing
+
+    Returns:
+        int: Number of variant files written
+    """
+    min_size = min_size if min_size is not None else config.COMPRESSION_MIN_SIZE
+    written = 0
+    for root, _, files in os.walk(build_dir):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            if stat.st_size < min_size:
+                continue
+
+            data = None
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES:
+                if encoding == "br" and brotli is None:
+                    continue
+                target = path + suffix
+                if os.path.exists(target) and os.path.getmtime(target) >= stat.st_mtime:
+                    continue
+                if data is None:
+                    with open(path, "rb") as source:
+                        data = source.read()
+                if encoding == "br":
+                    compressed = brotli.compress(data, quality=11)
+                else:
+                    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+                tmp_path = target + ".tmp"
+                with open(tmp_path, "wb") as out:
+                    out.write(compressed)
+                os.replace(tmp_path, target)
+                written += 1
+    return written
+
+
+class SPAStaticFiles:
+    """
+    ASGI app serving a built single page application.
+
+    The build directory is indexed once, so requests are answered from a
+    dictionary lookup instead of filesystem checks. Content-hashed assets
+    are sent with immutable cache headers and, when the client accepts it,
+    as their precompressed .br or .gz variant. Any other path is answered
+    with index.html, which is held in memory, so client-side routes work
+    on reload.
+
+    Attributes:
+        build_dir (str): Directory of the built GUI
+    """
+
+    def __init__(self, build_dir: str):
+        """
+        Initialize the SPAStaticFiles app and index the build directory.
+
+        Args:
+            build_dir (str): Directory of the built GUI
+        """
+        self.build_dir = os.path.abspath(build_dir)
+        self._assets: Dict[str, StaticAsset] = {}
+        self._index_body = b""
+        self._index_etag = ""
+        self.reload()
+
+    def reload(self):
+        """
+        Re-index the build directory, e.g. after a new build.
+        """
+        assets = {}
+        for root, _, files in os.walk(self.build_dir):
+            for name in files:
+                if name.endswith((".br", ".gz", ".tmp")):
+                    continue
+                path = os.path.join(root, name)
+                url_path = os.path.relpath(path, self.build_dir).replace(os.sep, "/")
+                assets[url_path] = self._index_file(path, url_path)
+        self._assets = assets
+
+        index_path = os.path.join(self.build_dir, "index.html")
+        with open(index_path, "rb") as index:
+            self._index_body = index.read()
+        self._index_etag = '"' + hashlib.sha1(self._index_body).hexdigest()[:16] + '"'
+
+    @staticmethod
+    def _index_file(path: str, url_path: str) -> StaticAsset:
+        """
+        Build the index entry of one file.
+
+        Args:
+            path (str): Absolute path of the file
+            url_path (str): Path of the file relative to the build directory
+
+        Returns:
+            StaticAsset: The entry
+        """
+        stat = os.stat(path)
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        variants = {
+            encoding: (path + suffix, os.stat(path + suffix))
+            for encoding, suffix in PRECOMPRESSED_SUFFIXES
+            if os.path.exists(path + suffix)
+        }
+        return StaticAsset(
+            path=path,
+            stat=stat,
+            media_type=media_type,
+            etag=f'"{int(stat.st_mtime):x}-{stat.st_size:x}"',
+            cache_control=IMMUTABLE if HASHED_ASSET.match(url_path) else REVALIDATE,
+            variants=variants
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """
+        Serve a request for a GUI file.
+        """
+        if scope["type"] != "http":
+            return
+        if scope["method"] not in ("GET", "HEAD"):
+            await PlainTextResponse("Method Not Allowed", status_code=405)(scope, receive, send)
+            return
+
+        url_path = scope["path"].lstrip("/")
+        if url_path == "api" or url_path.startswith("api/"):
+            # Unknown API routes must not fall back to the SPA
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        headers = dict((key.decode("latin-1"), value.decode("latin-1")) for key, value in scope["headers"])
+        asset = self._assets.get(url_path) if url_path != "index.html" else None
+        if asset is None and url_path.startswith("assets/"):
+            # A stale hashed asset from a previous build; index.html would break the page
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+        response = self._asset_response(asset, headers) if asset else self._index_response(headers)
+        await response(scope, receive, send)
+
+    def _asset_response(self, asset: StaticAsset, headers: Dict[str, str]) -> Response:
+        """
+        Build the response for an indexed file, choosing a precompressed variant if accepted.
+
+        Args:
+            asset (StaticAsset): The file
+            headers (Dict[str, str]): Lower-cased request headers
+
+        Returns:
+            Response: The response
+        """
+        response_headers = {"Cache-Control": asset.cache_control}
+        if asset.variants:
+            response_headers["Vary"] = "Accept-Encoding"
+
+        encoding = self._choose_variant(asset, headers.get("accept-encoding"))
+        etag = asset.etag if encoding is None else asset.etag[:-1] + "-" + encoding + '"'
+        response_headers["ETag"] = etag
+        if headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=response_headers)
+
+        # Passing the indexed stat result spares FileResponse a stat() per request
+        if encoding is None:
+            return FileResponse(
+                asset.path, media_type=asset.media_type, headers=response_headers, stat_result=asset.stat
+            )
+        path, stat = asset.variants[encoding]
+        response_headers["Content-Encoding"] = encoding
+        return FileResponse(path, media_type=asset.media_type, headers=response_headers, stat_result=stat)
+
+    def _index_response(self, headers: Dict[str, str]) -> Response:
+        """
+        Build the response for index.html from memory.
+
+        Args:
+            headers (Dict[str, str]): Lower-cased request headers
+
+        Returns:
+            Response: The response
+        """
+        response_headers = {"Cache-Control": REVALIDATE, "ETag": self._index_etag}
+        if headers.get("if-none-match") == self._index_etag:
+            return Response(status_code=304, headers=response_headers)
+        return Response(self._index_body, media_type="text/html", headers=response_headers)
+
+    @staticmethod
+    def _choose_variant(asset: StaticAsset, accept_encoding: Optional[str]) -> Optional[str]:
+        """
+        Choose the best precompressed variant the client accepts.
+
+        Args:
+            asset (StaticAsset): The file
+            accept_encoding (str, optional): The request's Accept-Encoding header
+
+        Returns:
+            Optional[str]: The content coding, or None for the plain file
+        """
+        if not asset.variants:
+            return None
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        for encoding, _ in PRECOMPRESSED_SUFFIXES:
+            if encoding in asset.variants and accepted.get(encoding, wildcard) > 0:
+                return encoding
+        return None
@@ -0,0 +1,217 @@
+"""
+Command line tools for VaibVoice.
+Provides maintenance commands that operate on the history database.
+"""
+
+import argparse
+import os
+import sys
+
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+
+
+def _format_from_path(path: str, explicit: str = None) -> str:
+    """
+    Pick the history file format from an explicit option or the file extension.
+
+    Args:
+        path (str): File path
+        explicit (str, optional): Format given on the command line
+
+    Returns:
+        str: "ndjson" or "csv"
+    """
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def export_history(args: argparse.Namespace) -> int:
+    """
+    Export the transcription history to a file or stdout.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        int: Process exit code
+    """
+    from vaibvoice.services.history_io_service import HistoryIOService
+
+    export_format = _format_from_path(args.output or "", args.format)
+    service = HistoryIOService(TranscriptionRepository(args.db))
+
+    if args.output in (None, "-"):
+        out = sys.stdout.buffer
+        for chunk in service.export(export_format):
+            out.write(chunk)
+        out.flush()
+    else:
+        with open(args.output, "wb") as out:
+            for chunk in service.export(export_format):
+                out.write(chunk)
+        print(f"History exported to {args.output}", file=sys.stderr)
+    return 0
+
+
+def import_history(args: argparse.Namespace) -> int:
+    """
+    Import transcription history from an NDJSON or CSV file.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        int: Process exit code
+    """
+    from vaibvoice.services.history_io_service import HistoryImportError, HistoryIOService
+
+    if not os.path.isfile(args.input):
+        print(f"File not found: {args.input}", file=sys.stderr)
+        return 1
+
+    import_format = _format_from_path(args.input, args.format)
+    service = HistoryIOService(TranscriptionRepository(args.db))
+
+    def progress(total: int):
+        print(f"\rImported {total} rows...", end="", file=sys.stderr, flush=True)
+
+    try:
+        with open(args.input, "rb") as lines:
+            imported = service.import_lines(lines, import_format, batch_size=args.batch_size, progress=progress)
+    except HistoryImportError as e:
+        print(f"\rImport stopped: {str(e)}", file=sys.stderr)
+        return 1
+
+    print(f"\rImported {imported} rows, skipped {service.import_errors} invalid records.", file=sys.stderr)
+    return 0
+
+
+def export_columnar(args: argparse.Namespace) -> int:
+    """
+    Export the transcription history and audio metadata to Parquet or Arrow IPC.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        int: Process exit code
+    """
+    from vaibvoice.core.audio_store import AudioStore
+    from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+    from vaibvoice.services.columnar_export_service import ColumnarExportService
+
+    repository = TranscriptionRepository(args.db)
+    # Resolve recordings against this database's store, not the default one
+    store = AudioStore(repository=AudioBlobRepository(repository.db_path))
+    service = ColumnarExportService(repository, audio_store=store)
+    try:
+        result = service.export(
+            args.output,
+            export_format=args.format,
+            incremental=args.incremental,
+            batch_rows=args.batch_rows
+        )
+    except ImportError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+
+    if result["path"] is None:
+        print(f"No transcriptions newer than id {result['last_id']}. Nothing exported.", file=sys.stderr)
+    else:
+        print(f"Exported {result['rows']} rows to {result['path']} (watermark id {result['last_id']}).", file=sys.stderr)
+    if result["invalid_timestamps"]:
+        print(f"Warning: {result['invalid_timestamps']} row(s) had an invalid timestamp, exported as null.", file=sys.stderr)
+    return 0
+
+
+def migrate_audio(args: argparse.Namespace) -> int:
+    """
+    Move recordings referenced by legacy file paths into the audio store.
+
+    Args:
+        args (argparse.Namespace): Parsed arguments
+
+    Returns:
+        int: Process exit code
+    """
+    from vaibvoice.core.audio_store import AudioStore
+    from vaibvoice.db.repositories.archive_repository import ArchiveRepository
+    from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+
+    repository = TranscriptionRepository(args.db)
+    store = AudioStore(repository=AudioBlobRepository(repository.db_path))
+    try:
+        result = store.migrate_legacy([repository, ArchiveRepository(repository.db_path)])
+    finally:
+        store.close()
+
+    print(
+        f"Migrated {result['migrated']} recordings into {store.root}; "
+        f"{result['missing']} referenced files no longer exist.",
+        file=sys.stderr
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser for the command line tools.
+
+    Returns:
+        argparse.ArgumentParser: The configured parser
+    """
+    parser = argparse.ArgumentParser(prog="vaibvoice-admin", description="VaibVoice maintenance tools")
+    parser.add_argument("--db", default=None, help="Path to the history database (default: configured DB_PATH)")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    export_parser = subparsers.add_parser("export", help="Export transcription history")
+    export_parser.add_argument("output", nargs="?", help="Output file (default: stdout)")
+    export_parser.add_argument("--format", choices=("ndjson", "csv"), help="Output format (default: from extension)")
+    export_parser.set_defaults(func=export_history)
+
+    import_parser = subparsers.add_parser("import", help="Import transcription history")
+    import_parser.add_argument("input", help="NDJSON or CSV file to import")
+    import_parser.add_argument("--format", choices=("ndjson", "csv"), help="Input format (default: from extension)")
+    import_parser.add_argument("--batch-size", type=int, default=1000, help="Rows per transaction")
+    import_parser.set_defaults(func=import_history)
+
+    columnar_parser = subparsers.add_parser(
+        "export-columnar",
+        help="Export transcription history and audio metadata to Parquet or Arrow IPC"
+    )
+    columnar_parser.add_argument("output", help="Output file, or output directory with --incremental")
+    columnar_parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet", help="Output format")
+    columnar_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Write only rows newer than the last export to this directory as a new part file"
+    )
+    columnar_parser.add_argument("--batch-rows", type=int, default=10000, help="Rows per row group / record batch")
+    columnar_parser.set_defaults(func=export_columnar)
+
+    migrate_parser = subparsers.add_parser("migrate-audio", help="Move legacy recordings into the audio store")
+    migrate_parser.set_defaults(func=migrate_audio)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Entry point for the command line tools.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv
+
+    Returns:
+        int: Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
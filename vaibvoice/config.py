@@ -4,7 +4,6 @@ Centralizes configuration settings for the application.
 """
 
 import os
-import sqlite3
 from dotenv import load_dotenv
 
 # Determina la radice del progetto (indipendente dalla directory di lavoro corrente)
@@ -16,20 +15,71 @@ load_dotenv()
 # API Server Configuration
 API_HOST = os.getenv("API_HOST", "127.0.0.1")
 API_PORT = int(os.getenv("API_PORT", "5000"))
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))  # >1 runs worker processes that share state through the database
 
-# GUI Server Configuration
-GUI_HOST = os.getenv("GUI_HOST", "127.0.0.1")
-GUI_PORT = int(os.getenv("GUI_PORT", "8000"))
+# Response compression Configuration
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes; smaller bodies are sent as-is
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# GUI Configuration (the built GUI is served by the API server)
+GUI_DIST_DIR = os.path.join(PROJECT_ROOT, os.getenv("GUI_DIST_DIR", os.path.join("gui", "dist")))
 
 # Database Configuration
 DB_PATH = os.path.join(PROJECT_ROOT, os.getenv("DB_PATH", "transcription_history.db"))
+DB_WORKERS = int(os.getenv("DB_WORKERS", "4"))  # threads serving database calls for the API
+
+# History write-behind Configuration
+HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "32"))
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "1.0"))
+HISTORY_JOURNAL_PATH = os.path.join(PROJECT_ROOT, os.getenv("HISTORY_JOURNAL_PATH", "transcription_history.journal"))
+
+# Retention and maintenance Configuration
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "0"))  # 0 keeps all history in the hot table
+ARCHIVE_DB_PATH = os.path.join(PROJECT_ROOT, os.getenv("ARCHIVE_DB_PATH", "transcription_archive.db"))
+AUDIO_RETENTION_DAYS = int(os.getenv("AUDIO_RETENTION_DAYS", "0"))  # 0 keeps all recordings
+MAINTENANCE_INTERVAL = float(os.getenv("MAINTENANCE_INTERVAL", "3600"))  # seconds, 0 disables the scheduler
+
+# Transcription job queue Configuration
+TRANSCRIBE_WORKERS = int(os.getenv("TRANSCRIBE_WORKERS", "2"))  # jobs transcribed concurrently
+TRANSCRIBE_QUEUE_DEPTH = int(os.getenv("TRANSCRIBE_QUEUE_DEPTH", "32"))  # queued + running jobs before submissions are refused
+TRANSCRIBE_MAX_UPLOAD_MB = int(os.getenv("TRANSCRIBE_MAX_UPLOAD_MB", "25"))
+TRANSCRIBE_LEASE_SECONDS = float(os.getenv("TRANSCRIBE_LEASE_SECONDS", "60"))  # running jobs without a heartbeat for this long are requeued
+
+# Instrumentation Configuration
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")  # stage timings served at /metrics
+METRICS_EXPORT_INTERVAL = float(os.getenv("METRICS_EXPORT_INTERVAL", "15"))  # seconds; with API_WORKERS > 1, dictation metrics reach the workers this often
+DEBUG_TOKEN = os.getenv("DEBUG_TOKEN", None)  # enables /api/debug/profile for local clients presenting it; None disables
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))  # seconds between stack samples
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "0"))  # traceback depth for allocation tracing; 0 disables
+
+# Event stream Configuration
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "256"))  # recent events kept for Last-Event-ID resume
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))  # undelivered events before a subscriber is dropped
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))  # seconds between keep-alive comments
+EVENTS_POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL", "0.2"))  # seconds; with API_WORKERS > 1 only
 
 # Audio Configuration
-AUDIO_TEMP_DIR = os.getenv("AUDIO_TEMP_DIR", "audio_temp")
+AUDIO_TEMP_DIR = os.path.join(PROJECT_ROOT, os.getenv("AUDIO_TEMP_DIR", "audio_temp"))
+AUDIO_STORE_DIR = os.path.join(PROJECT_ROOT, os.getenv("AUDIO_STORE_DIR", "audio_store"))
+AUDIO_STORE_QUOTA_MB = int(os.getenv("AUDIO_STORE_QUOTA_MB", "2048"))  # 0 disables eviction
+AUDIO_STORE_FORMAT = os.getenv("AUDIO_STORE_FORMAT", "flac")  # "wav" keeps recordings uncompressed
+PEAKS_CACHE_DIR = os.path.join(PROJECT_ROOT, os.getenv("PEAKS_CACHE_DIR", "peaks_cache"))  # waveform peaks per recording
+PEAKS_SAMPLES_PER_PEAK = int(os.getenv("PEAKS_SAMPLES_PER_PEAK", "256"))  # audio frames per peak at the finest resolution
+TRANSCODE_CACHE_DIR = os.path.join(PROJECT_ROOT, os.getenv("TRANSCODE_CACHE_DIR", "transcode_cache"))  # Opus copies for streaming
+TRANSCODE_CACHE_MB = int(os.getenv("TRANSCODE_CACHE_MB", "512"))  # least recently used copies are deleted past this
+SIMILARITY_INDEX_PATH = os.path.join(PROJECT_ROOT, os.getenv("SIMILARITY_INDEX_PATH", "similarity.idx"))  # TF-IDF index of the DB_PATH texts; other databases keep theirs next to them
+SIMILARITY_FEATURES = int(os.getenv("SIMILARITY_FEATURES", "262144"))  # hashed features; changing it rebuilds the index
 SAMPLE_RATE = int(os.getenv("SAMPLE_RATE", "44100"))
 CHANNELS = int(os.getenv("CHANNELS", "1"))
 
-# Default values for user-configurable settings
+# OpenAI API Configuration
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", None)  # OpenAI-compatible endpoint, None for api.openai.com
+
+# Default values for user-configurable settings.
+# The live values are stored in the database and served by SettingsService.
+SETTINGS_POLL_INTERVAL = float(os.getenv("SETTINGS_POLL_INTERVAL", "1.0"))  # seconds between checks for changes by other processes
 START_SOUND = os.getenv("START_SOUND", "beep.mp3")
 END_SOUND = os.getenv("END_SOUND", "stop.mp3")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", None)
@@ -37,32 +87,3 @@ TRANSCRIPTION_LANGUAGE = os.getenv("TRANSCRIPTION_LANGUAGE", None)
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "gpt-4o-transcribe")
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
 RECORD_KEY = os.getenv("RECORD_KEY", "ctrl")
-
-# Try to load user-configurable settings from the database
-try:
-    # Check if the settings table exists
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='settings'")
-    table_exists = cursor.fetchone() is not None
-
-    if table_exists:
-        # Load settings from the database
-        cursor.execute("SELECT * FROM settings WHERE id = 1")
-        row = cursor.fetchone()
-
-        if row:
-            # Update settings from the database
-            RECORD_KEY = row[1]
-            OPENAI_API_KEY = row[2]
-            WHISPER_MODEL = row[3]
-            TRANSCRIPTION_LANGUAGE = row[4]
-            LLM_MODEL = row[5]
-            START_SOUND = row[6]
-            END_SOUND = row[7]
-
-    conn.close()
-except Exception as e:
-    # If there's an error loading from the database, use the values from .env
-    print(f"Error loading settings from database: {str(e)}")
-    print("Using settings from .env file instead.")
@@ -0,0 +1,404 @@
+"""
+Core functionality for storing recordings.
+Provides a content-addressed, compressed audio store with quota-based eviction.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import vaibvoice.config as config
+from vaibvoice.db.repositories.audio_blob_repository import AudioBlobRepository
+
+STORE_PREFIX = "store:"
+
+
+def derived_path(cache_dir: str, key: str, extension: str) -> str:
+    """
+    Get the path of a file derived from a recording, such as its peaks or an Opus copy.
+
+    Args:
+        cache_dir (str): Directory of the derived files
+        key (str): Content key of the recording, see AudioStore.content_key
+        extension (str): File extension of the derived file
+
+    Returns:
+        str: Path of the derived file
+    """
+    return os.path.join(cache_dir, key[:2], f"{key}.{extension}")
+
+
+def is_store_ref(audio_path: str) -> bool:
+    """
+    Check whether an audio path is a reference into the audio store.
+
+    Args:
+        audio_path (str): Value of transcriptions.audio_path
+
+    Returns:
+        bool: True for "store:<sha256>" references
+    """
+    return bool(audio_path) and audio_path.startswith(STORE_PREFIX)
+
+
+class AudioStore:
+    """
+    Content-addressed store for recordings.
+
+    Recordings are named by the SHA-256 of their original WAV content and sharded
+    into two directory levels (ab/cd/abcd....flac). Identical recordings are stored
+    once. New blobs are compressed to FLAC on a background thread, and when the
+    store grows past its quota the least recently accessed blobs are deleted.
+    Transcriptions keep referencing evicted blobs; resolving them returns None.
+    Files derived from a recording (see derived_path) are deleted with it.
+
+    Transcriptions reference blobs as "store:<sha256>". Resolving a reference
+    is read-only unless asked to count it as an access, and such touches are
+    written at most once per TOUCH_INTERVAL per blob.
+
+    Attributes:
+        root (str): Root directory of the store
+        quota_bytes (int): Maximum size of the blobs on disk (0 disables eviction)
+        compress_format (str): Format blobs are compressed to ("flac" or "wav")
+        repository (AudioBlobRepository): Repository tracking the blobs
+        derived_caches (Tuple[Tuple[str, str], ...]): (directory, extension) of the
+            caches of files derived from recordings
+    """
+
+    TOUCH_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        root: str = None,
+        quota_mb: int = None,
+        compress_format: str = None,
+        repository: Optional[AudioBlobRepository] = None,
+        derived_caches: Optional[Sequence[Tuple[str, str]]] = None
+    ):
+        """
+        Initialize the AudioStore.
+
+        Args:
+            root (str, optional): Root directory of the store
+            quota_mb (int, optional): Maximum size of the blobs on disk in MB
+            compress_format (str, optional): Format blobs are compressed to
+            repository (AudioBlobRepository, optional): Repository tracking the blobs
+            derived_caches (Sequence[Tuple[str, str]], optional): (directory, extension) of the
+                caches of files derived from recordings; the peaks and Opus caches by default
+        """
+        self.root = root if root is not None else config.AUDIO_STORE_DIR
+        quota_mb = quota_mb if quota_mb is not None else config.AUDIO_STORE_QUOTA_MB
+        self.quota_bytes = quota_mb * 1024 * 1024
+        self.compress_format = compress_format if compress_format is not None else config.AUDIO_STORE_FORMAT
+        self.repository = repository or AudioBlobRepository()
+        if derived_caches is None:
+            derived_caches = ((config.PEAKS_CACHE_DIR, "peaks"), (config.TRANSCODE_CACHE_DIR, "opus"))
+        self.derived_caches = tuple(derived_caches)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vaibvoice-audio-store")
+        # Held while blob files and their rows change together: ingest, the
+        # compressed file swap and eviction
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+
+    def blob_path(self, blob_hash: str, blob_format: str) -> str:
+        """
+        Get the sharded path of a blob.
+
+        Args:
+            blob_hash (str): SHA-256 hex digest of the recording
+            blob_format (str): File extension of the blob
+
+        Returns:
+            str: Path of the blob file
+        """
+        return os.path.join(self.root, blob_hash[:2], blob_hash[2:4], f"{blob_hash}.{blob_format}")
+
+    def ingest(
+        self,
+        wav_path: str,
+        compress: bool = True,
+        before_move: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """
+        Move a WAV recording into the store.
+
+        Args:
+            wav_path (str): Path to the WAV file; it is moved into the store
+            compress (bool): Schedule background compression of the new blob
+            before_move (Callable[[str], None], optional): Called with the reference once the
+                file is hashed and before it is moved, e.g. to journal it; if it raises,
+                the file is left in place
+
+        Returns:
+            Optional[str]: The "store:<sha256>" reference, or None if the file could not be stored
+        """
+        try:
+            blob_hash = self._hash_file(wav_path)
+            if before_move is not None:
+                before_move(STORE_PREFIX + blob_hash)
+            with self._lock:
+                existing = self.repository.get(blob_hash)
+                if existing and not existing[2] and os.path.exists(self.blob_path(blob_hash, existing[0])):
+                    # Same recording already stored: keep one copy
+                    os.remove(wav_path)
+                    self.repository.touch(blob_hash)
+                    return STORE_PREFIX + blob_hash
+
+                dest = self.blob_path(blob_hash, "wav")
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                shutil.move(wav_path, dest)
+                self.repository.upsert(blob_hash, "wav", os.path.getsize(dest))
+
+            if compress and self.compress_format != "wav":
+                self._executor.submit(self._compress_and_evict, blob_hash)
+            else:
+                self._executor.submit(self.enforce_quota)
+            return STORE_PREFIX + blob_hash
+        except Exception as e:
+            print(f"Error storing recording: {str(e)}")
+            return None
+
+    def resolve(self, audio_path: str, touch: bool = False) -> Optional[str]:
+        """
+        Resolve an audio path to a file on disk.
+        Store references are looked up in the store; legacy paths are returned
+        if the file still exists.
+
+        Args:
+            audio_path (str): Value of transcriptions.audio_path
+            touch (bool): Count this as an access for LRU eviction; written at most
+                once per TOUCH_INTERVAL per blob
+
+        Returns:
+            Optional[str]: Path of the audio file, or None if it is missing or evicted
+        """
+        if not is_store_ref(audio_path):
+            return audio_path if audio_path and os.path.isfile(audio_path) else None
+
+        blob_hash = audio_path[len(STORE_PREFIX):]
+        blob = self.repository.get(blob_hash)
+        if blob is None or blob[2]:
+            return None
+
+        # The compressor writes the new file before the row changes and removes
+        # the old one after, so fall back to the other format during the swap
+        for blob_format in (blob[0], "wav", self.compress_format):
+            path = self.blob_path(blob_hash, blob_format)
+            if os.path.isfile(path):
+                if touch:
+                    self._touch(blob_hash)
+                return path
+        return None
+
+    def content_key(self, audio_path: str, path: str) -> str:
+        """
+        Get a key identifying the content of a resolved recording, for naming derived files.
+
+        Args:
+            audio_path (str): Value of transcriptions.audio_path
+            path (str): Path the audio path resolved to
+
+        Returns:
+            str: The blob hash for store references; for legacy files, a hash of
+                path, size and modification time, so it changes when the file is replaced
+        """
+        if is_store_ref(audio_path):
+            # Blobs are immutable: recompressing keeps the content and the hash
+            return audio_path[len(STORE_PREFIX):]
+        stat = os.stat(path)
+        identity = f"{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    def enforce_quota(self) -> Dict[str, int]:
+        """
+        Delete least recently accessed blobs until the store fits its quota.
+
+        Returns:
+            Dict[str, int]: {"evicted_blobs", "bytes_reclaimed"}
+        """
+        evicted = 0
+        reclaimed = 0
+        if self.quota_bytes <= 0:
+            return {"evicted_blobs": 0, "bytes_reclaimed": 0}
+
+        with self._lock:
+            excess = self.repository.total_size() - self.quota_bytes
+            while excess > 0:
+                candidates = self.repository.least_recently_used()
+                if not candidates:
+                    break
+                for blob_hash, blob_format, size in candidates:
+                    path = self.blob_path(blob_hash, blob_format)
+                    if os.path.exists(path):
+                        os.remove(path)
+                    self.repository.mark_evicted(blob_hash)
+                    self.remove_derived(blob_hash)
+                    evicted += 1
+                    reclaimed += size
+                    excess -= size
+                    if excess <= 0:
+                        break
+
+        return {"evicted_blobs": evicted, "bytes_reclaimed": reclaimed}
+
+    def migrate_legacy(self, repositories) -> Dict[str, int]:
+        """
+        Move recordings referenced by legacy file paths into the store and
+        rewrite the referencing rows.
+
+        Args:
+            repositories (list): Repositories providing get_legacy_audio_paths()
+                and replace_audio_path(old, new)
+
+        Returns:
+            Dict[str, int]: {"migrated", "missing"} file counts
+        """
+        migrated = 0
+        missing = 0
+        for repository in repositories:
+            for audio_path in repository.get_legacy_audio_paths():
+                source = self.find_legacy_file(audio_path)
+                if source is None:
+                    missing += 1
+                    continue
+                legacy_key = self.content_key(source, source)
+                ref = self.ingest(source)
+                if ref is not None:
+                    repository.replace_audio_path(audio_path, ref)
+                    self.remove_derived(legacy_key)
+                    migrated += 1
+        return {"migrated": migrated, "missing": missing}
+
+    def remove_derived(self, key: str) -> int:
+        """
+        Delete the files derived from a recording.
+
+        Args:
+            key (str): Content key of the recording, see content_key
+
+        Returns:
+            int: Number of files deleted
+        """
+        removed = 0
+        for cache_dir, extension in self.derived_caches:
+            try:
+                os.remove(derived_path(cache_dir, key, extension))
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error removing cached {extension} file: {str(e)}")
+        return removed
+
+    def close(self):
+        """
+        Wait for pending compression work and stop the background thread.
+        """
+        self._executor.shutdown(wait=True)
+
+    def _compress_and_evict(self, blob_hash: str):
+        """
+        Compress a stored WAV blob and enforce the quota afterwards.
+        Encoding runs without the lock; the compressed file only replaces the
+        WAV if the blob was not evicted meanwhile.
+
+        Args:
+            blob_hash (str): SHA-256 hex digest of the recording
+        """
+        tmp_path = None
+        try:
+            import soundfile as sf
+
+            wav_path = self.blob_path(blob_hash, "wav")
+            if os.path.exists(wav_path):
+                dest = self.blob_path(blob_hash, self.compress_format)
+                tmp_path = dest + ".tmp"
+                data, samplerate = sf.read(wav_path, dtype="int16")
+                sf.write(tmp_path, data, samplerate, format=self.compress_format.upper())
+                with self._lock:
+                    blob = self.repository.get(blob_hash)
+                    if blob is not None and not blob[2] and blob[0] == "wav" and os.path.exists(wav_path):
+                        os.replace(tmp_path, dest)
+                        self.repository.upsert(blob_hash, self.compress_format, os.path.getsize(dest))
+                        os.remove(wav_path)
+        except Exception as e:
+            print(f"Error compressing recording {blob_hash}: {str(e)}")
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.enforce_quota()
+
+    def _touch(self, blob_hash: str):
+        """
+        Record an access to a blob, skipping the write if it was recorded recently.
+
+        Args:
+            blob_hash (str): SHA-256 hex digest of the recording
+        """
+        now = time.monotonic()
+        last = self._touched.get(blob_hash)
+        if last is not None and now - last < self.TOUCH_INTERVAL:
+            return
+        self._touched[blob_hash] = now
+        if len(self._touched) > 10000:
+            # Forget old entries so the map stays bounded
+            cutoff = now - self.TOUCH_INTERVAL
+            self._touched = {h: t for h, t in self._touched.items() if t >= cutoff}
+        self.repository.touch(blob_hash)
+
+    def find_legacy_file(self, audio_path: str) -> Optional[str]:
+        """
+        Locate a legacy recording, which may be relative to the old working directory.
+
+        Args:
+            audio_path (str): Legacy audio path
+
+        Returns:
+            Optional[str]: Existing file path, or None
+        """
+        candidates = [audio_path]
+        if not os.path.isabs(audio_path):
+            candidates.append(os.path.join(config.PROJECT_ROOT, audio_path))
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        """
+        Compute the SHA-256 of a file.
+
+        Args:
+            path (str): File to hash
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_audio_store() -> AudioStore:
+    """
+    Get the process-wide audio store.
+
+    Returns:
+        AudioStore: The shared audio store
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AudioStore()
+        return _store
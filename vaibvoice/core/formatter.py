@@ -3,10 +3,11 @@ Core functionality for formatting transcriptions.
 Provides functions for formatting transcriptions using the OpenAI API.
 """
 
-import openai
 from typing import Optional
 
-import vaibvoice.config as config
+from vaibvoice.core.openai_client import get_openai_client
+from vaibvoice.services.settings_service import get_settings_service
+from vaibvoice.utils.metrics import current_trace, get_metrics
 
 def format_transcription(text: str) -> str:
     """
@@ -19,9 +20,6 @@ def format_transcription(text: str) -> str:
     Returns:
         str: The formatted transcription text
     """
-    # Set up OpenAI API key
-    openai.api_key = config.OPENAI_API_KEY
-
     # If the text is empty, return it as is
     if not text.strip():
         return text
@@ -45,16 +43,24 @@ def format_transcription(text: str) -> str:
         Formatted version:
         """
 
+        llm_model = get_settings_service().current().llm_model
+
         # Call the OpenAI API
-        response = openai.chat.completions.create(
-            model=config.LLM_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that formats text appropriately based on its content and any formatting instructions provided. Always use plain text only, never use markdown or any special formatting characters. Only use line breaks where appropriate."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0,
-            max_tokens=12000
-        )
+        with get_metrics().span("format"):
+            response = get_openai_client().chat.completions.create(
+                model=llm_model,
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant that formats text appropriately based on its content and any formatting instructions provided. Always use plain text only, never use markdown or any special formatting characters. Only use line breaks where appropriate."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0,
+                max_tokens=12000
+            )
+
+        trace = current_trace()
+        if trace is not None:
+            trace.llm_model = llm_model
+            trace.add_usage("format", getattr(response, "usage", None))
 
         # Extract the formatted text from the response
         formatted_text = response.choices[0].message.content.strip()
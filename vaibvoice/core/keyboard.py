@@ -8,40 +8,64 @@ import time
 import platform
 from pynput import keyboard
 
+from vaibvoice.core.audio_store import get_audio_store
 from vaibvoice.core.recorder import AudioRecorder
 from vaibvoice.core.transcriber import transcribe_audio
+from vaibvoice.db.write_behind import get_history_writer
+from vaibvoice.services.settings_service import SettingsSnapshot, get_settings_service
 from vaibvoice.services.transcription_service import TranscriptionService
-import vaibvoice.config as config
+from vaibvoice.models.trace import DictationTrace
+from vaibvoice.utils.metrics import activate_trace, get_metrics
 
 def key_recording():
     """
     Record audio when a specific key is pressed and transcribe when released.
-    Uses Ctrl key by default, but can be configured in the .env file.
+    Uses Ctrl key by default, but can be configured in the settings.
+    The key is rebound when the setting changes.
     """
     recorder = AudioRecorder()
-    service = TranscriptionService()
+    audio_store = get_audio_store()
+    writer = get_history_writer()
+    service = TranscriptionService(writer=writer)
+    settings_service = get_settings_service()
+    metrics = get_metrics()
     recording_in_progress = False
+    trace = None
+    RECORD_KEY_OBJ = None
+    record_key_name = None
 
-    # Determine the key to use for recording based on configuration
-    if config.RECORD_KEY.lower() == "ctrl":
-        RECORD_KEY_OBJ = keyboard.Key.ctrl
-        print("\nUsing Ctrl key for recording.")
-    else:
-        # Try to use the specified key, fallback to Ctrl if not valid
-        try:
-            RECORD_KEY_OBJ = getattr(keyboard.Key, config.RECORD_KEY.lower())
-        except AttributeError:
+    def bind_record_key(settings: SettingsSnapshot):
+        """Determine the key to use for recording based on the settings."""
+        nonlocal RECORD_KEY_OBJ, record_key_name
+        if settings.record_key.lower() == record_key_name:
+            return
+        record_key_name = settings.record_key.lower()
+        if record_key_name == "ctrl":
             RECORD_KEY_OBJ = keyboard.Key.ctrl
-            print(f"\nInvalid key '{config.RECORD_KEY}'. Using Ctrl key for recording.")
+            print("\nUsing Ctrl key for recording.")
+        else:
+            # Try to use the specified key, fallback to Ctrl if not valid
+            try:
+                RECORD_KEY_OBJ = getattr(keyboard.Key, record_key_name)
+                print(f"\nUsing {settings.record_key} key for recording.")
+            except AttributeError:
+                RECORD_KEY_OBJ = keyboard.Key.ctrl
+                print(f"\nInvalid key '{settings.record_key}'. Using Ctrl key for recording.")
+
+    bind_record_key(settings_service.current())
+    settings_service.subscribe(bind_record_key)
 
     def on_press(key):
-        nonlocal recording_in_progress
+        nonlocal recording_in_progress, trace
         try:
             if key == RECORD_KEY_OBJ:
                 if not recording_in_progress:
                     recording_in_progress = True
                     print("\nRecording key pressed. Starting recording...")
-                    recorder.start_recording()
+                    # Each dictation gets a timing breakdown stored with its transcription
+                    trace = DictationTrace()
+                    with activate_trace(trace):
+                        recorder.start_recording()
         except AttributeError:
             pass
 
@@ -52,20 +76,25 @@ def key_recording():
                 if recording_in_progress:
                     recording_in_progress = False
                     print("\nRecording key released. Stopping recording...")
-                    audio_path, duration = recorder.stop_recording()
+                    with activate_trace(trace):
+                        # Time from key release until the dictation is typed
+                        with metrics.span("dictation"):
+                            with metrics.span("stop_recording"):
+                                audio_path, duration = recorder.stop_recording()
 
-                    if not audio_path:
-                        print("No audio was recorded.")
-                        return
+                            if not audio_path:
+                                print("No audio was recorded.")
+                                return
 
-                    print("\nTranscribing audio and typing directly...")
-                    transcription = transcribe_audio(audio_path, type_directly=True)
+                            print("\nTranscribing audio and typing directly...")
+                            transcription = transcribe_audio(audio_path, type_directly=True)
 
-                    print("\nTranscription:")
-                    print(transcription)
+                        print("\nTranscription:")
+                        print(transcription)
 
-                    # Save the transcription to history
-                    if service.add_transcription(audio_path, transcription, duration):
+                    # Save the transcription to history; the history writer moves
+                    # the recording into the audio store off this listener thread
+                    if service.add_transcription(audio_path, transcription, duration, trace=trace, ingest_audio=True):
                         print("Transcription saved to history.")
                     else:
                         print("Failed to save transcription to history.")
@@ -77,7 +106,7 @@ def key_recording():
     listener.start()
 
     print("\nVaibVoice is running.")
-    print(f"Press and hold the {config.RECORD_KEY} key to record, release to transcribe.")
+    print(f"Press and hold the {settings_service.current().record_key} key to record, release to transcribe.")
     print("The transcription will be automatically saved to history.")
     print("The text will be typed into the currently selected input box.")
     print("Press Ctrl+C to exit.")
@@ -89,4 +118,6 @@ def key_recording():
     except KeyboardInterrupt:
         print("\nExiting VaibVoice. Goodbye!")
         listener.stop()
+        writer.close()
+        audio_store.close()
         sys.exit(0)
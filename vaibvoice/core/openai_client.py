@@ -0,0 +1,57 @@
+"""
+Core functionality for accessing the OpenAI API.
+Provides a shared client that is rebuilt when the API key changes.
+"""
+
+import threading
+from typing import TYPE_CHECKING
+
+import vaibvoice.config as config
+from vaibvoice.services.settings_service import SettingsSnapshot, get_settings_service
+
+if TYPE_CHECKING:
+    import openai
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+_subscribed = False
+
+
+def _on_settings_changed(snapshot: SettingsSnapshot):
+    """
+    Drop the cached client when the API key changes.
+
+    Args:
+        snapshot (SettingsSnapshot): The new settings
+    """
+    global _client
+    with _client_lock:
+        if snapshot.openai_api_key != _client_key:
+            _client = None
+
+
+def get_openai_client() -> "openai.OpenAI":
+    """
+    Get the shared OpenAI client for the current API key.
+    The client keeps its HTTP connection pool between dictations.
+    The openai package is imported on first use, as it is slow to import.
+
+    Returns:
+        openai.OpenAI: The client
+    """
+    global _client, _client_key, _subscribed
+    settings_service = get_settings_service()
+    with _client_lock:
+        if not _subscribed:
+            settings_service.subscribe(_on_settings_changed)
+            _subscribed = True
+
+    api_key = settings_service.current().openai_api_key
+    with _client_lock:
+        if _client is None or api_key != _client_key:
+            import openai
+
+            _client = openai.OpenAI(api_key=api_key, base_url=config.OPENAI_BASE_URL)
+            _client_key = api_key
+        return _client
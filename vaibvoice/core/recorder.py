@@ -5,22 +5,61 @@ Provides classes for recording audio from the microphone.
 
 import os
 import time
+import uuid
 import datetime
-import sounddevice as sd
+import functools
+import queue
 import soundfile as sf
 import numpy as np
 from typing import Tuple, Optional
 import threading
 
 import vaibvoice.config as config
+from vaibvoice.services.settings_service import SettingsSnapshot, get_settings_service
+from vaibvoice.utils.metrics import get_metrics
+
+# Sound cues are played one after another by a single long-lived thread
+_cue_queue = queue.Queue(maxsize=4)
+_cue_thread = None
+_cue_thread_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=8)
+def _load_sound(sound_file: str, modified: float) -> Tuple[np.ndarray, int]:
+    """
+    Decode a sound file, caching the result until the file changes.
+
+    Args:
+        sound_file (str): Path to the sound file
+        modified (float): Modification time of the file, part of the cache key
+
+    Returns:
+        Tuple[np.ndarray, int]: The samples and the sample rate
+    """
+    return sf.read(sound_file)
+
+def _play_cues():
+    """
+    Play queued sound cues; runs on the sound cue thread.
+    """
+    import sounddevice as sd
+
+    while True:
+        data, samplerate = _cue_queue.get()
+        try:
+            sd.play(data, samplerate)
+            sd.wait()
+        except Exception as e:
+            print(f"Error playing sound: {str(e)}")
 
 def play_sound(sound_file: str):
     """
-    Play a sound file.
+    Play a sound file without blocking.
+    Cues are dropped if several are already waiting to be played.
 
     Args:
         sound_file (str): Path to the sound file
     """
+    global _cue_thread
     if not sound_file or sound_file == "none":
         return
 
@@ -35,17 +74,15 @@ def play_sound(sound_file: str):
                 return
 
         # Load the sound file
-        data, samplerate = sf.read(sound_file)
-
-        # Play the sound in a separate thread to avoid blocking
-        def _play():
-            try:
-                sd.play(data, samplerate)
-                sd.wait()
-            except Exception as e:
-                print(f"Error playing sound: {str(e)}")
-
-        threading.Thread(target=_play).start()
+        data, samplerate = _load_sound(sound_file, os.path.getmtime(sound_file))
+
+        with _cue_thread_lock:
+            if _cue_thread is None:
+                _cue_thread = threading.Thread(target=_play_cues, name="sound-cues", daemon=True)
+                _cue_thread.start()
+        _cue_queue.put_nowait((data, samplerate))
+    except queue.Full:
+        pass
     except Exception as e:
         print(f"Error playing sound: {str(e)}")
 
@@ -58,6 +95,8 @@ class AudioRecorder:
         channels (int): Number of audio channels
         recording (bool): Flag indicating if recording is in progress
         frames (list): List to store recorded audio frames
+        start_sound (str): Sound played when recording starts
+        end_sound (str): Sound played when recording ends
     """
 
     def __init__(self, sample_rate: int = None, channels: int = None):
@@ -72,10 +111,44 @@ class AudioRecorder:
         self.channels = channels if channels is not None else config.CHANNELS
         self.recording = False
         self.frames = []
+        self.stream = None
+        self.metrics = get_metrics()
+
+        # Follow the sound settings as they change
+        settings_service = get_settings_service()
+        self.reconfigure(settings_service.current())
+        settings_service.subscribe(self.reconfigure)
 
         # Ensure audio_temp directory exists
         os.makedirs(config.AUDIO_TEMP_DIR, exist_ok=True)
 
+    def reconfigure(self, settings: SettingsSnapshot):
+        """
+        Apply new settings to the recorder.
+
+        Args:
+            settings (SettingsSnapshot): The new settings
+        """
+        self.start_sound = settings.start_sound
+        self.end_sound = settings.end_sound
+
+    def _on_audio(self, indata: np.ndarray, frames: int, time_info, status):
+        """
+        Callback of the input stream: keep a copy of each captured block.
+        Runs on the audio thread, so it must stay cheap.
+
+        Args:
+            indata (np.ndarray): The captured block
+            frames (int): Number of frames in the block
+            time_info: Timestamps of the block
+            status (sounddevice.CallbackFlags): Over- and underflow flags
+        """
+        if status:
+            print(f"Stream status: {status}")
+            self.metrics.count("input_overflow" if status.input_overflow else "input_status")
+        if self.recording:
+            self.frames.append(indata.copy())
+
     def start_recording(self) -> bool:
         """
         Start recording audio from the microphone.
@@ -92,23 +165,19 @@ class AudioRecorder:
             self.recording = True
             self.start_time = time.time()
 
-            def callback(indata, frames, time, status):
-                """Callback function for the InputStream."""
-                if status:
-                    print(f"Stream status: {status}")
-                if self.recording:
-                    self.frames.append(indata.copy())
-
             # Start the input stream
-            self.stream = sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                callback=callback
-            )
-            self.stream.start()
+            with self.metrics.span("stream_open"):
+                import sounddevice as sd
+
+                self.stream = sd.InputStream(
+                    samplerate=self.sample_rate,
+                    channels=self.channels,
+                    callback=self._on_audio
+                )
+                self.stream.start()
 
             # Play the start sound
-            play_sound(config.START_SOUND)
+            play_sound(self.start_sound)
 
             print("Recording started...")
             return True
@@ -141,31 +210,49 @@ class AudioRecorder:
         try:
             # Stop recording
             self.recording = False
-            self.stream.stop()
-            self.stream.close()
+            with self.metrics.span("stream_close"):
+                self.stream.stop()
+                self.stream.close()
             duration = time.time() - self.start_time
+            self.metrics.observe("capture", duration)
 
             # Check if any frames were recorded
             if not self.frames:
                 print("No audio data was recorded.")
                 return None, 0
 
-            # Concatenate all recorded frames
-            audio_data = np.concatenate(self.frames, axis=0)
-
-            # Generate a filename with timestamp
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            file_path = os.path.join(config.AUDIO_TEMP_DIR, f"recording_{timestamp}.wav")
-
-            # Save the audio data to a WAV file
-            sf.write(file_path, audio_data, self.sample_rate)
+            file_path = self.save_recording()
             print(f"Recording saved to {file_path}")
 
             # Play the end sound
-            play_sound(config.END_SOUND)
+            play_sound(self.end_sound)
 
             return file_path, duration
 
         except Exception as e:
             print(f"Error stopping recording: {str(e)}")
             return None, 0
+        finally:
+            # Release the captured audio and the stream now rather than at the next recording
+            self.frames = []
+            self.stream = None
+
+    def save_recording(self) -> str:
+        """
+        Write the captured frames to a new WAV file in the audio temp directory.
+
+        Returns:
+            str: Path to the WAV file
+        """
+        # Concatenate all recorded frames
+        with self.metrics.span("concatenate"):
+            audio_data = np.concatenate(self.frames, axis=0)
+
+        # Generate a unique filename so recordings within the same second don't collide
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = os.path.join(config.AUDIO_TEMP_DIR, f"recording_{timestamp}_{uuid.uuid4().hex[:8]}.wav")
+
+        # Save the audio data to a WAV file
+        with self.metrics.span("file_write"):
+            sf.write(file_path, audio_data, self.sample_rate)
+        return file_path
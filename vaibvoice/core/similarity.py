@@ -0,0 +1,357 @@
+"""
+Core functionality for finding similar transcriptions.
+Provides a hashed TF-IDF index of texts with top-k cosine similarity queries.
+
+Texts are split into lowercase words and word pairs, which are hashed into a
+fixed number of features, so the index needs no vocabulary. Term
+frequencies are sublinear (1 + log tf) and weighted by smoothed IDF.
+
+Rows live in two segments. The base segment is an inverted index (the rows
+holding each feature, with their term frequencies) stored in one file and
+memory-mapped on load; a query only reads the postings of its own features.
+New rows go to an in-memory delta segment that is scanned in full, until
+compact() merges it into the base and recomputes the IDF weights.
+"""
+
+import os
+import re
+import struct
+import tempfile
+import zlib
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"VVSI"
+FORMAT_VERSION = 1
+
+# magic, version, features, rows, postings, max indexed id
+_HEADER = struct.Struct("<4sHIQQQ")
+
+_WORD = re.compile(r"\w+")
+
+
+def hash_features(text: str, dims: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turn a text into hashed features with sublinear term frequencies.
+
+    Args:
+        text (str): The text
+        dims (int): Number of features
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Sorted unique features (int32) and their term frequencies (float32)
+    """
+    words = _WORD.findall(text.lower())
+    tokens = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    if not tokens:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+    hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens), dtype=np.int64, count=len(tokens))
+    features, counts = np.unique(hashes % dims, return_counts=True)
+    return features.astype(np.int32), (1 + np.log(counts)).astype(np.float32)
+
+
+def idf_weights(df: np.ndarray, docs: int) -> np.ndarray:
+    """
+    Compute smoothed inverse document frequencies.
+
+    Args:
+        df (np.ndarray): Number of rows holding each feature
+        docs (int): Number of rows
+
+    Returns:
+        np.ndarray: float32 weights
+    """
+    return (np.log((1 + docs) / (1 + df.astype(np.float64))) + 1).astype(np.float32)
+
+
+def _aligned(offset: int) -> int:
+    """Round a file offset up to a multiple of 8, so arrays are aligned when mapped."""
+    return (offset + 7) & ~7
+
+
+class SimilarityIndex:
+    """
+    Hashed TF-IDF index of texts, keyed by row id.
+
+    Attributes:
+        dims (int): Number of hashed features
+        max_id (int): Highest row id added, including rows without any words
+    """
+
+    def __init__(self, dims: int):
+        """
+        Initialize an empty SimilarityIndex.
+
+        Args:
+            dims (int): Number of hashed features
+        """
+        self.dims = dims
+        self.max_id = 0
+        self._set_base(
+            np.zeros(0, dtype=np.int64),
+            np.zeros(dims + 1, dtype=np.int64),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.float32)
+        )
+        self._reset_delta()
+
+    @property
+    def base_rows(self) -> int:
+        """Number of rows in the base segment."""
+        return len(self._base_ids)
+
+    @property
+    def delta_rows(self) -> int:
+        """Number of rows added since the last compaction."""
+        return len(self._delta_ids)
+
+    def add(self, row_id: int, text: str) -> bool:
+        """
+        Add a row to the delta segment.
+
+        Args:
+            row_id (int): Id of the row; ids must be added in increasing order
+            text (str): Text of the row
+
+        Returns:
+            bool: False if the text has no words and was not indexed
+        """
+        self.max_id = max(self.max_id, row_id)
+        features, tf = hash_features(text or "", self.dims)
+        if not len(features):
+            return False
+        self._delta_ids.append(row_id)
+        self._delta_features.append(features)
+        self._delta_tf.append(tf)
+        self._delta_df[features] += 1
+        self._delta_arrays = None
+        return True
+
+    def query(self, text: str, limit: int, exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Find the rows most similar to a text.
+
+        Args:
+            text (str): The text
+            limit (int): Maximum number of rows to return
+            exclude_id (int, optional): Row to leave out, e.g. the one the text comes from
+
+        Returns:
+            List[Tuple[int, float]]: (row id, cosine similarity) pairs, most similar first;
+                rows sharing no feature with the text are left out
+        """
+        features, tf = hash_features(text or "", self.dims)
+        if not len(features) or not (self.base_rows + self.delta_rows):
+            return []
+        df = self._base_df[features] + self._delta_df[features]
+        weights = tf * idf_weights(df, self.base_rows + self.delta_rows)
+        weights /= np.linalg.norm(weights)
+
+        ids, scores = [], []
+        if self.base_rows:
+            ids.append(self._base_ids)
+            scores.append(self._score_base(features, weights))
+        if self.delta_rows:
+            ids.append(self._delta_id_array())
+            scores.append(self._score_delta(features, weights))
+        ids = np.concatenate(ids)
+        scores = np.concatenate(scores)
+
+        if exclude_id is not None:
+            scores[ids == exclude_id] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(scores[candidates], -limit)[-limit:]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(ids[i]), float(min(scores[i], 1.0))) for i in candidates]
+
+    def compact(self):
+        """
+        Merge the delta segment into the base segment and recompute the IDF weights.
+        """
+        if not self.delta_rows:
+            return
+        base_features = np.repeat(np.arange(self.dims, dtype=np.int32), np.diff(self._base_ptr))
+        delta_ids, delta_ptr, delta_features, delta_tf = self._delta_arrays_cached()
+        delta_rows = np.repeat(np.arange(self.delta_rows, dtype=np.int32) + self.base_rows, np.diff(delta_ptr))
+
+        features = np.concatenate([base_features, delta_features])
+        rows = np.concatenate([np.asarray(self._base_postings), delta_rows])
+        tf = np.concatenate([np.asarray(self._base_tf), delta_tf])
+        ids = np.concatenate([np.asarray(self._base_ids), delta_ids])
+
+        order = np.argsort(features, kind="stable")
+        ptr = np.zeros(self.dims + 1, dtype=np.int64)
+        np.cumsum(np.bincount(features, minlength=self.dims), out=ptr[1:])
+        self._set_base(ids, ptr, rows[order], tf[order])
+        self._reset_delta()
+
+    def dump(self, path: str):
+        """
+        Compact the index and write it to a file atomically.
+
+        Args:
+            path (str): Path of the index file
+        """
+        self.compact()
+        arrays = (self._base_ptr, self._base_ids, self._base_norms, self._base_postings, self._base_tf)
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(
+                    MAGIC, FORMAT_VERSION, self.dims, self.base_rows, len(self._base_postings), self.max_id
+                ))
+                for array in arrays:
+                    f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+                    f.write(np.ascontiguousarray(array).tobytes())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "SimilarityIndex":
+        """
+        Memory-map an index file. Postings are paged in as queries touch them.
+
+        Args:
+            path (str): Path of the index file
+
+        Returns:
+            SimilarityIndex: The index
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not an index of a supported version
+        """
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        if len(data) < _HEADER.size:
+            raise ValueError("Truncated similarity index")
+        magic, version, dims, rows, postings, max_id = _HEADER.unpack(data[:_HEADER.size].tobytes())
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a supported similarity index")
+
+        arrays = []
+        offset = _HEADER.size
+        for dtype, count in ((np.int64, dims + 1), (np.int64, rows), (np.float32, rows), (np.int32, postings), (np.float32, postings)):
+            offset = _aligned(offset)
+            size = count * np.dtype(dtype).itemsize
+            if offset + size > len(data):
+                raise ValueError("Truncated similarity index")
+            arrays.append(data[offset:offset + size].view(dtype))
+            offset += size
+
+        index = cls(dims)
+        ptr, ids, norms, base_postings, base_tf = arrays
+        index._set_base(ids, ptr, base_postings, base_tf, norms)
+        index.max_id = max_id
+        return index
+
+    def _set_base(
+        self,
+        ids: np.ndarray,
+        ptr: np.ndarray,
+        postings: np.ndarray,
+        tf: np.ndarray,
+        norms: Optional[np.ndarray] = None
+    ):
+        """
+        Replace the base segment; row norms are computed if not given.
+
+        Args:
+            ids (np.ndarray): Row ids
+            ptr (np.ndarray): Start of the postings of each feature, plus the end
+            postings (np.ndarray): Row index of each posting, grouped by feature
+            tf (np.ndarray): Term frequency of each posting
+            norms (np.ndarray, optional): Norm of each row's TF-IDF vector
+        """
+        self._base_ids = ids
+        self._base_ptr = ptr
+        self._base_postings = postings
+        self._base_tf = tf
+        self._base_df = np.diff(ptr).astype(np.int32)
+        self._base_idf = idf_weights(self._base_df, len(ids))
+        if norms is None:
+            features = np.repeat(np.arange(self.dims, dtype=np.int32), self._base_df)
+            weighted = tf * self._base_idf[features]
+            norms = np.sqrt(np.bincount(postings, weighted * weighted, minlength=len(ids))).astype(np.float32)
+        self._base_norms = norms
+
+    def _reset_delta(self):
+        """Empty the delta segment."""
+        self._delta_ids: List[int] = []
+        self._delta_features: List[np.ndarray] = []
+        self._delta_tf: List[np.ndarray] = []
+        self._delta_df = np.zeros(self.dims, dtype=np.int32)
+        self._delta_arrays = None
+
+    def _delta_id_array(self) -> np.ndarray:
+        """Row ids of the delta segment."""
+        return self._delta_arrays_cached()[0]
+
+    def _delta_arrays_cached(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the delta segment as row-major arrays, rebuilt after rows are added.
+
+        Returns:
+            Tuple[np.ndarray, ...]: Row ids, start of each row plus the end, features, term frequencies
+        """
+        if self._delta_arrays is None:
+            lengths = [len(features) for features in self._delta_features]
+            ptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=ptr[1:])
+            self._delta_arrays = (
+                np.array(self._delta_ids, dtype=np.int64),
+                ptr,
+                np.concatenate(self._delta_features),
+                np.concatenate(self._delta_tf),
+            )
+        return self._delta_arrays
+
+    def _score_base(self, features: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Score the base rows against a query, reading only the postings of its features.
+        Base rows are weighted with the IDF of the last compaction.
+
+        Args:
+            features (np.ndarray): Features of the query
+            weights (np.ndarray): Normalized TF-IDF weights of the query
+
+        Returns:
+            np.ndarray: Cosine similarity of each base row
+        """
+        starts = np.asarray(self._base_ptr[features])
+        lengths = np.asarray(self._base_ptr[features + 1]) - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(self.base_rows, dtype=np.float64)
+        # Indices of all postings of the query features, in one array
+        boundaries = np.cumsum(lengths) - lengths
+        positions = np.arange(total, dtype=np.int64) + np.repeat(starts - boundaries, lengths)
+        contributions = np.repeat(weights * self._base_idf[features], lengths) * self._base_tf[positions]
+        dots = np.bincount(self._base_postings[positions], contributions, minlength=self.base_rows)
+        return dots / np.maximum(self._base_norms, 1e-12)
+
+    def _score_delta(self, features: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Score the delta rows against a query, weighting them with the current IDF.
+
+        Args:
+            features (np.ndarray): Features of the query
+            weights (np.ndarray): Normalized TF-IDF weights of the query
+
+        Returns:
+            np.ndarray: Cosine similarity of each delta row
+        """
+        _, ptr, row_features, row_tf = self._delta_arrays_cached()
+        df = self._base_df[row_features] + self._delta_df[row_features]
+        row_weights = row_tf * idf_weights(df, self.base_rows + self.delta_rows)
+        norms = np.sqrt(np.add.reduceat(row_weights * row_weights, ptr[:-1]))
+        query = np.zeros(self.dims, dtype=np.float32)
+        query[features] = weights
+        dots = np.add.reduceat(query[row_features] * row_weights, ptr[:-1])
+        return dots / np.maximum(norms, 1e-12)
@@ -0,0 +1,155 @@
+"""
+Core functionality for transcoding recordings.
+Converts a recording to Ogg Opus for streaming, reading and writing in
+blocks so long recordings are never loaded whole.
+"""
+
+import math
+from typing import Iterable, Iterator
+
+import numpy as np
+import soundfile as sf
+
+# Sample rates the Opus encoder accepts
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+BLOCK_FRAMES = 65536
+
+# Length of the anti-aliasing filter applied before downsampling (odd, so its delay is whole frames)
+LOWPASS_TAPS = 255
+
+
+def opus_sample_rate(sample_rate: int) -> int:
+    """
+    Pick the Opus sample rate for a recording: the lowest one that keeps its bandwidth.
+
+    Args:
+        sample_rate (int): Sample rate of the recording
+
+    Returns:
+        int: Opus sample rate
+    """
+    for rate in OPUS_SAMPLE_RATES:
+        if rate >= sample_rate:
+            return rate
+    return OPUS_SAMPLE_RATES[-1]
+
+
+def lowpass_filter(cutoff: float, taps: int = LOWPASS_TAPS) -> np.ndarray:
+    """
+    Design a windowed-sinc low-pass filter.
+
+    Args:
+        cutoff (float): Cutoff frequency as a fraction of the sample rate (below 0.5)
+        taps (int): Number of coefficients
+
+    Returns:
+        np.ndarray: Filter coefficients with unit gain at 0 Hz
+    """
+    n = np.arange(taps) - (taps - 1) / 2
+    h = np.sinc(2 * cutoff * n) * np.blackman(taps)
+    return h / h.sum()
+
+
+def lowpass_blocks(blocks: Iterable[np.ndarray], cutoff: float, taps: int = LOWPASS_TAPS) -> Iterator[np.ndarray]:
+    """
+    Low-pass filter a stream of audio blocks.
+    Blocks are convolved by FFT with the end of the previous input prepended,
+    and the output is shifted back by the filter delay, so it lines up with
+    the input and has the same number of frames.
+
+    Args:
+        blocks (Iterable[np.ndarray]): Blocks of shape (frames, channels)
+        cutoff (float): Cutoff frequency as a fraction of the sample rate (below 0.5)
+        taps (int): Number of filter coefficients
+
+    Yields:
+        np.ndarray: Filtered blocks of shape (frames, channels)
+    """
+    h = lowpass_filter(cutoff, taps)
+    delay = (taps - 1) // 2
+    history = None
+    skip = delay  # leading output frames that precede the first input frame
+
+    def convolve(block):
+        nonlocal history, skip
+        buffer = np.concatenate([history, block])
+        size = 1 << (len(buffer) - 1).bit_length()
+        # Circular convolution only wraps into the first taps - 1 frames, which are dropped
+        spectrum = np.fft.rfft(buffer, size, axis=0) * np.fft.rfft(h, size)[:, None]
+        out = np.fft.irfft(spectrum, size, axis=0)[taps - 1:len(buffer)].astype(block.dtype)
+        history = buffer[len(buffer) - (taps - 1):]
+        dropped = min(skip, len(out))
+        skip -= dropped
+        return out[dropped:]
+
+    for block in blocks:
+        if history is None:
+            history = np.zeros((taps - 1, block.shape[1]), dtype=block.dtype)
+        out = convolve(block)
+        if len(out):
+            yield out
+    if history is not None:
+        # Flush the frames still inside the filter
+        out = convolve(np.zeros((delay, history.shape[1]), dtype=history.dtype))
+        if len(out):
+            yield out
+
+
+def resample_blocks(blocks: Iterable[np.ndarray], rate_in: int, rate_out: int) -> Iterator[np.ndarray]:
+    """
+    Resample a stream of audio blocks by linear interpolation.
+    Output positions are computed from the frame count, so there is no drift
+    over long recordings. When downsampling, the blocks are low-pass filtered
+    below the output Nyquist frequency first, so higher frequencies do not
+    alias into the audible band.
+
+    Args:
+        blocks (Iterable[np.ndarray]): Blocks of shape (frames, channels)
+        rate_in (int): Sample rate of the blocks
+        rate_out (int): Sample rate of the output
+
+    Yields:
+        np.ndarray: Resampled blocks of shape (frames, channels)
+    """
+    if rate_in == rate_out:
+        yield from blocks
+        return
+    if rate_out < rate_in:
+        # Place the whole transition band below the output Nyquist frequency
+        blocks = lowpass_blocks(blocks, rate_out / rate_in / 2 - 2.75 / LOWPASS_TAPS)
+
+    step = rate_in / rate_out
+    produced = 0  # output frames so far
+    offset = 0  # input frame index of buffer[0]
+    tail = None
+    for block in blocks:
+        buffer = block if tail is None else np.concatenate([tail, block])
+        last = offset + len(buffer) - 1
+        # Output frames whose position is within this buffer
+        count = math.floor(last / step) + 1 - produced
+        if count > 0:
+            positions = (produced + np.arange(count)) * step - offset
+            index = positions.astype(np.int64)
+            weight = (positions - index)[:, None].astype(buffer.dtype)
+            following = buffer[np.minimum(index + 1, len(buffer) - 1)]
+            yield buffer[index] * (1 - weight) + following * weight
+            produced += count
+        tail = buffer[-1:].copy()
+        offset = last
+
+
+def transcode_to_opus(source_path: str, dest_path: str):
+    """
+    Transcode an audio file to Ogg Opus, resampling if its rate is not supported by Opus.
+
+    Args:
+        source_path (str): Path of the audio file
+        dest_path (str): Path of the Ogg Opus file to write
+    """
+    info = sf.info(source_path)
+    rate = opus_sample_rate(info.samplerate)
+    blocks = sf.blocks(source_path, blocksize=BLOCK_FRAMES, dtype="float32", always_2d=True)
+    with sf.SoundFile(dest_path, "w", samplerate=rate, channels=info.channels, format="OGG", subtype="OPUS") as out:
+        for block in resample_blocks(blocks, info.samplerate, rate):
+            out.write(block)
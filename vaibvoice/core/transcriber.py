@@ -1,98 +1,198 @@
 """
 Core functionality for transcribing audio.
 Provides functions for transcribing audio using the OpenAI API.
+
+Transcription runs as a pipeline of stages shared by the keyboard loop and
+the transcription job workers: preprocess_audio -> request_transcription ->
+format_transcription, optionally followed by type_text.
 """
 
 import os
-import openai
-import pyautogui
 import platform
-import pyperclip
-from typing import Optional
+import time
+from typing import Callable, Optional, Tuple
 
-import vaibvoice.config as config
 from vaibvoice.core.formatter import format_transcription
+from vaibvoice.core.openai_client import get_openai_client
+from vaibvoice.services.settings_service import SettingsSnapshot, get_settings_service
+from vaibvoice.utils.audio_utils import convert_audio_format, get_audio_metadata
+from vaibvoice.utils.metrics import current_trace, get_metrics
 
-def transcribe_audio(audio_path: str, type_directly: bool = False) -> str:
+class TranscriptionCancelled(Exception):
+    """Raised by request_transcription when should_cancel reports a cancellation."""
+
+def preprocess_audio(audio_path: str) -> Tuple[str, float]:
     """
-    Transcribe an audio file using the OpenAI API.
+    Prepare an audio file for transcription and storage.
+    Files that soundfile can decode but that are not WAV are converted to WAV,
+    so they can be moved into the audio store; other formats are passed
+    through unchanged for the API to decode.
+
+    Args:
+        audio_path (str): Path to the audio file
+
+    Returns:
+        Tuple[str, float]: Path of the file to transcribe and its duration in seconds (0 if unknown)
+    """
+    with get_metrics().span("preprocess"):
+        metadata = get_audio_metadata(audio_path)
+        if metadata is None:
+            return audio_path, 0.0
+
+        if not audio_path.lower().endswith(".wav"):
+            converted = convert_audio_format(audio_path, "wav")
+            if converted:
+                os.remove(audio_path)
+                audio_path = converted
+        return audio_path, metadata["duration"]
+
+def request_transcription(
+    audio_path: str,
+    settings: Optional[SettingsSnapshot] = None,
+    on_delta: Optional[Callable[[str], None]] = None,
+    should_cancel: Optional[Callable[[], bool]] = None
+) -> str:
+    """
+    Send an audio file to the OpenAI API and return the raw transcription.
 
     Args:
         audio_path (str): Path to the audio file to transcribe
-        type_directly (bool): Whether to type the transcription directly using pyautogui
+        settings (SettingsSnapshot, optional): Settings to use; the current settings by default
+        on_delta (Callable[[str], None], optional): Called with each streamed piece of text
+        should_cancel (Callable[[], bool], optional): Polled between streamed pieces
 
     Returns:
-        str: The transcription text
+        str: The unformatted transcription text
+
+    Raises:
+        TranscriptionCancelled: If should_cancel returned True
+        Exception: If the API request fails
     """
-    # Set up OpenAI API key
-    openai.api_key = config.OPENAI_API_KEY
+    settings = settings or get_settings_service().current()
 
     # Initialize variables to store the complete transcription
     full_transcription = ""
 
-    try:
-        # Open the audio file
-        with open(audio_path, 'rb') as audio_file:
-            if config.WHISPER_MODEL == "whisper-1":
-                # Whisper-1 does not support streaming
-                response = openai.audio.transcriptions.create(
-                    model=config.WHISPER_MODEL,
+    metrics = get_metrics()
+    trace = current_trace()
+    if trace is not None:
+        trace.transcription_model = settings.transcription_model
+        trace.upload_bytes = os.path.getsize(audio_path)
+
+    client = get_openai_client()
+    request_start = time.perf_counter()
+    with open(audio_path, 'rb') as audio_file:
+        if settings.transcription_model == "whisper-1":
+            # Whisper-1 does not support streaming: upload and transcription are one request
+            with metrics.span("upload"):
+                response = client.audio.transcriptions.create(
+                    model=settings.transcription_model,
                     file=audio_file,
-                    language=config.TRANSCRIPTION_LANGUAGE
+                    language=settings.transcription_language
                 )
-                if hasattr(response, "text"):
-                    full_transcription = response.text
-                else:
-                    full_transcription = str(response)
+            if hasattr(response, "text"):
+                full_transcription = response.text
             else:
-                # Create a streaming request to the OpenAI API
-                stream = openai.audio.transcriptions.create(
-                    model=config.WHISPER_MODEL,
+                full_transcription = str(response)
+            if trace is not None:
+                trace.first_delta = time.perf_counter() - request_start
+                trace.add_usage("transcription", getattr(response, "usage", None))
+            if on_delta and full_transcription:
+                on_delta(full_transcription)
+        else:
+            # Create a streaming request to the OpenAI API; it returns once the audio is uploaded
+            with metrics.span("upload"):
+                stream = client.audio.transcriptions.create(
+                    model=settings.transcription_model,
                     file=audio_file,
-                    language=config.TRANSCRIPTION_LANGUAGE,
+                    language=settings.transcription_language,
                     stream=True
                 )
 
-                # Process the streaming response
+            # Process the streaming response
+            with metrics.span("transcription"):
                 for event in stream:
+                    if should_cancel and should_cancel():
+                        raise TranscriptionCancelled()
                     # Handle TranscriptionTextDeltaEvent
                     if event.type == 'transcript.text.delta' and hasattr(event, 'delta'):
                         # Get the transcription delta
                         delta = event.delta
                         if delta:
+                            if trace is not None and not full_transcription:
+                                trace.first_delta = time.perf_counter() - request_start
                             # Append to the full transcription
                             full_transcription += delta
+                            if on_delta:
+                                on_delta(delta)
                     # Handle TranscriptionTextDoneEvent
                     elif event.type == 'transcript.text.done' and hasattr(event, 'text'):
                         # This event contains the complete transcription
                         print(f"Transcription complete: {event.text}")
+                        if trace is not None:
+                            trace.add_usage("transcription", getattr(event, "usage", None))
+
+    if should_cancel and should_cancel():
+        raise TranscriptionCancelled()
+    return full_transcription
+
+def type_text(text: str):
+    """
+    Replace the text of the focused input box with the given text.
+
+    Args:
+        text (str): The text to type
+    """
+    # Imported on first use: pyautogui is slow to import and needs a display
+    import pyautogui
+    import pyperclip
+
+    with get_metrics().span("paste"):
+        # Select all text (Ctrl+A on Windows/Linux, Command+A on macOS)
+        if platform.system() == 'Darwin':  # macOS
+            pyautogui.hotkey('command', 'a')
+        else:  # Windows or Linux
+            pyautogui.hotkey('ctrl', 'a')
 
-            # Format the transcription
-            formatted_transcription = format_transcription(full_transcription)
+        # Delete the selected text
+        # After selecting all text, we can use either delete or backspace
+        # Using backspace is more reliable across different operating systems and contexts
+        pyautogui.press('backspace')
 
-            # If type_directly is True, we need to replace the text in the textbox with the formatted text
-            if type_directly:
-                # Select all text (Ctrl+A on Windows/Linux, Command+A on macOS)
-                if platform.system() == 'Darwin':  # macOS
-                    pyautogui.hotkey('command', 'a')
-                else:  # Windows or Linux
-                    pyautogui.hotkey('ctrl', 'a')
+        # Copy the formatted text to the clipboard
+        pyperclip.copy(text)
+
+        # Paste the text using keyboard shortcut
+        if platform.system() == 'Darwin':  # macOS
+            pyautogui.hotkey('command', 'v')
+        else:  # Windows or Linux
+            pyautogui.hotkey('ctrl', 'v')
+
+def transcribe_audio(audio_path: str, type_directly: bool = False) -> str:
+    """
+    Transcribe an audio file using the OpenAI API.
 
-                # Delete the selected text
-                # After selecting all text, we can use either delete or backspace
-                # Using backspace is more reliable across different operating systems and contexts
-                pyautogui.press('backspace')
+    Args:
+        audio_path (str): Path to the audio file to transcribe
+        type_directly (bool): Whether to type the transcription directly using pyautogui
+
+    Returns:
+        str: The transcription text
+    """
+    # Read the settings once so the whole dictation uses one consistent snapshot
+    settings = get_settings_service().current()
+
+    try:
+        full_transcription = request_transcription(audio_path, settings)
 
-                # Copy the formatted text to the clipboard
-                pyperclip.copy(formatted_transcription)
+        # Format the transcription
+        formatted_transcription = format_transcription(full_transcription)
 
-                # Paste the text using keyboard shortcut
-                if platform.system() == 'Darwin':  # macOS
-                    pyautogui.hotkey('command', 'v')
-                else:  # Windows or Linux
-                    pyautogui.hotkey('ctrl', 'v')
+        # If type_directly is True, we need to replace the text in the textbox with the formatted text
+        if type_directly:
+            type_text(formatted_transcription)
 
-            return formatted_transcription
+        return formatted_transcription
 
     except Exception as e:
         print(f"Error during streaming transcription: {e}")
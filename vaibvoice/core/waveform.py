@@ -0,0 +1,170 @@
+"""
+Core functionality for waveform peaks.
+Computes multi-resolution min/max peaks of a recording and stores them in a
+compact binary file, so the GUI can draw waveforms without the audio.
+
+The file holds a header followed by one level per resolution, each level
+halving the number of peaks of the previous one. Peaks are int8 values
+(-127..127 for -1.0..1.0), interleaved as min, max pairs.
+"""
+
+import struct
+from typing import List, NamedTuple
+
+import numpy as np
+import soundfile as sf
+
+MAGIC = b"VVPK"
+FORMAT_VERSION = 1
+
+# magic, version, sample rate, frames, samples per peak at level 0, number of levels
+_HEADER = struct.Struct("<4sHIQIH")
+_LEVEL = struct.Struct("<I")
+
+# Coarser levels are added until a level has at most this many peaks
+MIN_LEVEL_PEAKS = 256
+
+
+class PeakLevel(NamedTuple):
+    """
+    Peaks of a recording at one resolution.
+    """
+    samples_per_peak: int
+    peaks: np.ndarray  # int8, shape (count, 2): min and max of each window
+
+
+class Waveform(NamedTuple):
+    """
+    Multi-resolution peaks of a recording, finest level first.
+    """
+    sample_rate: int
+    frames: int
+    levels: List[PeakLevel]
+
+    def level_for(self, resolution: int) -> PeakLevel:
+        """
+        Pick the coarsest level with at least `resolution` peaks, or the finest level.
+
+        Args:
+            resolution (int): Number of peaks wanted, e.g. the width of the display in pixels
+
+        Returns:
+            PeakLevel: The level
+        """
+        for level in reversed(self.levels):
+            if len(level.peaks) >= resolution:
+                return level
+        return self.levels[0]
+
+
+def _quantize(mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+    """
+    Convert float min/max pairs to int8, rounding outwards so peaks are never understated.
+
+    Args:
+        mins (np.ndarray): Minimum of each window
+        maxs (np.ndarray): Maximum of each window
+
+    Returns:
+        np.ndarray: int8 array of shape (count, 2)
+    """
+    pairs = np.empty((len(mins), 2), dtype=np.int8)
+    pairs[:, 0] = np.clip(np.floor(mins * 127), -127, 127)
+    pairs[:, 1] = np.clip(np.ceil(maxs * 127), -127, 127)
+    return pairs
+
+
+def compute_waveform(audio_path: str, samples_per_peak: int = 256) -> Waveform:
+    """
+    Compute the peaks of an audio file, reading it in blocks so long
+    recordings are never loaded whole. Channels are mixed down to mono.
+
+    Args:
+        audio_path (str): Path to the audio file
+        samples_per_peak (int): Frames per peak at the finest level
+
+    Returns:
+        Waveform: Peaks at every level
+    """
+    info = sf.info(audio_path)
+    # Whole windows per block, so only the last block has a partial window
+    blocksize = samples_per_peak * 4096
+    mins, maxs = [], []
+    for block in sf.blocks(audio_path, blocksize=blocksize, dtype="float32", always_2d=True):
+        mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+        whole = len(mono) // samples_per_peak * samples_per_peak
+        if whole:
+            windows = mono[:whole].reshape(-1, samples_per_peak)
+            mins.append(windows.min(axis=1))
+            maxs.append(windows.max(axis=1))
+        if whole < len(mono):
+            rest = mono[whole:]
+            mins.append(rest.min(keepdims=True))
+            maxs.append(rest.max(keepdims=True))
+
+    level_mins = np.concatenate(mins) if mins else np.zeros(0, dtype=np.float32)
+    level_maxs = np.concatenate(maxs) if maxs else np.zeros(0, dtype=np.float32)
+    levels = [PeakLevel(samples_per_peak, _quantize(level_mins, level_maxs))]
+
+    # Each coarser level merges pairs of windows of the previous one
+    while len(levels[-1].peaks) > MIN_LEVEL_PEAKS:
+        previous = levels[-1].peaks
+        if len(previous) % 2:
+            previous = np.concatenate([previous, previous[-1:]])
+        pairs = previous.reshape(-1, 2, 2)
+        merged = np.empty((len(pairs), 2), dtype=np.int8)
+        merged[:, 0] = pairs[:, :, 0].min(axis=1)
+        merged[:, 1] = pairs[:, :, 1].max(axis=1)
+        levels.append(PeakLevel(levels[-1].samples_per_peak * 2, merged))
+
+    return Waveform(info.samplerate, info.frames, levels)
+
+
+def dump_waveform(waveform: Waveform) -> bytes:
+    """
+    Serialize a waveform to the peaks file format.
+
+    Args:
+        waveform (Waveform): The waveform
+
+    Returns:
+        bytes: The file content
+    """
+    parts = [_HEADER.pack(
+        MAGIC, FORMAT_VERSION, waveform.sample_rate, waveform.frames,
+        waveform.levels[0].samples_per_peak, len(waveform.levels)
+    )]
+    for level in waveform.levels:
+        parts.append(_LEVEL.pack(len(level.peaks)))
+        parts.append(level.peaks.tobytes())
+    return b"".join(parts)
+
+
+def load_waveform(data: bytes) -> Waveform:
+    """
+    Parse a peaks file. The levels are views into `data`, not copies.
+
+    Args:
+        data (bytes): The file content
+
+    Returns:
+        Waveform: The waveform
+
+    Raises:
+        ValueError: If the data is not a peaks file of a supported version
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated peaks file")
+    magic, version, sample_rate, frames, samples_per_peak, level_count = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a supported peaks file")
+
+    levels = []
+    offset = _HEADER.size
+    for index in range(level_count):
+        (count,) = _LEVEL.unpack_from(data, offset)
+        offset += _LEVEL.size
+        peaks = np.frombuffer(data, dtype=np.int8, count=count * 2, offset=offset).reshape(count, 2)
+        offset += count * 2
+        levels.append(PeakLevel(samples_per_peak << index, peaks))
+    return Waveform(sample_rate, frames, levels)
@@ -5,10 +5,41 @@ Provides functionality for database connections and initialization.
 
 import os
 import sqlite3
-from typing import Optional
+import threading
+import weakref
+from typing import Callable, Optional
 
 import vaibvoice.config as config
 
+# Connections opened through Database.get_connection that are not closed yet;
+# entries also disappear when a connection is garbage collected
+_open_connections = weakref.WeakSet()
+_open_connections_lock = threading.Lock()
+
+class TrackedConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that is counted as open until it is closed.
+    """
+
+    def close(self):
+        """
+        Close the connection and stop counting it.
+        """
+        with _open_connections_lock:
+            _open_connections.discard(self)
+        super().close()
+
+def open_connection_count() -> int:
+    """
+    Get the number of connections opened through Database.get_connection that are still open.
+    Connections that were never closed but have been garbage collected are not counted.
+
+    Returns:
+        int: Number of open connections
+    """
+    with _open_connections_lock:
+        return len(_open_connections)
+
 class Database:
     """
     Base class for database operations.
@@ -27,16 +58,31 @@ class Database:
         self.db_path = db_path if db_path is not None else config.DB_PATH
         self.db_exists = os.path.exists(self.db_path)
 
-    def get_connection(self):
+    def get_connection(self, check_same_thread: bool = True):
         """
         Get a connection to the database.
 
+        Args:
+            check_same_thread (bool): Whether sqlite3 should reject use from other threads.
+                Disable for connections handed to code that hops threads, such as
+                generators consumed by a streaming response.
+
         Returns:
             sqlite3.Connection: A connection to the database
         """
-        return sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread, factory=TrackedConnection)
+        with _open_connections_lock:
+            _open_connections.add(conn)
+        return conn
 
-    def execute_query(self, query: str, params: tuple = (), fetch: bool = False, fetch_all: bool = True):
+    def execute_query(
+        self,
+        query: str,
+        params: tuple = (),
+        fetch: bool = False,
+        fetch_all: bool = True,
+        row_factory: Optional[Callable] = None
+    ):
         """
         Execute a SQL query on the database.
 
@@ -45,6 +91,7 @@ class Database:
             params (tuple): Parameters for the query
             fetch (bool): Whether to fetch results
             fetch_all (bool): Whether to fetch all results or just one
+            row_factory (Callable, optional): sqlite3 row factory used to build fetched rows
 
         Returns:
             Optional[Union[list, tuple, bool]]:
@@ -53,6 +100,8 @@ class Database:
                 - None if there was an error
         """
         conn = self.get_connection()
+        if row_factory is not None:
+            conn.row_factory = row_factory
         cursor = conn.cursor()
 
         try:
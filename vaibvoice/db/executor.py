@@ -0,0 +1,53 @@
+"""
+Bounded executor for database work.
+Runs blocking sqlite3 calls off the event loop on a fixed pool of threads.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import vaibvoice.config as config
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """
+    Get the process-wide database executor.
+
+    The pool is separate from the event loop's default threadpool, so long
+    database calls cannot starve other blocking work, and it is bounded by
+    DB_WORKERS, so a burst of requests queues instead of opening an unbounded
+    number of concurrent SQLite connections.
+
+    Returns:
+        ThreadPoolExecutor: The shared database executor
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, config.DB_WORKERS),
+                thread_name_prefix="vaibvoice-db"
+            )
+        return _executor
+
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking database call on the database executor and await its result.
+
+    Args:
+        func (Callable): The blocking function to call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Any: The return value of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
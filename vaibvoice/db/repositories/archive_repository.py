@@ -0,0 +1,289 @@
+"""
+Repository for archived transcriptions.
+Moves old rows from the hot transcriptions table into an attached archive database.
+"""
+
+import os
+import sqlite3
+from typing import List, Optional, Tuple
+
+import vaibvoice.config as config
+from vaibvoice.db.base import Database
+from vaibvoice.db.repositories.trace_repository import trace_row_factory, trace_table_sql
+from vaibvoice.db.repositories.transcription_repository import (
+    TRANSCRIPTION_COLUMNS,
+    transcription_row_factory,
+)
+from vaibvoice.models.trace import TRACE_COLUMNS, DictationTrace
+from vaibvoice.models.transcription import Transcription
+
+def archive_path_for(db_path: str) -> str:
+    """
+    Get the archive database that belongs to a history database.
+
+    Args:
+        db_path (str): Path to the main SQLite database file
+
+    Returns:
+        str: ARCHIVE_DB_PATH for the configured database, otherwise
+            "<name>_archive<ext>" next to the given database
+    """
+    if os.path.abspath(db_path) == os.path.abspath(config.DB_PATH):
+        return config.ARCHIVE_DB_PATH
+    root, ext = os.path.splitext(db_path)
+    return f"{root}_archive{ext or '.db'}"
+
+class ArchiveRepository(Database):
+    """
+    Repository for archived transcriptions.
+
+    The archive is a separate SQLite file attached to the main database as
+    "archive". Archived rows keep their original ids, so a transcription can
+    be looked up by id whether it is hot or archived.
+
+    Attributes:
+        db_path (str): Path to the main SQLite database file
+        archive_path (str): Path to the archive SQLite database file
+    """
+
+    def __init__(self, db_path: str = None, archive_path: str = None):
+        """
+        Initialize the ArchiveRepository.
+
+        Args:
+            db_path (str, optional): Path to the main SQLite database file
+            archive_path (str, optional): Path to the archive SQLite database file;
+                derived from db_path by default (see archive_path_for)
+        """
+        super().__init__(db_path)
+        self.archive_path = archive_path if archive_path is not None else archive_path_for(self.db_path)
+
+    def archive_exists(self) -> bool:
+        """
+        Check whether the archive database has been created.
+
+        Returns:
+            bool: True if the archive file exists
+        """
+        return os.path.exists(self.archive_path)
+
+    def get_archive_connection(self) -> sqlite3.Connection:
+        """
+        Get a connection to the main database with the archive attached.
+        Creates the archive table if it doesn't exist.
+
+        Returns:
+            sqlite3.Connection: A connection with the archive attached as "archive"
+        """
+        conn = self.get_connection()
+        conn.execute("ATTACH DATABASE ? AS archive", (self.archive_path,))
+        conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive.transcriptions (
+            id INTEGER PRIMARY KEY,
+            timestamp TEXT NOT NULL,
+            audio_path TEXT NOT NULL,
+            text TEXT NOT NULL,
+            duration REAL NOT NULL,
+            word_count INTEGER NOT NULL
+        )
+        ''')
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS archive.idx_archive_timestamp ON transcriptions(timestamp)"
+        )
+        conn.execute(trace_table_sql("archive"))
+        return conn
+
+    def archive_before(self, cutoff: str, batch_size: int = 5000) -> List[Tuple[int, str]]:
+        """
+        Move transcriptions older than the cutoff, and their traces, into the archive.
+        Each batch is copied and deleted in one transaction across both databases.
+
+        Args:
+            cutoff (str): ISO timestamp; rows with an earlier timestamp are archived
+            batch_size (int): Number of rows moved per transaction
+
+        Returns:
+            List[Tuple[int, str]]: (id, audio_path) of every archived row
+        """
+        archived = []
+        conn = self.get_archive_connection()
+        try:
+            has_traces = conn.execute(
+                "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'transcription_traces'"
+            ).fetchone() is not None
+            while True:
+                with conn:
+                    rows = conn.execute(
+                        "SELECT id, audio_path FROM main.transcriptions WHERE timestamp < ? ORDER BY id LIMIT ?",
+                        (cutoff, batch_size)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    last_id = rows[-1][0]
+                    conn.execute(
+                        f'''
+                        INSERT OR REPLACE INTO archive.transcriptions ({TRANSCRIPTION_COLUMNS})
+                        SELECT {TRANSCRIPTION_COLUMNS} FROM main.transcriptions
+                        WHERE timestamp < ? AND id <= ?
+                        ''',
+                        (cutoff, last_id)
+                    )
+                    if has_traces:
+                        # Deleting the rows below deletes their traces from the main database
+                        conn.execute(
+                            f'''
+                            INSERT OR REPLACE INTO archive.transcription_traces ({TRACE_COLUMNS})
+                            SELECT {TRACE_COLUMNS} FROM main.transcription_traces
+                            WHERE transcription_id IN (
+                                SELECT id FROM main.transcriptions WHERE timestamp < ? AND id <= ?
+                            )
+                            ''',
+                            (cutoff, last_id)
+                        )
+                    conn.execute(
+                        "DELETE FROM main.transcriptions WHERE timestamp < ? AND id <= ?",
+                        (cutoff, last_id)
+                    )
+                archived.extend(rows)
+        finally:
+            conn.close()
+        return archived
+
+    def get_all(self, limit: int = 100, offset: int = 0) -> List[Transcription]:
+        """
+        Get archived transcriptions, newest first.
+
+        Args:
+            limit (int): Maximum number of rows to return
+            offset (int): Number of rows to skip
+
+        Returns:
+            List[Transcription]: Archived transcriptions
+        """
+        if not self.archive_exists():
+            return []
+
+        conn = self.get_archive_connection()
+        conn.row_factory = transcription_row_factory
+        try:
+            return conn.execute(
+                f"SELECT {TRANSCRIPTION_COLUMNS} FROM archive.transcriptions ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        except Exception as e:
+            print(f"Error reading archived transcriptions: {str(e)}")
+            return []
+        finally:
+            conn.close()
+
+    def get_by_id(self, transcription_id: int) -> Optional[Transcription]:
+        """
+        Get an archived transcription by its ID.
+
+        Args:
+            transcription_id (int): ID of the transcription to get
+
+        Returns:
+            Optional[Transcription]: The transcription if archived, None otherwise
+        """
+        if not self.archive_exists():
+            return None
+
+        conn = self.get_archive_connection()
+        conn.row_factory = transcription_row_factory
+        try:
+            return conn.execute(
+                f"SELECT {TRANSCRIPTION_COLUMNS} FROM archive.transcriptions WHERE id = ?",
+                (transcription_id,)
+            ).fetchone()
+        except Exception as e:
+            print(f"Error reading archived transcription: {str(e)}")
+            return None
+        finally:
+            conn.close()
+
+    def get_trace(self, transcription_id: int) -> Optional[DictationTrace]:
+        """
+        Get the trace of an archived transcription.
+
+        Args:
+            transcription_id (int): ID of the transcription
+
+        Returns:
+            Optional[DictationTrace]: The trace, or None if the transcription is not archived or has none
+        """
+        if not self.archive_exists():
+            return None
+
+        conn = self.get_archive_connection()
+        conn.row_factory = trace_row_factory
+        try:
+            return conn.execute(
+                f"SELECT {TRACE_COLUMNS} FROM archive.transcription_traces WHERE transcription_id = ?",
+                (transcription_id,)
+            ).fetchone()
+        except Exception as e:
+            print(f"Error reading archived trace: {str(e)}")
+            return None
+        finally:
+            conn.close()
+
+    def get_legacy_audio_paths(self) -> List[str]:
+        """
+        Get the distinct archived audio paths that do not reference the audio store.
+
+        Returns:
+            List[str]: Legacy audio file paths
+        """
+        if not self.archive_exists():
+            return []
+
+        conn = self.get_archive_connection()
+        try:
+            rows = conn.execute(
+                "SELECT DISTINCT audio_path FROM archive.transcriptions WHERE audio_path NOT LIKE 'store:%' AND audio_path != ''"
+            ).fetchall()
+            return [row[0] for row in rows]
+        finally:
+            conn.close()
+
+    def replace_audio_path(self, old_path: str, new_path: str) -> bool:
+        """
+        Point every archived transcription that references old_path at new_path.
+
+        Args:
+            old_path (str): Current audio path
+            new_path (str): New audio path
+
+        Returns:
+            bool: True if the update ran
+        """
+        conn = self.get_archive_connection()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE archive.transcriptions SET audio_path = ? WHERE audio_path = ?",
+                    (new_path, old_path)
+                )
+            return True
+        except Exception as e:
+            print(f"Error updating archived audio path: {str(e)}")
+            return False
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        """
+        Count archived transcriptions.
+
+        Returns:
+            int: Number of archived rows
+        """
+        if not self.archive_exists():
+            return 0
+
+        conn = self.get_archive_connection()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM archive.transcriptions").fetchone()[0]
+        finally:
+            conn.close()
@@ -0,0 +1,151 @@
+"""
+Repository for audio store blobs.
+Tracks the format, size and last access time of every recording in the audio store.
+"""
+
+import datetime
+import time
+from typing import List, Optional, Tuple
+
+from vaibvoice.db.base import Database
+
+class AudioBlobRepository(Database):
+    """
+    Repository for audio store blobs.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize the AudioBlobRepository with the specified database path.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database file
+        """
+        super().__init__(db_path)
+        self.initialize_db()
+
+    def initialize_db(self):
+        """
+        Initialize the database by creating the audio_blobs table if it doesn't exist.
+        """
+        query = '''
+        CREATE TABLE IF NOT EXISTS audio_blobs (
+            hash TEXT PRIMARY KEY,
+            format TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            last_access REAL NOT NULL,
+            evicted INTEGER NOT NULL DEFAULT 0
+        )
+        '''
+        self.execute_query(query)
+        self.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_audio_blobs_lru ON audio_blobs(evicted, last_access)"
+        )
+
+    def get(self, blob_hash: str) -> Optional[Tuple[str, int, bool]]:
+        """
+        Get a blob by its hash.
+
+        Args:
+            blob_hash (str): SHA-256 hex digest of the recording
+
+        Returns:
+            Optional[Tuple[str, int, bool]]: (format, size, evicted), or None if unknown
+        """
+        row = self.execute_query(
+            "SELECT format, size, evicted FROM audio_blobs WHERE hash = ?",
+            (blob_hash,),
+            fetch=True,
+            fetch_all=False
+        )
+        if row:
+            return row[0], row[1], bool(row[2])
+        return None
+
+    def upsert(self, blob_hash: str, blob_format: str, size: int) -> bool:
+        """
+        Record a stored blob, reviving it if it was evicted.
+
+        Args:
+            blob_hash (str): SHA-256 hex digest of the recording
+            blob_format (str): File format of the stored blob ("wav" or "flac")
+            size (int): Size of the stored blob in bytes
+
+        Returns:
+            bool: True if the blob was recorded
+        """
+        query = '''
+        INSERT INTO audio_blobs (hash, format, size, created_at, last_access, evicted)
+        VALUES (?, ?, ?, ?, ?, 0)
+        ON CONFLICT(hash) DO UPDATE SET
+            format = excluded.format,
+            size = excluded.size,
+            last_access = excluded.last_access,
+            evicted = 0
+        '''
+        params = (blob_hash, blob_format, size, datetime.datetime.now().isoformat(), time.time())
+        return self.execute_query(query, params) is not None
+
+    def touch(self, blob_hash: str) -> bool:
+        """
+        Mark a blob as just accessed.
+
+        Args:
+            blob_hash (str): SHA-256 hex digest of the recording
+
+        Returns:
+            bool: True if the update ran
+        """
+        result = self.execute_query(
+            "UPDATE audio_blobs SET last_access = ? WHERE hash = ?",
+            (time.time(), blob_hash)
+        )
+        return result is not None
+
+    def total_size(self) -> int:
+        """
+        Get the total size of blobs currently on disk.
+
+        Returns:
+            int: Size in bytes
+        """
+        row = self.execute_query(
+            "SELECT COALESCE(SUM(size), 0) FROM audio_blobs WHERE evicted = 0",
+            fetch=True,
+            fetch_all=False
+        )
+        return row[0] if row else 0
+
+    def least_recently_used(self, limit: int = 100) -> List[Tuple[str, str, int]]:
+        """
+        Get the least recently accessed blobs still on disk.
+
+        Args:
+            limit (int): Maximum number of blobs to return
+
+        Returns:
+            List[Tuple[str, str, int]]: (hash, format, size), oldest access first
+        """
+        rows = self.execute_query(
+            "SELECT hash, format, size FROM audio_blobs WHERE evicted = 0 ORDER BY last_access LIMIT ?",
+            (limit,),
+            fetch=True
+        )
+        return rows or []
+
+    def mark_evicted(self, blob_hash: str) -> bool:
+        """
+        Mark a blob as evicted. The transcriptions that reference it are kept.
+
+        Args:
+            blob_hash (str): SHA-256 hex digest of the recording
+
+        Returns:
+            bool: True if the update ran
+        """
+        result = self.execute_query("UPDATE audio_blobs SET evicted = 1 WHERE hash = ?", (blob_hash,))
+        return result is not None
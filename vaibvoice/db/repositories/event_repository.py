@@ -0,0 +1,117 @@
+"""
+Repository for the shared event log.
+Lets API worker processes fan out events published by any of them.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from vaibvoice.db.base import Database
+
+
+class EventRepository(Database):
+    """
+    Repository for the shared event log.
+
+    Events are appended with an autoincrement id, which orders them across
+    processes and serves as their SSE id. The log is trimmed to the most
+    recent events; older ones can no longer be replayed.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize the EventRepository with the specified database path.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database file
+        """
+        super().__init__(db_path)
+        self.initialize_db()
+
+    def initialize_db(self):
+        """
+        Initialize the database by creating the events table if it doesn't exist.
+        Also switches the database to WAL mode, so that readers in one process
+        do not block writers in another.
+        """
+        self.execute_query("PRAGMA journal_mode=WAL", fetch=True, fetch_all=False)
+        self.execute_query('''
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            data TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+        ''')
+
+    def append(self, event_type: str, data: str) -> Optional[int]:
+        """
+        Append an event to the log.
+
+        Args:
+            event_type (str): Type of the event
+            data (str): JSON payload of the event
+
+        Returns:
+            Optional[int]: Id of the new event, or None if it could not be stored
+        """
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO events (type, data, created_at) VALUES (?, ?, ?)",
+                    (event_type, data, datetime.now().isoformat())
+                )
+                return cursor.lastrowid
+        except Exception as e:
+            print(f"Error appending event: {str(e)}")
+            return None
+        finally:
+            conn.close()
+
+    def get_after(self, event_id: int, limit: int = 1000) -> List[Tuple[int, str, str]]:
+        """
+        Get the events appended after the given id, oldest first.
+
+        Args:
+            event_id (int): Id of the last event already seen
+            limit (int): Maximum number of events to return
+
+        Returns:
+            List[Tuple[int, str, str]]: (id, type, data) rows
+        """
+        return self.execute_query(
+            "SELECT id, type, data FROM events WHERE id > ? ORDER BY id LIMIT ?",
+            (event_id, limit),
+            fetch=True
+        ) or []
+
+    def get_bounds(self) -> Tuple[int, int]:
+        """
+        Get the ids of the oldest and newest events in the log.
+
+        Returns:
+            Tuple[int, int]: (oldest id, newest id), (0, 0) when the log is empty
+        """
+        row = self.execute_query("SELECT MIN(id), MAX(id) FROM events", fetch=True, fetch_all=False)
+        if not row or row[0] is None:
+            return 0, 0
+        return row[0], row[1]
+
+    def trim(self, keep: int) -> bool:
+        """
+        Delete all but the most recent events.
+
+        Args:
+            keep (int): Number of events to keep
+
+        Returns:
+            bool: True if the delete ran
+        """
+        return self.execute_query(
+            "DELETE FROM events WHERE id <= (SELECT MAX(id) FROM events) - ?",
+            (keep,)
+        ) is not None
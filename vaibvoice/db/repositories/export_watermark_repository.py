@@ -0,0 +1,75 @@
+"""
+Repository for export watermarks.
+Records the last transcription id written to each incremental export target.
+"""
+
+import datetime
+
+from vaibvoice.db.base import Database
+
+class ExportWatermarkRepository(Database):
+    """
+    Repository for export watermarks.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize the ExportWatermarkRepository with the specified database path.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database file
+        """
+        super().__init__(db_path)
+        self.initialize_db()
+
+    def initialize_db(self):
+        """
+        Initialize the database by creating the export_watermarks table if it doesn't exist.
+        """
+        query = '''
+        CREATE TABLE IF NOT EXISTS export_watermarks (
+            target TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL,
+            exported_at TEXT NOT NULL
+        )
+        '''
+        self.execute_query(query)
+
+    def get(self, target: str) -> int:
+        """
+        Get the watermark for an export target.
+
+        Args:
+            target (str): Identifier of the export target (its absolute path)
+
+        Returns:
+            int: Last exported transcription id, 0 if the target was never exported
+        """
+        row = self.execute_query(
+            "SELECT last_id FROM export_watermarks WHERE target = ?",
+            (target,),
+            fetch=True,
+            fetch_all=False
+        )
+        return row[0] if row else 0
+
+    def set(self, target: str, last_id: int) -> bool:
+        """
+        Store the watermark for an export target.
+
+        Args:
+            target (str): Identifier of the export target (its absolute path)
+            last_id (int): Last exported transcription id
+
+        Returns:
+            bool: True if the watermark was stored, False otherwise
+        """
+        query = '''
+        INSERT OR REPLACE INTO export_watermarks (target, last_id, exported_at)
+        VALUES (?, ?, ?)
+        '''
+        result = self.execute_query(query, (target, last_id, datetime.datetime.now().isoformat()))
+        return result is not None
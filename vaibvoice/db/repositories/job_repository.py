@@ -0,0 +1,339 @@
+"""
+Repository for transcription jobs.
+Implements the durable SQLite-backed queue behind POST /api/transcribe.
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from vaibvoice.db.base import Database
+from vaibvoice.models.job import (
+    JOB_CANCELLED,
+    JOB_COLUMNS,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    TranscriptionJob,
+)
+
+
+def job_row_factory(cursor, row: tuple) -> TranscriptionJob:
+    """
+    sqlite3 row factory that builds TranscriptionJob objects directly from rows.
+
+    Args:
+        cursor (sqlite3.Cursor): The cursor that produced the row
+        row (tuple): Row selected with JOB_COLUMNS
+
+    Returns:
+        TranscriptionJob: The job for the row
+    """
+    return TranscriptionJob.from_row(row)
+
+
+class JobRepository(Database):
+    """
+    Repository for transcription jobs.
+
+    Jobs are claimed with BEGIN IMMEDIATE transactions, so several workers,
+    in one process or many, never pick up the same job. A claimed job records
+    the worker pool that owns it and a heartbeat the pool renews while it
+    runs, so jobs of a process that died can be told from jobs that are
+    still running elsewhere.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize the JobRepository with the specified database path.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database file
+        """
+        super().__init__(db_path)
+        self.initialize_db()
+
+    def initialize_db(self):
+        """
+        Initialize the database by creating the jobs table if it doesn't exist.
+        """
+        self.execute_query('''
+        CREATE TABLE IF NOT EXISTS transcription_jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            audio_path TEXT NOT NULL,
+            filename TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            duration REAL,
+            text TEXT,
+            error TEXT,
+            transcription_id INTEGER,
+            cancel_requested INTEGER NOT NULL DEFAULT 0
+        )
+        ''')
+        self.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_transcription_jobs_status ON transcription_jobs(status, created_at)"
+        )
+        # Lease columns, added to tables created by earlier versions
+        columns = {row[1] for row in self.execute_query("PRAGMA table_info(transcription_jobs)", fetch=True) or []}
+        for column in ("owner", "heartbeat_at"):
+            if column not in columns:
+                self.execute_query(f"ALTER TABLE transcription_jobs ADD COLUMN {column} TEXT")
+
+    def add_if_room(self, job: TranscriptionJob, max_active: int) -> bool:
+        """
+        Queue a job unless max_active jobs are already queued or running.
+
+        Args:
+            job (TranscriptionJob): The job to queue
+            max_active (int): Maximum number of queued and running jobs
+
+        Returns:
+            bool: True if the job was queued, False if the queue is full
+        """
+        conn = self.get_connection()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            active = conn.execute(
+                "SELECT COUNT(*) FROM transcription_jobs WHERE status IN (?, ?)",
+                (JOB_QUEUED, JOB_RUNNING)
+            ).fetchone()[0]
+            if active >= max_active:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                '''
+                INSERT INTO transcription_jobs (id, status, audio_path, filename, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                ''',
+                (job.id, job.status, job.audio_path, job.filename, job.created_at.isoformat())
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def claim_next(self, owner: Optional[str] = None) -> Optional[TranscriptionJob]:
+        """
+        Mark the oldest queued job as running and return it.
+
+        Args:
+            owner (str, optional): ID of the worker pool claiming the job
+
+        Returns:
+            Optional[TranscriptionJob]: The claimed job, or None if the queue is empty
+        """
+        conn = self.get_connection()
+        conn.isolation_level = None
+        conn.row_factory = job_row_factory
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            job = conn.execute(
+                f"SELECT {JOB_COLUMNS} FROM transcription_jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (JOB_QUEUED,)
+            ).fetchone()
+            if job is None:
+                conn.execute("ROLLBACK")
+                return None
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now()
+            conn.execute(
+                "UPDATE transcription_jobs SET status = ?, started_at = ?, owner = ?, heartbeat_at = ? WHERE id = ?",
+                (job.status, job.started_at.isoformat(), owner, job.started_at.isoformat(), job.id)
+            )
+            conn.execute("COMMIT")
+            return job
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        """
+        Get a job by its ID.
+
+        Args:
+            job_id (str): ID of the job
+
+        Returns:
+            Optional[TranscriptionJob]: The job if found, None otherwise
+        """
+        return self.execute_query(
+            f"SELECT {JOB_COLUMNS} FROM transcription_jobs WHERE id = ?",
+            (job_id,),
+            fetch=True,
+            fetch_all=False,
+            row_factory=job_row_factory
+        )
+
+    def get_recent(self, limit: int = 50) -> List[TranscriptionJob]:
+        """
+        Get the most recently submitted jobs.
+
+        Args:
+            limit (int): Maximum number of jobs to return
+
+        Returns:
+            List[TranscriptionJob]: Jobs, newest first
+        """
+        return self.execute_query(
+            f"SELECT {JOB_COLUMNS} FROM transcription_jobs ORDER BY created_at DESC LIMIT ?",
+            (limit,),
+            fetch=True,
+            row_factory=job_row_factory
+        ) or []
+
+    def finish(self, job: TranscriptionJob) -> bool:
+        """
+        Store the final status and results of a job.
+
+        Args:
+            job (TranscriptionJob): The job, with status and results set
+
+        Returns:
+            bool: True if the update ran
+        """
+        job.finished_at = datetime.now()
+        result = self.execute_query(
+            '''
+            UPDATE transcription_jobs
+            SET status = ?, audio_path = ?, finished_at = ?, duration = ?, text = ?, error = ?, transcription_id = ?
+            WHERE id = ?
+            ''',
+            (
+                job.status,
+                job.audio_path,
+                job.finished_at.isoformat(),
+                job.duration,
+                job.text,
+                job.error,
+                job.transcription_id,
+                job.id
+            )
+        )
+        return result is not None
+
+    def set_partial_text(self, job_id: str, text: str) -> bool:
+        """
+        Store the text streamed so far for a running job, for clients following
+        it from another process.
+
+        Args:
+            job_id (str): ID of the job
+            text (str): Raw text received so far
+
+        Returns:
+            bool: True if the update ran
+        """
+        result = self.execute_query(
+            "UPDATE transcription_jobs SET text = ? WHERE id = ? AND status = ?",
+            (text, job_id, JOB_RUNNING)
+        )
+        return result is not None
+
+    def request_cancel(self, job_id: str) -> Optional[TranscriptionJob]:
+        """
+        Cancel a job. Queued jobs are cancelled at once; running jobs are
+        flagged and stopped by their worker. Finished jobs are left unchanged.
+
+        Args:
+            job_id (str): ID of the job
+
+        Returns:
+            Optional[TranscriptionJob]: The job after the request, or None if not found
+        """
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE transcription_jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                    (JOB_CANCELLED, datetime.now().isoformat(), job_id, JOB_QUEUED)
+                )
+                conn.execute(
+                    "UPDATE transcription_jobs SET cancel_requested = 1 WHERE id = ? AND status = ?",
+                    (job_id, JOB_RUNNING)
+                )
+        finally:
+            conn.close()
+        return self.get(job_id)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        """
+        Check whether cancellation of a running job was requested.
+
+        Args:
+            job_id (str): ID of the job
+
+        Returns:
+            bool: True if the job should stop
+        """
+        row = self.execute_query(
+            "SELECT cancel_requested FROM transcription_jobs WHERE id = ?",
+            (job_id,),
+            fetch=True,
+            fetch_all=False
+        )
+        return bool(row and row[0])
+
+    def heartbeat(self, owner: str) -> int:
+        """
+        Renew the lease of the running jobs of a worker pool.
+
+        Args:
+            owner (str): ID of the worker pool
+
+        Returns:
+            int: Number of jobs renewed
+        """
+        conn = self.get_connection()
+        try:
+            with conn:
+                return conn.execute(
+                    "UPDATE transcription_jobs SET heartbeat_at = ? WHERE owner = ? AND status = ?",
+                    (datetime.now().isoformat(), owner, JOB_RUNNING)
+                ).rowcount
+        finally:
+            conn.close()
+
+    def requeue_interrupted(self, owner: Optional[str] = None, lease_seconds: float = 60.0) -> int:
+        """
+        Put running jobs whose worker is gone back in the queue: jobs owned by
+        the given worker pool (e.g. its previous run in this process) and jobs
+        whose heartbeat is older than the lease. Jobs whose cancellation was
+        requested are cancelled instead.
+
+        Args:
+            owner (str, optional): ID of a worker pool whose running jobs are abandoned
+            lease_seconds (float): Age of the heartbeat after which a job's worker is considered dead
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        expired = (datetime.now() - timedelta(seconds=lease_seconds)).isoformat()
+        interrupted = "status = ? AND (owner = ? OR heartbeat_at IS NULL OR heartbeat_at < ?)"
+        params = (JOB_RUNNING, owner, expired)
+        conn = self.get_connection()
+        try:
+            with conn:
+                conn.execute(
+                    f"UPDATE transcription_jobs SET status = ?, finished_at = ? WHERE {interrupted} AND cancel_requested = 1",
+                    (JOB_CANCELLED, datetime.now().isoformat()) + params
+                )
+                cursor = conn.execute(
+                    f"UPDATE transcription_jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL "
+                    f"WHERE {interrupted}",
+                    (JOB_QUEUED,) + params
+                )
+                return cursor.rowcount
+        finally:
+            conn.close()
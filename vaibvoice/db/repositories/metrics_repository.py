@@ -0,0 +1,72 @@
+"""
+Repository for metrics snapshots.
+Lets processes that serve no HTTP, such as the key listener, publish their
+metrics to the API worker processes.
+"""
+
+import datetime
+from typing import List
+
+from vaibvoice.db.base import Database
+
+class MetricsRepository(Database):
+    """
+    Repository for metrics snapshots.
+
+    Each process stores its latest snapshot under its own name; a snapshot
+    holds cumulative values, so it replaces the previous one.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize the MetricsRepository with the specified database path.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database file
+        """
+        super().__init__(db_path)
+        self.initialize_db()
+
+    def initialize_db(self):
+        """
+        Initialize the database by creating the metrics_snapshots table if it doesn't exist.
+        """
+        query = '''
+        CREATE TABLE IF NOT EXISTS metrics_snapshots (
+            process TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        '''
+        self.execute_query(query)
+
+    def get_all(self) -> List[str]:
+        """
+        Get the stored snapshots.
+
+        Returns:
+            List[str]: JSON snapshot of each process
+        """
+        rows = self.execute_query("SELECT data FROM metrics_snapshots", fetch=True)
+        return [row[0] for row in rows or []]
+
+    def set(self, process: str, data: str) -> bool:
+        """
+        Store the snapshot of a process.
+
+        Args:
+            process (str): Name of the process
+            data (str): JSON snapshot, see Metrics.snapshot
+
+        Returns:
+            bool: True if the snapshot was stored, False otherwise
+        """
+        query = '''
+        INSERT OR REPLACE INTO metrics_snapshots (process, data, updated_at)
+        VALUES (?, ?, ?)
+        '''
+        result = self.execute_query(query, (process, data, datetime.datetime.now().isoformat()))
+        return result is not None
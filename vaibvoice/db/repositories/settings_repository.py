@@ -5,6 +5,7 @@ Implements the Repository pattern for settings data.
 
 from typing import Optional
 
+import vaibvoice.config as config
 from vaibvoice.db.base import Database
 from vaibvoice.models.settings import Settings
 
@@ -75,40 +76,51 @@ class SettingsRepository(Database):
     def get(self) -> Settings:
         """
         Get the current settings from the database.
+        The table is created by the constructor, so this is a single-row read;
+        when the row is missing it is recreated from the defaults in config.
 
         Returns:
             Settings: The current settings
         """
         try:
-            # Ensure the settings table exists
+            query = "SELECT * FROM settings WHERE id = 1"
+            settings = self.execute_query(
+                query,
+                fetch=True,
+                fetch_all=False,
+                row_factory=lambda cursor, row: Settings.from_row(row)
+            )
+
+            if settings:
+                return settings
+
+            # No row (or no table, e.g. the database file was replaced):
+            # recreate it with the default settings
             if not self.initialize_db():
                 print("Failed to initialize database. Returning default settings.")
-                return Settings()
-
-            query = "SELECT * FROM settings WHERE id = 1"
-            row = self.execute_query(query, fetch=True, fetch_all=False)
-
-            if row:
-                return Settings(
-                    id=row[0],
-                    record_key=row[1],
-                    openai_api_key=row[2],
-                    transcription_model=row[3],
-                    transcription_language=row[4],
-                    llm_model=row[5],
-                    start_sound=row[6],
-                    end_sound=row[7]
-                )
-
-            # If no settings found, create and return default settings
-            default_settings = Settings()
-            if not self._insert_default_settings():
-                print("Failed to insert default settings. Returning default settings object.")
-            return default_settings
+            return self.default_settings()
         except Exception as e:
             print(f"Error getting settings: {str(e)}")
             # Return default settings if there's an error
-            return Settings()
+            return self.default_settings()
+
+    @staticmethod
+    def default_settings() -> Settings:
+        """
+        Build the default settings from the environment defaults in config.
+
+        Returns:
+            Settings: Default settings
+        """
+        return Settings(
+            record_key=config.RECORD_KEY,
+            openai_api_key=config.OPENAI_API_KEY,
+            transcription_model=config.WHISPER_MODEL,
+            transcription_language=config.TRANSCRIPTION_LANGUAGE,
+            llm_model=config.LLM_MODEL,
+            start_sound=config.START_SOUND,
+            end_sound=config.END_SOUND
+        )
 
     def save(self, settings: Settings) -> bool:
         """
@@ -190,7 +202,7 @@ class SettingsRepository(Database):
             bool: True if successful, False otherwise
         """
         try:
-            default_settings = Settings()
+            default_settings = self.default_settings()
             query = '''
             INSERT OR REPLACE INTO settings (
                 id, record_key, openai_api_key, transcription_model, 
@@ -0,0 +1,173 @@
+"""
+Repository for dictation traces.
+Stores the timing breakdown of each dictation in a side table keyed by transcription id.
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from vaibvoice.db.base import Database
+from vaibvoice.models.trace import TRACE_COLUMNS, TRACE_TIMINGS, DictationTrace
+
+# Statement storing a trace, replacing any previous one; parameters are DictationTrace.to_row()
+TRACE_INSERT = (
+    f"INSERT OR REPLACE INTO transcription_traces ({TRACE_COLUMNS}) "
+    f"VALUES ({', '.join('?' for _ in TRACE_COLUMNS.split(','))})"
+)
+
+def trace_table_sql(schema: str = "main") -> str:
+    """
+    Get the statement creating the traces table if it doesn't exist.
+
+    Args:
+        schema (str): Database to create it in, e.g. "archive" for an attached archive
+
+    Returns:
+        str: The CREATE TABLE statement
+    """
+    timings = ",\n        ".join(f"{name} REAL" for name in TRACE_TIMINGS)
+    return f'''
+    CREATE TABLE IF NOT EXISTS {schema}.transcription_traces (
+        transcription_id INTEGER PRIMARY KEY,
+        {timings},
+        upload_bytes INTEGER,
+        transcription_model TEXT,
+        llm_model TEXT,
+        transcription_input_tokens INTEGER,
+        transcription_output_tokens INTEGER,
+        format_input_tokens INTEGER,
+        format_output_tokens INTEGER
+    )
+    '''
+
+
+# Database files whose schema has been created by this process
+_initialized_paths = set()
+_initialized_lock = threading.Lock()
+
+
+def trace_row_factory(cursor, row: tuple) -> DictationTrace:
+    """
+    sqlite3 row factory that builds DictationTrace objects directly from rows.
+
+    Args:
+        cursor (sqlite3.Cursor): The cursor that produced the row
+        row (tuple): Row selected with TRACE_COLUMNS
+
+    Returns:
+        DictationTrace: The trace for the row
+    """
+    return DictationTrace.from_row(row)
+
+
+class TraceRepository(Database):
+    """
+    Repository for dictation traces.
+
+    Traces of new transcriptions are written by TranscriptionRepository in
+    the transaction that inserts the transcription, so the transcriptions
+    version changes once per dictation. Traces are deleted together with
+    their transcription; ArchiveRepository copies them into the archive
+    before it moves a transcription there.
+
+    Attributes:
+        db_path (str): Path to the SQLite database file
+    """
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize the TraceRepository with the specified database path.
+
+        Args:
+            db_path (str, optional): Path to the SQLite database file
+        """
+        super().__init__(db_path)
+        # Repositories are created per request; create the schema once per process
+        with _initialized_lock:
+            if self.db_path not in _initialized_paths:
+                self.initialize_db()
+                _initialized_paths.add(self.db_path)
+
+    def initialize_db(self):
+        """
+        Initialize the database by creating the traces table and its triggers if they don't exist.
+        Expects the transcriptions schema to exist.
+        """
+        self.execute_query(trace_table_sql())
+        self.execute_query('''
+        CREATE TRIGGER IF NOT EXISTS trg_transcriptions_delete_trace
+        AFTER DELETE ON transcriptions
+        BEGIN
+            DELETE FROM transcription_traces WHERE transcription_id = OLD.id;
+        END
+        ''')
+        # Created by earlier versions; the transcription insert already bumps the version
+        self.execute_query("DROP TRIGGER IF EXISTS trg_transcription_traces_version_insert")
+
+    def add(self, trace: DictationTrace) -> bool:
+        """
+        Store the trace of a transcription, replacing any previous one.
+
+        Args:
+            trace (DictationTrace): The trace, with transcription_id set
+
+        Returns:
+            bool: True if the trace was stored
+        """
+        return self.execute_query(TRACE_INSERT, trace.to_row()) is not None
+
+    def get(self, transcription_id: int) -> Optional[DictationTrace]:
+        """
+        Get the trace of a transcription.
+
+        Args:
+            transcription_id (int): Id of the transcription
+
+        Returns:
+            Optional[DictationTrace]: The trace, or None if the transcription has none
+        """
+        return self.execute_query(
+            f"SELECT {TRACE_COLUMNS} FROM transcription_traces WHERE transcription_id = ?",
+            (transcription_id,),
+            fetch=True,
+            fetch_all=False,
+            row_factory=trace_row_factory
+        )
+
+    def get_breakdown(self) -> Dict[str, Any]:
+        """
+        Aggregate the traces: average and maximum of each timing, and total token usage.
+
+        Returns:
+            Dict[str, Any]: {"count", "stages": {name: {"avg", "max"}}, "tokens": {...}}
+        """
+        aggregates = ", ".join(f"AVG({name}), MAX({name})" for name in TRACE_TIMINGS)
+        row = self.execute_query(
+            f'''
+            SELECT COUNT(*), {aggregates},
+                   SUM(transcription_input_tokens), SUM(transcription_output_tokens),
+                   SUM(format_input_tokens), SUM(format_output_tokens)
+            FROM transcription_traces
+            ''',
+            fetch=True,
+            fetch_all=False
+        )
+        if not row or not row[0]:
+            return {"count": 0, "stages": {}, "tokens": {}}
+
+        stages = {}
+        for index, name in enumerate(TRACE_TIMINGS):
+            average, maximum = row[1 + index * 2], row[2 + index * 2]
+            if average is not None:
+                stages[name] = {"avg": round(average, 4), "max": round(maximum, 4)}
+        tokens = row[1 + len(TRACE_TIMINGS) * 2:]
+        return {
+            "count": row[0],
+            "stages": stages,
+            "tokens": {
+                "transcription_input": tokens[0] or 0,
+                "transcription_output": tokens[1] or 0,
+                "format_input": tokens[2] or 0,
+                "format_output": tokens[3] or 0
+            }
+        }
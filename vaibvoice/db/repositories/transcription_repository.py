@@ -3,12 +3,44 @@ Repository for transcription data access.
 Implements the Repository pattern for transcription data.
 """
 
-import datetime
-from typing import List, Optional, Tuple
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from vaibvoice.db.base import Database
+from vaibvoice.db.repositories.trace_repository import TRACE_INSERT
+from vaibvoice.models.trace import DictationTrace
 from vaibvoice.models.transcription import Transcription
 
+TRANSCRIPTION_COLUMNS = "id, timestamp, audio_path, text, duration, word_count"
+
+# Database files whose schema has been created by this process
+_initialized_paths = set()
+_initialized_lock = threading.Lock()
+
+
+class DataVersion(NamedTuple):
+    """
+    Cheap version of the transcriptions table, changed by every insert, update and delete.
+    """
+    max_id: int
+    change_counter: int
+    modified_at: str
+
+
+def transcription_row_factory(cursor, row: tuple) -> Transcription:
+    """
+    sqlite3 row factory that builds Transcription objects directly from rows.
+
+    Args:
+        cursor (sqlite3.Cursor): The cursor that produced the row
+        row (tuple): Row selected with TRANSCRIPTION_COLUMNS
+
+    Returns:
+        Transcription: The transcription for the row
+    """
+    return Transcription.from_row(row)
+
+
 class TranscriptionRepository(Database):
     """
     Repository for transcription data access.
@@ -26,7 +58,11 @@ class TranscriptionRepository(Database):
             db_path (str, optional): Path to the SQLite database file
         """
         super().__init__(db_path)
-        self.initialize_db()
+        # Repositories are created per request; create the schema once per process
+        with _initialized_lock:
+            if self.db_path not in _initialized_paths:
+                self.initialize_db()
+                _initialized_paths.add(self.db_path)
 
     def initialize_db(self):
         """
@@ -45,13 +81,43 @@ class TranscriptionRepository(Database):
         )
         '''
         self.execute_query(query)
+        self.execute_query(
+            "CREATE INDEX IF NOT EXISTS idx_transcriptions_timestamp ON transcriptions(timestamp)"
+        )
 
-    def add(self, transcription: Transcription) -> bool:
+        # Change counter maintained by triggers, so readers can tell whether the
+        # table changed without reading it
+        self.execute_query('''
+        CREATE TABLE IF NOT EXISTS table_versions (
+            name TEXT PRIMARY KEY,
+            change_counter INTEGER NOT NULL,
+            modified_at TEXT NOT NULL
+        )
+        ''')
+        self.execute_query(
+            "INSERT OR IGNORE INTO table_versions VALUES ('transcriptions', 0, strftime('%Y-%m-%dT%H:%M:%SZ', 'now'))"
+        )
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            self.execute_query(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_transcriptions_version_{event.lower()}
+            AFTER {event} ON transcriptions
+            BEGIN
+                UPDATE table_versions
+                SET change_counter = change_counter + 1,
+                    modified_at = strftime('%Y-%m-%dT%H:%M:%SZ', 'now')
+                WHERE name = 'transcriptions';
+            END
+            ''')
+
+    def add(self, transcription: Transcription, trace: Optional[DictationTrace] = None) -> bool:
         """
         Add a new transcription to the database.
+        The id of the inserted transcription is set on the object.
 
         Args:
             transcription (Transcription): The transcription to add
+            trace (DictationTrace, optional): Trace stored in the same transaction
+                (the traces table must exist, see TraceRepository)
 
         Returns:
             bool: True if the transcription was added successfully, False otherwise
@@ -68,12 +134,87 @@ class TranscriptionRepository(Database):
             transcription.word_count
         )
 
+        conn = self.get_connection()
         try:
-            self.execute_query(query, params)
+            with conn:
+                transcription.id = conn.execute(query, params).lastrowid
+                if trace is not None:
+                    trace.transcription_id = transcription.id
+                    conn.execute(TRACE_INSERT, trace.to_row())
             return True
         except Exception as e:
             print(f"Error adding transcription: {str(e)}")
             return False
+        finally:
+            conn.close()
+
+    def add_many(
+        self,
+        transcriptions: List[Transcription],
+        skip_existing: bool = False,
+        traces: Optional[List[Optional[DictationTrace]]] = None
+    ) -> bool:
+        """
+        Add several transcriptions to the database in a single transaction.
+        The id of each inserted transcription is set on the object.
+
+        Args:
+            transcriptions (List[Transcription]): The transcriptions to add
+            skip_existing (bool): Skip transcriptions whose timestamp and audio path
+                are already stored (used when replaying the write-behind journal)
+            traces (List[Optional[DictationTrace]], optional): Trace of each transcription,
+                or None, stored in the same transaction (the traces table must exist,
+                see TraceRepository)
+
+        Returns:
+            bool: True if the whole batch was committed, False otherwise
+        """
+        if not transcriptions:
+            return True
+
+        if skip_existing:
+            query = '''
+            INSERT INTO transcriptions (timestamp, audio_path, text, duration, word_count)
+            SELECT ?, ?, ?, ?, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM transcriptions WHERE timestamp = ? AND audio_path = ?
+            )
+            '''
+        else:
+            query = '''
+            INSERT INTO transcriptions (timestamp, audio_path, text, duration, word_count)
+            VALUES (?, ?, ?, ?, ?)
+            '''
+
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                for index, transcription in enumerate(transcriptions):
+                    timestamp = transcription.timestamp.isoformat()
+                    params = (
+                        timestamp,
+                        transcription.audio_path,
+                        transcription.text,
+                        transcription.duration,
+                        transcription.word_count
+                    )
+                    if skip_existing:
+                        params += (timestamp, transcription.audio_path)
+                    cursor.execute(query, params)
+                    if not cursor.rowcount:
+                        continue
+                    transcription.id = cursor.lastrowid
+                    trace = traces[index] if traces else None
+                    if trace is not None:
+                        trace.transcription_id = transcription.id
+                        cursor.execute(TRACE_INSERT, trace.to_row())
+            return True
+        except Exception as e:
+            print(f"Error adding transcriptions: {str(e)}")
+            return False
+        finally:
+            conn.close()
 
     def get_all(self) -> List[Transcription]:
         """
@@ -82,22 +223,90 @@ class TranscriptionRepository(Database):
         Returns:
             List[Transcription]: List of all transcriptions
         """
-        query = "SELECT * FROM transcriptions ORDER BY timestamp DESC"
-        rows = self.execute_query(query, fetch=True)
-
-        transcriptions = []
-        for row in rows:
-            transcription = Transcription(
-                id=row[0],
-                timestamp=datetime.datetime.fromisoformat(row[1].split('.')[0]),
-                audio_path=row[2],
-                text=row[3],
-                duration=row[4],
-                word_count=row[5]
+        query = f"SELECT {TRANSCRIPTION_COLUMNS} FROM transcriptions ORDER BY timestamp DESC"
+        transcriptions = self.execute_query(query, fetch=True, row_factory=transcription_row_factory)
+        return transcriptions or []
+
+    def get_all_rows(self) -> List[tuple]:
+        """
+        Get all transcriptions as raw database rows, newest first.
+        Used by list endpoints that serialize rows straight to JSON.
+
+        Returns:
+            List[tuple]: Rows in TRANSCRIPTION_COLUMNS order
+        """
+        query = f"SELECT {TRANSCRIPTION_COLUMNS} FROM transcriptions ORDER BY timestamp DESC"
+        return self.execute_query(query, fetch=True) or []
+
+    def iter_rows(self, batch_size: int = 500, after_id: int = 0) -> Iterator[tuple]:
+        """
+        Iterate over transcriptions in id order without loading the table into memory.
+        Rows are stepped from a single cursor and fetched in batches.
+
+        Args:
+            batch_size (int): Number of rows fetched from the cursor at a time
+            after_id (int): Only yield rows with an id greater than this
+
+        Yields:
+            tuple: Rows in TRANSCRIPTION_COLUMNS order
+        """
+        conn = self.get_connection(check_same_thread=False)
+        try:
+            cursor = conn.execute(
+                f"SELECT {TRANSCRIPTION_COLUMNS} FROM transcriptions WHERE id > ? ORDER BY id",
+                (after_id,)
             )
-            transcriptions.append(transcription)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
 
-        return transcriptions
+    def import_rows(
+        self,
+        rows: Iterable[tuple],
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Bulk insert rows, committing one executemany transaction per batch.
+
+        Args:
+            rows (Iterable[tuple]): (timestamp, audio_path, text, duration, word_count) tuples
+            batch_size (int): Number of rows per transaction
+            progress (Callable[[int], None], optional): Called with the running total after each batch
+
+        Returns:
+            int: Number of rows inserted
+        """
+        query = '''
+        INSERT INTO transcriptions (timestamp, audio_path, text, duration, word_count)
+        VALUES (?, ?, ?, ?, ?)
+        '''
+        total = 0
+        batch = []
+        conn = self.get_connection()
+        try:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    with conn:
+                        conn.executemany(query, batch)
+                    total += len(batch)
+                    batch = []
+                    if progress:
+                        progress(total)
+            if batch:
+                with conn:
+                    conn.executemany(query, batch)
+                total += len(batch)
+                if progress:
+                    progress(total)
+        finally:
+            conn.close()
+        return total
 
     def get_by_id(self, transcription_id: int) -> Optional[Transcription]:
         """
@@ -109,27 +318,87 @@ class TranscriptionRepository(Database):
         Returns:
             Optional[Transcription]: The transcription if found, None otherwise
         """
-        query = "SELECT * FROM transcriptions WHERE id = ?"
-        row = self.execute_query(query, (transcription_id,), fetch=True, fetch_all=False)
-
-        if row:
-            return Transcription(
-                id=row[0],
-                timestamp=datetime.datetime.fromisoformat(row[1].split('.')[0]),
-                audio_path=row[2],
-                text=row[3],
-                duration=row[4],
-                word_count=row[5]
-            )
+        query = f"SELECT {TRANSCRIPTION_COLUMNS} FROM transcriptions WHERE id = ?"
+        return self.execute_query(
+            query,
+            (transcription_id,),
+            fetch=True,
+            fetch_all=False,
+            row_factory=transcription_row_factory
+        )
+
+    def get_by_ids(self, transcription_ids: List[int], batch_size: int = 500) -> Dict[int, Transcription]:
+        """
+        Get transcriptions by their IDs, with one query per batch of ids.
 
-        return None
+        Args:
+            transcription_ids (List[int]): IDs of the transcriptions to get
+            batch_size (int): Number of ids per query, below SQLite's parameter limit
 
-    def get_stats(self) -> dict:
+        Returns:
+            Dict[int, Transcription]: The transcriptions found, by id; missing ids are left out
         """
-        Get statistics about the transcriptions.
+        found = {}
+        for start in range(0, len(transcription_ids), batch_size):
+            batch = tuple(transcription_ids[start:start + batch_size])
+            query = f"SELECT {TRANSCRIPTION_COLUMNS} FROM transcriptions WHERE id IN ({', '.join('?' * len(batch))})"
+            rows = self.execute_query(query, batch, fetch=True, row_factory=transcription_row_factory) or []
+            found.update((transcription.id, transcription) for transcription in rows)
+        return found
+
+    def get_data_version(self) -> DataVersion:
+        """
+        Get the current version of the transcriptions table.
+        Reads two indexed values and never touches the row data.
 
         Returns:
-            dict: Dictionary containing statistics
+            DataVersion: Max row id, change counter and time of the last change
+        """
+        query = '''
+        SELECT (SELECT COALESCE(MAX(id), 0) FROM transcriptions), change_counter, modified_at
+        FROM table_versions WHERE name = 'transcriptions'
+        '''
+        row = self.execute_query(query, fetch=True, fetch_all=False)
+        if not row:
+            return DataVersion(0, 0, "")
+        return DataVersion(*row)
+
+    def get_legacy_audio_paths(self) -> List[str]:
+        """
+        Get the distinct audio paths that do not reference the audio store.
+
+        Returns:
+            List[str]: Legacy audio file paths
+        """
+        rows = self.execute_query(
+            "SELECT DISTINCT audio_path FROM transcriptions WHERE audio_path NOT LIKE 'store:%' AND audio_path != ''",
+            fetch=True
+        )
+        return [row[0] for row in rows or []]
+
+    def replace_audio_path(self, old_path: str, new_path: str) -> bool:
+        """
+        Point every transcription that references old_path at new_path.
+
+        Args:
+            old_path (str): Current audio path
+            new_path (str): New audio path
+
+        Returns:
+            bool: True if the update ran
+        """
+        result = self.execute_query(
+            "UPDATE transcriptions SET audio_path = ? WHERE audio_path = ?",
+            (new_path, old_path)
+        )
+        return result is not None
+
+    def get_counters(self) -> dict:
+        """
+        Get the aggregate counters of the statistics, without the recent transcriptions.
+
+        Returns:
+            dict: Dictionary containing the totals and today's counters
         """
         # Get total counts
         count_query = "SELECT COUNT(*), SUM(duration), SUM(word_count) FROM transcriptions"
@@ -150,8 +419,29 @@ class TranscriptionRepository(Database):
         today_duration = today_row[1] if today_row and today_row[1] else 0
         today_words = today_row[2] if today_row and today_row[2] else 0
 
+        return {
+            'totalTranscriptions': total_transcriptions,
+            'totalDuration': int(total_duration / 60),  # Convert to minutes
+            'totalWords': total_words,
+            'avgWordsPerMinute': avg_words_per_minute,
+            'todayStats': {
+                'transcriptions': today_count,
+                'duration': int(today_duration / 60),  # Convert to minutes
+                'words': today_words
+            }
+        }
+
+    def get_stats(self) -> dict:
+        """
+        Get statistics about the transcriptions.
+
+        Returns:
+            dict: Dictionary containing statistics
+        """
+        stats = self.get_counters()
+
         # Get recent transcriptions
-        recent_query = "SELECT * FROM transcriptions ORDER BY timestamp DESC LIMIT 3"
+        recent_query = f"SELECT {TRANSCRIPTION_COLUMNS} FROM transcriptions ORDER BY timestamp DESC LIMIT 3"
         recent_rows = self.execute_query(recent_query, fetch=True)
 
         recent_transcriptions = []
@@ -165,15 +455,5 @@ class TranscriptionRepository(Database):
                     'words': row[5]
                 })
 
-        return {
-            'totalTranscriptions': total_transcriptions,
-            'totalDuration': int(total_duration / 60),  # Convert to minutes
-            'totalWords': total_words,
-            'avgWordsPerMinute': avg_words_per_minute,
-            'todayStats': {
-                'transcriptions': today_count,
-                'duration': int(today_duration / 60),  # Convert to minutes
-                'words': today_words
-            },
-            'recentTranscriptions': recent_transcriptions
-        }
+        stats['recentTranscriptions'] = recent_transcriptions
+        return stats
@@ -0,0 +1,402 @@
+"""
+Write-behind queue for transcription history.
+Batches history inserts into single transactions on a background thread so the
+dictation path never waits on the database.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+
+import vaibvoice.config as config
+from vaibvoice.core.audio_store import AudioStore, get_audio_store, is_store_ref
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.models.trace import DictationTrace
+from vaibvoice.models.transcription import Transcription
+from vaibvoice.utils.metrics import get_metrics
+
+_STOP = object()
+
+CommitCallback = Callable[[Transcription], None]
+
+
+class _Entry(NamedTuple):
+    """A queued transcription."""
+    seq: int  # journal sequence number
+    transcription: Transcription
+    on_commit: Optional[CommitCallback]
+    ingest_audio: bool
+    trace: Optional[DictationTrace]
+    queued_at: float  # perf_counter() value when it was queued
+
+
+class _FlushRequest:
+    """Marker placed on the queue to force a flush and signal its completion."""
+
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class WriteBehindQueue:
+    """
+    Queue that batches transcription inserts on a background thread.
+
+    Every queued transcription is first appended to a journal file (without fsync)
+    so that rows which were accepted but not yet committed survive a crash and are
+    replayed on the next start. Batches are written when the batch size is reached,
+    when the flush interval elapses, on an explicit flush, and on shutdown.
+
+    Recordings queued with ingest_audio are moved into the audio store on the
+    writer thread, just before their batch is written, so hashing and storing
+    the WAV stays off the caller's path. The journal entry is rewritten with
+    the store reference before the file is moved, so a replayed row matches
+    the row already committed and never points at a moved-away file. A row
+    replayed before its recording was stored keeps the temporary path;
+    maintenance moves those into the store later.
+
+    Dictation traces are written in the transaction of their transcription,
+    with db_write set to the time the row waited before its batch was written.
+
+    Attributes:
+        repository (TranscriptionRepository): Repository used to write batches
+        journal_path (str): Path to the crash-recovery journal
+        batch_size (int): Number of queued rows that triggers a flush
+        flush_interval (float): Maximum time in seconds a row waits before being written
+    """
+
+    def __init__(
+        self,
+        repository: Optional[TranscriptionRepository] = None,
+        journal_path: str = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+        audio_store: Optional[AudioStore] = None
+    ):
+        """
+        Initialize the WriteBehindQueue.
+
+        Args:
+            repository (TranscriptionRepository, optional): Repository used to write batches
+            journal_path (str, optional): Path to the crash-recovery journal
+            batch_size (int, optional): Number of queued rows that triggers a flush
+            flush_interval (float, optional): Maximum time in seconds a row waits before being written
+            audio_store (AudioStore, optional): Store recordings are ingested into
+        """
+        self.repository = repository or TranscriptionRepository()
+        self.journal_path = journal_path if journal_path is not None else config.HISTORY_JOURNAL_PATH
+        self.batch_size = max(1, batch_size if batch_size is not None else config.HISTORY_BATCH_SIZE)
+        self.flush_interval = flush_interval if flush_interval is not None else config.HISTORY_FLUSH_INTERVAL
+        self.audio_store = audio_store
+
+        self._queue = queue.Queue()
+        # Reentrant: put() journals its entry while holding it
+        self._journal_lock = threading.RLock()
+        self._journal = None
+        self._seq = 0
+        self._committed = 0
+        self._thread = None
+        self._closed = False
+
+    def start(self):
+        """
+        Replay any uncommitted journal entries and start the background writer.
+        """
+        if self._thread is not None:
+            return
+
+        recovered = self.recover()
+        if recovered:
+            print(f"Recovered {recovered} transcription(s) from the history journal.")
+
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="vaibvoice-history-writer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def put(
+        self,
+        transcription: Transcription,
+        on_commit: Optional[CommitCallback] = None,
+        ingest_audio: bool = False,
+        trace: Optional[DictationTrace] = None
+    ) -> bool:
+        """
+        Queue a transcription for writing.
+
+        Args:
+            transcription (Transcription): The transcription to write
+            on_commit (CommitCallback, optional): Called on the writer thread with the
+                transcription, its id set, once its batch has committed
+            ingest_audio (bool): Move the recording at transcription.audio_path into
+                the audio store before writing, and store the reference instead
+            trace (DictationTrace, optional): Timing breakdown stored with the transcription.
+                Not journaled: rows replayed after a crash have no trace.
+
+        Returns:
+            bool: True if the transcription was accepted, False if the queue is closed
+        """
+        if self._closed or self._thread is None:
+            return False
+
+        queued_at = time.perf_counter()
+        try:
+            with self._journal_lock:
+                self._seq += 1
+                self._journal_entry(self._seq, transcription)
+                self._queue.put(_Entry(self._seq, transcription, on_commit, ingest_audio, trace, queued_at))
+            return True
+        except Exception as e:
+            print(f"Error queueing transcription: {str(e)}")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write all queued transcriptions and wait for the batch to commit.
+
+        Args:
+            timeout (float, optional): Maximum time in seconds to wait
+
+        Returns:
+            bool: True if the flush completed within the timeout, False otherwise
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return False
+
+        request = _FlushRequest()
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Flush the remaining transcriptions and stop the background writer.
+        After a clean close the journal is empty and removed.
+
+        Args:
+            timeout (float, optional): Maximum time in seconds to wait for the writer
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+        with self._journal_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+                if self._committed == self._seq:
+                    os.remove(self.journal_path)
+
+    def recover(self) -> int:
+        """
+        Replay journal entries that were not committed before the last shutdown.
+        Rows that already reached the database are skipped.
+
+        Returns:
+            int: Number of journal entries replayed
+        """
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        entries = {}
+        sources = {}
+        committed = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write
+                        continue
+                    if "committed" in entry:
+                        committed = max(committed, entry["committed"])
+                    elif "seq" in entry:
+                        # A later line for the same seq carries the store reference
+                        entries[entry["seq"]] = entry["transcription"]
+                        sources[entry["seq"]] = entry.get("source")
+        except Exception as e:
+            print(f"Error reading history journal: {str(e)}")
+            return 0
+
+        pending = []
+        for seq, data in sorted(entries.items()):
+            if seq > committed:
+                transcription = Transcription.from_dict(data)
+                # Keep the exact stored timestamp so committed rows are recognised
+                transcription.timestamp = datetime.fromisoformat(data["timestamp"])
+                source = sources[seq]
+                if source and self._get_audio_store().resolve(transcription.audio_path) is None:
+                    # Crashed after journaling the reference, before the recording was stored
+                    transcription.audio_path = source
+                pending.append(transcription)
+        if pending and not self.repository.add_many(pending, skip_existing=True):
+            print("Failed to replay the history journal. It will be retried on next start.")
+            return 0
+
+        os.remove(self.journal_path)
+        return len(pending)
+
+    def _run(self):
+        """
+        Background writer loop.
+        """
+        pending: List[_Entry] = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None:
+                pending = self._write_batch(pending)
+                deadline = time.monotonic() + self.flush_interval if pending else None
+            elif item is _STOP:
+                self._write_batch(pending)
+                return
+            elif isinstance(item, _FlushRequest):
+                pending = self._write_batch(pending)
+                deadline = time.monotonic() + self.flush_interval if pending else None
+                item.done.set()
+            else:
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) >= self.batch_size:
+                    pending = self._write_batch(pending)
+                    deadline = time.monotonic() + self.flush_interval if pending else None
+
+    def _write_batch(self, pending: List[_Entry]) -> List[_Entry]:
+        """
+        Write a batch in a single transaction, record it as committed in the journal
+        and run the commit callbacks of its entries.
+
+        Args:
+            pending (List[_Entry]): Queued entries
+
+        Returns:
+            List[_Entry]: The entries still pending (the whole batch on failure)
+        """
+        if not pending:
+            return pending
+
+        for entry in pending:
+            transcription = entry.transcription
+            if entry.ingest_audio and transcription.audio_path and not is_store_ref(transcription.audio_path):
+                source = transcription.audio_path
+
+                def journal_ref(ref, entry=entry, source=source):
+                    self._journal_entry(entry.seq, entry.transcription, audio_path=ref, source=source)
+
+                # Keep the temporary path if the recording cannot be stored
+                with get_metrics().span("audio_ingest"):
+                    ref = self._get_audio_store().ingest(source, before_move=journal_ref)
+                if ref is not None:
+                    transcription.audio_path = ref
+
+        now = time.perf_counter()
+        for entry in pending:
+            if entry.trace is not None:
+                entry.trace.db_write = now - entry.queued_at
+
+        with get_metrics().span("db_write"):
+            written = self.repository.add_many(
+                [entry.transcription for entry in pending],
+                traces=[entry.trace for entry in pending]
+            )
+        if not written:
+            print("Failed to write history batch. It will be retried.")
+            return pending
+
+        self._mark_committed(pending[-1].seq)
+        for entry in pending:
+            if entry.on_commit is not None:
+                try:
+                    entry.on_commit(entry.transcription)
+                except Exception as e:
+                    print(f"Error in history commit callback: {str(e)}")
+        return []
+
+    def _get_audio_store(self) -> AudioStore:
+        """Get the audio store, the process-wide one unless another was given."""
+        if self.audio_store is None:
+            self.audio_store = get_audio_store()
+        return self.audio_store
+
+    def _journal_entry(self, seq: int, transcription: Transcription, audio_path: str = None, source: str = None):
+        """
+        Append a transcription to the journal; a later entry with the same seq replaces it.
+
+        Args:
+            seq (int): Sequence number of the entry
+            transcription (Transcription): The transcription
+            audio_path (str, optional): Audio path to journal instead of the transcription's
+            source (str, optional): Temporary recording the audio path was ingested from
+
+        Raises:
+            OSError: If the journal cannot be written
+        """
+        data = transcription.to_dict()
+        if audio_path is not None:
+            data["audio_path"] = audio_path
+        entry = {"seq": seq, "transcription": data}
+        if source is not None:
+            entry["source"] = source
+        with self._journal_lock:
+            if self._journal is None:
+                raise OSError("The history journal is closed")
+            self._journal.write(json.dumps(entry) + "\n")
+            self._journal.flush()
+
+    def _mark_committed(self, seq: int):
+        """
+        Record that every journal entry up to seq has been committed.
+
+        Args:
+            seq (int): Sequence number of the last committed entry
+        """
+        with self._journal_lock:
+            self._committed = seq
+            if self._journal is None:
+                return
+            if self._queue.empty():
+                # Everything journaled so far is committed: start a fresh journal
+                self._journal.seek(0)
+                self._journal.truncate()
+                self._seq = self._committed = 0
+            else:
+                self._journal.write(json.dumps({"committed": self._committed}) + "\n")
+                self._journal.flush()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_history_writer() -> WriteBehindQueue:
+    """
+    Get the process-wide history writer, starting it on first use.
+    The writer is flushed and closed automatically on interpreter exit.
+
+    Returns:
+        WriteBehindQueue: The shared history writer
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehindQueue()
+            _writer.start()
+            atexit.register(_writer.close)
+        return _writer
@@ -1,74 +1,129 @@
 """
 Main module for VaibVoice.
 Provides the entry point for the application.
+
+Startup is ordered so the key listener is ready as soon as possible: the
+API server, the GUI build and the background services start on a separate
+thread, and the slow-to-import audio, typing and OpenAI libraries are loaded
+on another one ahead of the first dictation.
 """
 
 import os
+import socket
 import sys
+import threading
 import time
 import webbrowser
-import threading
-import pathlib
-from http.server import HTTPServer, SimpleHTTPRequestHandler
 
 import vaibvoice.config as config
 from vaibvoice.core.keyboard import key_recording
-from vaibvoice.api.server import start_api_server_thread
 
-class SPAHandler(SimpleHTTPRequestHandler):
+def ensure_gui_built(build_dir: str = None):
     """
-    Custom HTTP request handler for Single Page Applications.
-    Serves index.html for all routes that don't correspond to static files.
-    """
-    def do_GET(self):
-        # Parse the requested path
-        url_parts = self.path.split('?')
-        request_path = url_parts[0]
-
-        # Check if the requested file exists
-        file_path = self.translate_path(request_path)
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            # If the file exists, serve it normally
-            return SimpleHTTPRequestHandler.do_GET(self)
-        else:
-            # If the file doesn't exist, serve index.html
-            self.path = '/index.html'
-            return SimpleHTTPRequestHandler.do_GET(self)
-
-def start_gui_server(host: str = None, port: int = None):
-    """
-    Start a simple HTTP server to serve the GUI.
+    Build the GUI if it has not been built yet and precompress its assets.
 
     Args:
-        host (str): Host to bind the server to
-        port (int): Port to bind the server to
-
-    Returns:
-        threading.Thread: The thread running the GUI server
+        build_dir (str): Directory of the built GUI
     """
-    host = host if host is not None else config.GUI_HOST
-    port = port if port is not None else config.GUI_PORT
-    # Verify if the GUI is built
-    gui_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gui")
-    build_dir = os.path.join(gui_dir, "dist")
+    from vaibvoice.api.static import precompress_assets
+
+    build_dir = build_dir if build_dir is not None else config.GUI_DIST_DIR
+    gui_dir = os.path.dirname(build_dir)
 
     if not os.path.exists(build_dir):
         print("Building GUI...")
-        os.system(f"cd {gui_dir} && npm run build")
+        os.system(f'cd "{gui_dir}" && npm run build')
+
+    if os.path.isdir(build_dir):
+        precompress_assets(build_dir)
+
+def wait_for_port(host: str, port: int, timeout: float) -> bool:
+    """
+    Wait until a TCP port accepts connections.
 
-    # Change directory to serve static files
-    os.chdir(build_dir)
+    Args:
+        host (str): Host to connect to
+        port (int): Port to connect to
+        timeout (float): Seconds to wait at most
 
-    # Start a simple HTTP server with the custom SPA handler
-    server = HTTPServer((host, port), SPAHandler)
-    server_thread = threading.Thread(target=server.serve_forever)
-    server_thread.daemon = True
-    server_thread.start()
+    Returns:
+        bool: True if the port accepted a connection in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def start_services():
+    """
+    Start the API server and the background services, then open the GUI.
+    Runs on a background thread while the key listener starts.
+    """
+    from vaibvoice.api.server import start_api_server_process, start_api_server_thread
+    from vaibvoice.services.maintenance_service import get_maintenance_scheduler
+    from vaibvoice.services.metrics_service import get_metrics_exporter
+    from vaibvoice.services.similarity_service import get_similarity_service
+    from vaibvoice.services.transcription_job_service import get_transcription_workers
+
+    # Build the GUI before the API server starts, as the server mounts it
+    ensure_gui_built()
+
+    # Start the API server, which also serves the GUI, in a separate thread,
+    # or as worker processes sharing state through the database
+    if config.API_WORKERS > 1:
+        start_api_server_process(host=config.API_HOST, port=config.API_PORT)
+        # Dictation runs in this process, which the workers' /metrics cannot see
+        get_metrics_exporter().start()
+    else:
+        start_api_server_thread(host=config.API_HOST, port=config.API_PORT)
+
+    # Start periodic retention and database maintenance
+    get_maintenance_scheduler().start()
+
+    # Load or build the similarity index, so the first query does not wait for it
+    get_similarity_service().start()
+
+    # Start the workers for transcription jobs submitted over HTTP; jobs
+    # interrupted by a previous shutdown are picked up again
+    get_transcription_workers().start()
+
+    if wait_for_port(config.API_HOST, config.API_PORT, timeout=30):
+        print(f"API server running at http://{config.API_HOST}:{config.API_PORT}/api")
+    else:
+        print(f"API server did not start on port {config.API_PORT}.")
+        return
+
+    # Open the GUI
+    gui_url = f"http://{config.API_HOST}:{config.API_PORT}"
+    webbrowser.open(gui_url)
+    print(f"GUI running at {gui_url}")
+
+def preload_dependencies():
+    """
+    Import the libraries the first dictation needs, so that it does not pay for them.
+    Each is optional here: a failure is reported again when the library is used.
+    """
+    try:
+        # Importing sounddevice initializes PortAudio
+        import sounddevice  # noqa: F401
+    except Exception as e:
+        print(f"Error loading the audio backend: {e}")
 
-    # Open the browser
-    webbrowser.open(f'http://{host}:{port}')
+    try:
+        import pyautogui  # noqa: F401
+        import pyperclip  # noqa: F401
+    except Exception as e:
+        print(f"Error loading the typing backend: {e}")
 
-    return server_thread
+    try:
+        from vaibvoice.core.openai_client import get_openai_client
+        get_openai_client()
+    except Exception as e:
+        print(f"Error creating the OpenAI client: {e}")
 
 def main():
     """
@@ -77,13 +132,9 @@ def main():
     # Ensure the audio_temp directory exists
     os.makedirs(config.AUDIO_TEMP_DIR, exist_ok=True)
 
-    # Start the API server in a separate thread
-    api_thread = start_api_server_thread(host=config.API_HOST, port=config.API_PORT)
-    print(f"API server running at http://{config.API_HOST}:{config.API_PORT}")
-
-    # Start the GUI server in a separate thread
-    gui_thread = start_gui_server(host=config.GUI_HOST, port=config.GUI_PORT)
-    print(f"GUI running at http://{config.GUI_HOST}:{config.GUI_PORT}")
+    # Bring up the API and load the audio subsystem in parallel with the key listener
+    threading.Thread(target=start_services, name="vaibvoice-services", daemon=True).start()
+    threading.Thread(target=preload_dependencies, name="vaibvoice-preload", daemon=True).start()
 
     # Start the key recording mode
     try:
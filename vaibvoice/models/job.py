@@ -0,0 +1,131 @@
+"""
+Domain models for transcription jobs.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATUSES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+JOB_COLUMNS = (
+    "id, status, audio_path, filename, created_at, started_at, finished_at, "
+    "duration, text, error, transcription_id, cancel_requested"
+)
+
+class TranscriptionJob:
+    """
+    Domain model for a transcription job submitted through the API.
+
+    Attributes:
+        id (str): Unique identifier for the job
+        status (str): queued, running, done, failed or cancelled
+        audio_path (str): Path to the uploaded audio, or its audio store reference once done
+        filename (str): Name of the uploaded file as given by the client
+        created_at (datetime): When the job was submitted
+        started_at (datetime): When a worker picked the job up
+        finished_at (datetime): When the job reached a final status
+        duration (float): Duration of the audio in seconds
+        text (str): Formatted transcription once done; while running, the text streamed so far
+            if the job is followed from another process (see TranscriptionWorkerPool)
+        error (str): Failure reason, if the job failed
+        transcription_id (int): Id of the history entry created for the job
+        cancel_requested (bool): Whether cancellation was requested while running
+    """
+
+    __slots__ = (
+        "id", "status", "audio_path", "filename", "created_at", "started_at", "finished_at",
+        "duration", "text", "error", "transcription_id", "cancel_requested"
+    )
+
+    def __init__(
+        self,
+        id: str,
+        audio_path: str,
+        filename: Optional[str] = None,
+        status: str = JOB_QUEUED,
+        created_at: Optional[datetime] = None
+    ):
+        """
+        Initialize a queued TranscriptionJob.
+
+        Args:
+            id (str): Unique identifier for the job
+            audio_path (str): Path to the uploaded audio
+            filename (str, optional): Name of the uploaded file
+            status (str): Initial status
+            created_at (datetime, optional): When the job was submitted
+        """
+        self.id = id
+        self.status = status
+        self.audio_path = audio_path
+        self.filename = filename
+        self.created_at = created_at or datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.duration = None
+        self.text = None
+        self.error = None
+        self.transcription_id = None
+        self.cancel_requested = False
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether the job reached a final status.
+
+        Returns:
+            bool: True if done, failed or cancelled
+        """
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self):
+        """
+        Convert the TranscriptionJob object to a dictionary.
+
+        Returns:
+            dict: Dictionary representation of the TranscriptionJob
+        """
+        return {
+            "id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration": self.duration,
+            "text": self.text,
+            "error": self.error,
+            "transcription_id": self.transcription_id,
+            "cancel_requested": self.cancel_requested
+        }
+
+    @classmethod
+    def from_row(cls, row: tuple):
+        """
+        Create a TranscriptionJob object directly from a database row.
+
+        Args:
+            row (tuple): Row selected with JOB_COLUMNS
+
+        Returns:
+            TranscriptionJob: A new TranscriptionJob object
+        """
+        job = cls.__new__(cls)
+        job.id = row[0]
+        job.status = row[1]
+        job.audio_path = row[2]
+        job.filename = row[3]
+        job.created_at = datetime.fromisoformat(row[4]) if row[4] else None
+        job.started_at = datetime.fromisoformat(row[5]) if row[5] else None
+        job.finished_at = datetime.fromisoformat(row[6]) if row[6] else None
+        job.duration = row[7]
+        job.text = row[8]
+        job.error = row[9]
+        job.transcription_id = row[10]
+        job.cancel_requested = bool(row[11])
+        return job
@@ -19,6 +19,17 @@ class Settings:
         end_sound (str): Sound played when recording ends
     """
 
+    __slots__ = (
+        "id",
+        "record_key",
+        "openai_api_key",
+        "transcription_model",
+        "transcription_language",
+        "llm_model",
+        "start_sound",
+        "end_sound",
+    )
+
     def __init__(
         self,
         id: int = 1,
@@ -91,3 +102,17 @@ class Settings:
             start_sound=data.get("start_sound", "beep.mp3"),
             end_sound=data.get("end_sound", "stop.mp3")
         )
+
+    @classmethod
+    def from_row(cls, row: tuple):
+        """
+        Create a Settings object directly from a database row.
+        The row must follow the column order of the settings table.
+
+        Args:
+            row (tuple): Row from the settings table
+
+        Returns:
+            Settings: A new Settings object
+        """
+        return cls(*row)
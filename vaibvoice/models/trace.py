@@ -0,0 +1,137 @@
+"""
+Domain models for dictation traces.
+"""
+
+from typing import Optional
+
+# Timing fields, in seconds, in the column order of the transcription_traces table
+TRACE_TIMINGS = (
+    "stream_open", "capture", "encode", "upload", "first_delta", "transcription",
+    "format", "paste", "db_write", "total"
+)
+
+TRACE_COLUMNS = (
+    "transcription_id, " + ", ".join(TRACE_TIMINGS) + ", upload_bytes, "
+    "transcription_model, llm_model, transcription_input_tokens, transcription_output_tokens, "
+    "format_input_tokens, format_output_tokens"
+)
+
+# Instrumentation stages (see vaibvoice.utils.metrics) and the trace fields they add to
+STAGE_FIELDS = {
+    "stream_open": "stream_open",
+    "capture": "capture",
+    "concatenate": "encode",
+    "file_write": "encode",
+    "upload": "upload",
+    "transcription": "transcription",
+    "format": "format",
+    "paste": "paste",
+    "db_write": "db_write",
+    "dictation": "total",
+}
+
+class DictationTrace:
+    """
+    Domain model for the timing breakdown of one dictation.
+
+    Attributes:
+        transcription_id (int): Id of the transcription the trace belongs to
+        stream_open (float): Key press until the microphone stream was running
+        capture (float): Length of the recording
+        encode (float): Joining the captured frames and writing the WAV file
+        upload (float): Sending the audio until the API started responding
+        first_delta (float): Start of the upload until the first streamed text
+        transcription (float): Streaming the transcription until it was done
+        format (float): The formatting request
+        paste (float): Typing the text into the focused input box
+        db_write (float): Queueing the history entry until its batch was written
+        total (float): Key release until the text was typed
+        upload_bytes (int): Size of the uploaded audio
+        transcription_model (str): Model used for the transcription
+        llm_model (str): Model used for the formatting
+        transcription_input_tokens (int): Input tokens billed for the transcription
+        transcription_output_tokens (int): Output tokens billed for the transcription
+        format_input_tokens (int): Input tokens billed for the formatting
+        format_output_tokens (int): Output tokens billed for the formatting
+    """
+
+    __slots__ = ("transcription_id",) + TRACE_TIMINGS + (
+        "upload_bytes", "transcription_model", "llm_model",
+        "transcription_input_tokens", "transcription_output_tokens",
+        "format_input_tokens", "format_output_tokens"
+    )
+
+    def __init__(self, transcription_id: Optional[int] = None):
+        """
+        Initialize an empty DictationTrace.
+
+        Args:
+            transcription_id (int, optional): Id of the transcription the trace belongs to
+        """
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.transcription_id = transcription_id
+
+    def add_stage(self, stage: str, seconds: float):
+        """
+        Add the duration of an instrumented stage to the matching field.
+        Stages without a field are ignored.
+
+        Args:
+            stage (str): Name of the stage
+            seconds (float): Duration in seconds
+        """
+        field = STAGE_FIELDS.get(stage)
+        if field is not None:
+            setattr(self, field, (getattr(self, field) or 0.0) + seconds)
+
+    def add_usage(self, prefix: str, usage):
+        """
+        Record the token usage reported by the API.
+
+        Args:
+            prefix (str): "transcription" or "format"
+            usage: Usage object of an API response; None is ignored
+        """
+        if usage is None:
+            return
+        input_tokens = getattr(usage, "input_tokens", None) or getattr(usage, "prompt_tokens", None)
+        output_tokens = getattr(usage, "output_tokens", None) or getattr(usage, "completion_tokens", None)
+        if input_tokens is not None:
+            setattr(self, f"{prefix}_input_tokens", input_tokens)
+        if output_tokens is not None:
+            setattr(self, f"{prefix}_output_tokens", output_tokens)
+
+    def to_row(self) -> tuple:
+        """
+        Convert the trace to a row in the order of TRACE_COLUMNS.
+
+        Returns:
+            tuple: The row
+        """
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self):
+        """
+        Convert the DictationTrace object to a dictionary.
+
+        Returns:
+            dict: Dictionary representation of the DictationTrace
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_row(cls, row: tuple):
+        """
+        Create a DictationTrace object directly from a database row.
+
+        Args:
+            row (tuple): Row selected with TRACE_COLUMNS
+
+        Returns:
+            DictationTrace: A new DictationTrace object
+        """
+        trace = cls.__new__(cls)
+        for name, value in zip(cls.__slots__, row):
+            setattr(trace, name, value)
+        return trace
@@ -5,6 +5,27 @@ Domain models for transcriptions.
 from datetime import datetime
 from typing import Optional
 
+def transcription_row_to_dict(row: tuple) -> dict:
+    """
+    Convert a transcriptions row to its API dictionary form without building
+    a Transcription object. Matches Transcription.from_row(row).to_dict() except
+    that the timestamp keeps the API's second precision.
+    
+    Args:
+        row (tuple): (id, timestamp, audio_path, text, duration, word_count)
+        
+    Returns:
+        dict: The row as a dictionary
+    """
+    return {
+        "id": row[0],
+        "timestamp": row[1].split('.')[0],
+        "audio_path": row[2],
+        "text": row[3],
+        "duration": row[4],
+        "word_count": row[5]
+    }
+
 class Transcription:
     """
     Domain model for a transcription.
@@ -18,6 +39,8 @@ class Transcription:
         word_count (int): Number of words in the transcription
     """
     
+    __slots__ = ("id", "timestamp", "audio_path", "text", "duration", "word_count")
+    
     def __init__(
         self,
         id: Optional[int] = None,
@@ -88,4 +111,25 @@ class Transcription:
             text=data.get("text", ""),
             duration=data.get("duration", 0.0),
             word_count=data.get("word_count")
-        )
\ No newline at end of file
+        )
+    
+    @classmethod
+    def from_row(cls, row: tuple):
+        """
+        Create a Transcription object directly from a database row.
+        The row must follow the column order of the transcriptions table.
+        
+        Args:
+            row (tuple): (id, timestamp, audio_path, text, duration, word_count)
+            
+        Returns:
+            Transcription: A new Transcription object
+        """
+        transcription = cls.__new__(cls)
+        transcription.id = row[0]
+        transcription.timestamp = datetime.fromisoformat(row[1].split('.')[0])
+        transcription.audio_path = row[2]
+        transcription.text = row[3]
+        transcription.duration = row[4]
+        transcription.word_count = row[5]
+        return transcription
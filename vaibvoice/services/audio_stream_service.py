@@ -0,0 +1,219 @@
+"""
+Service for streaming recordings.
+Resolves the audio file of a transcription and keeps Opus copies of
+recordings for clients that stream them.
+"""
+
+import contextlib
+import os
+import tempfile
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+import vaibvoice.config as config
+from vaibvoice.core.audio_store import AudioStore, derived_path, get_audio_store
+from vaibvoice.core.transcode import transcode_to_opus
+
+AUDIO_MEDIA_TYPES = {
+    "wav": "audio/wav",
+    "flac": "audio/flac",
+    "opus": "audio/ogg; codecs=opus",
+}
+
+
+class AudioFile(NamedTuple):
+    """
+    An audio file ready to be served.
+    """
+    key: str  # content key of the recording, see AudioStore.content_key
+    path: str
+    format: str  # key of AUDIO_MEDIA_TYPES
+
+
+class AudioStreamService:
+    """
+    Service for streaming recordings.
+
+    Opus copies are transcoded on first request and kept in a cache directory
+    named by the content key of the recording. Concurrent requests for the same
+    recording transcode it once. When the cache grows past its quota the least
+    recently served copies are deleted.
+
+    Attributes:
+        audio_store (AudioStore): Store the recordings are resolved through
+        cache_dir (str): Directory of the Opus copies
+        quota_bytes (int): Maximum size of the cache (0 disables eviction)
+    """
+
+    def __init__(self, audio_store: Optional[AudioStore] = None, cache_dir: str = None, quota_mb: int = None):
+        """
+        Initialize the AudioStreamService.
+
+        Args:
+            audio_store (AudioStore, optional): Store the recordings are resolved through
+            cache_dir (str, optional): Directory of the Opus copies
+            quota_mb (int, optional): Maximum size of the cache in MB
+        """
+        self.audio_store = audio_store or get_audio_store()
+        self.cache_dir = cache_dir if cache_dir is not None else config.TRANSCODE_CACHE_DIR
+        quota_mb = quota_mb if quota_mb is not None else config.TRANSCODE_CACHE_MB
+        self.quota_bytes = quota_mb * 1024 * 1024
+        # Per recording: [lock, number of requests holding or waiting for it]
+        self._locks: Dict[str, List] = {}
+        self._locks_lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+
+    def get_audio_file(self, audio_path: str, format: str = "original") -> Optional[AudioFile]:
+        """
+        Get the file to serve for a recording.
+
+        Args:
+            audio_path (str): Value of transcriptions.audio_path
+            format (str): "original" for the stored file, "opus" for an Opus copy
+
+        Returns:
+            Optional[AudioFile]: The file, or None if the recording is missing,
+                evicted, in an unknown format or cannot be transcoded
+        """
+        # Throttled by the store, so seeking with Range requests does not write on each one
+        path = self.audio_store.resolve(audio_path, touch=True)
+        if path is None:
+            return None
+        key = self.audio_store.content_key(audio_path, path)
+
+        if format != "opus":
+            extension = os.path.splitext(path)[1].lstrip(".").lower()
+            return AudioFile(key, path, extension) if extension in AUDIO_MEDIA_TYPES else None
+
+        cache_path = derived_path(self.cache_dir, key, "opus")
+        if self._touch(cache_path):
+            return AudioFile(key, cache_path, "opus")
+
+        try:
+            with self._locked(key):
+                # Another request may have transcoded it while we waited
+                if not os.path.isfile(cache_path):
+                    self._transcode(path, cache_path)
+        except Exception as e:
+            print(f"Error transcoding {audio_path}: {str(e)}")
+            return None
+
+        self.enforce_quota(keep=cache_path)
+        return AudioFile(key, cache_path, "opus")
+
+    def enforce_quota(self, keep: Optional[str] = None) -> int:
+        """
+        Delete least recently served Opus copies until the cache fits its quota.
+
+        Args:
+            keep (str, optional): Copy that must not be deleted, e.g. the one about to be served
+
+        Returns:
+            int: Number of copies deleted
+        """
+        if self.quota_bytes <= 0:
+            return 0
+        with self._evict_lock:
+            copies = []
+            for directory, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    if not name.endswith(".opus"):
+                        continue
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    copies.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in copies)
+            deleted = 0
+            for _, size, path in sorted(copies):
+                if total <= self.quota_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                deleted += 1
+            return deleted
+
+    @contextlib.contextmanager
+    def _locked(self, key: str):
+        """
+        Hold the lock serializing the transcoding of one recording.
+        The lock is dropped once no request holds or waits for it.
+
+        Args:
+            key (str): Content key of the recording
+        """
+        with self._locks_lock:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    @staticmethod
+    def _touch(cache_path: str) -> bool:
+        """
+        Mark an Opus copy as served, for LRU eviction.
+
+        Args:
+            cache_path (str): Path of the copy
+
+        Returns:
+            bool: True if the copy exists
+        """
+        try:
+            os.utime(cache_path)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _transcode(path: str, cache_path: str):
+        """
+        Transcode a recording into the cache atomically, so readers never see a partial file.
+
+        Args:
+            path (str): Path of the recording
+            cache_path (str): Path of the Opus copy
+        """
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+        os.close(fd)
+        try:
+            transcode_to_opus(path, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_audio_stream_service() -> AudioStreamService:
+    """
+    Get the process-wide audio stream service.
+
+    Returns:
+        AudioStreamService: The shared audio stream service
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = AudioStreamService()
+        return _service
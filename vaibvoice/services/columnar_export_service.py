@@ -0,0 +1,256 @@
+"""
+Service for columnar exports of the transcription history.
+Writes transcriptions and audio metadata to Parquet or Arrow IPC files for analytics.
+"""
+
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from vaibvoice.core.audio_store import AudioStore, get_audio_store
+from vaibvoice.db.repositories.export_watermark_repository import ExportWatermarkRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.utils.audio_utils import get_audio_metadata
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+FILE_EXTENSIONS = {
+    "parquet": "parquet",
+    "arrow": "arrow",
+}
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow, which is an optional dependency.
+
+    Returns:
+        module: The pyarrow module
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Columnar export requires pyarrow. Install it with: pip install 'vaibvoice[analytics]'"
+        ) from None
+    return pyarrow
+
+
+class ColumnarExportService:
+    """
+    Service for columnar exports of the transcription history.
+
+    Rows are read from SQLite in batches and each batch becomes one Parquet row
+    group or one Arrow record batch, so no per-row API objects are created.
+    In incremental mode the output is a directory of part files and only rows
+    newer than the watermark of the previous export are written.
+
+    Attributes:
+        repository (TranscriptionRepository): Repository for transcription data access
+        watermarks (ExportWatermarkRepository): Repository for export watermarks
+        audio_store (AudioStore): Store used to resolve recordings
+    """
+
+    def __init__(
+        self,
+        repository: Optional[TranscriptionRepository] = None,
+        watermarks: Optional[ExportWatermarkRepository] = None,
+        audio_store: Optional[AudioStore] = None
+    ):
+        """
+        Initialize the ColumnarExportService.
+
+        Args:
+            repository (TranscriptionRepository, optional): Repository for transcription data access
+            watermarks (ExportWatermarkRepository, optional): Repository for export watermarks
+            audio_store (AudioStore, optional): Store used to resolve recordings
+        """
+        self.repository = repository or TranscriptionRepository()
+        self.watermarks = watermarks or ExportWatermarkRepository(self.repository.db_path)
+        self.audio_store = audio_store or get_audio_store()
+        self._invalid_timestamps = 0
+
+    def export(
+        self,
+        output: str,
+        export_format: str = "parquet",
+        incremental: bool = False,
+        batch_rows: int = 10000
+    ) -> Dict:
+        """
+        Export transcriptions to a columnar file.
+
+        Args:
+            output (str): Output file, or output directory in incremental mode
+            export_format (str): "parquet" or "arrow"
+            incremental (bool): Only export rows newer than the last export to this directory
+            batch_rows (int): Number of rows per row group / record batch
+
+        Returns:
+            Dict: {"rows": rows written, "path": file written or None, "last_id": new watermark,
+                "invalid_timestamps": rows whose timestamp could not be parsed and was written as null}
+
+        Raises:
+            ValueError: If the format is not supported
+            ImportError: If pyarrow is not installed
+        """
+        if export_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported columnar format: {export_format}")
+        pa = _import_pyarrow()
+
+        self._invalid_timestamps = 0
+        target = os.path.abspath(output)
+        after_id = self.watermarks.get(target) if incremental else 0
+        batches = self._iter_batches(pa, after_id, batch_rows)
+
+        first = next(batches, None)
+        if first is None:
+            return {"rows": 0, "path": None, "last_id": after_id, "invalid_timestamps": 0}
+
+        if incremental:
+            os.makedirs(target, exist_ok=True)
+            first_id = first.column("id")[0].as_py()
+            path = os.path.join(
+                target,
+                f"part-{first_id:012d}.{FILE_EXTENSIONS[export_format]}"
+            )
+        else:
+            parent = os.path.dirname(target)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            path = target
+
+        # Write to a temporary name so readers never see a partial file
+        tmp_path = path + ".tmp"
+        rows = 0
+        last_id = after_id
+        try:
+            with self._open_writer(pa, export_format, tmp_path, first.schema) as write:
+                for batch in self._chain(first, batches):
+                    write(batch)
+                    rows += batch.num_rows
+                    last_id = batch.column("id")[-1].as_py()
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        if incremental:
+            self.watermarks.set(target, last_id)
+
+        return {"rows": rows, "path": path, "last_id": last_id, "invalid_timestamps": self._invalid_timestamps}
+
+    def _iter_batches(self, pa, after_id: int, batch_rows: int) -> Iterator:
+        """
+        Read rows newer than after_id and convert them to record batches.
+
+        Args:
+            pa (module): The pyarrow module
+            after_id (int): Only rows with a greater id are read
+            batch_rows (int): Number of rows per batch
+
+        Yields:
+            pyarrow.RecordBatch: The next batch of rows
+        """
+        schema = self._schema(pa)
+        columns = self._empty_columns()
+        count = 0
+        for row in self.repository.iter_rows(batch_size=batch_rows, after_id=after_id):
+            audio = get_audio_metadata(self.audio_store.resolve(row[2], touch=False))
+            columns["id"].append(row[0])
+            columns["timestamp"].append(self._parse_timestamp(row[1]))
+            columns["audio_path"].append(row[2])
+            columns["text"].append(row[3])
+            columns["duration"].append(row[4])
+            columns["word_count"].append(row[5])
+            columns["audio_duration"].append(audio["duration"] if audio else None)
+            columns["audio_sample_rate"].append(audio["sample_rate"] if audio else None)
+            columns["audio_channels"].append(audio["channels"] if audio else None)
+            count += 1
+            if count >= batch_rows:
+                yield pa.RecordBatch.from_pydict(columns, schema=schema)
+                columns = self._empty_columns()
+                count = 0
+        if count:
+            yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+    def _parse_timestamp(self, timestamp: str) -> Optional[datetime]:
+        """
+        Parse a stored timestamp; a malformed one is counted and exported as null
+        instead of aborting the export.
+
+        Args:
+            timestamp (str): Value of transcriptions.timestamp
+
+        Returns:
+            Optional[datetime]: The timestamp, or None if it cannot be parsed
+        """
+        try:
+            return datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            self._invalid_timestamps += 1
+            return None
+
+    @staticmethod
+    def _schema(pa):
+        """Arrow schema of the export."""
+        return pa.schema([
+            ("id", pa.int64()),
+            ("timestamp", pa.timestamp("us")),
+            ("audio_path", pa.string()),
+            ("text", pa.string()),
+            ("duration", pa.float64()),
+            ("word_count", pa.int64()),
+            ("audio_duration", pa.float64()),
+            ("audio_sample_rate", pa.int32()),
+            ("audio_channels", pa.int16()),
+        ])
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, List]:
+        """Column buffers for one batch."""
+        return {
+            "id": [],
+            "timestamp": [],
+            "audio_path": [],
+            "text": [],
+            "duration": [],
+            "word_count": [],
+            "audio_duration": [],
+            "audio_sample_rate": [],
+            "audio_channels": [],
+        }
+
+    @staticmethod
+    def _chain(first, rest: Iterator) -> Iterator:
+        """Yield the first batch followed by the remaining ones."""
+        yield first
+        yield from rest
+
+    @staticmethod
+    @contextmanager
+    def _open_writer(pa, export_format: str, path: str, schema):
+        """
+        Open a writer for the format and yield a function that writes one batch.
+
+        Args:
+            pa (module): The pyarrow module
+            export_format (str): "parquet" or "arrow"
+            path (str): File to write
+            schema (pyarrow.Schema): Schema of the batches
+
+        Yields:
+            Callable: write(batch)
+        """
+        if export_format == "parquet":
+            with pa.parquet.ParquetWriter(path, schema, compression="zstd") as parquet_writer:
+                # Each batch is written as its own row group
+                yield lambda batch: parquet_writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, schema) as ipc_writer:
+                yield ipc_writer.write_batch
@@ -0,0 +1,505 @@
+"""
+Event bus for pushing changes to API clients.
+Events are kept for resume and fanned out to bounded subscriber queues, either
+within one process or, with several API workers, through the database.
+"""
+
+import asyncio
+import collections
+import itertools
+import json
+import threading
+import uuid
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+import vaibvoice.config as config
+from vaibvoice.db.repositories.event_repository import EventRepository
+
+
+class Event(NamedTuple):
+    """
+    A published event.
+    """
+    id: str
+    type: str
+    data: Any
+
+    def to_sse(self) -> str:
+        """
+        Format the event as a Server-Sent Events message.
+
+        Returns:
+            str: The SSE message, terminated by a blank line
+        """
+        payload = json.dumps(self.data, ensure_ascii=False, separators=(",", ":"))
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """
+    A subscriber's bounded queue of events.
+
+    Events can be delivered from any thread; they are consumed on the event
+    loop that created the subscription. A subscriber that falls more than
+    maxsize events behind is dropped instead of slowing down publishers or
+    growing without bound; it can reconnect and resume with Last-Event-ID.
+
+    Attributes:
+        maxsize (int): Maximum number of undelivered events
+        dropped (bool): True once the subscriber fell too far behind
+        delivered (int): Sequence number of the last event published before the
+            subscriber registered; later events are delivered to it
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize a Subscription bound to the running event loop.
+
+        Args:
+            maxsize (int): Maximum number of undelivered events
+        """
+        self.maxsize = maxsize
+        self.dropped = False
+        self.delivered = 0
+        self._events: Deque[Event] = collections.deque()
+        self._lock = threading.Lock()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
+    def deliver(self, event: Event):
+        """
+        Queue an event for this subscriber. Called from any thread.
+
+        Args:
+            event (Event): The event to queue
+        """
+        with self._lock:
+            if self.dropped:
+                return
+            if len(self._events) >= self.maxsize:
+                self.dropped = True
+                self._events.clear()
+            else:
+                self._events.append(event)
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # The subscriber's event loop has been closed
+            pass
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout (float): Maximum time in seconds to wait
+
+        Returns:
+            Optional[Event]: The next event, or None on timeout or when the subscriber was dropped
+        """
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                if self.dropped:
+                    return None
+                if self._events:
+                    return self._events.popleft()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+
+class EventBus:
+    """
+    Publishes events to every subscriber and keeps the most recent ones for resume.
+
+    Event ids are "<boot>-<sequence>", where boot identifies this process, so an
+    id from before a restart is never mistaken for a current one.
+
+    Attributes:
+        buffer_size (int): Number of recent events kept for Last-Event-ID resume
+        queue_size (int): Maximum number of undelivered events per subscriber
+    """
+
+    def __init__(self, buffer_size: int = None, queue_size: int = None):
+        """
+        Initialize the EventBus.
+
+        Args:
+            buffer_size (int, optional): Number of recent events kept for resume
+            queue_size (int, optional): Maximum number of undelivered events per subscriber
+        """
+        self.buffer_size = buffer_size if buffer_size is not None else config.EVENTS_BUFFER_SIZE
+        self.queue_size = queue_size if queue_size is not None else config.EVENTS_QUEUE_SIZE
+        self._boot = uuid.uuid4().hex[:8]
+        self._sequence = itertools.count(1)
+        self._recent: Deque[Event] = collections.deque(maxlen=self.buffer_size)
+        self._published = 0
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def publish(self, event_type: str, data: Any) -> Optional[Event]:
+        """
+        Publish an event to every subscriber. Never blocks on slow subscribers.
+
+        Args:
+            event_type (str): Type of the event, sent as the SSE event name
+            data (Any): JSON-serializable payload
+
+        Returns:
+            Optional[Event]: The published event, or None if it could not be published
+        """
+        with self._lock:
+            self._published = next(self._sequence)
+            event = Event(f"{self._boot}-{self._published}", event_type, data)
+            self._recent.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event
+
+    def start(self):
+        """
+        Prepare the bus for subscribers. Nothing to do for a bus local to this process.
+        """
+
+    def subscribe(self) -> Subscription:
+        """
+        Register a subscriber on the running event loop. Never reads the database,
+        so it can run on the event loop; replay missed events with replay().
+
+        Returns:
+            Subscription: The subscription
+        """
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            subscription.delivered = self._published
+            self._subscribers.append(subscription)
+        return subscription
+
+    def replay(self, last_event_id: str, subscription: Subscription) -> Optional[List[Event]]:
+        """
+        Get the events a resuming client missed: those published after its last
+        event and before its subscription registered. Later events reach the
+        subscription directly.
+
+        Args:
+            last_event_id (str): Id of the last event the client received
+            subscription (Subscription): The client's new subscription
+
+        Returns:
+            Optional[List[Event]]: The missed events, or None if the client cannot
+                resume and must refetch its data
+        """
+        with self._lock:
+            return self._missed_since(last_event_id, subscription.delivered)
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a subscriber.
+
+        Args:
+            subscription (Subscription): The subscription to remove
+        """
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def _missed_since(self, last_event_id: str, delivered: int) -> Optional[List[Event]]:
+        """
+        Get the buffered events published after the given id, up to delivered.
+        Must be called with the lock held.
+
+        Args:
+            last_event_id (str): Id of the last event the client received
+            delivered (int): Sequence number of the last event to include
+
+        Returns:
+            Optional[List[Event]]: The missed events, or None if they are no longer buffered
+        """
+        boot, _, sequence = last_event_id.partition("-")
+        if boot != self._boot or not sequence.isdigit():
+            return None
+
+        sequence = int(sequence)
+        missed = [
+            event for event in self._recent
+            if sequence < int(event.id.split("-")[1]) <= delivered
+        ]
+        oldest = int(self._recent[0].id.split("-")[1]) if self._recent else 1
+        if sequence < oldest - 1:
+            # Some events after last_event_id have already left the buffer
+            return None
+        return missed
+
+
+class KeyedEventBus:
+    """
+    Publishes events to the subscribers of one key, such as a job id, within
+    this process. Nothing is kept for resume: a subscriber receives the
+    events published after it subscribed.
+
+    Attributes:
+        queue_size (int): Maximum number of undelivered events per subscriber
+    """
+
+    def __init__(self, queue_size: int = None):
+        """
+        Initialize the KeyedEventBus.
+
+        Args:
+            queue_size (int, optional): Maximum number of undelivered events per subscriber
+        """
+        self.queue_size = queue_size if queue_size is not None else config.EVENTS_QUEUE_SIZE
+        self._boot = uuid.uuid4().hex[:8]
+        self._sequence = itertools.count(1)
+        self._subscribers: Dict[str, List[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, key: str, event_type: str, data: Any) -> Event:
+        """
+        Publish an event to the subscribers of a key. Never blocks on slow subscribers.
+
+        Args:
+            key (str): Key the event belongs to
+            event_type (str): Type of the event, sent as the SSE event name
+            data (Any): JSON-serializable payload
+
+        Returns:
+            Event: The published event
+        """
+        with self._lock:
+            event = Event(f"{self._boot}-{next(self._sequence)}", event_type, data)
+            subscribers = list(self._subscribers.get(key, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event
+
+    def subscribe(self, key: str) -> Subscription:
+        """
+        Register a subscriber to a key on the running event loop.
+
+        Args:
+            key (str): Key to receive the events of
+
+        Returns:
+            Subscription: The subscription
+        """
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, key: str, subscription: Subscription):
+        """
+        Remove a subscriber.
+
+        Args:
+            key (str): Key the subscriber was registered to
+            subscription (Subscription): The subscription to remove
+        """
+        with self._lock:
+            subscribers = self._subscribers.get(key)
+            if subscribers and subscription in subscribers:
+                subscribers.remove(subscription)
+                if not subscribers:
+                    del self._subscribers[key]
+
+
+class SharedEventBus(EventBus):
+    """
+    Event bus shared by several processes through the events table.
+
+    Publishing appends the event to the table; a relay thread in every
+    process polls the table and delivers new events to that process's
+    subscribers, so a client connected to any API worker receives events
+    published by all of them, in the same order. Event ids are the ids of
+    the table rows, so Last-Event-ID resume works across workers and
+    restarts for as long as the events are kept.
+
+    Attributes:
+        repository (EventRepository): Repository for the shared event log
+        poll_interval (float): Seconds between polls of the event log
+    """
+
+    # Trim the log every this many events
+    TRIM_EVERY = 64
+
+    def __init__(
+        self,
+        repository: Optional[EventRepository] = None,
+        buffer_size: int = None,
+        queue_size: int = None,
+        poll_interval: float = None
+    ):
+        """
+        Initialize the SharedEventBus.
+
+        Args:
+            repository (EventRepository, optional): Repository for the shared event log
+            buffer_size (int, optional): Number of recent events kept for resume
+            queue_size (int, optional): Maximum number of undelivered events per subscriber
+            poll_interval (float, optional): Seconds between polls of the event log
+        """
+        super().__init__(buffer_size, queue_size)
+        self.repository = repository or EventRepository()
+        self.poll_interval = poll_interval if poll_interval is not None else config.EVENTS_POLL_INTERVAL
+        self._last_id = 0
+        self._relay = None
+        self._wakeup = threading.Event()
+
+    def publish(self, event_type: str, data: Any) -> Optional[Event]:
+        """
+        Append an event to the shared log. Subscribers in every process receive
+        it from their relay thread.
+
+        Args:
+            event_type (str): Type of the event, sent as the SSE event name
+            data (Any): JSON-serializable payload
+
+        Returns:
+            Optional[Event]: The published event, or None if it could not be appended to the log
+        """
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        event_id = self.repository.append(event_type, payload)
+        if event_id is None:
+            print(f"Dropped {event_type} event: it could not be appended to the event log.")
+            return None
+        if event_id % self.TRIM_EVERY == 0:
+            self.repository.trim(self.buffer_size)
+        # Deliver to this process's subscribers without waiting for the next poll
+        self._wakeup.set()
+        return Event(str(event_id), event_type, data)
+
+    def start(self):
+        """
+        Start the relay thread from the newest logged event, unless it is running.
+        Reads the event log, so call it from a worker thread (see run_db).
+        """
+        if self._relay is not None:
+            return
+        newest = self.repository.get_bounds()[1]
+        with self._lock:
+            if self._relay is None:
+                self._last_id = newest
+                self._relay = threading.Thread(target=self._run_relay, name="vaibvoice-event-relay")
+                self._relay.daemon = True
+                self._relay.start()
+
+    def subscribe(self) -> Subscription:
+        """
+        Register a subscriber on the running event loop. Never reads the event log;
+        start() must have run, and missed events are read with replay().
+
+        Returns:
+            Subscription: The subscription
+        """
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            # Events after this id reach the subscription through the relay
+            subscription.delivered = self._last_id
+            self._subscribers.append(subscription)
+        return subscription
+
+    def replay(self, last_event_id: str, subscription: Subscription) -> Optional[List[Event]]:
+        """
+        Get the events a resuming client missed from the event log. Reads the
+        log without holding the bus lock; call it from a worker thread (see run_db).
+
+        Args:
+            last_event_id (str): Id of the last event the client received
+            subscription (Subscription): The client's new subscription
+
+        Returns:
+            Optional[List[Event]]: The missed events, or None if they are no longer kept
+        """
+        return self._missed_since(last_event_id, subscription.delivered)
+
+    def _run_relay(self):
+        """
+        Relay loop: deliver events appended to the log by any process.
+        """
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                self._relay_new_events()
+            except Exception as e:
+                print(f"Error relaying events: {str(e)}")
+
+    def _relay_new_events(self):
+        """
+        Read the events appended since the last poll and deliver them to the subscribers.
+        Only the relay thread advances the last delivered id, so the log is read
+        without holding the lock; the subscribers are taken together with the
+        new id, so each one either replays an event or receives it here.
+        """
+        with self._lock:
+            idle = not self._subscribers
+        if idle:
+            # Nobody to deliver to; skip ahead instead of reading the log
+            newest = self.repository.get_bounds()[1]
+            with self._lock:
+                if not self._subscribers:
+                    self._last_id = max(self._last_id, newest)
+            return
+
+        rows = self.repository.get_after(self._last_id)
+        if not rows:
+            return
+        with self._lock:
+            self._last_id = rows[-1][0]
+            subscribers = list(self._subscribers)
+
+        for event_id, event_type, data in rows:
+            event = Event(str(event_id), event_type, json.loads(data))
+            for subscription in subscribers:
+                subscription.deliver(event)
+
+    def _missed_since(self, last_event_id: str, delivered: int) -> Optional[List[Event]]:
+        """
+        Get the logged events published after the given id that the relay had
+        already delivered when the subscriber registered; later ones reach the
+        subscriber through the relay. Reads the log, so it must be called
+        without the lock held.
+
+        Args:
+            last_event_id (str): Id of the last event the client received
+            delivered (int): Id of the last event the relay delivered before
+                the subscriber registered
+
+        Returns:
+            Optional[List[Event]]: The missed events, or None if they are no longer kept
+        """
+        if not last_event_id.isdigit():
+            return None
+
+        sequence = int(last_event_id)
+        oldest, _ = self.repository.get_bounds()
+        if sequence < oldest - 1 or sequence > delivered:
+            return None
+        return [
+            Event(str(event_id), event_type, json.loads(data))
+            for event_id, event_type, data in self.repository.get_after(sequence, self.buffer_size)
+            if event_id <= delivered
+        ]
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """
+    Get the process-wide event bus. With several API workers the bus is
+    shared with the other processes through the database.
+
+    Returns:
+        EventBus: The shared event bus
+    """
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = SharedEventBus() if config.API_WORKERS > 1 else EventBus()
+        return _bus
@@ -0,0 +1,228 @@
+"""
+Service for exporting and importing transcription history.
+Streams history out as NDJSON or CSV and bulk-loads it back in batches.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.models.transcription import transcription_row_to_dict
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_FIELDS = ("id", "timestamp", "audio_path", "text", "duration", "word_count")
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Timestamps are stored as naive local ISO times, as written by datetime.isoformat()
+TIMESTAMP_FORMATS = ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f")
+
+
+class HistoryImportError(ValueError):
+    """
+    Raised when an import file cannot be read or parsed; rows before the line are kept.
+
+    Attributes:
+        line (int): Line of the input where reading stopped
+    """
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Line {line}: {message}")
+        self.line = line
+
+
+def is_valid_timestamp(timestamp: str) -> bool:
+    """
+    Check that a timestamp has the stored form, e.g. "2024-01-31T12:00:00" or "2024-01-31T12:00:00.123456".
+
+    Args:
+        timestamp (str): The timestamp
+
+    Returns:
+        bool: True if it is a valid naive ISO timestamp
+    """
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            datetime.strptime(timestamp, timestamp_format)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+class HistoryIOService:
+    """
+    Service for exporting and importing transcription history.
+    Export runs as a generator over a single cursor, so memory use does not
+    depend on the size of the history.
+
+    Attributes:
+        repository (TranscriptionRepository): Repository for transcription data access
+        import_errors (int): Number of records skipped by the last import
+    """
+
+    def __init__(self, repository: Optional[TranscriptionRepository] = None):
+        """
+        Initialize the HistoryIOService with the specified repository.
+
+        Args:
+            repository (TranscriptionRepository, optional): Repository for transcription data access
+        """
+        self.repository = repository or TranscriptionRepository()
+        self.import_errors = 0
+        self._line = 0
+
+    def export(self, export_format: str = "ndjson", chunk_rows: int = 500) -> Iterator[bytes]:
+        """
+        Export all transcriptions.
+
+        Args:
+            export_format (str): "ndjson" or "csv"
+            chunk_rows (int): Number of rows encoded into each yielded chunk
+
+        Yields:
+            bytes: Encoded chunks of the export
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        rows = self.repository.iter_rows(batch_size=chunk_rows)
+        if export_format == "csv":
+            return self._export_csv(rows, chunk_rows)
+        return self._export_ndjson(rows, chunk_rows)
+
+    def import_lines(
+        self,
+        lines: Iterable[Union[str, bytes]],
+        import_format: str = "ndjson",
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Import transcriptions from NDJSON or CSV lines. Ids in the input are ignored
+        and malformed records are skipped and counted in import_errors.
+
+        Args:
+            lines (Iterable[Union[str, bytes]]): Lines of the input file; binary lines are
+                decoded as UTF-8 one by one, so decoding errors are reported at the exact line
+            import_format (str): "ndjson" or "csv"
+            batch_size (int): Number of rows per transaction
+            progress (Callable[[int], None], optional): Called with the running total after each batch
+
+        Returns:
+            int: Number of rows imported
+
+        Raises:
+            ValueError: If the format is not supported
+            HistoryImportError: If the input is not valid UTF-8 or not valid CSV;
+                the rows before the offending line have been imported
+        """
+        if import_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported import format: {import_format}")
+
+        self.import_errors = 0
+        self._line = 0
+        numbered = self._number_lines(lines)
+        if import_format == "csv":
+            records = csv.DictReader(numbered)
+        else:
+            records = self._parse_ndjson(numbered)
+
+        return self.repository.import_rows(
+            self._to_rows(self._guard(records)),
+            batch_size=batch_size,
+            progress=progress
+        )
+
+    def _number_lines(self, lines: Iterable[Union[str, bytes]]) -> Iterator[str]:
+        """Count the lines read from the input, for error messages, and decode binary lines."""
+        for line in lines:
+            self._line += 1
+            if isinstance(line, bytes):
+                try:
+                    line = line.decode("utf-8")
+                except UnicodeDecodeError:
+                    raise HistoryImportError(self._line, "input is not valid UTF-8")
+            yield line
+
+    def _guard(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Turn read and parse errors of the whole input into HistoryImportError."""
+        try:
+            yield from records
+        except UnicodeDecodeError:
+            # Text input is decoded in chunks, ahead of the line being parsed
+            raise HistoryImportError(self._line + 1, "input is not valid UTF-8")
+        except csv.Error as e:
+            raise HistoryImportError(self._line, f"invalid CSV: {str(e)}")
+
+    def _export_ndjson(self, rows: Iterator[tuple], chunk_rows: int) -> Iterator[bytes]:
+        """Encode rows as newline-delimited JSON, chunk_rows rows per chunk."""
+        chunk = []
+        for row in rows:
+            chunk.append(json.dumps(transcription_row_to_dict(row), ensure_ascii=False))
+            if len(chunk) >= chunk_rows:
+                yield ("\n".join(chunk) + "\n").encode("utf-8")
+                chunk = []
+        if chunk:
+            yield ("\n".join(chunk) + "\n").encode("utf-8")
+
+    def _export_csv(self, rows: Iterator[tuple], chunk_rows: int) -> Iterator[bytes]:
+        """Encode rows as CSV with a header line, chunk_rows rows per chunk."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        count = 0
+        for row in rows:
+            writer.writerow(transcription_row_to_dict(row)[field] for field in EXPORT_FIELDS)
+            count += 1
+            if count >= chunk_rows:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                count = 0
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def _parse_ndjson(self, lines: Iterable[str]) -> Iterator[Dict]:
+        """Parse NDJSON lines, skipping blank and malformed ones."""
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.import_errors += 1
+                continue
+            if isinstance(record, dict):
+                yield record
+            else:
+                self.import_errors += 1
+
+    def _to_rows(self, records: Iterable[Dict]) -> Iterator[Tuple]:
+        """Convert parsed records to insert tuples, skipping invalid ones."""
+        for record in records:
+            try:
+                text = record.get("text") or ""
+                timestamp = record.get("timestamp") or datetime.now().isoformat()
+                if not is_valid_timestamp(timestamp):
+                    raise ValueError(f"Invalid timestamp: {timestamp}")
+                word_count = record.get("word_count")
+                word_count = int(word_count) if word_count not in (None, "") else len(text.split())
+                yield (
+                    timestamp,
+                    record.get("audio_path") or "",
+                    text,
+                    float(record.get("duration") or 0.0),
+                    word_count
+                )
+            except (AttributeError, TypeError, ValueError):
+                self.import_errors += 1
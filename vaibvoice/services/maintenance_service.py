@@ -0,0 +1,270 @@
+"""
+Service for history retention and database maintenance.
+Archives old transcriptions, prunes old recordings and keeps the SQLite files compact.
+"""
+
+import datetime
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import vaibvoice.config as config
+from vaibvoice.core.audio_store import AudioStore, get_audio_store
+from vaibvoice.db.repositories.archive_repository import ArchiveRepository
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+
+class MaintenanceService:
+    """
+    Service for history retention and database maintenance.
+
+    A maintenance run:
+        - moves transcriptions older than retention_days into the archive database
+        - moves recordings still referenced by legacy paths into the audio store
+          and evicts stored audio beyond the store quota
+        - deletes temporary recordings older than audio_retention_days, with
+          their cached peaks and Opus copies, unless a transcription still
+          references them
+        - switches the main database to incremental auto_vacuum (once) and
+          releases free pages with incremental_vacuum
+        - refreshes query planner statistics with ANALYZE
+        - checkpoints and truncates the write-ahead log, if the database uses one
+    and reports how much space was reclaimed.
+
+    Attributes:
+        repository (ArchiveRepository): Repository for archived transcriptions
+        retention_days (int): Age in days after which rows are archived (0 disables)
+        audio_retention_days (int): Age in days after which recordings are deleted (0 disables)
+        audio_dir (str): Directory holding temporary recordings
+        audio_store (AudioStore): Store holding recordings referenced by transcriptions
+        last_report (dict): Report of the most recent run, None before the first run
+    """
+
+    def __init__(
+        self,
+        repository: Optional[ArchiveRepository] = None,
+        db_path: str = None,
+        retention_days: int = None,
+        audio_retention_days: int = None,
+        audio_dir: str = None,
+        audio_store: Optional[AudioStore] = None
+    ):
+        """
+        Initialize the MaintenanceService.
+
+        Args:
+            repository (ArchiveRepository, optional): Repository for archived transcriptions
+            db_path (str, optional): History database to maintain when no repository is given;
+                its archive is derived from it
+            retention_days (int, optional): Age in days after which rows are archived
+            audio_retention_days (int, optional): Age in days after which recordings are deleted
+            audio_dir (str, optional): Directory holding temporary recordings
+            audio_store (AudioStore, optional): Store holding recordings referenced by transcriptions
+        """
+        self.repository = repository or ArchiveRepository(db_path)
+        self.retention_days = retention_days if retention_days is not None else config.RETENTION_DAYS
+        self.audio_retention_days = (
+            audio_retention_days if audio_retention_days is not None else config.AUDIO_RETENTION_DAYS
+        )
+        self.audio_dir = audio_dir if audio_dir is not None else config.AUDIO_TEMP_DIR
+        self.audio_store = audio_store or get_audio_store()
+        self.last_report = None
+        self._lock = threading.Lock()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run retention and database maintenance once.
+
+        Returns:
+            Dict[str, Any]: Report of the run
+        """
+        with self._lock:
+            started = time.monotonic()
+            report = {
+                "started_at": datetime.datetime.now().isoformat(),
+                "archived_rows": 0,
+                "deleted_audio_files": 0,
+                "audio_bytes_reclaimed": 0,
+                "migrated_audio_files": 0,
+                "evicted_audio_blobs": 0,
+                "db_bytes_before": self._db_size(),
+                "db_bytes_after": 0,
+                "db_bytes_reclaimed": 0,
+                "errors": [],
+            }
+
+            if self.retention_days > 0:
+                try:
+                    cutoff = datetime.datetime.now() - datetime.timedelta(days=self.retention_days)
+                    report["archived_rows"] = len(self.repository.archive_before(cutoff.isoformat()))
+                except Exception as e:
+                    report["errors"].append(f"archive: {str(e)}")
+
+            # Migrate first: recordings that rows still reference by path are
+            # moved into the store rather than pruned as temporary files
+            try:
+                migration = self.audio_store.migrate_legacy([
+                    TranscriptionRepository(self.repository.db_path),
+                    self.repository
+                ])
+                report["migrated_audio_files"] = migration["migrated"]
+                eviction = self.audio_store.enforce_quota()
+                report["evicted_audio_blobs"] = eviction["evicted_blobs"]
+                report["audio_bytes_reclaimed"] += eviction["bytes_reclaimed"]
+            except Exception as e:
+                report["errors"].append(f"audio store: {str(e)}")
+
+            if self.audio_retention_days > 0:
+                try:
+                    files, size = self._prune_audio(self.audio_retention_days)
+                    report["deleted_audio_files"] = files
+                    report["audio_bytes_reclaimed"] += size
+                except Exception as e:
+                    report["errors"].append(f"audio: {str(e)}")
+
+            try:
+                self._compact()
+            except Exception as e:
+                report["errors"].append(f"compact: {str(e)}")
+
+            report["db_bytes_after"] = self._db_size()
+            report["db_bytes_reclaimed"] = max(0, report["db_bytes_before"] - report["db_bytes_after"])
+            report["duration_ms"] = int((time.monotonic() - started) * 1000)
+
+            self.last_report = report
+            return report
+
+    def _compact(self):
+        """
+        Release free pages, refresh statistics and, in WAL mode, checkpoint the WAL of the main database.
+        """
+        conn = self.repository.get_connection()
+        # Autocommit mode: VACUUM and the pragmas below cannot run inside a transaction
+        conn.isolation_level = None
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                # Switching an existing database to incremental mode needs one full VACUUM
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA incremental_vacuum").fetchall()
+            conn.execute("ANALYZE")
+            if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        finally:
+            conn.close()
+
+    def _prune_audio(self, days: int):
+        """
+        Delete temporary recordings older than the given number of days,
+        except those still referenced by a transcription or an archived one.
+
+        Args:
+            days (int): Minimum age in days of deleted recordings
+
+        Returns:
+            tuple: (number of files deleted, bytes reclaimed)
+        """
+        if not os.path.isdir(self.audio_dir):
+            return 0, 0
+
+        referenced = set()
+        for repository in (TranscriptionRepository(self.repository.db_path), self.repository):
+            for audio_path in repository.get_legacy_audio_paths():
+                path = self.audio_store.find_legacy_file(audio_path)
+                if path is not None:
+                    referenced.add(os.path.realpath(path))
+
+        cutoff = time.time() - days * 86400
+        deleted = 0
+        reclaimed = 0
+        with os.scandir(self.audio_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if stat.st_mtime < cutoff and os.path.realpath(entry.path) not in referenced:
+                    key = self.audio_store.content_key(entry.path, entry.path)
+                    os.remove(entry.path)
+                    self.audio_store.remove_derived(key)
+                    deleted += 1
+                    reclaimed += stat.st_size
+        return deleted, reclaimed
+
+    def _db_size(self) -> int:
+        """
+        Get the on-disk size of the main database including its WAL file.
+
+        Returns:
+            int: Size in bytes
+        """
+        size = 0
+        for path in (self.repository.db_path, self.repository.db_path + "-wal"):
+            if os.path.exists(path):
+                size += os.path.getsize(path)
+        return size
+
+
+class MaintenanceScheduler:
+    """
+    Runs a MaintenanceService periodically on a background thread.
+
+    Attributes:
+        service (MaintenanceService): The service to run
+        interval (float): Seconds between runs
+    """
+
+    def __init__(self, service: Optional[MaintenanceService] = None, interval: float = None):
+        """
+        Initialize the MaintenanceScheduler.
+
+        Args:
+            service (MaintenanceService, optional): The service to run
+            interval (float, optional): Seconds between runs
+        """
+        self.service = service or MaintenanceService()
+        self.interval = interval if interval is not None else config.MAINTENANCE_INTERVAL
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start the scheduler thread. Does nothing if the interval is 0.
+        """
+        if self._thread is not None or self.interval <= 0:
+            return
+
+        self._thread = threading.Thread(target=self._run, name="vaibvoice-maintenance")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the scheduler thread.
+        """
+        self._stop.set()
+
+    def _run(self):
+        """
+        Scheduler loop. The first run happens one interval after start so that
+        maintenance never competes with application startup.
+        """
+        while not self._stop.wait(self.interval):
+            report = self.service.run()
+            for error in report["errors"]:
+                print(f"Maintenance error: {error}")
+
+
+_scheduler = None
+
+
+def get_maintenance_scheduler() -> MaintenanceScheduler:
+    """
+    Get the process-wide maintenance scheduler.
+
+    Returns:
+        MaintenanceScheduler: The shared scheduler
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = MaintenanceScheduler()
+    return _scheduler
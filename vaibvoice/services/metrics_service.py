@@ -0,0 +1,135 @@
+"""
+Service for metrics operations.
+Shares the metrics of the dictation process with the API worker processes,
+which otherwise could only report their own.
+"""
+
+import json
+import threading
+from typing import Optional
+
+import vaibvoice.config as config
+from vaibvoice.db.repositories.metrics_repository import MetricsRepository
+from vaibvoice.utils.metrics import Metrics, get_metrics
+
+# Name the dictation process stores its snapshot under
+DICTATION_PROCESS = "dictation"
+
+
+class MetricsService:
+    """
+    Service for metrics operations.
+
+    With several API workers the dictation pipeline runs in the parent
+    process, which serves no HTTP. It exports snapshots of its metrics to
+    the database, and each worker adds the stored snapshots to its own
+    metrics when scraped.
+
+    Attributes:
+        repository (MetricsRepository): Repository for metrics snapshots
+        metrics (Metrics): Metrics of this process
+    """
+
+    def __init__(self, repository: Optional[MetricsRepository] = None, metrics: Optional[Metrics] = None):
+        """
+        Initialize the MetricsService.
+
+        Args:
+            repository (MetricsRepository, optional): Repository for metrics snapshots
+            metrics (Metrics, optional): Metrics of this process
+        """
+        self.repository = repository or MetricsRepository()
+        self.metrics = metrics or get_metrics()
+
+    def export(self, process: str = DICTATION_PROCESS) -> bool:
+        """
+        Store a snapshot of this process's metrics.
+
+        Args:
+            process (str): Name the snapshot is stored under
+
+        Returns:
+            bool: True if the snapshot was stored
+        """
+        return self.repository.set(process, json.dumps(self.metrics.snapshot()))
+
+    def render(self) -> str:
+        """
+        Render this process's metrics together with the exported snapshots
+        in the Prometheus text format.
+
+        Returns:
+            str: The exposition
+        """
+        combined = Metrics(enabled=True)
+        combined.merge(self.metrics.snapshot())
+        for data in self.repository.get_all():
+            try:
+                combined.merge(json.loads(data))
+            except (ValueError, TypeError) as e:
+                print(f"Ignoring invalid metrics snapshot: {str(e)}")
+        return combined.render()
+
+
+class MetricsExporter:
+    """
+    Exports the metrics of this process periodically on a background thread.
+
+    Attributes:
+        service (MetricsService): Service used to export
+        interval (float): Seconds between exports
+    """
+
+    def __init__(self, service: Optional[MetricsService] = None, interval: float = None):
+        """
+        Initialize the MetricsExporter.
+
+        Args:
+            service (MetricsService, optional): Service used to export
+            interval (float, optional): Seconds between exports
+        """
+        self.service = service or MetricsService()
+        self.interval = interval if interval is not None else config.METRICS_EXPORT_INTERVAL
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start the exporter thread. Does nothing if metrics are disabled or the interval is 0.
+        """
+        if self._thread is not None or self.interval <= 0 or not self.service.metrics.enabled:
+            return
+
+        self._thread = threading.Thread(target=self._run, name="vaibvoice-metrics-export")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the exporter thread.
+        """
+        self._stop.set()
+
+    def _run(self):
+        """
+        Exporter loop.
+        """
+        while not self._stop.wait(self.interval):
+            if not self.service.export():
+                print("Failed to export metrics.")
+
+
+_exporter = None
+
+
+def get_metrics_exporter() -> MetricsExporter:
+    """
+    Get the process-wide metrics exporter.
+
+    Returns:
+        MetricsExporter: The shared exporter
+    """
+    global _exporter
+    if _exporter is None:
+        _exporter = MetricsExporter()
+    return _exporter
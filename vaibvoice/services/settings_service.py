@@ -0,0 +1,260 @@
+"""
+Service for settings operations.
+Serves the current settings from an in-memory snapshot and notifies subscribers of changes.
+"""
+
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+import vaibvoice.config as config
+from vaibvoice.db.repositories.settings_repository import SettingsRepository
+from vaibvoice.models.settings import Settings
+
+
+class SettingsSnapshot(NamedTuple):
+    """
+    Immutable view of the settings at one version.
+    """
+    version: int
+    record_key: str
+    openai_api_key: Optional[str]
+    transcription_model: str
+    transcription_language: Optional[str]
+    llm_model: str
+    start_sound: str
+    end_sound: str
+
+    @classmethod
+    def from_settings(cls, settings: Settings, version: int) -> "SettingsSnapshot":
+        """
+        Create a snapshot from a Settings object.
+
+        Args:
+            settings (Settings): The settings to copy
+            version (int): Version number of the snapshot
+
+        Returns:
+            SettingsSnapshot: The snapshot
+        """
+        return cls(
+            version=version,
+            record_key=settings.record_key,
+            openai_api_key=settings.openai_api_key,
+            transcription_model=settings.transcription_model,
+            transcription_language=settings.transcription_language,
+            llm_model=settings.llm_model,
+            start_sound=settings.start_sound,
+            end_sound=settings.end_sound
+        )
+
+    def to_settings(self) -> Settings:
+        """
+        Create a mutable Settings object with the values of this snapshot.
+
+        Returns:
+            Settings: The settings
+        """
+        values = self._asdict()
+        values.pop("version")
+        return Settings(**values)
+
+    def same_values(self, other: "SettingsSnapshot") -> bool:
+        """
+        Compare the setting values of two snapshots, ignoring their versions.
+
+        Args:
+            other (SettingsSnapshot): The snapshot to compare with
+
+        Returns:
+            bool: True if every setting is equal
+        """
+        return self[1:] == other[1:]
+
+
+SettingsSubscriber = Callable[[SettingsSnapshot], None]
+
+
+class SettingsService:
+    """
+    Service for settings operations.
+
+    Settings are loaded once and served from an immutable snapshot that is
+    swapped atomically on every change, so readers on any thread never see a
+    half-applied update and never touch the database. Each change bumps the
+    snapshot version and notifies subscribers.
+
+    Changes committed by other processes are picked up by polling
+    PRAGMA data_version on a dedicated connection, at most once every
+    SETTINGS_POLL_INTERVAL seconds: the value changes whenever another
+    connection commits to the database file. Commits to other tables cause a
+    single-row read that is discarded when no setting changed.
+
+    Attributes:
+        repository (SettingsRepository): Repository for settings data access
+    """
+
+    def __init__(self, repository: Optional[SettingsRepository] = None):
+        """
+        Initialize the SettingsService with the specified repository.
+
+        Args:
+            repository (SettingsRepository, optional): Repository for settings data access
+        """
+        self.repository = repository or SettingsRepository()
+        self._lock = threading.RLock()
+        self._subscribers: List[SettingsSubscriber] = []
+        self._version = 0
+        self._snapshot = None
+        self._data_version = None
+        self._watch_conn = None
+        self._checked_at = 0.0
+
+    def current(self) -> SettingsSnapshot:
+        """
+        Get the current settings snapshot, reloading it if another process changed the settings.
+
+        Returns:
+            SettingsSnapshot: The current settings
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            if time.monotonic() - self._checked_at < config.SETTINGS_POLL_INTERVAL:
+                return snapshot
+            if not self._changed_externally():
+                return snapshot
+
+        with self._lock:
+            return self._reload()
+
+    def update(self, **changes) -> SettingsSnapshot:
+        """
+        Change one or more settings, persist them and notify subscribers.
+        Values of None are ignored.
+
+        Args:
+            **changes: Setting names and their new values
+
+        Returns:
+            SettingsSnapshot: The new settings
+
+        Raises:
+            ValueError: If a change names an unknown setting
+            RuntimeError: If the settings could not be saved
+        """
+        with self._lock:
+            settings = self.current().to_settings()
+            for name, value in changes.items():
+                if name not in SettingsSnapshot._fields or name == "version":
+                    raise ValueError(f"Unknown setting: {name}")
+                if value is not None:
+                    setattr(settings, name, value)
+
+            if not self.repository.save(settings):
+                raise RuntimeError("Failed to save settings to the database")
+            return self._reload()
+
+    def reset(self) -> SettingsSnapshot:
+        """
+        Reset the settings to their default values and notify subscribers.
+
+        Returns:
+            SettingsSnapshot: The default settings
+
+        Raises:
+            RuntimeError: If the settings could not be reset
+        """
+        with self._lock:
+            if not self.repository.reset():
+                raise RuntimeError("Failed to reset settings to default values")
+            return self._reload()
+
+    def subscribe(self, callback: SettingsSubscriber) -> Callable[[], None]:
+        """
+        Register a callback invoked with the new snapshot after every change.
+
+        Args:
+            callback (SettingsSubscriber): Function receiving the new snapshot
+
+        Returns:
+            Callable[[], None]: Function that removes the subscription
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def _reload(self) -> SettingsSnapshot:
+        """
+        Load the settings from the database and swap in a new snapshot if they changed.
+        Must be called with the lock held.
+
+        Returns:
+            SettingsSnapshot: The current snapshot
+        """
+        self._data_version = self._read_data_version()
+        self._checked_at = time.monotonic()
+        settings = self.repository.get()
+
+        candidate = SettingsSnapshot.from_settings(settings, self._version + 1)
+        if self._snapshot is not None and candidate.same_values(self._snapshot):
+            return self._snapshot
+
+        self._version += 1
+        self._snapshot = candidate
+        for callback in list(self._subscribers):
+            try:
+                callback(candidate)
+            except Exception as e:
+                print(f"Error in settings subscriber: {str(e)}")
+        return candidate
+
+    def _changed_externally(self) -> bool:
+        """
+        Check whether another connection committed to the database since the last load.
+
+        Returns:
+            bool: True if the settings should be reloaded
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            return self._read_data_version() != self._data_version
+
+    def _read_data_version(self) -> Optional[int]:
+        """
+        Read PRAGMA data_version on the dedicated watch connection.
+        Must be called with the lock held.
+
+        Returns:
+            Optional[int]: The data version, or None if it could not be read
+        """
+        try:
+            if self._watch_conn is None:
+                self._watch_conn = self.repository.get_connection(check_same_thread=False)
+            return self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        except Exception as e:
+            print(f"Error reading settings data version: {str(e)}")
+            return None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_settings_service() -> SettingsService:
+    """
+    Get the process-wide settings service.
+
+    Returns:
+        SettingsService: The shared settings service
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SettingsService()
+        return _service
@@ -0,0 +1,215 @@
+"""
+Service for similarity operations.
+Keeps the TF-IDF index of transcription texts in step with the history and
+answers "similar transcriptions" queries.
+"""
+
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import vaibvoice.config as config
+from vaibvoice.core.similarity import SimilarityIndex
+from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.models.transcription import Transcription
+
+# The delta segment is merged into the base and the file rewritten once it
+# holds this many rows, or a tenth of the base if that is more
+COMPACT_MIN_ROWS = 1000
+
+# Matches read from the index per result wanted, to make up for archived and
+# deleted transcriptions; multiplied by this again while too few are left
+OVERFETCH = 2
+
+def similarity_index_path_for(db_path: str) -> str:
+    """
+    Get the similarity index file that belongs to a history database.
+
+    Args:
+        db_path (str): Path to the main SQLite database file
+
+    Returns:
+        str: SIMILARITY_INDEX_PATH for the configured database, otherwise
+            "<name>_similarity.idx" next to the given database
+    """
+    if os.path.abspath(db_path) == os.path.abspath(config.DB_PATH):
+        return config.SIMILARITY_INDEX_PATH
+    return f"{os.path.splitext(db_path)[0]}_similarity.idx"
+
+class SimilarityService:
+    """
+    Service for similarity operations.
+
+    The index is loaded or built on a background thread (see start), and
+    queries find nothing until it is ready. Before each query, transcriptions
+    added since the index was last updated are read by id and appended to it,
+    whichever way they were written (the dictation pipeline, imports or
+    another process). The index file is rewritten when the appended rows are
+    compacted, and reloaded when another process has rewritten it.
+
+    Archived and deleted transcriptions stay in the index; matches are read
+    back from the history in one query and those no longer in it are
+    skipped, reading further down the ranking until enough are left.
+
+    Attributes:
+        repository (TranscriptionRepository): Repository the texts are read from
+        index_path (str): Path of the index file
+        dims (int): Number of hashed features
+    """
+
+    def __init__(
+        self,
+        repository: Optional[TranscriptionRepository] = None,
+        index_path: str = None,
+        dims: int = None
+    ):
+        """
+        Initialize the SimilarityService.
+
+        Args:
+            repository (TranscriptionRepository, optional): Repository the texts are read from
+            index_path (str, optional): Path of the index file; derived from the
+                repository's database by default (see similarity_index_path_for)
+            dims (int, optional): Number of hashed features
+        """
+        self.repository = repository or TranscriptionRepository()
+        self.index_path = index_path if index_path is not None else similarity_index_path_for(self.repository.db_path)
+        self.dims = dims or config.SIMILARITY_FEATURES
+        self._index: Optional[SimilarityIndex] = None
+        self._file_state = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._builder: Optional[threading.Thread] = None
+        self._builder_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been loaded or built and can be queried."""
+        return self._ready.is_set()
+
+    def start(self):
+        """
+        Load or build the index on a background thread, unless it is ready or being built.
+        """
+        with self._builder_lock:
+            if self.ready or (self._builder is not None and self._builder.is_alive()):
+                return
+            self._builder = threading.Thread(target=self._build, name="vaibvoice-similarity", daemon=True)
+            self._builder.start()
+
+    def find_similar(
+        self,
+        text: str,
+        limit: int = 10,
+        exclude_id: Optional[int] = None
+    ) -> Optional[List[Tuple[Transcription, float]]]:
+        """
+        Find the transcriptions most similar to a text.
+        Starts building the index if it is not ready.
+
+        Args:
+            text (str): The text
+            limit (int): Maximum number of transcriptions to return
+            exclude_id (int, optional): Transcription to leave out, e.g. the one the text comes from
+
+        Returns:
+            Optional[List[Tuple[Transcription, float]]]: (transcription, cosine similarity) pairs,
+                most similar first, or None if the index is not ready yet
+        """
+        if not self.ready:
+            self.start()
+            return None
+
+        with self._lock:
+            self._refresh()
+        fetch = limit * OVERFETCH
+        while True:
+            with self._lock:
+                matches = self._index.query(text, fetch, exclude_id)
+            found = self.repository.get_by_ids([match_id for match_id, _ in matches])
+            similar = [(found[match_id], score) for match_id, score in matches if match_id in found]
+            # Fewer matches than asked for means the ranking is exhausted
+            if len(similar) >= limit or len(matches) < fetch:
+                return similar[:limit]
+            fetch *= OVERFETCH
+
+    def _build(self):
+        """
+        Load or build the index, then mark it ready.
+        """
+        try:
+            with self._lock:
+                self._refresh()
+            self._ready.set()
+        except Exception as e:
+            # The next query starts another attempt
+            print(f"Error building similarity index: {str(e)}")
+
+    def _refresh(self):
+        """
+        Reload the index file if it changed, append new transcriptions and compact if due.
+        """
+        state = self._stat()
+        if self._index is None or (state is not None and state != self._file_state):
+            self._index = self._load()
+            self._file_state = state
+
+        for row in self.repository.iter_rows(after_id=self._index.max_id):
+            self._index.add(row[0], row[3])
+
+        if self._index.delta_rows >= max(COMPACT_MIN_ROWS, self._index.base_rows // 10):
+            try:
+                self._index.dump(self.index_path)
+                self._file_state = self._stat()
+            except OSError as e:
+                # The compacted index is still used in memory
+                print(f"Error saving similarity index: {str(e)}")
+
+    def _load(self) -> SimilarityIndex:
+        """
+        Load the index file, or start an empty index if it is missing, invalid or has other dimensions.
+
+        Returns:
+            SimilarityIndex: The index
+        """
+        try:
+            index = SimilarityIndex.load(self.index_path)
+            if index.dims == self.dims:
+                return index
+            print("Similarity index has a different number of features, rebuilding it.")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable similarity index: {str(e)}")
+        return SimilarityIndex(self.dims)
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        """
+        Identify the current version of the index file.
+
+        Returns:
+            Optional[Tuple[int, int, int]]: Inode, size and modification time, or None if there is no file
+        """
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_similarity_service() -> SimilarityService:
+    """
+    Get the process-wide similarity service.
+
+    Returns:
+        SimilarityService: The shared similarity service
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SimilarityService()
+        return _service
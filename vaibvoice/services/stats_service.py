@@ -5,7 +5,8 @@ Implements business logic for transcription statistics.
 
 from typing import Dict, Any, Optional
 
-from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
+from vaibvoice.db.repositories.trace_repository import TraceRepository
+from vaibvoice.db.repositories.transcription_repository import DataVersion, TranscriptionRepository
 
 class StatsService:
     """
@@ -14,22 +15,41 @@ class StatsService:
     
     Attributes:
         repository (TranscriptionRepository): Repository for transcription data access
+        traces (TraceRepository): Repository for dictation traces
     """
     
-    def __init__(self, repository: Optional[TranscriptionRepository] = None):
+    def __init__(
+        self,
+        repository: Optional[TranscriptionRepository] = None,
+        traces: Optional[TraceRepository] = None
+    ):
         """
         Initialize the StatsService with the specified repository.
         
         Args:
             repository (TranscriptionRepository, optional): Repository for transcription data access
+            traces (TraceRepository, optional): Repository for dictation traces
         """
         self.repository = repository or TranscriptionRepository()
+        self.traces = traces or TraceRepository(self.repository.db_path)
     
     def get_stats(self) -> Dict[str, Any]:
         """
-        Get statistics about the transcriptions.
+        Get statistics about the transcriptions, including the average latency
+        of each dictation stage.
         
         Returns:
             Dict[str, Any]: Dictionary containing statistics
         """
-        return self.repository.get_stats()
\ No newline at end of file
+        stats = self.repository.get_stats()
+        stats["latencyBreakdown"] = self.traces.get_breakdown()
+        return stats
+    
+    def get_data_version(self) -> DataVersion:
+        """
+        Get the version of the data the statistics are computed from.
+        
+        Returns:
+            DataVersion: Version that changes whenever a transcription is added, changed or removed
+        """
+        return self.repository.get_data_version()
@@ -0,0 +1,432 @@
+"""
+Service for transcription jobs submitted over HTTP.
+Queues uploaded audio in a durable SQLite queue and runs the transcription
+pipeline on a bounded pool of worker threads.
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional
+
+import vaibvoice.config as config
+from vaibvoice.core.audio_store import get_audio_store
+from vaibvoice.db.repositories.job_repository import JobRepository
+from vaibvoice.models.job import JOB_CANCELLED, JOB_DONE, JOB_FAILED, TranscriptionJob
+from vaibvoice.models.trace import DictationTrace
+from vaibvoice.services.event_bus import KeyedEventBus
+from vaibvoice.services.transcription_service import TranscriptionService
+from vaibvoice.utils.metrics import activate_trace
+
+# Whether this process has requeued the jobs of dead workers yet
+_requeued = False
+_requeue_lock = threading.Lock()
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its configured depth."""
+
+
+class TranscriptionJobService:
+    """
+    Service for transcription jobs.
+
+    Job progress is published on a bus of its own, keyed by job id, so only
+    the clients following a job receive it: every status change as a "job"
+    event with the job's dictionary, and streamed text as "job_delta" events
+    with {"job_id", "delta"}. The bus is local to the process running the
+    job; clients in other processes follow the job row instead.
+
+    Attributes:
+        repository (JobRepository): Repository for job data access
+        events (KeyedEventBus): Bus on which job progress is published, keyed by job id
+        queue_depth (int): Maximum number of queued and running jobs
+    """
+
+    def __init__(
+        self,
+        repository: Optional[JobRepository] = None,
+        events: Optional[KeyedEventBus] = None,
+        queue_depth: int = None
+    ):
+        """
+        Initialize the TranscriptionJobService.
+
+        Args:
+            repository (JobRepository, optional): Repository for job data access
+            events (KeyedEventBus, optional): Bus on which job progress is published
+            queue_depth (int, optional): Maximum number of queued and running jobs
+        """
+        self.repository = repository or JobRepository()
+        self.events = events or KeyedEventBus()
+        self.queue_depth = queue_depth if queue_depth is not None else config.TRANSCRIBE_QUEUE_DEPTH
+
+    def submit(self, audio_path: str, filename: Optional[str] = None) -> TranscriptionJob:
+        """
+        Queue an uploaded audio file for transcription.
+
+        Args:
+            audio_path (str): Path to the uploaded audio; the job takes ownership of the file
+            filename (str, optional): Name of the file as given by the client
+
+        Returns:
+            TranscriptionJob: The queued job
+
+        Raises:
+            QueueFullError: If the queue is at its configured depth
+        """
+        job = TranscriptionJob(id=uuid.uuid4().hex, audio_path=audio_path, filename=filename)
+        if not self.repository.add_if_room(job, self.queue_depth):
+            raise QueueFullError(f"The transcription queue is full ({self.queue_depth} jobs)")
+        self.publish(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        """
+        Get a job by its ID.
+
+        Args:
+            job_id (str): ID of the job
+
+        Returns:
+            Optional[TranscriptionJob]: The job if found, None otherwise
+        """
+        return self.repository.get(job_id)
+
+    def get_recent(self, limit: int = 50) -> List[TranscriptionJob]:
+        """
+        Get the most recently submitted jobs.
+
+        Args:
+            limit (int): Maximum number of jobs to return
+
+        Returns:
+            List[TranscriptionJob]: Jobs, newest first
+        """
+        return self.repository.get_recent(limit)
+
+    def cancel(self, job_id: str) -> Optional[TranscriptionJob]:
+        """
+        Cancel a job. A queued job is cancelled at once and its upload deleted;
+        a running job stops at its next checkpoint.
+
+        Args:
+            job_id (str): ID of the job
+
+        Returns:
+            Optional[TranscriptionJob]: The job after the request, or None if not found
+        """
+        before = self.repository.get(job_id)
+        if before is None:
+            return None
+
+        job = self.repository.request_cancel(job_id)
+        if job.status == JOB_CANCELLED and before.status != JOB_CANCELLED:
+            self._remove_upload(job.audio_path)
+            self.publish(job)
+        return job
+
+    def publish(self, job: TranscriptionJob):
+        """
+        Publish the current state of a job as a "job" event.
+
+        Args:
+            job (TranscriptionJob): The job
+        """
+        self.events.publish(job.id, "job", job.to_dict())
+
+    def publish_delta(self, job_id: str, delta: str):
+        """
+        Publish a piece of streamed text of a running job as a "job_delta" event.
+
+        Args:
+            job_id (str): ID of the job
+            delta (str): The new text
+        """
+        self.events.publish(job_id, "job_delta", {"job_id": job_id, "delta": delta})
+
+    @staticmethod
+    def _remove_upload(audio_path: str):
+        """
+        Delete an uploaded audio file that will not be transcribed.
+
+        Args:
+            audio_path (str): Path to the upload
+        """
+        try:
+            if audio_path and os.path.isfile(audio_path):
+                os.remove(audio_path)
+        except OSError as e:
+            print(f"Error removing upload: {str(e)}")
+
+
+class TranscriptionWorkerPool:
+    """
+    Pool of threads that claim queued jobs and run the transcription pipeline:
+    preprocess -> transcribe -> format -> store audio -> add to history.
+
+    Workers are woken when a job is submitted in this process and otherwise
+    poll the queue, so jobs queued by another process are picked up as well.
+    One pool runs in the main process; API worker processes only queue jobs,
+    so at most TRANSCRIBE_WORKERS jobs run at a time. Clients connected to
+    those processes follow a job through its row, so with share_progress the
+    text streamed so far is stored in the row, at most every
+    CANCEL_CHECK_INTERVAL.
+
+    Claimed jobs are leased to the pool: a heartbeat thread renews the lease
+    of its running jobs every third of TRANSCRIBE_LEASE_SECONDS. The first
+    pool started in a process requeues the jobs whose lease expired, i.e.
+    jobs left running by a process that died, and leaves the jobs of live
+    processes alone.
+
+    Attributes:
+        service (TranscriptionJobService): Service whose queue is processed
+        workers (int): Number of jobs transcribed concurrently
+        poll_interval (float): Seconds between queue polls when idle
+        lease_seconds (float): Heartbeat age after which a running job is considered abandoned
+        share_progress (bool): Store the streamed text of running jobs in their rows
+        owner (str): ID recorded on the jobs this pool claims
+    """
+
+    # Minimum seconds between cancellation checks while a job streams
+    CANCEL_CHECK_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        service: Optional[TranscriptionJobService] = None,
+        workers: int = None,
+        poll_interval: float = 2.0,
+        lease_seconds: float = None,
+        share_progress: bool = None
+    ):
+        """
+        Initialize the TranscriptionWorkerPool.
+
+        Args:
+            service (TranscriptionJobService, optional): Service whose queue is processed
+            workers (int, optional): Number of jobs transcribed concurrently
+            poll_interval (float): Seconds between queue polls when idle
+            lease_seconds (float, optional): Heartbeat age after which a running job is considered abandoned
+            share_progress (bool, optional): Store the streamed text of running jobs in their rows;
+                by default when API worker processes serve the clients
+        """
+        self.service = service or TranscriptionJobService()
+        self.workers = max(1, workers if workers is not None else config.TRANSCRIBE_WORKERS)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds if lease_seconds is not None else config.TRANSCRIBE_LEASE_SECONDS
+        self.share_progress = share_progress if share_progress is not None else config.API_WORKERS > 1
+        self.owner = uuid.uuid4().hex
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the worker threads, requeueing abandoned jobs if no pool of this
+        process did yet. Does nothing if already started.
+        """
+        global _requeued
+        with self._lock:
+            if self._threads:
+                return
+
+            with _requeue_lock:
+                if not _requeued:
+                    _requeued = True
+                    requeued = self.service.repository.requeue_interrupted(self.owner, self.lease_seconds)
+                    if requeued:
+                        print(f"Requeued {requeued} interrupted transcription job(s).")
+
+            heartbeat = threading.Thread(target=self._heartbeat, name="vaibvoice-transcribe-heartbeat")
+            heartbeat.daemon = True
+            heartbeat.start()
+            self._threads.append(heartbeat)
+
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"vaibvoice-transcribe-{index}")
+                thread.daemon = True
+                thread.start()
+                self._threads.append(thread)
+
+    def notify(self):
+        """
+        Wake idle workers to check the queue.
+        """
+        self._wakeup.set()
+
+    def stop(self):
+        """
+        Stop the workers after their current job. Running jobs are finished, not cancelled.
+        """
+        self._stop.set()
+        self._wakeup.set()
+
+    def _run(self):
+        """
+        Worker loop.
+        """
+        while not self._stop.is_set():
+            try:
+                job = self.service.repository.claim_next(self.owner)
+            except Exception as e:
+                print(f"Error claiming transcription job: {str(e)}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self.service.publish(job)
+            self._process(job)
+
+    def _heartbeat(self):
+        """
+        Heartbeat loop: renews the lease of this pool's running jobs.
+        """
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.service.repository.heartbeat(self.owner)
+            except Exception as e:
+                print(f"Error renewing transcription job leases: {str(e)}")
+
+    def _process(self, job: TranscriptionJob):
+        """
+        Run the transcription pipeline for a claimed job and store its outcome.
+
+        Args:
+            job (TranscriptionJob): The running job
+        """
+        # Imported here so that the API can start without the OpenAI and audio stacks loaded
+        from vaibvoice.core.formatter import format_transcription
+        from vaibvoice.core.transcriber import (
+            TranscriptionCancelled,
+            preprocess_audio,
+            request_transcription,
+        )
+
+        should_cancel = self._cancel_checker(job.id)
+        on_delta = self._delta_publisher(job.id)
+        trace = DictationTrace()
+        try:
+            with activate_trace(trace):
+                audio_path, job.duration = preprocess_audio(job.audio_path)
+                job.audio_path = audio_path
+                trace.capture = job.duration
+
+                raw_text = request_transcription(
+                    audio_path,
+                    on_delta=on_delta,
+                    should_cancel=should_cancel
+                )
+                job.text = format_transcription(raw_text)
+            if should_cancel(force=True):
+                raise TranscriptionCancelled()
+
+            if audio_path.lower().endswith(".wav"):
+                job.audio_path = get_audio_store().ingest(audio_path) or audio_path
+            stored = TranscriptionService().store_transcription(job.audio_path, job.text, job.duration, trace=trace)
+            job.transcription_id = stored.id if stored else None
+            job.status = JOB_DONE
+        except TranscriptionCancelled:
+            job.status = JOB_CANCELLED
+            job.text = None
+            self.service._remove_upload(job.audio_path)
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+            self.service._remove_upload(job.audio_path)
+            print(f"Error in transcription job {job.id}: {str(e)}")
+
+        self.service.repository.finish(job)
+        self.service.publish(job)
+
+    def _delta_publisher(self, job_id: str) -> Callable[[str], None]:
+        """
+        Build the callback that publishes the streamed text of a running job,
+        storing the text so far in its row if progress is shared.
+
+        Args:
+            job_id (str): ID of the job
+
+        Returns:
+            Callable[[str], None]: Called with each piece of streamed text
+        """
+        received = []
+        last_saved = 0.0
+
+        def on_delta(delta: str):
+            nonlocal last_saved
+            self.service.publish_delta(job_id, delta)
+            if not self.share_progress:
+                return
+            received.append(delta)
+            now = time.monotonic()
+            if now - last_saved >= self.CANCEL_CHECK_INTERVAL:
+                last_saved = now
+                try:
+                    self.service.repository.set_partial_text(job_id, "".join(received))
+                except Exception as e:
+                    print(f"Error saving transcription job progress: {str(e)}")
+
+        return on_delta
+
+    def _cancel_checker(self, job_id: str) -> Callable[..., bool]:
+        """
+        Build a throttled check for a cancellation request on a running job.
+
+        Args:
+            job_id (str): ID of the job
+
+        Returns:
+            Callable[..., bool]: Returns True once cancellation was requested;
+                pass force=True to skip the throttle
+        """
+        last_check = 0.0
+        cancelled = False
+
+        def should_cancel(force: bool = False) -> bool:
+            nonlocal last_check, cancelled
+            now = time.monotonic()
+            if not cancelled and (force or now - last_check >= self.CANCEL_CHECK_INTERVAL):
+                last_check = now
+                cancelled = self.service.repository.is_cancel_requested(job_id)
+            return cancelled
+
+        return should_cancel
+
+
+_service = None
+_workers = None
+_lock = threading.Lock()
+
+
+def get_transcription_job_service() -> TranscriptionJobService:
+    """
+    Get the process-wide transcription job service.
+
+    Returns:
+        TranscriptionJobService: The shared service
+    """
+    global _service
+    with _lock:
+        if _service is None:
+            _service = TranscriptionJobService()
+        return _service
+
+
+def get_transcription_workers() -> TranscriptionWorkerPool:
+    """
+    Get the process-wide transcription worker pool.
+
+    Returns:
+        TranscriptionWorkerPool: The shared pool
+    """
+    global _workers
+    service = get_transcription_job_service()
+    with _lock:
+        if _workers is None:
+            _workers = TranscriptionWorkerPool(service)
+        return _workers
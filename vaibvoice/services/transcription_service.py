@@ -3,10 +3,18 @@ Service for transcription operations.
 Implements business logic for transcriptions.
 """
 
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
 
-from vaibvoice.db.repositories.transcription_repository import TranscriptionRepository
-from vaibvoice.models.transcription import Transcription
+from vaibvoice.core.audio_store import get_audio_store
+from vaibvoice.db.repositories.archive_repository import ArchiveRepository
+from vaibvoice.db.repositories.trace_repository import TraceRepository
+from vaibvoice.db.repositories.transcription_repository import DataVersion, TranscriptionRepository
+from vaibvoice.db.write_behind import WriteBehindQueue
+from vaibvoice.models.trace import DictationTrace
+from vaibvoice.models.transcription import Transcription, transcription_row_to_dict
+from vaibvoice.services.event_bus import EventBus, get_event_bus
+from vaibvoice.utils.metrics import get_metrics
 
 class TranscriptionService:
     """
@@ -15,18 +23,47 @@ class TranscriptionService:
     
     Attributes:
         repository (TranscriptionRepository): Repository for transcription data access
+        writer (WriteBehindQueue): Optional write-behind queue used for new transcriptions
+        archive (ArchiveRepository): Repository for archived transcriptions
+        events (EventBus): Bus on which new transcriptions are published
+        traces (TraceRepository): Repository for dictation traces
     """
     
-    def __init__(self, repository: Optional[TranscriptionRepository] = None):
+    def __init__(
+        self,
+        repository: Optional[TranscriptionRepository] = None,
+        writer: Optional[WriteBehindQueue] = None,
+        archive: Optional[ArchiveRepository] = None,
+        events: Optional[EventBus] = None,
+        traces: Optional[TraceRepository] = None
+    ):
         """
         Initialize the TranscriptionService with the specified repository.
         
         Args:
             repository (TranscriptionRepository, optional): Repository for transcription data access
+            writer (WriteBehindQueue, optional): Write-behind queue for new transcriptions.
+                When given, add_transcription returns as soon as the row is queued.
+            archive (ArchiveRepository, optional): Repository for archived transcriptions
+            events (EventBus, optional): Bus on which new transcriptions are published
+            traces (TraceRepository, optional): Repository for dictation traces
         """
         self.repository = repository or TranscriptionRepository()
+        self.writer = writer
+        self.archive = archive or ArchiveRepository(self.repository.db_path)
+        self.events = events or get_event_bus()
+        self.traces = traces or TraceRepository(self.repository.db_path)
+        self._counters: Optional[Tuple[DataVersion, date, dict]] = None
     
-    def add_transcription(self, audio_path: str, text: str, duration: float, word_count: Optional[int] = None) -> bool:
+    def add_transcription(
+        self,
+        audio_path: str,
+        text: str,
+        duration: float,
+        word_count: Optional[int] = None,
+        trace: Optional[DictationTrace] = None,
+        ingest_audio: bool = False
+    ) -> bool:
         """
         Add a new transcription.
         
@@ -35,9 +72,12 @@ class TranscriptionService:
             text (str): Transcribed text
             duration (float): Duration of the audio in seconds
             word_count (int, optional): Number of words in the transcription
+            trace (DictationTrace, optional): Timing breakdown stored with the transcription
+            ingest_audio (bool): Move the recording into the audio store first; with a
+                writer this happens on the writer thread
             
         Returns:
-            bool: True if the transcription was added successfully, False otherwise
+            bool: True if the transcription was added (or queued) successfully, False otherwise
         """
         transcription = Transcription(
             audio_path=audio_path,
@@ -46,7 +86,106 @@ class TranscriptionService:
             word_count=word_count
         )
         
-        return self.repository.add(transcription)
+        if self.writer is not None:
+            return self.writer.put(
+                transcription, on_commit=self._publish_added, ingest_audio=ingest_audio, trace=trace
+            )
+        if ingest_audio:
+            transcription.audio_path = get_audio_store().ingest(audio_path) or audio_path
+        return self._store(transcription, trace)
+    
+    def store_transcription(
+        self,
+        audio_path: str,
+        text: str,
+        duration: float,
+        trace: Optional[DictationTrace] = None
+    ) -> Optional[Transcription]:
+        """
+        Add a new transcription synchronously, bypassing the write-behind queue.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            text (str): Transcribed text
+            duration (float): Duration of the audio in seconds
+            trace (DictationTrace, optional): Timing breakdown stored with the transcription
+            
+        Returns:
+            Optional[Transcription]: The stored transcription with its id set, or None on failure
+        """
+        transcription = Transcription(audio_path=audio_path, text=text, duration=duration)
+        return transcription if self._store(transcription, trace) else None
+    
+    def _store(self, transcription: Transcription, trace: Optional[DictationTrace] = None) -> bool:
+        """
+        Write a transcription and its trace to the repository and publish it.
+        
+        Args:
+            transcription (Transcription): The transcription to store
+            trace (DictationTrace, optional): Timing breakdown stored with the transcription
+            
+        Returns:
+            bool: True if the transcription was stored
+        """
+        with get_metrics().span("db_write"):
+            added = self.repository.add(transcription, trace)
+        if not added:
+            return False
+        self._publish_added(transcription)
+        return True
+    
+    def get_trace(self, transcription_id: int) -> Optional[DictationTrace]:
+        """
+        Get the timing breakdown of a transcription, looking in the archive if it is no longer hot.
+        
+        Args:
+            transcription_id (int): ID of the transcription
+            
+        Returns:
+            Optional[DictationTrace]: The trace, or None if the transcription has none
+        """
+        trace = self.traces.get(transcription_id)
+        if trace is None:
+            trace = self.archive.get_trace(transcription_id)
+        return trace
+    
+    def _publish_added(self, transcription: Transcription):
+        """
+        Publish a committed transcription and the updated counters as a "transcription" event.
+        
+        Args:
+            transcription (Transcription): The stored transcription, with its id set
+        """
+        row = (
+            transcription.id,
+            transcription.timestamp.isoformat(),
+            transcription.audio_path,
+            transcription.text,
+            transcription.duration,
+            transcription.word_count
+        )
+        self.events.publish("transcription", {
+            "transcription": transcription_row_to_dict(row),
+            "stats": self._current_counters()
+        })
+    
+    def _current_counters(self) -> dict:
+        """
+        Get the aggregate counters for a "transcription" event.
+        They are recomputed only when the history version or the day changed,
+        so a flushed batch is aggregated once rather than once per row.
+        
+        Returns:
+            dict: Counters as returned by TranscriptionRepository.get_counters
+        """
+        version = self.repository.get_data_version()
+        today = datetime.now(timezone.utc).date()  # the day of date('now') in the counters query
+        cached = self._counters
+        if cached is not None and cached[0] == version and cached[1] == today:
+            return cached[2]
+        counters = self.repository.get_counters()
+        self._counters = (version, today, counters)
+        return counters
     
     def get_all_transcriptions(self) -> List[Transcription]:
         """
@@ -57,9 +196,27 @@ class TranscriptionService:
         """
         return self.repository.get_all()
     
+    def get_all_transcription_rows(self) -> List[tuple]:
+        """
+        Get all transcriptions as raw database rows, newest first.
+        
+        Returns:
+            List[tuple]: Rows in TRANSCRIPTION_COLUMNS order
+        """
+        return self.repository.get_all_rows()
+    
+    def get_data_version(self) -> DataVersion:
+        """
+        Get the current version of the transcription history.
+        
+        Returns:
+            DataVersion: Version that changes whenever a transcription is added, changed or removed
+        """
+        return self.repository.get_data_version()
+    
     def get_transcription_by_id(self, transcription_id: int) -> Optional[Transcription]:
         """
-        Get a transcription by its ID.
+        Get a transcription by its ID, looking in the archive if it is no longer hot.
         
         Args:
             transcription_id (int): ID of the transcription to get
@@ -67,4 +224,20 @@ class TranscriptionService:
         Returns:
             Optional[Transcription]: The transcription if found, None otherwise
         """
-        return self.repository.get_by_id(transcription_id)
\ No newline at end of file
+        transcription = self.repository.get_by_id(transcription_id)
+        if transcription is None:
+            transcription = self.archive.get_by_id(transcription_id)
+        return transcription
+    
+    def get_archived_transcriptions(self, limit: int = 100, offset: int = 0) -> List[Transcription]:
+        """
+        Get archived transcriptions, newest first.
+        
+        Args:
+            limit (int): Maximum number of transcriptions to return
+            offset (int): Number of transcriptions to skip
+            
+        Returns:
+            List[Transcription]: Archived transcriptions
+        """
+        return self.archive.get_all(limit, offset)
\ No newline at end of file
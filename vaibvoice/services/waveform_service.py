@@ -0,0 +1,162 @@
+"""
+Service for waveform operations.
+Computes the peaks of a recording on first request and caches them on disk.
+"""
+
+import contextlib
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import vaibvoice.config as config
+from vaibvoice.core.audio_store import AudioStore, derived_path, get_audio_store
+from vaibvoice.core.waveform import Waveform, compute_waveform, dump_waveform, load_waveform
+
+class WaveformService:
+    """
+    Service for waveform operations.
+
+    Peaks files are named after the content key of the recording (see
+    AudioStore.content_key) and are deleted by the audio store together with
+    the recording. Concurrent requests for the same recording compute its
+    peaks once.
+
+    Attributes:
+        audio_store (AudioStore): Store the recordings are resolved through
+        cache_dir (str): Directory of the peaks files
+        samples_per_peak (int): Frames per peak at the finest level
+    """
+
+    def __init__(
+        self,
+        audio_store: Optional[AudioStore] = None,
+        cache_dir: str = None,
+        samples_per_peak: int = None
+    ):
+        """
+        Initialize the WaveformService.
+
+        Args:
+            audio_store (AudioStore, optional): Store the recordings are resolved through
+            cache_dir (str, optional): Directory of the peaks files
+            samples_per_peak (int, optional): Frames per peak at the finest level
+        """
+        self.audio_store = audio_store or get_audio_store()
+        self.cache_dir = cache_dir if cache_dir is not None else config.PEAKS_CACHE_DIR
+        self.samples_per_peak = samples_per_peak or config.PEAKS_SAMPLES_PER_PEAK
+        # Per recording: [lock, number of requests holding or waiting for it]
+        self._locks: Dict[str, List] = {}
+        self._locks_lock = threading.Lock()
+
+    def get_waveform(self, audio_path: str) -> Optional[Tuple[str, Waveform]]:
+        """
+        Get the peaks of a recording, computing and caching them if needed.
+
+        Args:
+            audio_path (str): Value of transcriptions.audio_path
+
+        Returns:
+            Optional[Tuple[str, Waveform]]: Cache key of the recording and its peaks,
+                or None if the recording is missing, evicted or unreadable
+        """
+        path = self.audio_store.resolve(audio_path, touch=False)
+        if path is None:
+            return None
+
+        key = self.audio_store.content_key(audio_path, path)
+        cache_path = derived_path(self.cache_dir, key, "peaks")
+        waveform = self._load(cache_path)
+        if waveform is not None:
+            return key, waveform
+
+        try:
+            with self._locked(key):
+                # Another request may have computed it while we waited
+                waveform = self._load(cache_path)
+                if waveform is None:
+                    waveform = compute_waveform(path, self.samples_per_peak)
+                    self._save(cache_path, waveform)
+        except Exception as e:
+            print(f"Error computing waveform of {audio_path}: {str(e)}")
+            return None
+        return key, waveform
+
+    @contextlib.contextmanager
+    def _locked(self, key: str):
+        """
+        Hold the lock serializing the computation of one recording's peaks.
+        The lock is dropped once no request holds or waits for it.
+
+        Args:
+            key (str): Cache key of the recording
+        """
+        with self._locks_lock:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._locks_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    @staticmethod
+    def _load(cache_path: str) -> Optional[Waveform]:
+        """
+        Read a peaks file.
+
+        Args:
+            cache_path (str): Path of the peaks file
+
+        Returns:
+            Optional[Waveform]: The peaks, or None if the file is missing or invalid
+        """
+        try:
+            with open(cache_path, "rb") as f:
+                return load_waveform(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable peaks file {cache_path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _save(cache_path: str, waveform: Waveform):
+        """
+        Write a peaks file atomically, so readers never see a partial file.
+
+        Args:
+            cache_path (str): Path of the peaks file
+            waveform (Waveform): The peaks
+        """
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(dump_waveform(waveform))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Error caching waveform: {str(e)}")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_waveform_service() -> WaveformService:
+    """
+    Get the process-wide waveform service.
+
+    Returns:
+        WaveformService: The shared waveform service
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = WaveformService()
+        return _service
@@ -43,6 +43,31 @@ def get_audio_sample_rate(audio_path: str) -> int:
         print(f"Error getting audio sample rate: {str(e)}")
         return config.SAMPLE_RATE
 
+def get_audio_metadata(audio_path: str) -> Optional[dict]:
+    """
+    Get the duration, sample rate and channel count of an audio file with a single header read.
+    Unlike get_audio_duration and get_audio_sample_rate, missing or unreadable files
+    are reported as None instead of falling back to defaults.
+
+    Args:
+        audio_path (str): Path to the audio file
+
+    Returns:
+        Optional[dict]: {"duration", "sample_rate", "channels"}, or None if the file cannot be read
+    """
+    if not audio_path or not os.path.isfile(audio_path):
+        return None
+
+    try:
+        info = sf.info(audio_path)
+        return {
+            "duration": info.duration,
+            "sample_rate": info.samplerate,
+            "channels": info.channels
+        }
+    except Exception:
+        return None
+
 def convert_audio_format(audio_path: str, output_format: str = "wav") -> Optional[str]:
     """
     Convert an audio file to a different format.
@@ -0,0 +1,129 @@
+"""
+Utility functions for resource diagnostics.
+Reports memory, file descriptors, threads and SQLite connections of the
+running process, to spot leaks in long-running instances.
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import vaibvoice.config as config
+from vaibvoice.db.base import open_connection_count
+
+
+def start_tracemalloc():
+    """
+    Start tracing allocations if TRACEMALLOC_FRAMES is set and tracing is not running yet.
+    Tracing slows allocations down, so it is off by default.
+    """
+    if config.TRACEMALLOC_FRAMES > 0 and not tracemalloc.is_tracing():
+        tracemalloc.start(config.TRACEMALLOC_FRAMES)
+
+
+def rss_bytes() -> Optional[int]:
+    """
+    Get the resident set size of the process.
+
+    Returns:
+        Optional[int]: Current RSS in bytes on Linux, peak RSS on macOS, None elsewhere
+    """
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def open_file_descriptors() -> Optional[int]:
+    """
+    Count the open file descriptors of the process, including sockets and pipes.
+
+    Returns:
+        Optional[int]: Number of descriptors, or None if the platform does not expose them
+    """
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            # Listing the directory opens one descriptor itself
+            return len(os.listdir(path)) - 1
+        except OSError:
+            continue
+    return None
+
+
+def thread_counts() -> Dict[str, int]:
+    """
+    Count live threads by name, with trailing numbers dropped so pools group together.
+
+    Returns:
+        Dict[str, int]: Thread name -> number of threads
+    """
+    counts: Dict[str, int] = {}
+    for thread in threading.enumerate():
+        name = thread.name.rstrip("0123456789").rstrip("-_ ") or thread.name
+        counts[name] = counts.get(name, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def top_allocations(limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+    """
+    Get the source lines holding the most traced memory.
+
+    Args:
+        limit (int): Number of lines to report
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: {"location", "size", "count"} per line, None if tracing is off
+    """
+    if not tracemalloc.is_tracing():
+        return None
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+
+
+def collect(limit: int = 20) -> Dict[str, Any]:
+    """
+    Collect all diagnostics of the process.
+
+    Args:
+        limit (int): Number of allocation sites to report
+
+    Returns:
+        Dict[str, Any]: Process id, RSS, descriptors, threads, SQLite connections and allocations
+    """
+    threads = thread_counts()
+    traced = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else None
+    return {
+        "pid": os.getpid(),
+        "rss": rss_bytes(),
+        "open_fds": open_file_descriptors(),
+        "threads": sum(threads.values()),
+        "thread_names": threads,
+        "sqlite_connections": open_connection_count(),
+        "tracemalloc": {
+            "tracing": traced is not None,
+            "current": traced[0] if traced else None,
+            "peak": traced[1] if traced else None,
+            "top": top_allocations(limit),
+        },
+    }
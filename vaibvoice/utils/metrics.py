@@ -0,0 +1,444 @@
+"""
+Utility functions for latency instrumentation.
+Provides monotonic spans around the stages of a dictation and exports the
+resulting histograms and counters in the Prometheus text format. Spans also
+add to the trace of the dictation running on the current thread, if any.
+"""
+
+import bisect
+import contextlib
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import vaibvoice.config as config
+
+# Upper bounds in seconds, from a fast DB insert to a long transcription
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Holds the trace of the dictation being processed by each thread
+_local = threading.local()
+
+
+def current_trace():
+    """
+    Get the trace activated on the current thread.
+
+    Returns:
+        Optional[DictationTrace]: The trace, or None outside a traced dictation
+    """
+    return getattr(_local, "trace", None)
+
+
+@contextlib.contextmanager
+def activate_trace(trace):
+    """
+    Make spans on the current thread add to a trace for the duration of the block.
+
+    Args:
+        trace (DictationTrace): The trace to add stage durations to
+    """
+    previous = getattr(_local, "trace", None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def _escape(value: str) -> str:
+    """
+    Escape a label value for the Prometheus text format.
+
+    Args:
+        value (str): The label value
+
+    Returns:
+        str: The escaped value
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    """
+    Format a label set as {name="value",...}.
+
+    Args:
+        labelnames (Sequence[str]): Names of the labels
+        values (Tuple[str, ...]): Values of the labels
+        extra (str): Additional pre-formatted label, such as le="0.5"
+
+    Returns:
+        str: The label set, or an empty string when there are no labels
+    """
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """
+    Format a sample value the way Prometheus expects.
+
+    Args:
+        value (float): The value
+
+    Returns:
+        str: The formatted value
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    A monotonically increasing count, optionally split by labels.
+
+    Attributes:
+        name (str): Metric name
+        help (str): Description of the metric
+        labelnames (Tuple[str, ...]): Names of the labels
+    """
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize the Counter.
+
+        Args:
+            name (str): Metric name
+            help (str): Description of the metric
+            labelnames (Sequence[str]): Names of the labels
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str):
+        """
+        Increase the count.
+
+        Args:
+            amount (float): Amount to add
+            *labels (str): Label values, in the order of labelnames
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        """
+        Render the counter in the Prometheus text format.
+
+        Returns:
+            Iterable[str]: Lines of the exposition
+        """
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def snapshot(self) -> list:
+        """
+        Get the current values in a JSON-serializable form.
+
+        Returns:
+            list: [label values, value] pairs
+        """
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def merge(self, snapshot: list):
+        """
+        Add the values of a snapshot, e.g. one taken in another process.
+
+        Args:
+            snapshot (list): Result of snapshot()
+        """
+        for labels, value in snapshot:
+            self.inc(value, *labels)
+
+
+class Histogram:
+    """
+    A distribution of observed values in cumulative buckets, optionally split by labels.
+
+    Attributes:
+        name (str): Metric name
+        help (str): Description of the metric
+        labelnames (Tuple[str, ...]): Names of the labels
+        buckets (Tuple[float, ...]): Upper bounds of the buckets
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        """
+        Initialize the Histogram.
+
+        Args:
+            name (str): Metric name
+            help (str): Description of the metric
+            labelnames (Sequence[str]): Names of the labels
+            buckets (Sequence[float]): Upper bounds of the buckets
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        """
+        Record an observation.
+
+        Args:
+            value (float): The observed value
+            *labels (str): Label values, in the order of labelnames
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterable[str]:
+        """
+        Render the histogram in the Prometheus text format.
+
+        Returns:
+            Iterable[str]: Lines of the exposition
+        """
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = sorted((labels, list(counts), total[0]) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+    def snapshot(self) -> list:
+        """
+        Get the current observations in a JSON-serializable form.
+
+        Returns:
+            list: [label values, bucket counts, sum] triples
+        """
+        with self._lock:
+            return [[list(labels), list(counts), total[0]] for labels, (counts, total) in self._series.items()]
+
+    def merge(self, snapshot: list):
+        """
+        Add the observations of a snapshot, e.g. one taken in another process.
+        Series recorded with other buckets are ignored.
+
+        Args:
+            snapshot (list): Result of snapshot()
+        """
+        with self._lock:
+            for labels, counts, total in snapshot:
+                if len(counts) != len(self.buckets) + 1:
+                    continue
+                labels = tuple(labels)
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+                for index, count in enumerate(counts):
+                    series[0][index] += count
+                series[1][0] += total
+
+
+class _Span:
+    """
+    Context manager timing one stage with the monotonic clock.
+    """
+
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        if exc_type is not None and self.metrics.enabled:
+            self.metrics.stage_errors.inc(1, self.stage)
+        return False
+
+
+class _NoopSpan:
+    """
+    Span used when metrics are disabled; costs one attribute lookup and a call.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Metrics:
+    """
+    The application's metrics.
+
+    Stages of a dictation are timed with span(), e.g.
+
+        with get_metrics().span("format"):
+            ...
+
+    which observes vaibvoice_stage_seconds{stage="format"} and counts
+    vaibvoice_stage_errors_total{stage="format"} when the block raises.
+    Inside activate_trace() the durations are also added to the trace.
+    When disabled, span() returns a shared no-op context manager outside
+    traced dictations, and observe() and count() only feed the trace.
+
+    Attributes:
+        enabled (bool): Whether observations are recorded
+    """
+
+    def __init__(self, enabled: bool = None):
+        """
+        Initialize the Metrics.
+
+        Args:
+            enabled (bool, optional): Whether observations are recorded
+        """
+        self.enabled = enabled if enabled is not None else config.METRICS_ENABLED
+        self.stage_seconds = Histogram(
+            "vaibvoice_stage_seconds", "Time spent in each stage of a dictation.", ("stage",)
+        )
+        self.stage_errors = Counter(
+            "vaibvoice_stage_errors_total", "Stages that ended with an exception.", ("stage",)
+        )
+        self.events = Counter(
+            "vaibvoice_events_total", "Counts of notable events, such as audio input overflows.", ("event",)
+        )
+        self._metrics = [self.stage_seconds, self.stage_errors, self.events]
+
+    def span(self, stage: str):
+        """
+        Time a stage.
+
+        Args:
+            stage (str): Name of the stage
+
+        Returns:
+            A context manager that records the duration of its block
+        """
+        if not self.enabled and getattr(_local, "trace", None) is None:
+            return _NOOP_SPAN
+        return _Span(self, stage)
+
+    def observe(self, stage: str, seconds: float):
+        """
+        Record the duration of a stage measured elsewhere, such as the capture length.
+
+        Args:
+            stage (str): Name of the stage
+            seconds (float): Duration in seconds
+        """
+        if self.enabled:
+            self.stage_seconds.observe(seconds, stage)
+        trace = getattr(_local, "trace", None)
+        if trace is not None:
+            trace.add_stage(stage, seconds)
+
+    def count(self, event: str, amount: float = 1):
+        """
+        Count an event.
+
+        Args:
+            event (str): Name of the event
+            amount (float): Amount to add
+        """
+        if self.enabled:
+            self.events.inc(amount, event)
+
+    def register(self, metric):
+        """
+        Add a Counter or Histogram to the exposition.
+
+        Args:
+            metric (Counter | Histogram): The metric
+        """
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, list]:
+        """
+        Get the values of every metric in a JSON-serializable form.
+
+        Returns:
+            Dict[str, list]: Snapshot of each metric, by metric name
+        """
+        return {metric.name: metric.snapshot() for metric in self._metrics}
+
+    def merge(self, snapshot: Dict[str, list]):
+        """
+        Add the values of a snapshot, e.g. one taken in another process.
+        Metrics that are not registered here are ignored.
+
+        Args:
+            snapshot (Dict[str, list]): Result of snapshot()
+        """
+        for metric in self._metrics:
+            if metric.name in snapshot:
+                metric.merge(snapshot[metric.name])
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """
+    Get the process-wide metrics.
+
+    Returns:
+        Metrics: The shared metrics
+    """
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = Metrics()
+    return _metrics
@@ -0,0 +1,181 @@
+"""
+Utility functions for on-demand profiling.
+Provides a sampling profiler that periodically records the Python stack of
+every thread in the process (the API event loop, the key listener, the audio
+callback, sound cues and workers) without restarting it. Threads started
+outside Python, such as the PortAudio callback thread, are sampled while
+they run Python code.
+
+Results are exported as collapsed stacks (one "frame;frame;... count" line
+per stack, the input of flamegraph.pl and many viewers) or as a speedscope
+file with one profile per thread.
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Only one profile runs at a time: sampling twice would double the overhead
+_running = threading.Lock()
+
+# Frame label: (function name, file name, first line of the function)
+FrameKey = Tuple[str, str, int]
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profile is requested while another one is running."""
+
+
+class StackSampler:
+    """
+    Sampling profiler for all threads of the process.
+
+    Sampling holds the GIL only while walking the stacks, so the overhead is
+    roughly proportional to the sampling rate and the stack depth. Code
+    objects are labelled once and then looked up.
+
+    Attributes:
+        interval (float): Seconds between samples
+        samples (Dict[str, Dict[tuple, int]]): Per thread name, stack (root first) -> sample count
+        duration (float): Seconds actually sampled
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialize the StackSampler.
+
+        Args:
+            interval (float): Seconds between samples
+        """
+        self.interval = interval
+        self.samples: Dict[str, Dict[tuple, int]] = {}
+        self.sample_count = 0
+        self.duration = 0.0
+        self._labels: Dict[object, FrameKey] = {}
+
+    def _label(self, code) -> FrameKey:
+        """
+        Label a code object, caching the result.
+
+        Args:
+            code (types.CodeType): Code object of a frame
+
+        Returns:
+            FrameKey: (function name, file name, first line)
+        """
+        label = self._labels.get(code)
+        if label is None:
+            label = (code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
+            self._labels[code] = label
+        return label
+
+    def sample(self, skip: Optional[int] = None):
+        """
+        Record the current stack of every thread once.
+
+        Args:
+            skip (int, optional): Ident of a thread to leave out, normally the sampler's own
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == skip:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            thread_samples = self.samples.setdefault(names.get(ident, f"thread-{ident}"), {})
+            key = tuple(stack)
+            thread_samples[key] = thread_samples.get(key, 0) + 1
+        self.sample_count += 1
+
+    def run(self, seconds: float):
+        """
+        Sample on the calling thread for the given time.
+
+        Args:
+            seconds (float): How long to sample
+
+        Raises:
+            ProfilerBusyError: If another profile is running
+        """
+        if not _running.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            own = threading.get_ident()
+            start = time.perf_counter()
+            deadline = start + seconds
+            next_sample = start
+            while True:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                self.sample(skip=own)
+                # Keep a steady rate; skip ticks rather than bursting after a stall
+                next_sample = max(next_sample + self.interval, time.perf_counter())
+                time.sleep(max(0.0, min(next_sample, deadline) - time.perf_counter()))
+            self.duration = time.perf_counter() - start
+        finally:
+            _running.release()
+
+    def to_collapsed(self) -> str:
+        """
+        Export the samples as collapsed stacks, with the thread name as the root frame.
+
+        Returns:
+            str: One "thread;frame;...;frame count" line per distinct stack
+        """
+        lines = []
+        for thread_name, stacks in sorted(self.samples.items()):
+            root = thread_name.replace(";", ":").replace(" ", "_")
+            for stack, count in stacks.items():
+                frames = ";".join(f"{name} ({filename}:{line})" for name, filename, line in stack)
+                lines.append(f"{root};{frames} {count}" if frames else f"{root} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str = "VaibVoice") -> dict:
+        """
+        Export the samples in the speedscope file format, one sampled profile per thread.
+        Samples are weighted by the sampling interval, so times are approximate.
+
+        Args:
+            name (str): Name of the profile
+
+        Returns:
+            dict: The speedscope document
+        """
+        frames: List[dict] = []
+        index: Dict[FrameKey, int] = {}
+        profiles = []
+        weight = self.duration / self.sample_count if self.sample_count else self.interval
+        for thread_name, stacks in sorted(self.samples.items()):
+            samples, weights = [], []
+            for stack, count in stacks.items():
+                indices = []
+                for key in stack:
+                    if key not in index:
+                        index[key] = len(frames)
+                        frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                    indices.append(index[key])
+                samples.append(indices)
+                weights.append(count * weight)
+            profiles.append({
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            })
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "vaibvoice",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }